@@ -1,57 +1,250 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
-def baixar_sumula(ano: int, codigo: int, sufixo: str = "se", pasta_destino: Path = Path("sumulas/2013")):
+URL_SUMULA = "https://conteudo.cbf.com.br/sumulas/{ano}/{codigo}{sufixo}.pdf"
+PASTA_SUMULAS = Path("sumulas")
+
+# Resultado de cada tentativa de download
+BAIXADO = "baixado"
+EXISTENTE = "existente"
+AUSENTE = "ausente"
+ERRO = "erro"
+
+_print_lock = threading.Lock()
+
+
+def _log(msg: str):
+    # Várias threads imprimindo ao mesmo tempo embaralham as linhas
+    with _print_lock:
+        print(msg)
+
+
+def criar_sessao(workers: int = 8) -> requests.Session:
+    """
+    Sessão HTTP compartilhada entre as threads: reaproveita as conexões
+    keep-alive com o servidor da CBF (sem novo handshake TLS a cada súmula)
+    e refaz automaticamente erros transitórios (5xx, 429, conexão caída).
+    """
+    sessao = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=retry)
+    sessao.mount("https://", adapter)
+    sessao.mount("http://", adapter)
+    return sessao
+
+
+def sumula_valida(caminho: Path) -> bool:
+    """
+    Um PDF baixado por completo começa com "%PDF" e termina com "%%EOF".
+    Arquivos truncados (download interrompido) falham no segundo teste.
+    """
+    try:
+        tamanho = caminho.stat().st_size
+        if tamanho < 8:
+            return False
+        with open(caminho, "rb") as f:
+            if f.read(4) != b"%PDF":
+                return False
+            f.seek(max(0, tamanho - 1024))
+            return b"%%EOF" in f.read()
+    except OSError:
+        return False
+
+
+def baixar_sumula(ano: int, codigo, sufixo: str = "se", pasta_destino: Path = None,
+                  sessao: requests.Session = None) -> str:
     """
     Baixa uma única súmula dado o ano e o código (ex.: 142376),
     gerando a URL no formato:
     https://conteudo.cbf.com.br/sumulas/{ano}/{codigo}{sufixo}.pdf
+
+    - Pula o download se o arquivo já existe e é um PDF válido.
+    - Grava em streaming num arquivo temporário (.part) e só renomeia para o
+      nome final quando o download termina, então nunca fica um PDF pela
+      metade com o nome definitivo.
+
+    Retorna BAIXADO, EXISTENTE, AUSENTE ou ERRO.
     """
+    pasta_destino = pasta_destino or PASTA_SUMULAS / str(ano)
     pasta_destino.mkdir(parents=True, exist_ok=True)
+    sessao = sessao or criar_sessao(1)
 
     nome_arquivo = f"{codigo}{sufixo}.pdf"
-    url = f"https://conteudo.cbf.com.br/sumulas/{ano}/{nome_arquivo}"
+    url = URL_SUMULA.format(ano=ano, codigo=codigo, sufixo=sufixo)
     caminho_arquivo = pasta_destino / nome_arquivo
 
-    print(f"Tentando baixar {url} ...")
+    if sumula_valida(caminho_arquivo):
+        return EXISTENTE
 
+    caminho_tmp = caminho_arquivo.with_suffix(".pdf.part")
     try:
-        resp = requests.get(url, timeout=15)
+        with sessao.get(url, timeout=15, stream=True) as resp:
+            if resp.status_code != 200:
+                _log(f"  {nome_arquivo}: não encontrado ({resp.status_code})")
+                return AUSENTE
+
+            chunks = resp.iter_content(chunk_size=64 * 1024)
+            primeiro = next(chunks, b"")
+            if not primeiro.startswith(b"%PDF"):
+                # A CBF responde 200 com uma página HTML para códigos inexistentes
+                _log(f"  {nome_arquivo}: resposta não é PDF")
+                return AUSENTE
+
+            with open(caminho_tmp, "wb") as f:
+                f.write(primeiro)
+                for chunk in chunks:
+                    f.write(chunk)
+        os.replace(caminho_tmp, caminho_arquivo)
     except Exception as e:
-        print(f"  Erro na requisição: {e}")
+        _log(f"  {nome_arquivo}: erro na requisição: {e}")
+        if caminho_tmp.exists():
+            caminho_tmp.unlink()
+        return ERRO
+
+    _log(f"  OK! Salvo em: {caminho_arquivo}")
+    return BAIXADO
+
+
+def sumula_existe(ano: int, codigo, sufixo: str = "se", sessao: requests.Session = None) -> bool:
+    """
+    Sonda o servidor sem baixar o arquivo inteiro: abre a resposta em
+    streaming, lê só o começo para confirmar que é um PDF e fecha.
+    """
+    sessao = sessao or criar_sessao(1)
+    url = URL_SUMULA.format(ano=ano, codigo=codigo, sufixo=sufixo)
+    try:
+        with sessao.get(url, timeout=15, stream=True) as resp:
+            if resp.status_code != 200:
+                return False
+            return next(resp.iter_content(chunk_size=8), b"").startswith(b"%PDF")
+    except requests.RequestException:
         return False
 
-    if resp.status_code == 200 and resp.content.startswith(b"%PDF"):
-        with open(caminho_arquivo, "wb") as f:
-            f.write(resp.content)
-        print(f"  OK! Salvo em: {caminho_arquivo}")
-        return True
-    else:
-        print(f"  Não encontrado ({resp.status_code})")
+
+def descobrir_intervalo(ano: int, sufixo: str = "se", prefixo: str = "", inicio: int = 1,
+                        tolerancia: int = 3, sessao: requests.Session = None) -> tuple:
+    """
+    Descobre o último número de jogo publicado no ano sem testar código por código.
+
+    Os códigos da CBF são "{prefixo}{numero}" com numero = 1, 2, 3, ... até o
+    último jogo da temporada. Em vez de varrer todos:
+
+      1. Galope: testa inicio+1, inicio+2, inicio+4, inicio+8, ... (passo dobrando)
+         até achar um número que não existe — O(log N) requisições.
+      2. Busca binária entre o último número existente e o primeiro ausente.
+
+    Como às vezes falta uma súmula isolada no meio da temporada, um número só é
+    considerado ausente se os `tolerancia` números seguintes também estiverem
+    ausentes.
+
+    Retorna (primeiro, ultimo) ou None se nem o primeiro código existir.
+    """
+    sessao = sessao or criar_sessao(1)
+    sondagens = 0
+
+    def existe(numero: int) -> bool:
+        nonlocal sondagens
+        for n in range(numero, numero + tolerancia + 1):
+            sondagens += 1
+            if sumula_existe(ano, f"{prefixo}{n}", sufixo, sessao):
+                return True
         return False
 
+    if not existe(inicio):
+        _log(f"Nenhuma súmula a partir de {prefixo}{inicio}{sufixo} em {ano}")
+        return None
 
-def baixar_intervalo(ano: int, inicio: int, fim: int, sufixo: str = "se"):
+    # 1. Galope
+    passo = 1
+    ultimo_ok = inicio
+    while existe(inicio + passo):
+        ultimo_ok = inicio + passo
+        passo *= 2
+    primeiro_ausente = inicio + passo
+
+    # 2. Busca binária em (ultimo_ok, primeiro_ausente)
+    while primeiro_ausente - ultimo_ok > 1:
+        meio = (ultimo_ok + primeiro_ausente) // 2
+        if existe(meio):
+            ultimo_ok = meio
+        else:
+            primeiro_ausente = meio
+
+    # A tolerância pode ter "pulado" para um vizinho existente; o último jogo
+    # real é o maior número existente dentro da janela
+    for n in range(ultimo_ok + tolerancia, ultimo_ok, -1):
+        sondagens += 1
+        if sumula_existe(ano, f"{prefixo}{n}", sufixo, sessao):
+            ultimo_ok = n
+            break
+
+    _log(f"Intervalo {ano}: {inicio}..{ultimo_ok} ({sondagens} sondagens)")
+    return inicio, ultimo_ok
+
+
+def baixar_intervalo(ano: int, inicio: int, fim: int, sufixo: str = "se", prefixo: str = "",
+                     pasta_destino: Path = None, workers: int = 8,
+                     sessao: requests.Session = None) -> dict:
     """
     Baixa todas as súmulas do intervalo [inicio, fim],
     ex.: inicio=142371, fim=142400.
+
+    Os downloads rodam em paralelo num pool limitado a `workers` threads,
+    todas usando a mesma sessão HTTP. Arquivos já presentes e válidos são
+    pulados, então a função pode ser chamada de novo para retomar um
+    download interrompido.
+
+    Retorna a contagem de resultados por status.
     """
-    pasta_destino = Path("sumulas/2013")
-    pasta_destino.mkdir(exist_ok=True)
+    pasta_destino = pasta_destino or PASTA_SUMULAS / str(ano)
+    pasta_destino.mkdir(parents=True, exist_ok=True)
+    sessao = sessao or criar_sessao(workers)
+
+    contagem = {BAIXADO: 0, EXISTENTE: 0, AUSENTE: 0, ERRO: 0}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futuros = [
+            pool.submit(baixar_sumula, ano, f"{prefixo}{numero}", sufixo, pasta_destino, sessao)
+            for numero in range(inicio, fim + 1)
+        ]
+        for futuro in as_completed(futuros):
+            contagem[futuro.result()] += 1
+
+    _log(f"Resumo {ano}: {contagem[BAIXADO]} baixadas, {contagem[EXISTENTE]} já existiam, "
+         f"{contagem[AUSENTE]} ausentes, {contagem[ERRO]} erros")
+    return contagem
+
 
-    for codigo in range(inicio, fim + 1):
-        baixar_sumula(ano, codigo, sufixo, pasta_destino)
+def baixar_temporada(ano: int, sufixo: str = "se", prefixo: str = "", workers: int = 8) -> dict:
+    """Descobre o intervalo de códigos do ano e baixa todas as súmulas dele."""
+    sessao = criar_sessao(workers)
+    intervalo = descobrir_intervalo(ano, sufixo, prefixo, sessao=sessao)
+    if not intervalo:
+        return {}
+    inicio, fim = intervalo
+    return baixar_intervalo(ano, inicio, fim, sufixo, prefixo, workers=workers, sessao=sessao)
 
 
 if __name__ == "__main__":
     # >>> AJUSTE AQUI OS PARÂMETROS QUE VOCÊ QUISER <<<
 
     ANO = 2013
-    INICIO = 14210     # primeiro código que você quer testar
-    FIM = 14210       # último código do intervalo
+    PREFIXO = "142"      # parte fixa do código (ex.: 142 + número do jogo = 14210)
     SUFIXO = "se"        # em Série A está vindo "se" (pode existir "sb" etc., se precisar)
+    WORKERS = 8          # downloads simultâneos (seja educado com o servidor)
 
-    baixar_intervalo(ANO, INICIO, FIM, SUFIXO)
+    # Descobre sozinho o último jogo publicado e baixa a temporada inteira.
+    # Para um intervalo fixo use:
+    #   baixar_intervalo(ANO, INICIO, FIM, SUFIXO, PREFIXO, workers=WORKERS)
+    baixar_temporada(ANO, SUFIXO, PREFIXO, WORKERS)
@@ -0,0 +1,89 @@
+"""
+Micro-benchmark da divisão da súmula em seções.
+
+Compara a abordagem antiga (cada extrator faz seus próprios split() sobre o
+texto inteiro para achar a sua seção) com dividir_secoes(), que acha todos os
+marcadores numa varredura só. O texto dos PDFs é extraído uma única vez antes
+das medições, então o tempo do pdfplumber não entra na conta.
+
+Uso (de dentro de scraping/):
+    python benchmark_secoes.py
+    python benchmark_secoes.py --pasta ../sumulas/2013 --repeticoes 2000
+"""
+import argparse
+import time
+from pathlib import Path
+
+import pdfplumber
+
+from sumula import SECOES, dividir_secoes, extrair_dados_texto, limpar_texto
+
+# PDFs de exemplo versionados no repositório (dados_brasileirao_sumula/sumulas/2013)
+PASTA_PADRAO = Path(__file__).resolve().parent.parent / "sumulas" / "2013"
+
+
+def secoes_por_split(texto: str) -> dict:
+    """Reprodução do que os extratores faziam antes: um split por seção."""
+    secoes = {}
+    for nome, inicio, fim in SECOES:
+        if inicio not in texto:
+            secoes[nome] = None
+            continue
+        bloco = texto.split(inicio, 1)[1]
+        if fim in bloco:
+            bloco = bloco.split(fim, 1)[0]
+        secoes[nome] = bloco
+    secoes["cabecalho"] = texto.split("Gols", 1)[0]
+    return secoes
+
+
+def carregar_textos(pasta: Path) -> list:
+    textos = []
+    for pdf_path in sorted(pasta.glob("*.pdf")):
+        with pdfplumber.open(str(pdf_path)) as pdf:
+            texto = "\n".join(page.extract_text() or "" for page in pdf.pages)
+        textos.append((pdf_path.name, limpar_texto(texto)))
+    return textos
+
+
+def cronometrar(funcao, textos: list, repeticoes: int) -> float:
+    """Tempo médio por súmula, em microssegundos."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for _, texto in textos:
+            funcao(texto)
+    decorrido = time.perf_counter() - inicio
+    return decorrido / (repeticoes * len(textos)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da divisão de seções da súmula")
+    parser.add_argument("--pasta", default=str(PASTA_PADRAO))
+    parser.add_argument("--repeticoes", type=int, default=1000)
+    args = parser.parse_args()
+
+    pasta = Path(args.pasta)
+    textos = carregar_textos(pasta)
+    if not textos:
+        print(f"⚠️ Nenhum PDF encontrado em {pasta}")
+        return
+    print(f"📄 {len(textos)} súmulas carregadas de {pasta}")
+
+    # As duas abordagens precisam devolver exatamente os mesmos blocos
+    for nome, texto in textos:
+        if secoes_por_split(texto) != dividir_secoes(texto):
+            print(f"❌ {nome}: seções diferentes entre as duas abordagens")
+            return
+    print("✅ Seções idênticas nas duas abordagens")
+
+    t_split = cronometrar(secoes_por_split, textos, args.repeticoes)
+    t_unica = cronometrar(dividir_secoes, textos, args.repeticoes)
+    t_total = cronometrar(lambda t: extrair_dados_texto(t, ""), textos, max(1, args.repeticoes // 10))
+
+    print(f"   split por seção:       {t_split:8.1f} µs/súmula")
+    print(f"   dividir_secoes():      {t_unica:8.1f} µs/súmula  ({t_split / t_unica:.1f}x)")
+    print(f"   extração completa:     {t_total:8.1f} µs/súmula")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,34 +5,88 @@ from pathlib import Path
 import pdfplumber
 
 
+# -------------------------------------------------
+# Padrões pré-compilados
+# -------------------------------------------------
+
+RE_ESPACOS = re.compile(r"[ \t]+")
+RE_CAMPEONATO = re.compile(r"Campeonato:\s*(.+?)\s+Rodada:\s*([0-9]+)")
+RE_JOGO = re.compile(r"Jogo:\s*(.+)")
+RE_JOGO_LINHA = re.compile(r"Jogo:\s*(.+?)\n")
+RE_DATA = re.compile(r"Data:\s*([0-9/]+)\s+Horário:\s*([0-9:]+)\s+Estádio:\s*(.+)")
+RE_NUMERO_JOGO = re.compile(r"Jogo:\s*([0-9]+)")
+
+# Seções da súmula: (nome, marcador de início, marcador de fim).
+# O bloco de uma seção vai do fim da PRIMEIRA ocorrência do marcador de
+# início até a primeira ocorrência do marcador de fim depois dele.
+SECOES = (
+    ("gols",              "Gols",              "Cartões Amarelos"),
+    ("cartoes_amarelos",  "Cartões Amarelos",  "Cartões Vermelhos"),
+    ("cartoes_vermelhos", "Cartões Vermelhos", "Ocorrências"),
+    ("substituicoes",     "Substituições",     "Confederação Brasileira de Futebol"),
+)
+
+
 # -------------------------------------------------
 # Utilitários
 # -------------------------------------------------
 
 def limpar_texto(texto: str) -> str:
     texto = texto.replace("\r", "\n")
-    texto = re.sub(r"[ \t]+", " ", texto)
+    texto = RE_ESPACOS.sub(" ", texto)
     return texto
 
 
+def dividir_secoes(texto: str) -> dict:
+    """
+    Divide o texto da súmula em seções nomeadas uma única vez.
+
+    Antes cada extrator fazia seus próprios split() sobre o texto inteiro
+    para achar o começo e o fim da sua seção, copiando o resto do texto a
+    cada split. Aqui só as posições dos marcadores são procuradas (str.find,
+    sem cópias) e cada bloco é fatiado uma vez a partir delas.
+
+    Retorna {"cabecalho": ..., "gols": ..., "cartoes_amarelos": ...,
+    "cartoes_vermelhos": ..., "substituicoes": ...}; seções ausentes
+    ficam como None. O cabeçalho é tudo antes de "Gols" (ou o texto
+    inteiro, se não houver a seção de gols).
+    """
+    secoes = {}
+    for nome, inicio, fim in SECOES:
+        pos = texto.find(inicio)
+        if pos < 0:
+            secoes[nome] = None
+            continue
+        comeco = pos + len(inicio)
+        final = texto.find(fim, comeco)
+        secoes[nome] = texto[comeco:final if final >= 0 else len(texto)]
+
+    pos_gols = texto.find("Gols")
+    secoes["cabecalho"] = texto[:pos_gols] if pos_gols >= 0 else texto
+    return secoes
+
+
 # -------------------------------------------------
 # Extração de informações gerais
 # -------------------------------------------------
 
-def extrair_info_geral(texto: str, mandante_hint=None, visitante_hint=None) -> dict:
+def extrair_info_geral(texto: str, mandante_hint=None, visitante_hint=None, secoes: dict = None) -> dict:
     info = {}
 
+    # Todas as informações gerais ficam no cabeçalho, antes de "Gols"
+    if secoes is None:
+        secoes = dividir_secoes(texto)
+    texto = secoes["cabecalho"]
+
     # Campeonato / Rodada
-    m_campeonato = re.search(
-        r"Campeonato:\s*(.+?)\s+Rodada:\s*([0-9]+)", texto
-    )
+    m_campeonato = RE_CAMPEONATO.search(texto)
     if m_campeonato:
         info["campeonato"] = m_campeonato.group(1).strip()
         info["rodada"] = m_campeonato.group(2).strip()
 
     # Descrição do jogo (linha com "Time X Time")
     jogo_descricao = None
-    for m in re.finditer(r"Jogo:\s*(.+)", texto):
+    for m in RE_JOGO.finditer(texto):
         candidato = m.group(1).strip()
         if " X " in candidato:
             jogo_descricao = candidato
@@ -46,7 +100,7 @@ def extrair_info_geral(texto: str, mandante_hint=None, visitante_hint=None) -> d
             info.setdefault("visitante", vis.strip())
     else:
         # fallback
-        m_jogo = re.search(r"Jogo:\s*(.+?)\n", texto)
+        m_jogo = RE_JOGO_LINHA.search(texto)
         if m_jogo:
             info["jogo_descricao"] = m_jogo.group(1).strip()
 
@@ -57,17 +111,14 @@ def extrair_info_geral(texto: str, mandante_hint=None, visitante_hint=None) -> d
         info["visitante"] = visitante_hint
 
     # Data / Horário / Estádio
-    m_data = re.search(
-        r"Data:\s*([0-9/]+)\s+Horário:\s*([0-9:]+)\s+Estádio:\s*(.+)",
-        texto,
-    )
+    m_data = RE_DATA.search(texto)
     if m_data:
         info["data"] = m_data.group(1).strip()
         info["horario"] = m_data.group(2).strip()
         info["estadio"] = m_data.group(3).strip()
 
     # Número do jogo (primeiro "Jogo: 371" do cabeçalho)
-    m_num = re.search(r"Jogo:\s*([0-9]+)", texto)
+    m_num = RE_NUMERO_JOGO.search(texto)
     if m_num:
         info["numero_jogo"] = m_num.group(1).strip()
 
@@ -143,14 +194,11 @@ def extrair_jogadores(pdf):
 # Extração de eventos (gols, cartões, substituições)
 # -------------------------------------------------
 
-def extrair_gols(texto: str):
-    if "Gols" not in texto:
+def extrair_gols(texto: str, secoes: dict = None):
+    bloco = (secoes or dividir_secoes(texto))["gols"]
+    if bloco is None:
         return []
 
-    bloco = texto.split("Gols", 1)[1]
-    if "Cartões Amarelos" in bloco:
-        bloco = bloco.split("Cartões Amarelos", 1)[0]
-
     linhas = [l.strip() for l in bloco.splitlines() if l.strip()]
     gols = []
 
@@ -181,14 +229,11 @@ def extrair_gols(texto: str):
     return gols
 
 
-def extrair_cartoes_amarelos(texto: str):
-    if "Cartões Amarelos" not in texto:
+def extrair_cartoes_amarelos(texto: str, secoes: dict = None):
+    bloco = (secoes or dividir_secoes(texto))["cartoes_amarelos"]
+    if bloco is None:
         return []
 
-    bloco = texto.split("Cartões Amarelos", 1)[1]
-    if "Cartões Vermelhos" in bloco:
-        bloco = bloco.split("Cartões Vermelhos", 1)[0]
-
     linhas = [l.strip() for l in bloco.splitlines() if l.strip()]
     amarelos = []
 
@@ -217,14 +262,11 @@ def extrair_cartoes_amarelos(texto: str):
     return amarelos
 
 
-def extrair_cartoes_vermelhos(texto: str):
-    if "Cartões Vermelhos" not in texto:
+def extrair_cartoes_vermelhos(texto: str, secoes: dict = None):
+    bloco = (secoes or dividir_secoes(texto))["cartoes_vermelhos"]
+    if bloco is None:
         return []
 
-    bloco = texto.split("Cartões Vermelhos", 1)[1]
-    if "Ocorrências / Observações" in bloco:
-        bloco = bloco.split("Ocorrências / Observações", 1)[0]
-
     linhas = [l.strip() for l in bloco.splitlines() if l.strip()]
     vermelhos = []
 
@@ -260,14 +302,11 @@ def extrair_cartoes_vermelhos(texto: str):
     return vermelhos
 
 
-def extrair_substituicoes(texto: str):
-    if "Substituições" not in texto:
+def extrair_substituicoes(texto: str, secoes: dict = None):
+    bloco = (secoes or dividir_secoes(texto))["substituicoes"]
+    if bloco is None:
         return []
 
-    bloco = texto.split("Substituições", 1)[1]
-    if "Confederação Brasileira de Futebol" in bloco:
-        bloco = bloco.split("Confederação Brasileira de Futebol", 1)[0]
-
     linhas = [l.strip() for l in bloco.splitlines() if l.strip()]
     subs = []
 
@@ -337,17 +376,23 @@ def parse_sumula(pdf_path: Path) -> dict:
         texto = "\n".join(page.extract_text() or "" for page in pdf.pages)
         jogadores, mand, vis = extrair_jogadores(pdf)
 
+    return extrair_dados_texto(texto, pdf_path.name, jogadores, mand, vis)
+
+
+def extrair_dados_texto(texto: str, arquivo: str, jogadores=None, mand=None, vis=None) -> dict:
+    """Parte da extração que só depende do texto (separada para o benchmark)."""
     texto = limpar_texto(texto)
-    info = extrair_info_geral(texto, mand, vis)
+    secoes = dividir_secoes(texto)
+    info = extrair_info_geral(texto, mand, vis, secoes)
 
     dados = {
-        "arquivo": pdf_path.name,
+        "arquivo": arquivo,
         "info": info,
-        "jogadores": jogadores,
-        "gols": extrair_gols(texto),
-        "cartoes_amarelos": extrair_cartoes_amarelos(texto),
-        "cartoes_vermelhos": extrair_cartoes_vermelhos(texto),
-        "substituicoes": extrair_substituicoes(texto),
+        "jogadores": jogadores or [],
+        "gols": extrair_gols(texto, secoes),
+        "cartoes_amarelos": extrair_cartoes_amarelos(texto, secoes),
+        "cartoes_vermelhos": extrair_cartoes_vermelhos(texto, secoes),
+        "substituicoes": extrair_substituicoes(texto, secoes),
     }
 
     return dados
@@ -357,6 +402,12 @@ def parse_sumula(pdf_path: Path) -> dict:
 # Main: percorre pasta sumulas/ e gera JSONs
 # -------------------------------------------------
 
+# "json"  → um arquivo saida/jogo_<n>.json por súmula
+# "jsonl" → todas as súmulas em saida/sumulas.jsonl, uma por linha
+FORMATO_SAIDA = "json"
+ARQUIVO_JSONL = "sumulas.jsonl"
+
+
 def main():
     pasta_sumulas = Path("sumulas")
     pasta_saida = Path("saida")
@@ -368,19 +419,31 @@ def main():
         print("Nenhuma súmula encontrada na pasta 'sumulas'.")
         return
 
-    for pdf in pdfs:
-        print(f"Processando {pdf.name}...")
-        dados = parse_sumula(pdf)
+    arquivo_jsonl = None
+    if FORMATO_SAIDA == "jsonl":
+        arquivo_jsonl = open(pasta_saida / ARQUIVO_JSONL, "w", encoding="utf-8")
 
-        num_jogo = dados["info"].get("numero_jogo")
-        if num_jogo:
-            nome_saida = f"jogo_{num_jogo}.json"
-        else:
-            nome_saida = pdf.stem + ".json"
+    try:
+        for pdf in pdfs:
+            print(f"Processando {pdf.name}...")
+            dados = parse_sumula(pdf)
+
+            if arquivo_jsonl:
+                arquivo_jsonl.write(json.dumps(dados, ensure_ascii=False) + "\n")
+                continue
+
+            num_jogo = dados["info"].get("numero_jogo")
+            if num_jogo:
+                nome_saida = f"jogo_{num_jogo}.json"
+            else:
+                nome_saida = pdf.stem + ".json"
 
-        caminho_saida = pasta_saida / nome_saida
-        with open(caminho_saida, "w", encoding="utf-8") as f:
-            json.dump(dados, f, ensure_ascii=False, indent=2)
+            caminho_saida = pasta_saida / nome_saida
+            with open(caminho_saida, "w", encoding="utf-8") as f:
+                json.dump(dados, f, ensure_ascii=False, indent=2)
+    finally:
+        if arquivo_jsonl:
+            arquivo_jsonl.close()
 
     print("Concluído. JSONs gerados na pasta 'saida'.")
 
@@ -389,17 +452,43 @@ if __name__ == "__main__":
     main()
 import json
 import csv
+from contextlib import ExitStack
 from pathlib import Path
 
 
-def carregar_jsons(pasta_json: Path):
-    arquivos = sorted(pasta_json.glob("*.json"))
-    dados = []
+# Cabeçalho de cada CSV gerado a partir dos JSONs
+CABECALHOS = {
+    "jogos":             ["id_jogo", "arquivo", "campeonato", "rodada", "mandante", "visitante", "data", "horario", "estadio"],
+    "jogadores":         ["id_jogo", "time", "numero", "apelido", "nome_completo", "tr", "pa", "cbf"],
+    "gols":              ["id_jogo", "tempo", "tempo_parte", "numero", "tipo", "jogador", "time"],
+    "cartoes_amarelos":  ["id_jogo", "tempo", "tempo_parte", "numero", "jogador", "time"],
+    "cartoes_vermelhos": ["id_jogo", "tempo", "tempo_parte", "numero", "jogador", "time"],
+    "substituicoes":     ["id_jogo", "tempo", "tempo_parte", "time", "numero_entrou", "jogador_entrou", "numero_saiu", "jogador_saiu"],
+}
+
 
-    for arq in arquivos:
+def iterar_jsons(pasta_json: Path):
+    """
+    Gera as súmulas uma por vez, sem carregar a pasta inteira na memória.
+    Lê saida/sumulas.jsonl quando FORMATO_SAIDA = "jsonl", senão os *.json.
+    """
+    if FORMATO_SAIDA == "jsonl":
+        caminho = pasta_json / ARQUIVO_JSONL
+        if not caminho.exists():
+            return
+        with open(caminho, "r", encoding="utf-8") as f:
+            for linha in f:
+                if linha.strip():
+                    yield json.loads(linha)
+        return
+
+    for arq in sorted(pasta_json.glob("*.json")):
         with open(arq, "r", encoding="utf-8") as f:
-            dados.append(json.load(f))
-    return dados
+            yield json.load(f)
+
+
+def carregar_jsons(pasta_json: Path):
+    return list(iterar_jsons(pasta_json))
 
 
 def escrever_csv(caminho, cabecalho, linhas):
@@ -410,123 +499,86 @@ def escrever_csv(caminho, cabecalho, linhas):
         writer.writerows(linhas)
 
 
+def linhas_da_sumula(s: dict):
+    """
+    Achata uma súmula em (nome_do_csv, linha) — os mesmos campos que iam
+    para as seis listas, mas produzidos sob demanda.
+    """
+    info = s["info"]
+    id_jogo = info.get("numero_jogo") or s["arquivo"]
+
+    # -----------------------
+    # JOGOS
+    # -----------------------
+    yield "jogos", {
+        "id_jogo": id_jogo,
+        "arquivo": s["arquivo"],
+        "campeonato": info.get("campeonato"),
+        "rodada": info.get("rodada"),
+        "mandante": info.get("mandante"),
+        "visitante": info.get("visitante"),
+        "data": info.get("data"),
+        "horario": info.get("horario"),
+        "estadio": info.get("estadio"),
+    }
+
+    # -----------------------
+    # JOGADORES
+    # -----------------------
+    for j in s["jogadores"]:
+        yield "jogadores", {
+            "id_jogo": id_jogo,
+            "time": j.get("time"),
+            "numero": j.get("numero"),
+            "apelido": j.get("apelido"),
+            "nome_completo": j.get("nome_completo"),
+            "tr": j.get("tr"),
+            "pa": j.get("pa"),
+            "cbf": j.get("cbf"),
+        }
+
+    # -----------------------
+    # GOLS, CARTÕES E SUBSTITUIÇÕES
+    # -----------------------
+    for chave_json, nome_csv in (
+        ("gols", "gols"),
+        ("cartoes_amarelos", "cartoes_amarelos"),
+        ("cartoes_vermelhos", "cartoes_vermelhos"),
+        ("substituicoes", "substituicoes"),
+    ):
+        for evento in s[chave_json]:
+            evento["id_jogo"] = id_jogo
+            yield nome_csv, evento
+
+
 def main():
+    """
+    Converte os JSONs em CSVs em streaming: cada súmula é lida, achatada e
+    escrita direto nos seis CSVs abertos, então a memória usada não cresce
+    com o número de temporadas processadas.
+    """
     pasta_json = Path("saida")
     pasta_csv = Path("csv")
     pasta_csv.mkdir(exist_ok=True)
 
-    print("Carregando JSONs...")
-    sumulas = carregar_jsons(pasta_json)
+    print("Convertendo JSONs em CSVs...")
 
-    jogos = []
-    jogadores = []
-    gols = []
-    amarelos = []
-    vermelhos = []
-    subs = []
+    total = 0
+    with ExitStack() as stack:
+        writers = {}
+        for nome, cabecalho in CABECALHOS.items():
+            f = stack.enter_context(
+                open(pasta_csv / f"{nome}.csv", "w", newline="", encoding="utf-8")
+            )
+            writers[nome] = csv.DictWriter(f, fieldnames=cabecalho)
+            writers[nome].writeheader()
 
-    for s in sumulas:
-        info = s["info"]
-        id_jogo = info.get("numero_jogo") or s["arquivo"]
-
-        # -----------------------
-        # JOGOS
-        # -----------------------
-        jogos.append({
-            "id_jogo": id_jogo,
-            "arquivo": s["arquivo"],
-            "campeonato": info.get("campeonato"),
-            "rodada": info.get("rodada"),
-            "mandante": info.get("mandante"),
-            "visitante": info.get("visitante"),
-            "data": info.get("data"),
-            "horario": info.get("horario"),
-            "estadio": info.get("estadio"),
-        })
+        for s in iterar_jsons(pasta_json):
+            for nome_csv, linha in linhas_da_sumula(s):
+                writers[nome_csv].writerow(linha)
+            total += 1
 
-        # -----------------------
-        # JOGADORES
-        # -----------------------
-        for j in s["jogadores"]:
-            jogadores.append({
-                "id_jogo": id_jogo,
-                "time": j.get("time"),
-                "numero": j.get("numero"),
-                "apelido": j.get("apelido"),
-                "nome_completo": j.get("nome_completo"),
-                "tr": j.get("tr"),
-                "pa": j.get("pa"),
-                "cbf": j.get("cbf"),
-            })
-
-        # -----------------------
-        # GOLS
-        # -----------------------
-        for g in s["gols"]:
-            g["id_jogo"] = id_jogo
-            gols.append(g)
-
-        # -----------------------
-        # CARTÕES AMARELOS
-        # -----------------------
-        for a in s["cartoes_amarelos"]:
-            a["id_jogo"] = id_jogo
-            amarelos.append(a)
-
-        # -----------------------
-        # CARTÕES VERMELHOS
-        # -----------------------
-        for v in s["cartoes_vermelhos"]:
-            v["id_jogo"] = id_jogo
-            vermelhos.append(v)
-
-        # -----------------------
-        # SUBSTITUIÇÕES
-        # -----------------------
-        for sub in s["substituicoes"]:
-            sub["id_jogo"] = id_jogo
-            subs.append(sub)
-
-    print("Gerando CSVs...")
-
-    # Exportar tudo para CSV
-    escrever_csv(
-        pasta_csv / "jogos.csv",
-        ["id_jogo", "arquivo", "campeonato", "rodada", "mandante", "visitante", "data", "horario", "estadio"],
-        jogos,
-    )
-
-    escrever_csv(
-        pasta_csv / "jogadores.csv",
-        ["id_jogo", "time", "numero", "apelido", "nome_completo", "tr", "pa", "cbf"],
-        jogadores,
-    )
-
-    escrever_csv(
-        pasta_csv / "gols.csv",
-        ["id_jogo", "tempo", "tempo_parte", "numero", "tipo", "jogador", "time"],
-        gols,
-    )
-
-    escrever_csv(
-        pasta_csv / "cartoes_amarelos.csv",
-        ["id_jogo", "tempo", "tempo_parte", "numero", "jogador", "time"],
-        amarelos,
-    )
-
-    escrever_csv(
-        pasta_csv / "cartoes_vermelhos.csv",
-        ["id_jogo", "tempo", "tempo_parte", "numero", "jogador", "time"],
-        vermelhos,
-    )
-
-    escrever_csv(
-        pasta_csv / "substituicoes.csv",
-        ["id_jogo", "tempo", "tempo_parte", "time", "numero_entrou", "jogador_entrou", "numero_saiu", "jogador_saiu"],
-        subs,
-    )
-
-    print("\n✔ Conversão concluída!")
+    print(f"\n✔ Conversão concluída! ({total} súmulas)")
     print("CSV gerados em: pasta 'csv/'")
 
 
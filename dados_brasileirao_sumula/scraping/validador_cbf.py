@@ -5,7 +5,7 @@ Valida os dados extraídos do OGol comparando com as súmulas oficiais da CBF.
 Trabalha inteiramente com arquivos CSV — sem SQLite.
 
 FLUXO GERAL:
-  1. Carrega todos os CSVs em memória (pandas DataFrames)
+  1. Carrega os CSVs em memória (pandas DataFrames tipados, com cache Parquet)
   2. Para cada súmula PDF em ./sumulas/, extrai dados com pdfplumber
   3. Localiza a partida correspondente nos CSVs por data + mandante + visitante
   4. Compara: placar, escalação, árbitro principal
@@ -24,10 +24,12 @@ ESTRUTURA DE ARQUIVOS ESPERADA:
 
 DEPENDÊNCIAS:
   pip install pdfplumber pandas
+  pip install pyarrow        ← opcional, ativa o cache Parquet dos CSVs
 """
 
 import re
 import json
+import time
 import unicodedata
 from pathlib import Path
 from dataclasses import dataclass, field
@@ -36,6 +38,8 @@ from typing import Optional
 import pandas as pd
 import pdfplumber
 
+from sumula import dividir_secoes, limpar_texto
+
 
 # ──────────────────────────────────────────────────────────────────
 # CONFIGURAÇÃO — ajuste os caminhos se necessário
@@ -51,15 +55,129 @@ PASTA_RELATORIO.mkdir(exist_ok=True)
 # CARREGAMENTO DOS CSVs
 # ──────────────────────────────────────────────────────────────────
 
+# Tipos explícitos por tabela. IDs viram inteiros anuláveis compactos (Int32/Int16)
+# em vez de int64/float64, e textos repetitivos (nome do clube, posição) viram
+# categóricos — cada valor distinto é guardado uma vez só.
+DTYPES_CSV = {
+    "partidas": {
+        "id": "Int32", "edicao_id": "Int16", "campeonato_id": "Int16",
+        "estadio_id": "Int16",
+        "mandante_id": "Int16", "visitante_id": "Int16",
+        "mandante_placar": "Int8", "visitante_placar": "Int8",
+    },
+    "clubes":                 {"id": "Int16", "clube": "category"},
+    "edicoes":                {"ID": "Int16", "ano": "category"},   # "1973/74" etc.
+    "jogadores":              {"id": "Int32", "posicao": "category"},
+    "jogadores_em_partida": {
+        "partida_id": "Int32", "jogador_id": "Int32", "clube_id": "Int16",
+        "titular": "Int8", "posicao_jogada": "category", "numero_camisa": "Int8",
+    },
+    "arbitros":               {"id": "Int16"},
+    "arbitros_em_partida":    {"partida_id": "Int32", "arbitro_id": "Int16"},
+    "treinadores":            {"id": "Int16"},
+    "treinadores_em_partida": {"partida_id": "Int32", "treinador_id": "Int16", "clube_id": "Int16"},
+}
+
+# Colunas que o validador realmente usa. Todo o resto é descartado já na leitura
+# (usecols), o que corta a maior parte da memória de jogadores_em_partida.
+COLUNAS_USADAS = {
+    "partidas":               ["id", "data", "mandante_id", "visitante_id",
+                               "mandante_placar", "visitante_placar"],
+    "clubes":                 ["id", "clube"],
+    "edicoes":                ["ID", "ano"],
+    "jogadores":              ["id", "nome", "apelido"],
+    "jogadores_em_partida":   ["partida_id", "jogador_id", "clube_id", "titular", "numero_camisa"],
+    "arbitros":               ["id", "nome", "apelido"],
+    "arbitros_em_partida":    ["partida_id", "arbitro_id"],
+    "treinadores":            ["id", "nome", "apelido"],
+    "treinadores_em_partida": ["partida_id", "treinador_id", "clube_id"],
+}
+
+# Cache colunar (Parquet) dos CSVs já tipados. Fica ao lado dos CSVs e é
+# invalidado sempre que o CSV muda (mtime/tamanho) ou o esquema acima muda.
+PASTA_CACHE = PASTA_CSV / ".cache_validador"
+
+try:
+    import pyarrow  # noqa: F401 — só para saber se o cache Parquet está disponível
+    CACHE_DISPONIVEL = True
+except ImportError:
+    CACHE_DISPONIVEL = False
+
+
+def _assinatura_csv(caminho: Path, chave: str) -> dict:
+    """Identifica a versão de um CSV: mtime + tamanho + esquema de leitura."""
+    stat = caminho.stat()
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "tamanho":  stat.st_size,
+        "colunas":  COLUNAS_USADAS[chave],
+        "dtypes":   DTYPES_CSV[chave],
+    }
+
+
+def _ler_csv_tipado(caminho: Path, chave: str) -> pd.DataFrame:
+    """
+    Lê um CSV só com as colunas usadas e com tipos compactos.
+
+    '-' é tratado como nulo porque o scraper grava placar de WO/anulado assim,
+    o que quebraria a conversão para inteiro.
+    """
+    colunas = COLUNAS_USADAS[chave]
+    dtypes = {c: t for c, t in DTYPES_CSV[chave].items() if c in colunas}
+    return pd.read_csv(
+        caminho,
+        usecols=colunas,
+        dtype=dtypes,
+        na_values=["-"],
+        engine="c",
+    )
+
+
+def _carregar_tabela(caminho: Path, chave: str) -> tuple:
+    """
+    Carrega uma tabela usando o cache Parquet quando ele ainda é válido.
+    Retorna (DataFrame, origem) com origem = "cache" ou "csv".
+    """
+    if not CACHE_DISPONIVEL:
+        return _ler_csv_tipado(caminho, chave), "csv"
+
+    assinatura = _assinatura_csv(caminho, chave)
+    arq_cache = PASTA_CACHE / f"{chave}.parquet"
+    arq_meta = PASTA_CACHE / f"{chave}.json"
+
+    if arq_cache.exists() and arq_meta.exists():
+        try:
+            meta = json.loads(arq_meta.read_text(encoding="utf-8"))
+            if meta == assinatura:
+                return pd.read_parquet(arq_cache), "cache"
+        except (OSError, ValueError):
+            pass   # cache corrompido — relê do CSV abaixo
+
+    df = _ler_csv_tipado(caminho, chave)
+    try:
+        PASTA_CACHE.mkdir(exist_ok=True)
+        df.to_parquet(arq_cache, index=False)
+        arq_meta.write_text(json.dumps(assinatura), encoding="utf-8")
+    except OSError as e:
+        print(f"   ⚠️  Não foi possível gravar cache de {chave}: {e}")
+    return df, "csv"
+
+
 def carregar_csvs() -> dict:
     """
     Carrega todos os CSVs relevantes em um dicionário de DataFrames.
 
-    Usamos low_memory=False para evitar avisos de tipo em colunas mistas.
-    Os IDs são mantidos como inteiros onde possível para facilitar os JOINs
-    que faremos manualmente com merge().
+    Cada tabela é lida só com as colunas que o validador usa (COLUNAS_USADAS)
+    e com tipos explícitos (DTYPES_CSV): inteiros anuláveis compactos para os
+    IDs e categóricos para textos repetitivos. Quando o pyarrow está instalado,
+    o resultado fica num cache Parquet invalidado pelo mtime do CSV, então as
+    execuções seguintes nem passam pelo parser de CSV.
+
+    Para cada tabela mostramos linhas, memória ocupada e tempo de carga.
     """
     print("📂 Carregando CSVs...")
+    if not CACHE_DISPONIVEL:
+        print("   ℹ️  pyarrow não instalado — cache Parquet desativado")
     dados = {}
 
     arquivos = {
@@ -74,14 +192,26 @@ def carregar_csvs() -> dict:
         "treinadores_em_partida":   "treinadores_em_partida.csv",
     }
 
+    inicio_total = time.perf_counter()
+    memoria_total = 0
+
     for chave, nome_arquivo in arquivos.items():
         caminho = PASTA_CSV / nome_arquivo
         if not caminho.exists():
             print(f"   ⚠️  {nome_arquivo} não encontrado — pulando")
             dados[chave] = pd.DataFrame()
             continue
-        dados[chave] = pd.read_csv(caminho, low_memory=False)
-        print(f"   ✓ {nome_arquivo}: {len(dados[chave])} linhas")
+
+        inicio = time.perf_counter()
+        dados[chave], origem = _carregar_tabela(caminho, chave)
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        memoria = int(dados[chave].memory_usage(deep=True).sum())
+        memoria_total += memoria
+        print(f"   ✓ {nome_arquivo}: {len(dados[chave])} linhas | "
+              f"{memoria / 1024:.0f} KiB | {duracao_ms:.0f} ms ({origem})")
+
+    print(f"   Σ {memoria_total / 1024 / 1024:.1f} MiB em "
+          f"{(time.perf_counter() - inicio_total) * 1000:.0f} ms")
 
     # Padroniza nome da coluna de ID nas tabelas que usam "ID" maiúsculo
     # (edicoes e algumas outras usam "ID", as demais usam "id")
@@ -195,41 +325,55 @@ def extrair_sumula(pdf_path: Path) -> dict:
     Retornamos tudo num dicionário para facilitar a comparação.
     """
     with pdfplumber.open(str(pdf_path)) as pdf:
-        texto_completo = "\n".join(
+        texto_completo = limpar_texto("\n".join(
             page.extract_text() or "" for page in pdf.pages
-        )
-        texto_completo = re.sub(
-            r"[ \t]+", " ", texto_completo.replace("\r", "\n"))
+        ))
 
         # Jogadores via tabela (mais estruturado do que texto livre)
         jogadores, mandante_tabela, visitante_tabela = _extrair_jogadores_tabela(
             pdf)
 
+    # Uma varredura só separa as seções; cada extrator olha só o seu pedaço
+    secoes = dividir_secoes(texto_completo)
+
     info = _extrair_info_geral(
-        texto_completo, mandante_tabela, visitante_tabela)
+        secoes["cabecalho"], mandante_tabela, visitante_tabela)
 
     return {
         "arquivo":          pdf_path.name,
         "info":             info,
         "jogadores":        jogadores,
-        "gols":             _extrair_gols(texto_completo),
-        "cartoes_amarelos": _extrair_cartoes(texto_completo, "Cartões Amarelos", "Cartões Vermelhos"),
-        "cartoes_vermelhos": _extrair_cartoes(texto_completo, "Cartões Vermelhos", "Ocorrências"),
+        "gols":             _extrair_gols(secoes["gols"]),
+        "cartoes_amarelos": _extrair_cartoes(secoes["cartoes_amarelos"]),
+        "cartoes_vermelhos": _extrair_cartoes(secoes["cartoes_vermelhos"]),
         "arbitros":         _extrair_arbitros(texto_completo),
     }
 
 
+RE_CAMPEONATO = re.compile(r"Campeonato:\s*(.+?)\s+Rodada:\s*([0-9]+)")
+RE_JOGO = re.compile(r"Jogo:\s*(.+)")
+RE_DATA = re.compile(r"Data:\s*([0-9/]+)\s+Horário:\s*([0-9:]+)\s+Estádio:\s*(.+)")
+RE_RESULTADO = re.compile(r"Resultado[:\s]+(\d+)\s*[xX]\s*(\d+)")
+RE_UF_SUFIXO = re.compile(r"\s*\([A-Z]{2}\)\s*$")
+PADROES_ARBITROS = [
+    (re.compile(r"Árbitro[:\s]+([^\n]+)", re.IGNORECASE),           "Principal"),
+    (re.compile(r"1[oº]\s*Assistente[:\s]+([^\n]+)", re.IGNORECASE), "Assistente 1"),
+    (re.compile(r"2[oº]\s*Assistente[:\s]+([^\n]+)", re.IGNORECASE), "Assistente 2"),
+    (re.compile(r"4[oº]\s*Árbitro[:\s]+([^\n]+)", re.IGNORECASE),    "4º Árbitro"),
+]
+
+
 def _extrair_info_geral(texto: str, mandante_hint=None, visitante_hint=None) -> dict:
     info = {}
 
     # Campeonato e rodada
-    m = re.search(r"Campeonato:\s*(.+?)\s+Rodada:\s*([0-9]+)", texto)
+    m = RE_CAMPEONATO.search(texto)
     if m:
         info["campeonato"] = m.group(1).strip()
         info["rodada"] = m.group(2).strip()
 
     # Times via linha "Jogo: Time X Time"
-    for m in re.finditer(r"Jogo:\s*(.+)", texto):
+    for m in RE_JOGO.finditer(texto):
         cand = m.group(1).strip()
         if " X " in cand:
             mand, vis = cand.split(" X ", 1)
@@ -244,16 +388,14 @@ def _extrair_info_geral(texto: str, mandante_hint=None, visitante_hint=None) ->
         info["visitante"] = visitante_hint
 
     # Data, horário e estádio
-    m = re.search(
-        r"Data:\s*([0-9/]+)\s+Horário:\s*([0-9:]+)\s+Estádio:\s*(.+)", texto
-    )
+    m = RE_DATA.search(texto)
     if m:
         info["data"] = m.group(1).strip()
         info["horario"] = m.group(2).strip()
         info["estadio"] = m.group(3).strip()
 
     # Placar — nem sempre está explícito; às vezes só contamos os gols depois
-    m = re.search(r"Resultado[:\s]+(\d+)\s*[xX]\s*(\d+)", texto)
+    m = RE_RESULTADO.search(texto)
     if m:
         info["gols_mandante"] = int(m.group(1))
         info["gols_visitante"] = int(m.group(2))
@@ -316,29 +458,21 @@ def _extrair_arbitros(texto: str) -> list:
     então usamos vários padrões regex como fallback.
     """
     arbitros = []
-    padroes = [
-        (r"Árbitro[:\s]+([^\n]+)",           "Principal"),
-        (r"1[oº]\s*Assistente[:\s]+([^\n]+)", "Assistente 1"),
-        (r"2[oº]\s*Assistente[:\s]+([^\n]+)", "Assistente 2"),
-        (r"4[oº]\s*Árbitro[:\s]+([^\n]+)",    "4º Árbitro"),
-    ]
-    for padrao, funcao in padroes:
-        m = re.search(padrao, texto, re.IGNORECASE)
+    for padrao, funcao in PADROES_ARBITROS:
+        m = padrao.search(texto)
         if m:
             nome = m.group(1).strip()
             # Remove sufixo de UF tipo "(SP)" que aparece em alguns PDFs
-            nome = re.sub(r"\s*\([A-Z]{2}\)\s*$", "", nome).strip()
+            nome = RE_UF_SUFIXO.sub("", nome).strip()
             if nome:
                 arbitros.append({"nome": nome, "funcao": funcao})
     return arbitros
 
 
-def _extrair_gols(texto: str) -> list:
-    if "Gols" not in texto:
+def _extrair_gols(bloco: Optional[str]) -> list:
+    """Recebe o bloco da seção "Gols" já separado por dividir_secoes()."""
+    if bloco is None:
         return []
-    bloco = texto.split("Gols", 1)[1]
-    if "Cartões Amarelos" in bloco:
-        bloco = bloco.split("Cartões Amarelos", 1)[0]
     gols = []
     for linha in bloco.splitlines():
         linha = linha.strip()
@@ -355,12 +489,10 @@ def _extrair_gols(texto: str) -> list:
     return gols
 
 
-def _extrair_cartoes(texto: str, secao_inicio: str, secao_fim: str) -> list:
-    if secao_inicio not in texto:
+def _extrair_cartoes(bloco: Optional[str]) -> list:
+    """Recebe o bloco de uma seção de cartões já separado por dividir_secoes()."""
+    if bloco is None:
         return []
-    bloco = texto.split(secao_inicio, 1)[1]
-    if secao_fim in bloco:
-        bloco = bloco.split(secao_fim, 1)[0]
     cartoes = []
     for linha in bloco.splitlines():
         linha = linha.strip()
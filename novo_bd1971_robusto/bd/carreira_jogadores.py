@@ -0,0 +1,143 @@
+import sqlite3
+import argparse
+
+from rollups import (ControleRollup, impressoes_por_edicao, SQL_EVENTOS_POR_JOGADOR,
+                     SQL_IMPRESSAO_SUMULAS, SQL_IMPRESSAO_EVENTOS)
+
+
+# ============================================
+# Resumo de carreira dos jogadores
+# ============================================
+# Uma linha por jogador × clube × edição com jogos, jogos como titular, gols,
+# assistências e cartões. A página /jogador/<id> mostra a carreira a
+# partir daqui (poucas linhas) em vez de somar centenas de partidas a cada
+# visita.
+#
+# Gols, assistências e cartões vêm de eventos_partida: a migração só preenche
+# a escalação em jogadores_em_partida, e as colunas gols/cartao_* de lá ficam
+# zeradas (ver SQL_EVENTOS_POR_JOGADOR em rollups.py).
+#
+# Minutos jogados ficam de fora: a migração não preenche minutos_jogados (nem
+# minuto_entrada/minuto_saida), e a coluna sairia sempre zerada.
+
+ROLLUP = "jogador_carreira_resumo"
+
+SQL_CRIAR_TABELA = """
+    CREATE TABLE IF NOT EXISTS jogador_carreira_resumo (
+        jogador_id INTEGER NOT NULL,
+        clube_id INTEGER NOT NULL,
+        edicao_id INTEGER NOT NULL,
+        ano INTEGER,
+        jogos INTEGER NOT NULL,
+        titular INTEGER NOT NULL,
+        gols INTEGER NOT NULL,
+        gols_contra INTEGER NOT NULL,
+        assistencias INTEGER NOT NULL,
+        cartao_amarelo INTEGER NOT NULL,
+        cartao_vermelho INTEGER NOT NULL,
+        PRIMARY KEY (jogador_id, edicao_id, clube_id),
+        FOREIGN KEY (jogador_id) REFERENCES jogadores(ID) ON DELETE CASCADE,
+        FOREIGN KEY (clube_id) REFERENCES clubes(ID),
+        FOREIGN KEY (edicao_id) REFERENCES edicoes(ID) ON DELETE CASCADE
+    )
+"""
+SQL_CRIAR_INDICES = (
+    # A página do jogador busca as partidas dele; a PK de jogadores_em_partida
+    # começa por partida_id e não ajuda nessa busca
+    "CREATE INDEX IF NOT EXISTS idx_jogadores_em_partida_jogador ON jogadores_em_partida (jogador_id)",
+    "CREATE INDEX IF NOT EXISTS idx_eventos_partida_partida ON eventos_partida (partida_id, jogador_id)",
+)
+
+SQL_RECALCULAR_EDICAO = f"""
+    INSERT INTO jogador_carreira_resumo
+        (jogador_id, clube_id, edicao_id, ano, jogos, titular, gols, gols_contra,
+         assistencias, cartao_amarelo, cartao_vermelho)
+    SELECT
+        jp.jogador_id,
+        jp.clube_id,
+        p.edicao_id,
+        ed.ano,
+        COUNT(*),
+        TOTAL(jp.titular),
+        TOTAL(COALESCE(ev.gols, jp.gols)),
+        TOTAL(COALESCE(ev.gols_contra, jp.gol_contra)),
+        TOTAL(COALESCE(ev.assistencias, jp.assistencias)),
+        TOTAL(COALESCE(ev.amarelos, jp.cartao_amarelo)),
+        TOTAL(COALESCE(ev.vermelhos, jp.cartao_vermelho))
+    FROM jogadores_em_partida jp
+    JOIN partidas p ON jp.partida_id = p.ID
+    JOIN edicoes ed ON p.edicao_id = ed.ID
+    LEFT JOIN ({SQL_EVENTOS_POR_JOGADOR}) ev ON ev.partida_id = jp.partida_id AND ev.jogador_id = jp.jogador_id
+    WHERE p.edicao_id = ?
+    GROUP BY jp.jogador_id, jp.clube_id
+"""
+
+
+class AtualizadorCarreiraJogadores:
+    def __init__(self, conn):
+        """
+        Args:
+            conn: Conexão sqlite3 aberta (o commit fica a cargo do chamador)
+        """
+        self.conn = conn
+        self.controle = ControleRollup(conn, ROLLUP)
+        colunas = {c[1] for c in conn.execute(f"PRAGMA table_info({ROLLUP})")}
+        if "minutos" in colunas:
+            # Formato antigo (com a coluna minutos, sempre zerada): recria do zero
+            self.conn.execute(f"DROP TABLE {ROLLUP}")
+            self.controle.esquecer_tudo()
+        self.conn.execute(SQL_CRIAR_TABELA)
+        for sql in SQL_CRIAR_INDICES:
+            self.conn.execute(sql)
+
+    def recalcular_edicao(self, edicao_id):
+        self.conn.execute("DELETE FROM jogador_carreira_resumo WHERE edicao_id = ?", (edicao_id,))
+        self.conn.execute(SQL_RECALCULAR_EDICAO, (edicao_id, edicao_id))
+
+    def atualizar(self, completo=False):
+        """
+        Recalcula só as edições cujas escalações ou eventos mudaram desde a
+        última execução (ou todas, com completo=True).
+        Retorna o número de edições recalculadas.
+        """
+        impressoes = impressoes_por_edicao(self.conn, SQL_IMPRESSAO_SUMULAS, SQL_IMPRESSAO_EVENTOS)
+        alteradas, removidas = self.controle.edicoes_alteradas(impressoes, completo)
+
+        for edicao_id in removidas:
+            self.conn.execute("DELETE FROM jogador_carreira_resumo WHERE edicao_id = ?", (edicao_id,))
+            self.controle.esquecer(edicao_id)
+
+        for edicao_id in alteradas:
+            self.recalcular_edicao(edicao_id)
+            self.controle.marcar(edicao_id, impressoes[edicao_id])
+
+        if alteradas or removidas:
+            print(f"✅ Carreira dos jogadores: {len(alteradas)} edição(ões) recalculada(s)")
+        else:
+            print("✅ Carreira dos jogadores: sem alterações")
+        return len(alteradas)
+
+
+def atualizar_carreira_jogadores(conn, completo=False):
+    """Atalho usado pelo migrador ao final da carga"""
+    return AtualizadorCarreiraJogadores(conn).atualizar(completo)
+
+
+# ============================================
+# EXEMPLO DE USO
+# ============================================
+#   python bd/carreira_jogadores.py                → só edições alteradas
+#   python bd/carreira_jogadores.py --completo     → recalcula todas
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Atualiza a tabela jogador_carreira_resumo")
+    parser.add_argument("--banco", default="bd/estruturado_bd_1971.db")
+    parser.add_argument("--completo", action="store_true")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.banco)
+    try:
+        atualizar_carreira_jogadores(conn, args.completo)
+        conn.commit()
+    finally:
+        conn.close()
@@ -0,0 +1,395 @@
+import sqlite3
+import threading
+
+import numpy as np
+
+from referencias import versao_arquivo_banco
+
+
+# ============================================
+# Motor de classificação
+# ============================================
+# Carrega os resultados de uma temporada UMA vez em arrays NumPy compactos
+# (índice do mandante, índice do visitante, gols, rodada, grupo...) e calcula
+# qualquer tabela a partir deles com somas vetorizadas (np.bincount):
+#
+#   - classificação geral
+#   - classificação depois de qualquer rodada
+#   - classificação de cada grupo
+#
+# O site, a API e os scripts em lote usam este mesmo módulo, em vez de cada um
+# ter a sua cópia do SQL de classificação.
+
+SEM_GRUPO = -1
+SEM_RODADA = -1
+
+
+def calcular_pontos_vitoria(ano):
+    """
+    IMPORTANTE: Até 1994, vitória valia 2 pontos.
+    A partir de 1995, passou a valer 3 pontos.
+
+    Esta função é usada em TODOS os cálculos de classificação.
+    """
+    return 2 if ano <= 1994 else 3
+
+
+def get_formato_campeonato(ano):
+    """
+    Determina o formato do campeonato baseado no ano.
+    Isso ajuda a saber se devemos mostrar grupos ou não.
+
+    Formatos históricos do Brasileirão:
+    - Até 1991: Grupos + Fases eliminatórias
+    - 1992-2002: Misto (grupos + mata-mata)
+    - 2003 em diante: Pontos corridos puro
+    """
+    if ano >= 2003:
+        return 'pontos_corridos'
+    elif ano >= 1992:
+        return 'misto'
+    else:
+        return 'grupos_fases'
+
+
+def data_ordenavel(data):
+    """
+    Converte a data da partida em inteiro AAAAMMDD para ordenar.
+    O banco tem datas em DD/MM/AAAA (CSVs antigos) e AAAA-MM-DD (scraper).
+    """
+    if not data:
+        return 0
+    data = str(data).strip()
+    try:
+        if "/" in data:
+            dia, mes, ano = data.split("/")[:3]
+        else:
+            ano, mes, dia = data[:10].split("-")
+        return int(ano) * 10000 + int(mes) * 100 + int(dia)
+    except ValueError:
+        return 0
+
+
+def data_iso(aaaammdd):
+    """Inverso de data_ordenavel: 20130526 -> '2013-05-26' (None se desconhecida)"""
+    if not aaaammdd:
+        return None
+    return f"{aaaammdd // 10000:04d}-{aaaammdd // 100 % 100:02d}-{aaaammdd % 100:02d}"
+
+
+def placar_inteiro(valor):
+    """Placar inteiro ou None ('-' de W.O., jogo anulado, ainda não jogado...)"""
+    if valor is None or isinstance(valor, int):
+        return valor
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+class ResultadosTemporada:
+    """
+    Resultados de uma temporada em arrays paralelos (uma posição por partida).
+
+    Só entram partidas com placar numérico; os clubes são re-indexados de
+    0..n-1 para que as somas por clube sejam um np.bincount.
+    """
+
+    def __init__(self, ano, linhas):
+        """
+        Args:
+            ano: Ano da temporada (define 2 ou 3 pontos por vitória)
+            linhas: Tuplas (partida_id, data, rodada, mandante_id, mandante,
+                    visitante_id, visitante, mandante_placar, visitante_placar,
+                    mandante_grupo, visitante_grupo, fase)
+        """
+        self.ano = ano
+        self.pontos_vitoria = calcular_pontos_vitoria(ano)
+
+        linhas = [l for l in linhas
+                  if placar_inteiro(l[7]) is not None and placar_inteiro(l[8]) is not None]
+
+        # Ordem cronológica: as rodadas "por data" dependem disso
+        linhas.sort(key=lambda l: (data_ordenavel(l[1]), l[0]))
+
+        clubes = {}
+        for l in linhas:
+            clubes.setdefault(l[3], l[4])
+            clubes.setdefault(l[5], l[6])
+        self.clube_ids = np.array(list(clubes), dtype=np.int64)
+        self.clube_nomes = list(clubes.values())
+        indice = {clube_id: i for i, clube_id in enumerate(clubes)}
+
+        grupos = sorted({g for l in linhas for g in (l[9], l[10]) if g is not None})
+        self.grupos = grupos
+        indice_grupo = {g: i for i, g in enumerate(grupos)}
+
+        n = len(linhas)
+        self.partida_id = np.fromiter((l[0] for l in linhas), dtype=np.int64, count=n)
+        self.data = np.fromiter((data_ordenavel(l[1]) for l in linhas), dtype=np.int32, count=n)
+        self.rodada = np.fromiter(
+            (SEM_RODADA if placar_inteiro(l[2]) is None else placar_inteiro(l[2]) for l in linhas),
+            dtype=np.int32, count=n)
+        self.mandante = np.fromiter((indice[l[3]] for l in linhas), dtype=np.int32, count=n)
+        self.visitante = np.fromiter((indice[l[5]] for l in linhas), dtype=np.int32, count=n)
+        self.gols_mandante = np.fromiter((placar_inteiro(l[7]) for l in linhas), dtype=np.int32, count=n)
+        self.gols_visitante = np.fromiter((placar_inteiro(l[8]) for l in linhas), dtype=np.int32, count=n)
+        self.grupo_mandante = np.fromiter(
+            (indice_grupo.get(l[9], SEM_GRUPO) for l in linhas), dtype=np.int16, count=n)
+        self.grupo_visitante = np.fromiter(
+            (indice_grupo.get(l[10], SEM_GRUPO) for l in linhas), dtype=np.int16, count=n)
+
+        # Ordem alfabética do nome: último critério de desempate (estável)
+        self._ordem_nome = np.argsort(np.argsort(np.array(self.clube_nomes, dtype=object)))
+
+        self._numerar_etapas(linhas)
+
+    def _numerar_etapas(self, linhas):
+        """
+        Numera as "etapas" da temporada: 1, 2, 3... em ordem cronológica.
+
+        A rodada do banco recomeça a cada fase (e o scraper às vezes deixa
+        NULL), então não serve sozinha para ordenar o campeonato inteiro.
+        Uma etapa é o par (fase, rodada); partidas sem rodada são agrupadas
+        por (fase, data). As etapas são ordenadas pela primeira data de cada uma.
+        """
+        chaves = []
+        for l, data in zip(linhas, self.data):
+            rodada = placar_inteiro(l[2])
+            fase = l[11] if len(l) > 11 else None
+            chaves.append((fase, rodada, None) if rodada is not None else (fase, None, int(data)))
+
+        primeira = {}
+        for i, chave in enumerate(chaves):
+            primeira.setdefault(chave, (int(self.data[i]), i))
+        ordem = sorted(primeira, key=primeira.get)
+        numero = {chave: k for k, chave in enumerate(ordem)}
+
+        self.etapa = np.fromiter((numero[c] for c in chaves), dtype=np.int32, count=len(chaves))
+        self.etapas = []
+        for k, (fase, rodada, _) in enumerate(ordem):
+            datas = self.data[self.etapa == k]
+            self.etapas.append({
+                "etapa": k + 1,
+                "fase": fase,
+                "rodada": rodada,
+                "data": int(datas.max()) if len(datas) else 0,
+            })
+
+    def __len__(self):
+        return len(self.partida_id)
+
+    @property
+    def n_clubes(self):
+        return len(self.clube_ids)
+
+    def rodadas(self):
+        """Números de rodada presentes (vazio se o banco não tiver rodadas)"""
+        return sorted(int(r) for r in np.unique(self.rodada) if r != SEM_RODADA)
+
+    # ======================================================
+    # Agregação
+    # ======================================================
+
+    def _somar(self, mascara_mandante, mascara_visitante, linha=None, n_linhas=1):
+        """
+        Soma jogos, pontos, vitórias, empates, derrotas e gols de cada clube.
+        As máscaras são separadas porque na classificação de grupo cada lado
+        da partida conta só para o grupo do próprio clube.
+
+        Com `linha` (um número por partida, ex.: a etapa) devolve matrizes
+        n_linhas x n_clubes em vez de vetores: tudo num bincount só.
+        """
+        n = self.n_clubes
+        gm, gv = self.gols_mandante, self.gols_visitante
+        vitoria_m = gm > gv
+        empate = gm == gv
+        vitoria_v = gm < gv
+        deslocamento = 0 if linha is None else linha.astype(np.int64) * n
+
+        def por_clube(clubes, mascara, valores):
+            cesto = (clubes + deslocamento)[mascara] if linha is not None else clubes[mascara]
+            soma = np.bincount(cesto, weights=valores[mascara], minlength=n * n_linhas)
+            return soma if linha is None else soma.reshape(n_linhas, n)
+
+        def dois_lados(valores_m, valores_v):
+            return (por_clube(self.mandante, mascara_mandante, valores_m)
+                    + por_clube(self.visitante, mascara_visitante, valores_v)).astype(np.int64)
+
+        pontos_m = np.where(vitoria_m, self.pontos_vitoria, empate.astype(np.int32))
+        pontos_v = np.where(vitoria_v, self.pontos_vitoria, empate.astype(np.int32))
+
+        return {
+            "j":   dois_lados(np.ones_like(gm), np.ones_like(gv)),
+            "pts": dois_lados(pontos_m, pontos_v),
+            "v":   dois_lados(vitoria_m.astype(np.int32), vitoria_v.astype(np.int32)),
+            "e":   dois_lados(empate.astype(np.int32), empate.astype(np.int32)),
+            "d":   dois_lados(vitoria_v.astype(np.int32), vitoria_m.astype(np.int32)),
+            "gp":  dois_lados(gm, gv),
+            "gc":  dois_lados(gv, gm),
+        }
+
+    def _montar_tabela(self, totais):
+        """
+        Ordena por pontos, vitórias, saldo e gols pró (mesmo critério do SQL
+        antigo) e devolve uma lista de dicts prontos para template/JSON.
+        """
+        totais["sg"] = totais["gp"] - totais["gc"]
+        participantes = np.nonzero(totais["j"] > 0)[0]
+
+        # lexsort usa a ÚLTIMA chave como principal
+        ordem = np.lexsort((
+            self._ordem_nome[participantes],
+            -totais["gp"][participantes],
+            -totais["sg"][participantes],
+            -totais["v"][participantes],
+            -totais["pts"][participantes],
+        ))
+
+        tabela = []
+        for pos, i in enumerate(participantes[ordem], start=1):
+            linha = {"pos": pos, "clube": self.clube_nomes[i], "clube_id": int(self.clube_ids[i])}
+            for chave in ("j", "pts", "v", "e", "d", "gp", "gc", "sg"):
+                linha[chave] = int(totais[chave][i])
+            tabela.append(linha)
+        return tabela
+
+    # ======================================================
+    # Tabelas
+    # ======================================================
+
+    def classificacao(self, ate_rodada=None, ate_data=None):
+        """
+        Classificação geral. Com `ate_rodada` (ou `ate_data` em AAAAMMDD)
+        considera só as partidas até aquele ponto do campeonato.
+        """
+        mascara = np.ones(len(self), dtype=bool)
+        if ate_rodada is not None:
+            mascara &= (self.rodada != SEM_RODADA) & (self.rodada <= ate_rodada)
+        if ate_data is not None:
+            mascara &= self.data <= ate_data
+        return self._montar_tabela(self._somar(mascara, mascara))
+
+    def historico_por_etapa(self):
+        """
+        Classificação depois de cada etapa (para gráficos de posição x tempo).
+
+        Soma cada etapa num bincount só e acumula com np.cumsum, em vez de
+        recalcular a tabela inteira uma vez por rodada.
+
+        Retorna [(etapa_info, tabela), ...] na ordem das etapas.
+        """
+        if not len(self):
+            return []
+        tudo = np.ones(len(self), dtype=bool)
+        por_etapa = self._somar(tudo, tudo, linha=self.etapa, n_linhas=len(self.etapas))
+        acumulado = {chave: np.cumsum(m, axis=0) for chave, m in por_etapa.items()}
+        return [(info, self._montar_tabela({c: m[k] for c, m in acumulado.items()}))
+                for k, info in enumerate(self.etapas)]
+
+    def classificacao_grupo(self, grupo, ate_rodada=None):
+        """Classificação de um grupo (cada lado da partida filtrado pelo próprio grupo)"""
+        if grupo not in self.grupos:
+            return []
+        g = self.grupos.index(grupo)
+        mascara_m = self.grupo_mandante == g
+        mascara_v = self.grupo_visitante == g
+        if ate_rodada is not None:
+            ate = (self.rodada != SEM_RODADA) & (self.rodada <= ate_rodada)
+            mascara_m &= ate
+            mascara_v &= ate
+        return self._montar_tabela(self._somar(mascara_m, mascara_v))
+
+    def classificacoes_por_grupo(self):
+        """{grupo: tabela} para todos os grupos da temporada"""
+        return {grupo: self.classificacao_grupo(grupo) for grupo in self.grupos}
+
+
+def carregar_resultados(conn, ano, edicao_id=None):
+    """
+    Lê do banco as partidas da temporada e monta o ResultadosTemporada.
+    Com `edicao_id` lê só aquela edição (o ano continua definindo os pontos).
+    """
+    filtro, parametro = ("ed.ID = ?", edicao_id) if edicao_id is not None else ("ed.ano = ?", ano)
+    linhas = conn.execute(f"""
+        SELECT
+            p.ID, p.data, p.rodada,
+            p.mandante_id, cm.clube,
+            p.visitante_id, cv.clube,
+            p.mandante_placar, p.visitante_placar,
+            p.mandante_grupo, p.visitante_grupo, p.fase
+        FROM partidas p
+        JOIN clubes cm ON p.mandante_id = cm.ID
+        JOIN clubes cv ON p.visitante_id = cv.ID
+        JOIN edicoes ed ON p.edicao_id = ed.ID
+        WHERE {filtro}
+    """, (parametro,)).fetchall()
+    return ResultadosTemporada(ano, [tuple(l) for l in linhas])
+
+
+class MotorClassificacao:
+    def __init__(self, db_path):
+        """
+        Guarda em memória os resultados de cada temporada já consultada.
+
+        Args:
+            db_path: Caminho para o arquivo .db do SQLite
+
+        O cache é descartado sozinho quando o arquivo do banco muda (nova
+        migração), então não é preciso reiniciar o site depois de atualizar.
+        """
+        self.db_path = db_path
+        self._cache = {}
+        self._versao = None
+        self._lock = threading.Lock()
+
+    def resultados(self, ano, conn=None):
+        """ResultadosTemporada do ano (do cache, ou lido do banco na primeira vez)"""
+        versao = versao_arquivo_banco(self.db_path)
+        with self._lock:
+            if versao != self._versao:
+                self._cache.clear()
+                self._versao = versao
+            if ano in self._cache:
+                return self._cache[ano]
+
+        proprio = conn is None
+        if proprio:
+            conn = sqlite3.connect(self.db_path)
+        try:
+            resultados = carregar_resultados(conn, ano)
+        finally:
+            if proprio:
+                conn.close()
+
+        with self._lock:
+            self._cache[ano] = resultados
+        return resultados
+
+    def classificacao(self, ano, ate_rodada=None, conn=None):
+        return self.resultados(ano, conn).classificacao(ate_rodada=ate_rodada)
+
+    def classificacoes_por_grupo(self, ano, conn=None):
+        return self.resultados(ano, conn).classificacoes_por_grupo()
+
+
+# ============================================
+# EXEMPLO DE USO
+# ============================================
+#   python bd/classificacao.py 1971
+#   python bd/classificacao.py 1971 --rodada 10
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mostra a classificação de uma temporada")
+    parser.add_argument("ano", type=int)
+    parser.add_argument("--banco", default="bd/estruturado_bd_1971.db")
+    parser.add_argument("--rodada", type=int, default=None)
+    args = parser.parse_args()
+
+    motor = MotorClassificacao(args.banco)
+    for time in motor.classificacao(args.ano, ate_rodada=args.rodada):
+        print(f"{time['pos']:>3} {time['clube']:<25} {time['pts']:>3} pts  "
+              f"{time['j']:>2}j {time['v']:>2}v {time['e']:>2}e {time['d']:>2}d  "
+              f"{time['gp']:>3}:{time['gc']:<3} ({time['sg']:+d})")
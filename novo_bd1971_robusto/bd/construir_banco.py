@@ -0,0 +1,250 @@
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import argparse
+from pathlib import Path
+from datetime import datetime
+from contextlib import redirect_stdout
+
+from criar_banco_de_dados import criar_banco, checar_integridade
+from migrar_dados_para_novo_banco import MigradorCSVParaSQLite, trocar_banco, esvaziar_wal
+
+
+# ============================================
+# Reconstrução completa azul/verde
+# ============================================
+# criar_banco(recreate=True) apaga o banco no ar antes de recriar, e o site
+# fica fora (ou vendo um banco pela metade) durante toda a migração. Aqui a
+# reconstrução acontece num arquivo novo, com versão no nome:
+#
+#   bd/versoes/estruturado_bd_1971-20261019-031500-482913.db
+#
+#   1. schema (criar_banco)
+#   2. carga dos CSVs, índices e tabelas pré-calculadas (MigradorCSVParaSQLite,
+#      com lotes grandes, já que ninguém lê esse arquivo ainda, e os CSVs
+#      lidos em paralelo)
+#   3. checar_integridade + contagens mínimas; qualquer falha descarta a versão
+#   4. leitura do arquivo inteiro, para ele já estar no cache do sistema
+#      operacional quando o site começar a usá-lo
+#   5. troca: estruturado_bd_1971.db vira um symlink para a versão nova,
+#      trocado com os.replace (atômico: quem abre o banco vê a versão velha
+#      inteira ou a nova inteira, nunca nenhuma)
+#
+# Na primeira troca o banco no ar ainda é um arquivo comum: antes de o
+# symlink tomar o lugar dele, o arquivo (com o -wal esvaziado) ganha um
+# hard link em versoes/, com o horário da última modificação no nome, e
+# continua disponível para --apontar.
+#
+# O site abre uma conexão por requisição pelo caminho do symlink, então as
+# requisições seguintes já leem a versão nova. Os caches em memória
+# (referências, classificação, homepage) comparam versao_arquivo_banco, que
+# segue o symlink: cada processo recarrega uma vez, sob lock.
+#
+# As VERSOES_MANTIDAS versões mais recentes ficam na pasta; voltar para uma
+# delas é `python construir_banco.py --apontar <arquivo>`.
+#
+# Sem suporte a symlink (Windows sem modo desenvolvedor), a versão é copiada
+# por cima do banco no ar com a mesma troca atômica do banco sombra, que
+# aborta se o -wal do banco no ar não esvaziar (ver trocar_banco).
+
+PASTA_VERSOES = "versoes"
+VERSOES_MANTIDAS = 3
+TAMANHO_LOTE_CONSTRUCAO = 100000
+BLOCO_AQUECIMENTO = 1 << 20
+
+# Tabelas que não podem sair vazias de uma reconstrução
+TABELAS_OBRIGATORIAS = ("clubes", "edicoes", "partidas", "jogadores", "jogadores_em_partida")
+
+
+def caminho_versao(destino, pasta_versoes, agora=None):
+    """Arquivo livre em `pasta_versoes` com data e hora (até microssegundos) no nome"""
+    agora = agora or datetime.now()
+    base = f"{destino.stem}-{agora:%Y%m%d-%H%M%S-%f}"
+    caminho = pasta_versoes / f"{base}{destino.suffix}"
+    contador = 1
+    while os.path.lexists(caminho):
+        caminho = pasta_versoes / f"{base}-{contador}{destino.suffix}"
+        contador += 1
+    return caminho
+
+
+def validar(caminho):
+    """Lista de problemas da versão nova (vazia = pode ir ao ar)"""
+    problemas = []
+    with redirect_stdout(sys.stderr):
+        violacoes = checar_integridade(caminho)
+    if violacoes:
+        problemas.append(f"{len(violacoes)} violações de foreign key")
+
+    conn = sqlite3.connect(f"file:{caminho}?mode=ro", uri=True)
+    try:
+        resultado = conn.execute("PRAGMA quick_check").fetchone()[0]
+        if resultado != "ok":
+            problemas.append(f"quick_check: {resultado}")
+        for tabela in TABELAS_OBRIGATORIAS:
+            if conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0] == 0:
+                problemas.append(f"tabela {tabela} vazia")
+    finally:
+        conn.close()
+    return problemas
+
+
+def aquecer(caminho):
+    """Lê o arquivo inteiro (fica no cache de páginas do sistema operacional)"""
+    with open(caminho, "rb") as f:
+        while f.read(BLOCO_AQUECIMENTO):
+            pass
+
+
+def guardar_banco_atual(destino, pasta_versoes):
+    """
+    Primeira troca: o banco no ar é um arquivo comum, e o os.replace do
+    symlink o apagaria. Ele é guardado em `pasta_versoes` como mais uma
+    versão (hard link, ou cópia se a pasta estiver em outro disco).
+    Retorna o caminho guardado, ou None se não havia o que guardar.
+    """
+    if os.path.islink(destino) or not os.path.exists(destino):
+        return None
+    # A versão guardada vai ser aberta por outro caminho, com outro -wal
+    if not esvaziar_wal(str(destino)):
+        raise RuntimeError(f"{destino}: o -wal não esvaziou (checkpoint ocupado); troca abortada")
+    pasta_versoes.mkdir(parents=True, exist_ok=True)
+    guardado = caminho_versao(destino, pasta_versoes, datetime.fromtimestamp(destino.stat().st_mtime))
+    try:
+        os.link(destino, guardado)
+    except OSError:
+        shutil.copy2(destino, guardado)
+    return guardado
+
+
+def apontar(destino, versao, pasta_versoes=None):
+    """Troca atomicamente `destino` para a versão `versao`"""
+    destino = Path(destino)
+    pasta_versoes = Path(pasta_versoes) if pasta_versoes else destino.parent / PASTA_VERSOES
+    guardado = guardar_banco_atual(destino, pasta_versoes)
+    if guardado:
+        print(f"📦 Banco atual guardado como {guardado.name}")
+    temporario = destino.with_name(destino.name + ".novo")
+    if os.path.lexists(temporario):
+        os.remove(temporario)
+    try:
+        os.symlink(os.path.relpath(os.path.abspath(versao), os.path.abspath(destino.parent)), temporario)
+    except (OSError, NotImplementedError):
+        print("⚠️  Sem suporte a symlink: copiando a versão por cima do banco")
+        # A cópia leva só o .db: o que estiver no -wal da versão ficaria para trás
+        if not esvaziar_wal(str(versao)):
+            raise RuntimeError(f"{versao}: o -wal não esvaziou (checkpoint ocupado); troca abortada")
+        shutil.copyfile(versao, temporario)
+    try:
+        trocar_banco(str(temporario), str(destino))
+    except RuntimeError:
+        os.remove(temporario)
+        raise
+
+
+def limpar_versoes(destino, pasta_versoes, manter=VERSOES_MANTIDAS):
+    """Apaga as versões mais antigas (nunca a que está no ar)"""
+    atual = os.path.realpath(destino)
+    versoes = sorted(pasta_versoes.glob(f"{destino.stem}-*{destino.suffix}"), reverse=True)
+    removidas = []
+    for versao in versoes[manter:]:
+        if os.path.realpath(versao) == atual:
+            continue
+        for arquivo in (str(versao), f"{versao}-wal", f"{versao}-shm"):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+        removidas.append(versao.name)
+    return removidas
+
+
+def construir(schema, csv_dir, destino, pasta_versoes=None, manter=VERSOES_MANTIDAS, trocar=True):
+    """
+    Constrói uma versão nova do banco e (se `trocar`) põe no ar.
+
+    Returns:
+        Caminho da versão construída, ou None se alguma etapa falhou
+    """
+    destino = Path(destino)
+    pasta_versoes = Path(pasta_versoes) if pasta_versoes else destino.parent / PASTA_VERSOES
+    pasta_versoes.mkdir(parents=True, exist_ok=True)
+    versao = caminho_versao(destino, pasta_versoes)
+    inicio = time.perf_counter()
+
+    print(f"🏗️  Construindo {versao}")
+    criar_banco(Path(schema), versao)
+
+    migrador = MigradorCSVParaSQLite(str(versao), csv_dir, tamanho_lote=TAMANHO_LOTE_CONSTRUCAO,
+                                     processos=os.cpu_count())
+    sucesso = migrador.executar_migracao_completa()
+
+    problemas = validar(versao) if sucesso else ["migração falhou"]
+    if problemas:
+        print(f"❌ Versão descartada: {'; '.join(problemas)}")
+        for arquivo in (str(versao), f"{versao}-wal", f"{versao}-shm"):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+        return None
+
+    aquecer(versao)
+    print(f"✅ Versão pronta em {time.perf_counter() - inicio:.1f}s ({versao.stat().st_size / 1e6:.1f} MB)")
+
+    if trocar:
+        try:
+            apontar(destino, versao, pasta_versoes)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            print(f"⚠️  A versão fica em {versao}; para pô-la no ar: --apontar {versao}")
+            return None
+        print(f"🔁 {destino} → {versao.name}")
+        for nome in limpar_versoes(destino, pasta_versoes, manter):
+            print(f"   🗑️ versão antiga removida: {nome}")
+    return versao
+
+
+# ============================================
+# EXEMPLO DE USO
+# ============================================
+#   python bd/construir_banco.py                          → reconstrói e põe no ar
+#   python bd/construir_banco.py --sem-trocar             → só constrói e valida
+#   python bd/construir_banco.py --apontar bd/versoes/estruturado_bd_1971-20261018-031500-482913.db
+#   python bd/construir_banco.py --listar
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconstrução azul/verde do banco com troca atômica")
+    parser.add_argument("--schema", default="tabelas/tabelas.txt")
+    parser.add_argument("--csvs", default="csv_atualizados", help="pasta com os CSVs da migração")
+    parser.add_argument("--destino", default="bd/estruturado_bd_1971.db", help="caminho que o site abre")
+    parser.add_argument("--versoes", help=f"pasta das versões (padrão: <pasta do destino>/{PASTA_VERSOES})")
+    parser.add_argument("--manter", type=int, default=VERSOES_MANTIDAS, help="versões guardadas")
+    parser.add_argument("--sem-trocar", action="store_true", help="constrói e valida sem pôr no ar")
+    parser.add_argument("--apontar", help="põe no ar uma versão já construída (rollback)")
+    parser.add_argument("--listar", action="store_true", help="lista as versões e a que está no ar")
+    args = parser.parse_args()
+
+    destino = Path(args.destino)
+    pasta_versoes = Path(args.versoes) if args.versoes else destino.parent / PASTA_VERSOES
+
+    if args.listar:
+        atual = os.path.realpath(destino)
+        for versao in sorted(pasta_versoes.glob(f"{destino.stem}-*{destino.suffix}")):
+            marcador = "→" if os.path.realpath(versao) == atual else " "
+            print(f"{marcador} {versao.name}  {versao.stat().st_size / 1e6:.1f} MB")
+        sys.exit(0)
+
+    if args.apontar:
+        problemas = validar(args.apontar)
+        if problemas:
+            print(f"❌ {args.apontar} não passou na validação: {'; '.join(problemas)}")
+            sys.exit(1)
+        try:
+            apontar(destino, args.apontar, pasta_versoes)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"🔁 {destino} → {args.apontar}")
+        sys.exit(0)
+
+    versao = construir(args.schema, args.csvs, destino, pasta_versoes, args.manter, trocar=not args.sem_trocar)
+    sys.exit(0 if versao else 1)
@@ -29,6 +29,8 @@ def criar_banco(schema_path=SCHEMA_PATH, db_path=DB_PATH, recreate=False):
         # executa o schema inteiro (várias CREATE TABLE)
         conn.executescript(schema_sql)
         conn.commit()
+        # WAL fica gravado no arquivo: o site lê enquanto a migração escreve
+        conn.execute("PRAGMA journal_mode=WAL;")
         # ativa foreign keys por segurança nas operações seguintes
         conn.execute("PRAGMA foreign_keys = ON;")
         print(f"Banco criado com sucesso em: {db_path}")
@@ -36,9 +38,11 @@ def criar_banco(schema_path=SCHEMA_PATH, db_path=DB_PATH, recreate=False):
         conn.close()
 
 def checar_integridade(db_path=DB_PATH):
+    """Imprime e devolve as violações de foreign key (lista vazia = tudo certo)"""
+    db_path = Path(db_path)
     if not db_path.exists():
         print("Banco não encontrado para checagem.")
-        return
+        return None
     conn = sqlite3.connect(db_path)
     try:
         cur = conn.cursor()
@@ -51,6 +55,7 @@ def checar_integridade(db_path=DB_PATH):
                 print(i)
         else:
             print("✅ Nenhuma inconsistência de foreign key detectada.")
+        return issues
     finally:
         conn.close()
 
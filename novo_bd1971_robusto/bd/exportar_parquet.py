@@ -0,0 +1,383 @@
+import sqlite3
+import os
+import json
+import hashlib
+import shutil
+import argparse
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from referencias import versao_arquivo_banco
+
+
+# Tabelas que dependem de uma partida (ou são a própria partida) são gravadas
+# particionadas por edição; as demais (clubes, jogadores, locais...) são
+# pequenas e vão num arquivo único. Partidas sem edicao_id caem na partição
+# nula padrão do Hive.
+PARTICAO_NULA = "__HIVE_DEFAULT_PARTITION__"
+
+# Marcadores de "sem valor" que os CSVs antigos deixaram em colunas numéricas
+VALORES_NULOS = ("", "-")
+
+# Entrada do manifesto com a versão do arquivo do banco exportada por último
+CHAVE_VERSAO_BANCO = "_versao_banco"
+
+# Entrada do manifesto com o tipo Arrow gravado para cada coluna de cada tabela
+CHAVE_TIPOS = "_tipos"
+
+# Tipos Arrow usados na exportação; o que não converte vira "texto" (string
+# codificada em dicionário)
+TIPOS_ARROW = {"int64": pa.int64(), "float64": pa.float64(), "bool": pa.bool_()}
+TIPO_TEXTO = "texto"
+
+
+class ExportadorSQLiteParaParquet:
+    def __init__(self, db_path, saida_dir):
+        """
+        Inicializa o exportador com o caminho do banco SQLite e a pasta de saída
+
+        Args:
+            db_path: Caminho para o arquivo .db do SQLite
+            saida_dir: Pasta onde o dataset Parquet será gravado
+
+        Layout gerado (estilo Hive, lido direto por pyarrow/pandas/duckdb/spark):
+            saida_dir/partidas/edicao_id=45/part-0.parquet
+            saida_dir/jogadores_em_partida/edicao_id=45/part-0.parquet
+            saida_dir/clubes/part-0.parquet
+            saida_dir/_manifesto.json
+        """
+        self.db_path = db_path
+        self.saida_dir = Path(saida_dir)
+        self.conn = None
+        self.manifesto_path = self.saida_dir / "_manifesto.json"
+        self.manifesto = {}
+
+    def conectar(self):
+        """Abre o banco em modo somente leitura"""
+        self.conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        print(f"✅ Conectado ao banco: {self.db_path}")
+
+    def desconectar(self):
+        """Fecha a conexão com o banco"""
+        if self.conn:
+            self.conn.close()
+            print("✅ Conexão encerrada")
+
+    # ======================================================
+    # Manifesto (o que já foi gravado)
+    # ======================================================
+
+    def _carregar_manifesto(self):
+        """
+        O manifesto guarda a versão do arquivo do banco exportada por último
+        (versao_arquivo_banco), o tipo Arrow de cada coluna e, para cada
+        partição já gravada, a impressão digital do conteúdo que a gerou.
+
+        - banco com a mesma versão: nada é lido, a exportação termina na hora
+        - banco alterado: todas as linhas são lidas e comparadas pela impressão
+          digital, e só as partições cujo conteúdo mudou são convertidas e
+          regravadas (o SQLite não marca quais linhas mudaram: atualizado_em
+          não é preenchido pela migração)
+        """
+        if self.manifesto_path.exists():
+            with open(self.manifesto_path, 'r', encoding='utf-8') as f:
+                self.manifesto = json.load(f)
+        else:
+            self.manifesto = {}
+
+    def _salvar_manifesto(self):
+        self.saida_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifesto_path.with_suffix(".json.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.manifesto, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifesto_path)
+
+    # ======================================================
+    # Esquema e conversão de tipos
+    # ======================================================
+
+    def listar_tabelas(self):
+        """Todas as tabelas do banco (menos as internas do SQLite)"""
+        rows = self.conn.execute("""
+            SELECT name FROM sqlite_master
+            WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+            ORDER BY name
+        """).fetchall()
+        return [r[0] for r in rows]
+
+    def colunas_da_tabela(self, tabela):
+        """Lista de (nome, tipo_declarado) na ordem do CREATE TABLE"""
+        return [(r[1], (r[2] or "").upper())
+                for r in self.conn.execute(f"PRAGMA table_info([{tabela}])")]
+
+    def _tabela_particionada(self, tabela, colunas):
+        nomes = {c for c, _ in colunas}
+        return tabela == "partidas" or "partida_id" in nomes
+
+    @staticmethod
+    def _tipo_declarado_para_arrow(tipo_declarado):
+        """Tipo Arrow pretendido para o tipo declarado no CREATE TABLE"""
+        if "INT" in tipo_declarado:
+            return "int64"
+        if "REAL" in tipo_declarado or "FLOA" in tipo_declarado or "DOUB" in tipo_declarado:
+            return "float64"
+        if "BOOL" in tipo_declarado:
+            return "bool"
+        # TEXT / TIMESTAMP: strings repetitivas (fase, tipo_evento, nomes de
+        # clube...) ficam muito menores codificadas em dicionário
+        return TIPO_TEXTO
+
+    def _conversor(self, tipo):
+        return {"int64": self._para_int, "float64": self._para_float,
+                "bool": self._para_bool}[tipo]
+
+    def _ajustar_tipos(self, tabela, colunas, linhas, tipos):
+        """
+        Rebaixa para texto, em tipos ({coluna: tipo}), as colunas em que algum
+        valor de linhas não converte para o tipo pretendido.
+
+        O SQLite aceita qualquer valor em qualquer coluna, então os CSVs antigos
+        deixaram alguns '' e '-' em colunas INTEGER. Esses viram nulo; qualquer
+        outro valor que não converta (ex.: '45+2' numa coluna INTEGER) faz a
+        coluna inteira cair para texto, para não perder dados. A decisão vale
+        para a tabela toda (todas as partições), senão o dataset teria a mesma
+        coluna com tipos diferentes e não poderia ser lido de uma vez.
+        """
+        for idx, (nome, _) in enumerate(colunas):
+            if tipos[nome] == TIPO_TEXTO:
+                continue
+            converter = self._conversor(tipos[nome])
+            try:
+                for linha in linhas:
+                    converter(linha[idx])
+            except (ValueError, TypeError) as e:
+                print(f"⚠️  Coluna {tabela}.{nome} ({tipos[nome]}) exportada como texto: {e}")
+                tipos[nome] = TIPO_TEXTO
+
+    def _coluna_arrow(self, valores, tipo):
+        """Converte uma coluna do SQLite para um array Arrow do tipo já decidido"""
+        if tipo == TIPO_TEXTO:
+            return self._coluna_texto(valores)
+        converter = self._conversor(tipo)
+        return pa.array([converter(v) for v in valores], type=TIPOS_ARROW[tipo])
+
+    @staticmethod
+    def _coluna_texto(valores):
+        return pa.array([None if v is None else str(v) for v in valores],
+                        type=pa.string()).dictionary_encode()
+
+    @staticmethod
+    def _para_int(valor):
+        """Inteiro, None para vazio; ValueError para qualquer outra coisa"""
+        if valor is None or isinstance(valor, int):
+            return valor
+        if isinstance(valor, str) and valor.strip() in VALORES_NULOS:
+            return None
+        numero = float(valor)
+        if not numero.is_integer():
+            raise ValueError(f"{valor!r} não é inteiro")
+        return int(numero)
+
+    @staticmethod
+    def _para_float(valor):
+        """Real, None para vazio; ValueError para qualquer outra coisa"""
+        if valor is None or isinstance(valor, float):
+            return valor
+        if isinstance(valor, str) and valor.strip() in VALORES_NULOS:
+            return None
+        return float(valor)
+
+    @classmethod
+    def _para_bool(cls, valor):
+        numero = cls._para_int(valor)
+        return None if numero is None else bool(numero)
+
+    def _montar_tabela_arrow(self, colunas, linhas, tipos):
+        arrays = []
+        for idx, (nome, _) in enumerate(colunas):
+            arrays.append(self._coluna_arrow([l[idx] for l in linhas], tipos[nome]))
+        return pa.Table.from_arrays(arrays, names=[c for c, _ in colunas])
+
+    def _tipos_iniciais(self, colunas):
+        return {nome: self._tipo_declarado_para_arrow(tipo) for nome, tipo in colunas}
+
+    def _registrar_tipos(self, tabela, tipos):
+        """
+        Guarda os tipos da tabela no manifesto. Retorna True se mudaram desde a
+        última exportação: nesse caso todas as partições têm de ser regravadas,
+        inclusive as de conteúdo igual, para o dataset continuar com um só esquema.
+        """
+        registrados = self.manifesto.setdefault(CHAVE_TIPOS, {})
+        mudou = registrados.get(tabela) != tipos
+        registrados[tabela] = tipos
+        return mudou
+
+    @staticmethod
+    def _impressao_digital(linhas):
+        """Hash do conteúdo das linhas — muda se qualquer valor mudar"""
+        h = hashlib.sha1()
+        for linha in linhas:
+            h.update(repr(linha).encode("utf-8"))
+        return f"{len(linhas)}:{h.hexdigest()}"
+
+    def _gravar_parquet(self, tabela_arrow, destino: Path):
+        """Grava num arquivo temporário e renomeia (leitores nunca veem arquivo pela metade)"""
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        tmp = destino.with_suffix(".parquet.tmp")
+        pq.write_table(
+            tabela_arrow, tmp,
+            compression="zstd",
+            use_dictionary=True,
+        )
+        os.replace(tmp, destino)
+
+    # ======================================================
+    # Exportação
+    # ======================================================
+
+    def _consulta_particao(self, tabela, colunas):
+        lista = ", ".join(f"t.[{c}]" for c, _ in colunas)
+        if tabela == "partidas":
+            return f"SELECT {lista} FROM partidas t WHERE t.edicao_id IS ? ORDER BY t.rowid"
+        return f"""
+            SELECT {lista} FROM [{tabela}] t
+            JOIN partidas p ON t.partida_id = p.ID
+            WHERE p.edicao_id IS ?
+            ORDER BY t.rowid
+        """
+
+    def exportar_tabela_particionada(self, tabela, colunas, completo=False):
+        edicoes = [r[0] for r in self.conn.execute(
+            "SELECT DISTINCT edicao_id FROM partidas ORDER BY edicao_id")]
+        # A chave de partição vai no nome da pasta, não dentro do arquivo
+        colunas = [(c, t) for c, t in colunas if c != "edicao_id"]
+        sql = self._consulta_particao(tabela, colunas)
+        estado = self.manifesto.setdefault(tabela, {})
+
+        # 1ª passada: impressão digital de cada partição e tipos da tabela toda
+        digitais = {}
+        tipos = self._tipos_iniciais(colunas)
+        for edicao_id in edicoes:
+            linhas = self.conn.execute(sql, (edicao_id,)).fetchall()
+            digitais[edicao_id] = self._impressao_digital(linhas)
+            self._ajustar_tipos(tabela, colunas, linhas, tipos)
+        if self._registrar_tipos(tabela, tipos):
+            completo = True
+
+        # 2ª passada: relê e grava só as partições que mudaram
+        gravadas = 0
+        for edicao_id in edicoes:
+            chave = PARTICAO_NULA if edicao_id is None else str(edicao_id)
+            digital = digitais[edicao_id]
+            destino = self.saida_dir / tabela / f"edicao_id={chave}" / "part-0.parquet"
+            vazia = digital.startswith("0:")
+
+            # Partição vazia não tem arquivo: a impressão basta
+            if not completo and estado.get(chave) == digital and (destino.exists() or vazia):
+                continue
+
+            if not vazia:
+                linhas = self.conn.execute(sql, (edicao_id,)).fetchall()
+                self._gravar_parquet(self._montar_tabela_arrow(colunas, linhas, tipos), destino)
+            elif destino.parent.exists():
+                shutil.rmtree(destino.parent)
+            estado[chave] = digital
+            gravadas += 1
+
+        # Edições que sumiram do banco: remove a partição órfã
+        validas = {PARTICAO_NULA if e is None else str(e) for e in edicoes}
+        for chave in list(estado):
+            if chave not in validas:
+                pasta = self.saida_dir / tabela / f"edicao_id={chave}"
+                if pasta.exists():
+                    shutil.rmtree(pasta)
+                del estado[chave]
+                gravadas += 1
+
+        print(f"✅ {tabela}: {gravadas} partição(ões) regravada(s) de {len(edicoes)}")
+
+    def exportar_tabela_simples(self, tabela, colunas, completo=False):
+        lista = ", ".join(f"[{c}]" for c, _ in colunas)
+        linhas = self.conn.execute(f"SELECT {lista} FROM [{tabela}] ORDER BY rowid").fetchall()
+        digital = self._impressao_digital(linhas)
+        destino = self.saida_dir / tabela / "part-0.parquet"
+        tipos = self._tipos_iniciais(colunas)
+        self._ajustar_tipos(tabela, colunas, linhas, tipos)
+        if self._registrar_tipos(tabela, tipos):
+            completo = True
+
+        if not completo and self.manifesto.get(tabela) == digital and destino.exists():
+            print(f"✅ {tabela}: sem alterações")
+            return
+
+        self._gravar_parquet(self._montar_tabela_arrow(colunas, linhas, tipos), destino)
+        self.manifesto[tabela] = digital
+        print(f"✅ {tabela}: {len(linhas)} linhas exportadas")
+
+    def executar_exportacao(self, completo=False):
+        """
+        Exporta todas as tabelas do banco para Parquet.
+
+        Args:
+            completo: se True, ignora o manifesto e regrava tudo. Por padrão só
+                      as partições (edições) cujo conteúdo mudou são regravadas,
+                      e nada é lido se o arquivo do banco não mudou desde a
+                      última exportação.
+        """
+        print("\n" + "="*60)
+        print("📦 EXPORTAÇÃO SQLite → PARQUET")
+        print("="*60)
+
+        versao = versao_arquivo_banco(self.db_path)
+        self._carregar_manifesto()
+        if (not completo and versao is not None
+                and self.manifesto.get(CHAVE_VERSAO_BANCO) == list(versao)):
+            print(f"✅ Banco sem alterações desde a última exportação ({self.saida_dir})")
+            return
+
+        try:
+            self.conectar()
+
+            for tabela in self.listar_tabelas():
+                colunas = self.colunas_da_tabela(tabela)
+                if self._tabela_particionada(tabela, colunas):
+                    self.exportar_tabela_particionada(tabela, colunas, completo)
+                else:
+                    self.exportar_tabela_simples(tabela, colunas, completo)
+
+            self.manifesto[CHAVE_VERSAO_BANCO] = list(versao) if versao else None
+            self._salvar_manifesto()
+
+            print("\n" + "="*60)
+            print(f"✅ EXPORTAÇÃO CONCLUÍDA em {self.saida_dir}")
+            print("="*60)
+
+        except Exception as e:
+            print(f"\n❌ ERRO NA EXPORTAÇÃO: {e}")
+            raise
+        finally:
+            self.desconectar()
+
+
+# ============================================
+# EXEMPLO DE USO
+# ============================================
+#   python bd/exportar_parquet.py                 → só edições alteradas (nada, se o banco não mudou)
+#   python bd/exportar_parquet.py --completo      → regrava tudo
+#
+# Leitura no notebook:
+#   import pyarrow.dataset as ds
+#   partidas = ds.dataset("parquet/partidas", partitioning="hive").to_table()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta o banco SQLite para Parquet particionado por edição")
+    parser.add_argument("--banco", default="bd/estruturado_bd_1971.db")
+    parser.add_argument("--saida", default="parquet")
+    parser.add_argument("--completo", action="store_true",
+                        help="ignora o manifesto e regrava todas as partições")
+    args = parser.parse_args()
+
+    exportador = ExportadorSQLiteParaParquet(args.banco, args.saida)
+    exportador.executar_exportacao(completo=args.completo)
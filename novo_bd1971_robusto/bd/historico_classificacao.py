@@ -0,0 +1,141 @@
+import sqlite3
+import argparse
+
+from classificacao import carregar_resultados, data_iso
+
+
+# ============================================
+# Classificação por rodada (pré-calculada)
+# ============================================
+# Guarda em classificacao_por_rodada a posição, os pontos e o saldo de cada
+# clube depois de cada etapa (rodada) da edição, para os gráficos de
+# "posição ao longo do campeonato". Calcular isso na hora exigiria uma tabela
+# completa por rodada a cada requisição.
+#
+# A atualização é incremental: a temporada é recalculada em memória (é
+# barato, ver classificacao.py) e comparada com o que já está gravado; só as
+# etapas a partir da primeira diferença são apagadas e regravadas. Quando o
+# scraper acrescenta uma rodada nova, só essa rodada é escrita no banco.
+
+SQL_CRIAR_TABELA = """
+    CREATE TABLE IF NOT EXISTS classificacao_por_rodada (
+        edicao_id INTEGER NOT NULL,
+        etapa INTEGER NOT NULL,
+        fase TEXT,
+        rodada INTEGER,
+        data TEXT,
+        clube_id INTEGER NOT NULL,
+        posicao INTEGER NOT NULL,
+        jogos INTEGER NOT NULL,
+        pontos INTEGER NOT NULL,
+        vitorias INTEGER NOT NULL,
+        saldo_gols INTEGER NOT NULL,
+        gols_pro INTEGER NOT NULL,
+        PRIMARY KEY (edicao_id, etapa, clube_id),
+        FOREIGN KEY (edicao_id) REFERENCES edicoes(ID) ON DELETE CASCADE,
+        FOREIGN KEY (clube_id) REFERENCES clubes(ID) ON DELETE CASCADE
+    )
+"""
+
+
+def linhas_do_historico(edicao_id, resultados):
+    """Linhas prontas para INSERT, agrupadas por etapa: {etapa: [tupla, ...]}"""
+    por_etapa = {}
+    for info, tabela in resultados.historico_por_etapa():
+        por_etapa[info["etapa"]] = [
+            (edicao_id, info["etapa"], info["fase"], info["rodada"], data_iso(info["data"]),
+             t["clube_id"], t["pos"], t["j"], t["pts"], t["v"], t["sg"], t["gp"])
+            for t in tabela
+        ]
+    return por_etapa
+
+
+class AtualizadorClassificacaoPorRodada:
+    def __init__(self, conn):
+        """
+        Args:
+            conn: Conexão sqlite3 aberta (o commit fica a cargo do chamador)
+        """
+        self.conn = conn
+        self.conn.execute(SQL_CRIAR_TABELA)
+
+    def _gravado(self, edicao_id):
+        """O que já está no banco para a edição, no mesmo formato de linhas_do_historico"""
+        por_etapa = {}
+        for linha in self.conn.execute("""
+            SELECT edicao_id, etapa, fase, rodada, data, clube_id,
+                   posicao, jogos, pontos, vitorias, saldo_gols, gols_pro
+            FROM classificacao_por_rodada
+            WHERE edicao_id = ?
+            ORDER BY etapa, posicao
+        """, (edicao_id,)):
+            por_etapa.setdefault(linha[1], []).append(tuple(linha))
+        return por_etapa
+
+    def atualizar_edicao(self, edicao_id, ano):
+        """
+        Recalcula o histórico da edição e regrava só as etapas que mudaram.
+        Retorna o número de etapas regravadas.
+        """
+        novo = linhas_do_historico(edicao_id, carregar_resultados(self.conn, ano, edicao_id))
+        antigo = self._gravado(edicao_id)
+
+        etapas = sorted(set(novo) | set(antigo))
+        primeira_diferente = next((e for e in etapas if novo.get(e) != antigo.get(e)), None)
+        if primeira_diferente is None:
+            return 0
+
+        # Uma etapa diferente muda todas as seguintes (a tabela é acumulada)
+        self.conn.execute(
+            "DELETE FROM classificacao_por_rodada WHERE edicao_id = ? AND etapa >= ?",
+            (edicao_id, primeira_diferente))
+        self.conn.executemany("""
+            INSERT INTO classificacao_por_rodada
+                (edicao_id, etapa, fase, rodada, data, clube_id,
+                 posicao, jogos, pontos, vitorias, saldo_gols, gols_pro)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [linha for e in etapas if e >= primeira_diferente for linha in novo.get(e, [])])
+        return sum(1 for e in etapas if e >= primeira_diferente and e in novo)
+
+    def atualizar(self, edicao_ids=None):
+        """Atualiza todas as edições (ou só as informadas)"""
+        edicoes = self.conn.execute("SELECT ID, ano FROM edicoes ORDER BY ano").fetchall()
+        total = 0
+        for edicao_id, ano in edicoes:
+            if edicao_ids is not None and edicao_id not in edicao_ids:
+                continue
+            try:
+                ano = int(str(ano)[:4])
+            except ValueError:
+                print(f"⚠️  Edição {edicao_id}: ano inválido ({ano}), ignorada")
+                continue
+            regravadas = self.atualizar_edicao(edicao_id, ano)
+            total += regravadas
+            if regravadas:
+                print(f"✅ Classificação por rodada {ano}: {regravadas} etapa(s) regravada(s)")
+        if not total:
+            print("✅ Classificação por rodada: sem alterações")
+        return total
+
+
+def atualizar_classificacao_por_rodada(conn, edicao_ids=None):
+    """Atalho usado pelo migrador ao final da carga"""
+    return AtualizadorClassificacaoPorRodada(conn).atualizar(edicao_ids)
+
+
+# ============================================
+# EXEMPLO DE USO
+# ============================================
+#   python bd/historico_classificacao.py
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Atualiza a tabela classificacao_por_rodada")
+    parser.add_argument("--banco", default="bd/estruturado_bd_1971.db")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.banco)
+    try:
+        atualizar_classificacao_por_rodada(conn)
+        conn.commit()
+    finally:
+        conn.close()
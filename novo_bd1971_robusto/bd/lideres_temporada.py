@@ -0,0 +1,185 @@
+import sqlite3
+import argparse
+
+from rollups import (ControleRollup, impressoes_por_edicao, SQL_EVENTOS_POR_JOGADOR,
+                     SQL_IMPRESSAO_SUMULAS, SQL_IMPRESSAO_EVENTOS)
+
+
+# ============================================
+# Líderes da temporada (artilharia, assistências, cartões...)
+# ============================================
+# Para cada edição e categoria guarda o ranking completo dos jogadores já
+# ordenado, com uma coluna `ordem` (1, 2, 3...) na chave primária. O top-N
+# de qualquer categoria é então uma leitura de N linhas pelo índice, sem
+# GROUP BY sobre jogadores_em_partida a cada visita à página da temporada.
+#
+# Os números vêm da mesma fonte que carreira_jogadores.py (eventos_partida,
+# com jogadores_em_partida para partidas sem eventos do jogador: ver
+# SQL_EVENTOS_POR_JOGADOR), então a artilharia bate com a soma das carreiras.
+# Não há categoria de minutos: a migração não preenche minutos_jogados.
+# Jogadores com valor zero na categoria não entram no ranking.
+
+ROLLUP = "lideres_temporada"
+
+# categoria -> título exibido
+CATEGORIAS = {
+    "gols": "Gols",
+    "gols_penalti": "Gols de pênalti",
+    "gols_contra": "Gols contra",
+    "assistencias": "Assistências",
+    "cartao_amarelo": "Cartões amarelos",
+    "cartao_vermelho": "Cartões vermelhos",
+    "jogos": "Jogos",
+}
+
+SQL_CRIAR_TABELA = """
+    CREATE TABLE IF NOT EXISTS lideres_temporada (
+        edicao_id INTEGER NOT NULL,
+        categoria TEXT NOT NULL,
+        ordem INTEGER NOT NULL,
+        posicao INTEGER NOT NULL,
+        jogador_id INTEGER NOT NULL,
+        clube_id INTEGER,
+        valor INTEGER NOT NULL,
+        jogos INTEGER NOT NULL,
+        PRIMARY KEY (edicao_id, categoria, ordem),
+        FOREIGN KEY (edicao_id) REFERENCES edicoes(ID) ON DELETE CASCADE,
+        FOREIGN KEY (jogador_id) REFERENCES jogadores(ID) ON DELETE CASCADE,
+        FOREIGN KEY (clube_id) REFERENCES clubes(ID)
+    ) WITHOUT ROWID
+"""
+
+# Uma linha por jogador × clube da edição
+SQL_TOTAIS_EDICAO = f"""
+    SELECT
+        jp.jogador_id,
+        jp.clube_id,
+        COUNT(*) AS jogos,
+        TOTAL(COALESCE(ev.gols, jp.gols)) AS gols,
+        TOTAL(ev.gols_penalti) AS gols_penalti,
+        TOTAL(COALESCE(ev.gols_contra, jp.gol_contra)) AS gols_contra,
+        TOTAL(COALESCE(ev.assistencias, jp.assistencias)) AS assistencias,
+        TOTAL(COALESCE(ev.amarelos, jp.cartao_amarelo)) AS cartao_amarelo,
+        TOTAL(COALESCE(ev.vermelhos, jp.cartao_vermelho)) AS cartao_vermelho
+    FROM jogadores_em_partida jp
+    JOIN partidas p ON jp.partida_id = p.ID
+    LEFT JOIN ({SQL_EVENTOS_POR_JOGADOR}) ev ON ev.partida_id = jp.partida_id AND ev.jogador_id = jp.jogador_id
+    WHERE p.edicao_id = ?
+    GROUP BY jp.jogador_id, jp.clube_id
+"""
+
+
+def calcular_lideres(conn, edicao_id):
+    """
+    Rankings completos da edição: {categoria: [(ordem, posicao, jogador_id,
+    clube_id, valor, jogos), ...]}.
+
+    O clube de cada jogador é aquele pelo qual ele mais jogou na edição.
+    Empate no valor divide a posição (1º, 1º, 3º); dentro do empate fica na
+    frente quem precisou de menos jogos.
+    """
+    jogadores = {}
+    for linha in conn.execute(SQL_TOTAIS_EDICAO, (edicao_id, edicao_id)):
+        linha = tuple(linha)
+        jogador_id, clube_id, jogos = linha[0], linha[1], linha[2]
+        valores = dict(zip(("gols", "gols_penalti", "gols_contra",
+                            "assistencias", "cartao_amarelo", "cartao_vermelho"),
+                           (int(v) for v in linha[3:])))
+        atual = jogadores.get(jogador_id)
+        if atual is None:
+            valores.update(jogos=jogos, clube_id=clube_id, jogos_no_clube=jogos)
+            jogadores[jogador_id] = valores
+            continue
+        for chave, valor in valores.items():
+            atual[chave] += valor
+        atual["jogos"] += jogos
+        if jogos > atual["jogos_no_clube"]:
+            atual["clube_id"], atual["jogos_no_clube"] = clube_id, jogos
+
+    rankings = {}
+    for categoria in CATEGORIAS:
+        candidatos = sorted(
+            ((j[categoria], j["jogos"], jogador_id, j["clube_id"])
+             for jogador_id, j in jogadores.items() if j[categoria] > 0),
+            key=lambda c: (-c[0], c[1], c[2]))
+        linhas = []
+        posicao = 0
+        for ordem, (valor, jogos, jogador_id, clube_id) in enumerate(candidatos, start=1):
+            if not linhas or valor != linhas[-1][4]:
+                posicao = ordem
+            linhas.append((ordem, posicao, jogador_id, clube_id, valor, jogos))
+        rankings[categoria] = linhas
+    return rankings
+
+
+class AtualizadorLideresTemporada:
+    def __init__(self, conn):
+        """
+        Args:
+            conn: Conexão sqlite3 aberta (o commit fica a cargo do chamador)
+        """
+        self.conn = conn
+        self.conn.execute(SQL_CRIAR_TABELA)
+        # Categorias que deixaram de existir (ex.: minutos) não ficam para trás
+        self.conn.execute(
+            f"DELETE FROM lideres_temporada WHERE categoria NOT IN ({', '.join('?' * len(CATEGORIAS))})",
+            tuple(CATEGORIAS))
+        self.controle = ControleRollup(conn, ROLLUP)
+
+    def recalcular_edicao(self, edicao_id):
+        rankings = calcular_lideres(self.conn, edicao_id)
+        self.conn.execute("DELETE FROM lideres_temporada WHERE edicao_id = ?", (edicao_id,))
+        self.conn.executemany("""
+            INSERT INTO lideres_temporada
+                (edicao_id, categoria, ordem, posicao, jogador_id, clube_id, valor, jogos)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(edicao_id, categoria) + linha
+              for categoria, linhas in rankings.items() for linha in linhas])
+
+    def atualizar(self, completo=False):
+        """
+        Recalcula só as edições cujas escalações ou eventos mudaram desde a
+        última execução (ou todas, com completo=True).
+        Retorna o número de edições recalculadas.
+        """
+        impressoes = impressoes_por_edicao(self.conn, SQL_IMPRESSAO_SUMULAS, SQL_IMPRESSAO_EVENTOS)
+        alteradas, removidas = self.controle.edicoes_alteradas(impressoes, completo)
+
+        for edicao_id in removidas:
+            self.conn.execute("DELETE FROM lideres_temporada WHERE edicao_id = ?", (edicao_id,))
+            self.controle.esquecer(edicao_id)
+
+        for edicao_id in alteradas:
+            self.recalcular_edicao(edicao_id)
+            self.controle.marcar(edicao_id, impressoes[edicao_id])
+
+        if alteradas or removidas:
+            print(f"✅ Líderes da temporada: {len(alteradas)} edição(ões) recalculada(s)")
+        else:
+            print("✅ Líderes da temporada: sem alterações")
+        return len(alteradas)
+
+
+def atualizar_lideres_temporada(conn, completo=False):
+    """Atalho usado pelo migrador ao final da carga"""
+    return AtualizadorLideresTemporada(conn).atualizar(completo)
+
+
+# ============================================
+# EXEMPLO DE USO
+# ============================================
+#   python bd/lideres_temporada.py                → só edições alteradas
+#   python bd/lideres_temporada.py --completo     → recalcula todas
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Atualiza a tabela lideres_temporada")
+    parser.add_argument("--banco", default="bd/estruturado_bd_1971.db")
+    parser.add_argument("--completo", action="store_true")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.banco)
+    try:
+        atualizar_lideres_temporada(conn, args.completo)
+        conn.commit()
+    finally:
+        conn.close()
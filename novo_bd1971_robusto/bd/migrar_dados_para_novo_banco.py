@@ -1,32 +1,373 @@
 import sqlite3
 import csv
 import os
+import time
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+from historico_classificacao import atualizar_classificacao_por_rodada
+from ratings import atualizar_ratings
+from carreira_jogadores import atualizar_carreira_jogadores
+from lideres_temporada import atualizar_lideres_temporada
+from snapshot_homepage import atualizar_snapshot_homepage
+
+# Índices das listas de partidas paginadas do site (/api/<entidade>/<id>/partidas).
+# As chaves primárias das tabelas de vínculo começam por partida_id e não
+# servem para buscar "todas as partidas do árbitro X".
+INDICES_CONSULTA = (
+    "CREATE INDEX IF NOT EXISTS idx_arbitros_em_partida_arbitro ON arbitros_em_partida (arbitro_id)",
+    "CREATE INDEX IF NOT EXISTS idx_treinadores_em_partida_treinador ON treinadores_em_partida (treinador_id)",
+    "CREATE INDEX IF NOT EXISTS idx_partidas_estadio ON partidas (estadio_id)",
+)
+
+# ============================================
+# Carga com o site no ar (modo WAL)
+# ============================================
+# O banco fica em journal_mode=WAL (gravado no próprio arquivo, vale para
+# toda conexão depois da primeira carga): quem lê (o site) nunca espera
+# quem escreve e vice-versa, e cada leitor enxerga o banco como estava no
+# último COMMIT. Sem WAL, cada COMMIT da carga trava o arquivo inteiro e as
+# requisições do site recebem "database is locked" ou ficam esperando.
+#
+# Dois jeitos de carregar:
+#   - no lugar (padrão): transações curtas de `tamanho_lote` linhas, com
+#     checkpoint PASSIVE a cada LOTES_POR_CHECKPOINT lotes (o -wal não
+#     cresce sem limite e o checkpoint não espera leitores). O site vê os
+#     dados chegando aos poucos.
+#   - banco sombra (banco_sombra=True): copia o banco para <banco>.sombra,
+#     carrega tudo lá e troca o arquivo de uma vez com os.replace. O site vê
+#     o banco antigo inteiro até a troca e o novo inteiro depois; se a carga
+#     falhar, o banco no ar nem foi tocado.
+#
+# Conexões já abertas continuam lendo o arquivo antigo até fecharem (o site
+# abre uma por requisição). O cache do site percebe a troca pelo mtime.
+
+TAMANHO_LOTE = 5000
+LOTES_POR_CHECKPOINT = 20
+SUFIXO_SOMBRA = ".sombra"
+
+# Troca do banco sombra: tentativas de esvaziar o -wal antes de desistir
+TENTATIVAS_TROCA = 10
+ESPERA_TROCA = 0.25
+
+
+def ativar_wal(conn):
+    """Põe o banco em WAL (persistente no arquivo) com fsync só nos checkpoints"""
+    modo = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return modo
+
+
+def _wal_vazio(caminho):
+    wal = caminho + "-wal"
+    return not os.path.exists(wal) or os.path.getsize(wal) == 0
+
+
+def esvaziar_wal(caminho, tentativas=TENTATIVAS_TROCA, espera=ESPERA_TROCA):
+    """
+    Checkpoint TRUNCATE até o -wal ao lado de `caminho` ficar vazio.
+    Retorna False se o checkpoint voltou ocupado (busy) em todas as tentativas.
+    """
+    if not os.path.exists(caminho):
+        return True
+    for tentativa in range(tentativas):
+        if tentativa:
+            time.sleep(espera)
+        # O busy handler espera leitores por até 5s em cada tentativa
+        conn = sqlite3.connect(caminho, timeout=5)
+        try:
+            ocupado = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0]
+        finally:
+            conn.close()
+        if ocupado == 0 and _wal_vazio(caminho):
+            return True
+    return False
+
+
+def trocar_banco(sombra, destino):
+    """
+    Troca `destino` por `sombra` atomicamente.
+
+    O -wal e o -shm ficam ao lado do caminho, não do arquivo: depois do
+    os.replace o arquivo novo usa o -wal que era do banco no ar, e se ele
+    ainda tiver quadros o SQLite os aplica ao arquivo novo (quem abre lê
+    linhas do banco antigo). Por isso os dois -wal precisam estar vazios,
+    com o checkpoint TRUNCATE confirmado sem busy. Se `sombra` é um symlink
+    (construir_banco.py) o -wal fica ao lado da versão e o do destino não
+    importa.
+
+    Levanta RuntimeError, sem tocar no banco no ar, se algum -wal não
+    esvaziar em TENTATIVAS_TROCA tentativas.
+    """
+    if not esvaziar_wal(sombra):
+        raise RuntimeError(f"{sombra}: o -wal não esvaziou (checkpoint ocupado); troca abortada")
+    if not os.path.islink(sombra) and not esvaziar_wal(destino):
+        raise RuntimeError(f"{destino}: o -wal não esvaziou (checkpoint ocupado); troca abortada")
+    os.replace(sombra, destino)
+
+
+# ============================================
+# Tabelas da migração
+# ============================================
+# Na ordem das chaves estrangeiras (locais → clubes → ... → eventos). Cada
+# coluna: (coluna no SQLite, campo no CSV, tipo). Campos em `padroes` podem
+# faltar no CSV; os outros são obrigatórios.
+#
+# preparar_tabela lê um CSV e devolve as tuplas prontas para o INSERT
+# (limpar_valor, inteiros convertidos, avisos de validação). Não toca no
+# banco, então no modo paralelo (processos=N) todos os CSVs são preparados
+# ao mesmo tempo num ProcessPoolExecutor, enquanto um único escritor insere
+# na ordem acima, conforme cada tabela fica pronta.
+
+INTEIRO = "inteiro"
+TEXTO = "texto"
+
+TABELAS_MIGRACAO = {
+    'locais': {
+        'arquivo': 'locais - locais.csv',
+        'titulo': '📍 Migrando LOCAIS...',
+        'entidade': 'local',
+        'migrados': 'locais migrados',
+        'colunas': (('ID', 'id', INTEIRO), ('cidade', 'cidade', TEXTO), ('estado', 'estado', TEXTO),
+                    ('UF', 'uf', TEXTO), ('regiao', 'regiao', TEXTO), ('pais', 'pais', TEXTO)),
+    },
+    'clubes': {
+        'arquivo': 'clubes - clubes.csv',
+        'titulo': '⚽ Migrando CLUBES...',
+        'entidade': 'clube',
+        'migrados': 'clubes migrados',
+        'colunas': (('ID', 'id', INTEIRO), ('clube', 'clube', TEXTO), ('apelido', 'apelido', TEXTO),
+                    ('local_id', 'local_id', INTEIRO), ('fundacao', 'fundacao', TEXTO),
+                    ('ativo', 'ativo', INTEIRO)),
+        'padroes': {'ativo': 1},
+    },
+    'estadios': {
+        'arquivo': 'estadios - estadios.csv',
+        'titulo': '🏟️  Migrando ESTÁDIOS...',
+        'entidade': 'estádio',
+        'migrados': 'estádios migrados',
+        'colunas': (('ID', 'id', INTEIRO), ('estadio', 'estadio', TEXTO), ('capacidade', 'capacidade', INTEIRO),
+                    ('local_id', 'local_id', INTEIRO), ('inauguracao', 'inauguracao', TEXTO),
+                    ('ativo', 'ativo', INTEIRO)),
+        'padroes': {'ativo': 1},
+    },
+    'jogadores': {
+        'arquivo': 'jogadores - jogadores.csv',
+        'titulo': '👟 Migrando JOGADORES...',
+        'entidade': 'jogador',
+        'migrados': 'jogadores migrados',
+        'colunas': (('ID', 'id', INTEIRO), ('nome', 'nome', TEXTO), ('nascimento', 'nascimento', TEXTO),
+                    ('falecimento', 'falecimento', TEXTO), ('nacionalidade', 'nacionalidade', TEXTO),
+                    ('naturalidade', 'naturalidade', TEXTO), ('altura', 'altura', INTEIRO),
+                    ('peso', 'peso', INTEIRO), ('posicao', 'posicao', TEXTO),
+                    ('posicao_detalhada', 'posicao_detalhada', TEXTO), ('pe_preferido', 'pe_preferido', TEXTO),
+                    ('aposentado', 'aposentado', INTEIRO)),
+        'padroes': {'aposentado': 0},
+    },
+    'treinadores': {
+        'arquivo': 'treinadores - treinadores.csv',
+        'titulo': '👔 Migrando TREINADORES...',
+        'entidade': 'treinador',
+        'migrados': 'treinadores migrados',
+        'colunas': (('ID', 'id', INTEIRO), ('nome', 'nome', TEXTO), ('nascimento', 'nascimento', TEXTO),
+                    ('falecimento', 'falecimento', TEXTO), ('nacionalidade', 'nacionalidade', TEXTO),
+                    ('naturalidade', 'naturalidade', TEXTO), ('aposentado', 'aposentado', INTEIRO)),
+    },
+    'arbitros': {
+        'arquivo': 'arbitros - arbitros.csv',
+        'titulo': '🧑‍⚖️  Migrando ÁRBITROS...',
+        'entidade': 'árbitro',
+        'migrados': 'árbitros migrados',
+        'colunas': (('ID', 'id', INTEIRO), ('nome', 'nome', TEXTO), ('nascimento', 'nascimento', TEXTO),
+                    ('falecimento', 'falecimento', TEXTO), ('nacionalidade', 'nacionalidade', TEXTO),
+                    ('naturalidade', 'naturalidade', TEXTO), ('aposentado', 'aposentado', INTEIRO)),
+    },
+    'campeonatos': {
+        'arquivo': 'campeonatos - campeonatos.csv',
+        'titulo': '🏆 Migrando CAMPEONATOS...',
+        'entidade': 'campeonato',
+        'migrados': 'campeonatos migrados',
+        'colunas': (('ID', 'ID', INTEIRO), ('campeonato', 'campeonato', TEXTO), ('pais', 'pais', TEXTO),
+                    ('entidade', 'entidade', TEXTO), ('tipo', 'tipo', TEXTO), ('criado_em', 'criado_em', TEXTO)),
+    },
+    'edicoes': {
+        'arquivo': 'edicoes - edicoes.csv',
+        'titulo': '📅 Migrando EDIÇÕES...',
+        'entidade': 'edição',
+        'migrados': 'edições migradas',
+        'colunas': (('ID', 'ID', INTEIRO), ('campeonato_id', 'campeonato_id', INTEIRO), ('ano', 'ano', TEXTO),
+                    ('data_inicio', 'data_inicio', TEXTO), ('data_fim', 'data_fim', TEXTO),
+                    ('campeao_id', 'campeao_id', INTEIRO), ('vice_id', 'vice_id', INTEIRO),
+                    ('criado_em', 'criado_em', TEXTO)),
+    },
+    'partidas': {
+        'arquivo': 'partidas - partidas.csv',
+        'titulo': '⚽ Migrando PARTIDAS...',
+        'entidade': 'partida',
+        'migrados': 'partidas migradas',
+        'colunas': (('ID', 'id', INTEIRO), ('edicao_id', 'edicao_id', INTEIRO),
+                    ('campeonato_id', 'campeonato_id', INTEIRO), ('data', 'data', TEXTO), ('hora', 'hora', TEXTO),
+                    ('fase', 'fase', TEXTO), ('grupo', 'grupo', TEXTO), ('rodada', 'rodada', INTEIRO),
+                    ('estadio_id', 'estadio_id', INTEIRO), ('mandante_id', 'mandante_id', INTEIRO),
+                    ('visitante_id', 'visitante_id', INTEIRO), ('mandante_placar', 'mandante_placar', INTEIRO),
+                    ('visitante_placar', 'visitante_placar', INTEIRO), ('mandante_grupo', 'mandante_grupo', TEXTO),
+                    ('visitante_grupo', 'visitante_grupo', TEXTO),
+                    ('mandante_penalti', 'mandante_penalti', INTEIRO),
+                    ('visitante_penalti', 'visitante_penalti', INTEIRO), ('prorrogacao', 'prorrogacao', INTEIRO)),
+    },
+    'jogadores_em_partida': {
+        'arquivo': 'jogadores_em_partida - jogadores_em_partida.csv',
+        'titulo': '👥 Migrando JOGADORES EM PARTIDA...',
+        'entidade': 'jogador em partida',
+        'migrados': 'registros de jogadores em partidas migrados',
+        'colunas': (('partida_id', 'partida_id', INTEIRO), ('jogador_id', 'jogador_id', INTEIRO),
+                    ('clube_id', 'clube_id', INTEIRO), ('titular', 'titular', INTEIRO),
+                    ('posicao_jogada', 'posicao_jogada', TEXTO), ('numero_camisa', 'numero_camisa', INTEIRO)),
+    },
+    'treinadores_em_partida': {
+        'arquivo': 'treinadores_em_partida - treinadores_em_partida.csv',
+        'titulo': '👔 Migrando TREINADORES EM PARTIDA...',
+        'entidade': 'treinador em partida',
+        'migrados': 'registros de treinadores em partidas migrados',
+        'colunas': (('partida_id', 'partida_id', INTEIRO), ('treinador_id', 'treinador_id', INTEIRO),
+                    ('clube_id', 'clube_id', INTEIRO), ('tipo', 'tipo', TEXTO)),
+    },
+    'arbitros_em_partida': {
+        'arquivo': 'arbitros_em_partida - arbitros_em_partida.csv',
+        'titulo': '🧑‍⚖️  Migrando ÁRBITROS EM PARTIDA...',
+        'entidade': 'árbitro em partida',
+        'migrados': 'registros de árbitros em partidas migrados',
+        'colunas': (('partida_id', 'partida_id', INTEIRO), ('arbitro_id', 'arbitro_id', INTEIRO)),
+    },
+    'eventos_partida': {
+        'arquivo': 'eventos_partida - eventos_partida.csv',
+        'titulo': '📝 Migrando EVENTOS DE PARTIDA...',
+        'entidade': 'evento',
+        'migrados': 'eventos migrados',
+        'colunas': (('ID', 'id', INTEIRO), ('partida_id', 'partida_id', INTEIRO), ('jogador_id', 'jogador_id', INTEIRO),
+                    ('clube_id', 'clube_id', INTEIRO), ('tipo_evento', 'tipo_evento', TEXTO),
+                    ('tipo_gol', 'tipo_gol', TEXTO), ('minuto', 'minuto', TEXTO)),
+    },
+}
+
+
+def limpar_valor(valor):
+    """Strings vazias, '-', 'None' e 'NULL' viram NULL; o resto perde espaços nas pontas"""
+    if valor in ['', '-', 'None', 'NULL']:
+        return None
+    return valor.strip() if isinstance(valor, str) else valor
+
+
+def _tamanho_csv(csv_dir, tabela):
+    caminho = os.path.join(csv_dir, TABELAS_MIGRACAO[tabela]['arquivo'])
+    return os.path.getsize(caminho) if os.path.exists(caminho) else 0
+
+
+def preparar_tabela(csv_dir, tabela):
+    """
+    Lê o CSV de uma tabela e devolve {'linhas': [tupla, ...], 'avisos': [...],
+    'ausente': bool}. Roda em outro processo no modo paralelo: só recebe e
+    devolve valores simples.
+    """
+    spec = TABELAS_MIGRACAO[tabela]
+    caminho = os.path.join(csv_dir, spec['arquivo'])
+    if not os.path.exists(caminho):
+        return {'linhas': [], 'avisos': [], 'ausente': True}
+
+    padroes = spec.get('padroes', {})
+    colunas = spec['colunas']
+    linhas, avisos = [], []
+    nao_numericos = {}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        cabecalho = next(reader, [])
+        posicoes = {campo: i for i, campo in enumerate(cabecalho)}
+
+        faltando = [campo for _, campo, _ in colunas if campo not in posicoes and campo not in padroes]
+        if faltando:
+            avisos.append(f"{spec['arquivo']}: colunas ausentes {faltando}; tabela ignorada")
+            return {'linhas': [], 'avisos': avisos, 'ausente': False}
+
+        extratores = [(posicoes.get(campo), padroes.get(campo), tipo, coluna) for coluna, campo, tipo in colunas]
+        for row in reader:
+            if not row:
+                continue
+            tupla = []
+            for posicao, padrao, tipo, coluna in extratores:
+                bruto = row[posicao] if posicao is not None and posicao < len(row) else padrao
+                valor = limpar_valor(bruto)
+                if tipo == INTEIRO and isinstance(valor, str):
+                    try:
+                        valor = int(valor)
+                    except ValueError:
+                        # Fica como texto, como antes (o SQLite guarda do jeito que vier)
+                        nao_numericos[coluna] = nao_numericos.get(coluna, 0) + 1
+                tupla.append(valor)
+            linhas.append(tuple(tupla))
+
+    for coluna, n in nao_numericos.items():
+        avisos.append(f"{n} valores não numéricos em {tabela}.{coluna}")
+    sem_chave = sum(1 for linha in linhas if linha[0] is None)
+    if sem_chave:
+        avisos.append(f"{sem_chave} linhas de {tabela} sem {colunas[0][0]}")
+    return {'linhas': linhas, 'avisos': avisos, 'ausente': False}
+
 
 class MigradorCSVParaSQLite:
-    def __init__(self, db_path, csv_dir):
+    def __init__(self, db_path, csv_dir, tamanho_lote=TAMANHO_LOTE, banco_sombra=False, processos=None):
         """
         Inicializa o migrador com o caminho do banco SQLite e diretório dos CSVs
 
         Args:
             db_path: Caminho para o arquivo .db do SQLite
             csv_dir: Diretório onde estão os arquivos CSV
+            tamanho_lote: Linhas por transação (o site só espera um lote, nunca a carga)
+            banco_sombra: Carrega numa cópia e troca o arquivo no fim (ver comentário acima)
+            processos: Processos lendo os CSVs em paralelo (None = um só; ver migrar_tabelas)
         """
         self.db_path = db_path
         self.csv_dir = csv_dir
+        self.tamanho_lote = tamanho_lote
+        self.banco_sombra = banco_sombra
+        self.processos = processos
         self.conn = None
         self.cursor = None
-
-    def conectar(self):
-        """Estabelece conexão com o banco SQLite"""
-        self.conn = sqlite3.connect(self.db_path)
+        self._lotes = 0
+
+    def conectar(self, caminho=None):
+        """Estabelece conexão com o banco SQLite (em modo WAL)"""
+        caminho = caminho or self.db_path
+        self.conn = sqlite3.connect(caminho, timeout=60)
+        modo = ativar_wal(self.conn)
+        # Checkpoints ficam por conta do migrador (checkpoint_parcial)
+        self.conn.execute("PRAGMA wal_autocheckpoint=0")
         self.cursor = self.conn.cursor()
-        print(f"✅ Conectado ao banco: {self.db_path}")
+        print(f"✅ Conectado ao banco: {caminho} (journal_mode={modo})")
+
+    def commit_lote(self):
+        """Fecha a transação do lote (e faz checkpoint a cada LOTES_POR_CHECKPOINT lotes)"""
+        self.conn.commit()
+        self._lotes += 1
+        if self._lotes % LOTES_POR_CHECKPOINT == 0:
+            self.checkpoint_parcial()
+
+    def checkpoint_parcial(self):
+        """Copia o que der do -wal para o .db sem esperar leitores"""
+        self.conn.commit()
+        self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def checkpoint_final(self):
+        """Esvazia o -wal (espera leitores em andamento, até o timeout)"""
+        self.conn.commit()
+        ocupado, paginas_wal, copiadas = self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        if ocupado:
+            print(f"⚠️  Checkpoint incompleto ({copiadas}/{paginas_wal} páginas): leitores ainda abertos")
 
     def desconectar(self):
         """Fecha a conexão com o banco"""
         if self.conn:
             self.conn.close()
+            self.conn = None
             print("✅ Conexão encerrada")
 
     def limpar_valor(self, valor):
@@ -34,466 +375,131 @@ class MigradorCSVParaSQLite:
         Limpa valores vazios ou inválidos dos CSVs
         Converte strings vazias, '-' ou 'None' em NULL do SQLite
         """
-        if valor in ['', '-', 'None', 'NULL']:
-            return None
-        return valor.strip() if isinstance(valor, str) else valor
+        return limpar_valor(valor)
 
-    def migrar_locais(self):
-        """Migra dados da tabela locais"""
-        csv_path = os.path.join(self.csv_dir, 'locais - locais.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  locais.csv não encontrado")
+    def migrar_tabela(self, tabela, preparada=None):
+        """
+        Insere uma tabela de TABELAS_MIGRACAO em lotes de `tamanho_lote` linhas
+
+        Args:
+            tabela: Nome da tabela (chave de TABELAS_MIGRACAO)
+            preparada: Resultado de preparar_tabela já calculado (modo paralelo);
+                       None = lê e prepara o CSV aqui mesmo
+        """
+        spec = TABELAS_MIGRACAO[tabela]
+        if preparada is None:
+            preparada = preparar_tabela(self.csv_dir, tabela)
+        if preparada['ausente']:
+            print(f"⚠️  {tabela}.csv não encontrado")
             return
 
-        print("\n📍 Migrando LOCAIS...")
+        print(f"\n{spec['titulo']}")
+        for aviso in preparada['avisos']:
+            print(f"⚠️  {aviso}")
+
+        colunas = [coluna for coluna, _, _ in spec['colunas']]
+        sql = (f"INSERT OR IGNORE INTO {tabela} ({', '.join(colunas)}) "
+               f"VALUES ({', '.join('?' * len(colunas))})")
+        linhas = preparada['linhas']
+        contador = 0
+        for inicio in range(0, len(linhas), self.tamanho_lote):
+            lote = linhas[inicio:inicio + self.tamanho_lote]
+            try:
+                self.cursor.executemany(sql, lote)
+                contador += len(lote)
+            except sqlite3.Error:
+                # Uma linha ruim derruba o executemany: refaz o lote uma a uma
+                for linha in lote:
+                    try:
+                        self.cursor.execute(sql, linha)
+                        contador += 1
+                    except sqlite3.Error as e:
+                        print(f"❌ Erro ao inserir {spec['entidade']} {linha[0]}: {e}")
+            self.commit_lote()
+
+        self.conn.commit()
+        print(f"✅ {contador} {spec['migrados']}")
+
+    def migrar_tabelas(self, processos=None):
+        """
+        Migra todas as tabelas na ordem das chaves estrangeiras.
 
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
+        Args:
+            processos: None/1 = lê cada CSV na hora de inserir (um processo só);
+                       N > 1 = os CSVs são lidos, limpos e validados em paralelo
+                       por N processos, e este processo só insere, na mesma ordem
+        """
+        if not processos or processos <= 1:
+            for tabela in TABELAS_MIGRACAO:
+                self.migrar_tabela(tabela)
+            return
 
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO locais (ID, cidade, estado, UF, regiao, pais)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        self.limpar_valor(row['id']),
-                        self.limpar_valor(row['cidade']),
-                        self.limpar_valor(row['estado']),
-                        self.limpar_valor(row['uf']),
-                        self.limpar_valor(row['regiao']),
-                        self.limpar_valor(row['pais'])
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir local {row.get('id')}: {e}")
+        print(f"\n⚙️  Preparando {len(TABELAS_MIGRACAO)} CSVs em {processos} processos...")
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            # As maiores primeiro, para não ficarem por último na fila do pool
+            tamanhos = {t: _tamanho_csv(self.csv_dir, t) for t in TABELAS_MIGRACAO}
+            futuros = {t: pool.submit(preparar_tabela, self.csv_dir, t)
+                       for t in sorted(TABELAS_MIGRACAO, key=tamanhos.get, reverse=True)}
+            for tabela in TABELAS_MIGRACAO:
+                self.migrar_tabela(tabela, futuros[tabela].result())
 
-            self.conn.commit()
-            print(f"✅ {contador} locais migrados")
+    def migrar_locais(self):
+        """Migra dados da tabela locais"""
+        self.migrar_tabela('locais')
 
     def migrar_clubes(self):
         """Migra dados da tabela clubes"""
-        csv_path = os.path.join(self.csv_dir, 'clubes - clubes.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  clubes.csv não encontrado")
-            return
-
-        print("\n⚽ Migrando CLUBES...")
-
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
-
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO clubes (ID, clube, apelido, local_id, fundacao, ativo)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        self.limpar_valor(row['id']),
-                        self.limpar_valor(row['clube']),
-                        self.limpar_valor(row['apelido']),
-                        self.limpar_valor(row['local_id']),
-                        self.limpar_valor(row['fundacao']),
-                        self.limpar_valor(row.get('ativo', 1))
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir clube {row.get('clube')}: {e}")
-
-            self.conn.commit()
-            print(f"✅ {contador} clubes migrados")
+        self.migrar_tabela('clubes')
 
     def migrar_estadios(self):
         """Migra dados da tabela estadios"""
-        csv_path = os.path.join(self.csv_dir, 'estadios - estadios.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  estadios.csv não encontrado")
-            return
-
-        print("\n🏟️  Migrando ESTÁDIOS...")
-
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
-
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO estadios (ID, estadio, capacidade, local_id, inauguracao, ativo)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        self.limpar_valor(row['id']),
-                        self.limpar_valor(row['estadio']),
-                        self.limpar_valor(row['capacidade']),
-                        self.limpar_valor(row['local_id']),
-                        self.limpar_valor(row['inauguracao']),
-                        self.limpar_valor(row.get('ativo', 1))
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir estádio {row.get('estadio')}: {e}")
-
-            self.conn.commit()
-            print(f"✅ {contador} estádios migrados")
+        self.migrar_tabela('estadios')
 
     def migrar_jogadores(self):
         """Migra dados da tabela jogadores"""
-        csv_path = os.path.join(self.csv_dir, 'jogadores - jogadores.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  jogadores.csv não encontrado")
-            return
-
-        print("\n👟 Migrando JOGADORES...")
-
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
-
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO jogadores
-                        (ID, nome, nascimento, falecimento, nacionalidade, naturalidade,
-                         altura, peso, posicao, posicao_detalhada, pe_preferido, aposentado)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        self.limpar_valor(row['id']),
-                        self.limpar_valor(row['nome']),
-                        self.limpar_valor(row['nascimento']),
-                        self.limpar_valor(row['falecimento']),
-                        self.limpar_valor(row['nacionalidade']),
-                        self.limpar_valor(row['naturalidade']),
-                        self.limpar_valor(row['altura']),
-                        self.limpar_valor(row['peso']),
-                        self.limpar_valor(row['posicao']),
-                        self.limpar_valor(row['posicao_detalhada']),
-                        self.limpar_valor(row['pe_preferido']),
-                        self.limpar_valor(row.get('aposentado', 0))
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir jogador {row.get('nome')}: {e}")
-
-            self.conn.commit()
-            print(f"✅ {contador} jogadores migrados")
+        self.migrar_tabela('jogadores')
 
     def migrar_treinadores(self):
         """Migra dados da tabela treinadores"""
-        csv_path = os.path.join(self.csv_dir, 'treinadores - treinadores.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  treinadores.csv não encontrado")
-            return
-
-        print("\n👔 Migrando TREINADORES...")
-
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
-
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO treinadores
-                        (ID, nome, nascimento, falecimento, nacionalidade, naturalidade, aposentado)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        self.limpar_valor(row['id']),
-                        self.limpar_valor(row['nome']),
-                        self.limpar_valor(row['nascimento']),
-                        self.limpar_valor(row['falecimento']),
-                        self.limpar_valor(row['nacionalidade']),
-                        self.limpar_valor(row['naturalidade']),
-                        self.limpar_valor(row['aposentado'])
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir treinador {row.get('nome')}: {e}")
-
-            self.conn.commit()
-            print(f"✅ {contador} treinadores migrados")
+        self.migrar_tabela('treinadores')
 
     def migrar_arbitros(self):
         """Migra dados da tabela arbitros"""
-        csv_path = os.path.join(self.csv_dir, 'arbitros - arbitros.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  arbitros.csv não encontrado")
-            return
-
-        print("\n🧑‍⚖️  Migrando ÁRBITROS...")
-
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
-
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO arbitros
-                        (ID, nome, nascimento, falecimento, nacionalidade, naturalidade, aposentado)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        self.limpar_valor(row['id']),
-                        self.limpar_valor(row['nome']),
-                        self.limpar_valor(row['nascimento']),
-                        self.limpar_valor(row['falecimento']),
-                        self.limpar_valor(row['nacionalidade']),
-                        self.limpar_valor(row['naturalidade']),
-                        self.limpar_valor(row['aposentado'])
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir árbitro {row.get('nome')}: {e}")
-
-            self.conn.commit()
-            print(f"✅ {contador} árbitros migrados")
+        self.migrar_tabela('arbitros')
 
     def migrar_campeonatos(self):
         """Migra dados da tabela campeonatos"""
-        csv_path = os.path.join(self.csv_dir, 'campeonatos - campeonatos.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  campeonatos.csv não encontrado")
-            return
-
-        print("\n🏆 Migrando CAMPEONATOS...")
-
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
-
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO campeonatos (ID, campeonato, pais, entidade, tipo, criado_em)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        self.limpar_valor(row['ID']),
-                        self.limpar_valor(row['campeonato']),
-                        self.limpar_valor(row['pais']),
-                        self.limpar_valor(row['entidade']),
-                        self.limpar_valor(row['tipo']),
-                        self.limpar_valor(row['criado_em'])
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir campeonato: {e}")
-
-            self.conn.commit()
-            print(f"✅ {contador} campeonatos migrados")
+        self.migrar_tabela('campeonatos')
 
     def migrar_edicoes(self):
         """Migra dados da tabela edicoes"""
-        csv_path = os.path.join(self.csv_dir, 'edicoes - edicoes.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  edicoes.csv não encontrado")
-            return
-
-        print("\n📅 Migrando EDIÇÕES...")
-
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
-
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO edicoes
-                        (ID, campeonato_id, ano, data_inicio, data_fim, campeao_id, vice_id, criado_em)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        self.limpar_valor(row['ID']),
-                        self.limpar_valor(row['campeonato_id']),
-                        self.limpar_valor(row['ano']),
-                        self.limpar_valor(row['data_inicio']),
-                        self.limpar_valor(row['data_fim']),
-                        self.limpar_valor(row['campeao_id']),
-                        self.limpar_valor(row['vice_id']),
-                        self.limpar_valor(row['criado_em'])
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir edição: {e}")
-
-            self.conn.commit()
-            print(f"✅ {contador} edições migradas")
+        self.migrar_tabela('edicoes')
 
     def migrar_partidas(self):
         """Migra dados da tabela partidas"""
-        csv_path = os.path.join(self.csv_dir, 'partidas - partidas.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  partidas.csv não encontrado")
-            return
-
-        print("\n⚽ Migrando PARTIDAS...")
-
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
-
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO partidas
-                        (ID, edicao_id, campeonato_id, data, hora, fase, grupo, rodada,
-                         estadio_id, mandante_id, visitante_id, mandante_placar,
-                         visitante_placar, mandante_grupo, visitante_grupo, mandante_penalti, visitante_penalti, prorrogacao)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        self.limpar_valor(row['id']),
-                        self.limpar_valor(row['edicao_id']),
-                        self.limpar_valor(row['campeonato_id']),
-                        self.limpar_valor(row['data']),
-                        self.limpar_valor(row['hora']),
-                        self.limpar_valor(row['fase']),
-                        self.limpar_valor(row['grupo']),
-                        self.limpar_valor(row['rodada']),
-                        self.limpar_valor(row['estadio_id']),
-                        self.limpar_valor(row['mandante_id']),
-                        self.limpar_valor(row['visitante_id']),
-                        self.limpar_valor(row['mandante_placar']),
-                        self.limpar_valor(row['visitante_placar']),
-                        self.limpar_valor(row['mandante_grupo']),
-                        self.limpar_valor(row['visitante_grupo']),
-                        self.limpar_valor(row['mandante_penalti']),
-                        self.limpar_valor(row['visitante_penalti']),
-                        self.limpar_valor(row['prorrogacao'])
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir partida {row.get('id')}: {e}")
-
-            self.conn.commit()
-            print(f"✅ {contador} partidas migradas")
+        self.migrar_tabela('partidas')
 
     def migrar_jogadores_em_partida(self):
         """Migra dados da tabela jogadores_em_partida"""
-        csv_path = os.path.join(self.csv_dir, 'jogadores_em_partida - jogadores_em_partida.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  jogadores_em_partida.csv não encontrado")
-            return
-
-        print("\n👥 Migrando JOGADORES EM PARTIDA...")
-
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
-
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO jogadores_em_partida
-                        (partida_id, jogador_id, clube_id, titular, posicao_jogada, numero_camisa)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        self.limpar_valor(row['partida_id']),
-                        self.limpar_valor(row['jogador_id']),
-                        self.limpar_valor(row['clube_id']),
-                        self.limpar_valor(row['titular']),
-                        self.limpar_valor(row['posicao_jogada']),
-                        self.limpar_valor(row['numero_camisa'])
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir jogador em partida: {e}")
-
-            self.conn.commit()
-            print(f"✅ {contador} registros de jogadores em partidas migrados")
+        self.migrar_tabela('jogadores_em_partida')
 
     def migrar_treinadores_em_partida(self):
         """Migra dados da tabela treinadores_em_partida"""
-        csv_path = os.path.join(self.csv_dir, 'treinadores_em_partida - treinadores_em_partida.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  treinadores_em_partida.csv não encontrado")
-            return
-
-        print("\n👔 Migrando TREINADORES EM PARTIDA...")
-
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
-
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO treinadores_em_partida
-                        (partida_id, treinador_id, clube_id, tipo)
-                        VALUES (?, ?, ?, ?)
-                    ''', (
-                        self.limpar_valor(row['partida_id']),
-                        self.limpar_valor(row['treinador_id']),
-                        self.limpar_valor(row['clube_id']),
-                        self.limpar_valor(row['tipo'])
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir treinador em partida: {e}")
-
-            self.conn.commit()
-            print(f"✅ {contador} registros de treinadores em partidas migrados")
+        self.migrar_tabela('treinadores_em_partida')
 
     def migrar_arbitros_em_partida(self):
         """Migra dados da tabela arbitros_em_partida"""
-        csv_path = os.path.join(self.csv_dir, 'arbitros_em_partida - arbitros_em_partida.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  arbitros_em_partida.csv não encontrado")
-            return
-
-        print("\n🧑‍⚖️  Migrando ÁRBITROS EM PARTIDA...")
-
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
-
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO arbitros_em_partida (partida_id, arbitro_id)
-                        VALUES (?, ?)
-                    ''', (
-                        self.limpar_valor(row['partida_id']),
-                        self.limpar_valor(row['arbitro_id'])
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir árbitro em partida: {e}")
-
-            self.conn.commit()
-            print(f"✅ {contador} registros de árbitros em partidas migrados")
+        self.migrar_tabela('arbitros_em_partida')
 
     def migrar_eventos_partida(self):
         """Migra dados da tabela eventos_partida"""
-        csv_path = os.path.join(self.csv_dir, 'eventos_partida - eventos_partida.csv')
-        if not os.path.exists(csv_path):
-            print("⚠️  eventos_partida.csv não encontrado")
-            return
-
-        print("\n📝 Migrando EVENTOS DE PARTIDA...")
-
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            contador = 0
-
-            for row in reader:
-                try:
-                    self.cursor.execute('''
-                        INSERT OR IGNORE INTO eventos_partida
-                        (ID, partida_id, jogador_id, clube_id, tipo_evento, tipo_gol, minuto)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        self.limpar_valor(row['id']),
-                        self.limpar_valor(row['partida_id']),
-                        self.limpar_valor(row['jogador_id']),
-                        self.limpar_valor(row['clube_id']),
-                        self.limpar_valor(row['tipo_evento']),
-                        self.limpar_valor(row['tipo_gol']),
-                        self.limpar_valor(row['minuto'])
-                    ))
-                    contador += 1
-                except Exception as e:
-                    print(f"❌ Erro ao inserir evento {row.get('id')}: {e}")
+        self.migrar_tabela('eventos_partida')
 
-            self.conn.commit()
-            print(f"✅ {contador} eventos migrados")
+    def criar_indices(self):
+        """Cria (se ainda não existirem) os índices usados pelas consultas do site"""
+        for sql in INDICES_CONSULTA:
+            self.cursor.execute(sql)
+        self.conn.commit()
 
     def executar_migracao_completa(self):
         """
@@ -504,34 +510,89 @@ class MigradorCSVParaSQLite:
         print("🚀 INICIANDO MIGRAÇÃO CSV → SQLite")
         print("="*60)
 
+        sombra = self.db_path + SUFIXO_SOMBRA if self.banco_sombra else None
+        sucesso = False
         try:
-            self.conectar()
+            if sombra:
+                self.preparar_sombra(sombra)
+            self.conectar(sombra)
 
             # Migra na ordem correta (respeitando dependências)
-            self.migrar_locais()
-            self.migrar_clubes()
-            self.migrar_estadios()
-            self.migrar_jogadores()
-            self.migrar_treinadores()
-            self.migrar_arbitros()
-            self.migrar_campeonatos()
-            self.migrar_edicoes()
-            self.migrar_partidas()
-            self.migrar_jogadores_em_partida()
-            self.migrar_treinadores_em_partida()
-            self.migrar_arbitros_em_partida()
-            self.migrar_eventos_partida()
+            self.migrar_tabelas(self.processos)
+            self.criar_indices()
 
-            print("\n" + "="*60)
-            print("✅ MIGRAÇÃO CONCLUÍDA COM SUCESSO!")
-            print("="*60)
+            # Tabelas pré-calculadas a partir das partidas recém-migradas
+            print("\n📈 Atualizando CLASSIFICAÇÃO POR RODADA...")
+            atualizar_classificacao_por_rodada(self.conn)
+            self.conn.commit()
+
+            print("\n📈 Atualizando RATINGS dos clubes...")
+            atualizar_ratings(self.conn)
+            self.conn.commit()
+
+            print("\n📈 Atualizando CARREIRA DOS JOGADORES...")
+            atualizar_carreira_jogadores(self.conn)
+            self.conn.commit()
+
+            print("\n📈 Atualizando LÍDERES DA TEMPORADA...")
+            atualizar_lideres_temporada(self.conn)
+            self.conn.commit()
+
+            # Por último: a homepage resume o resultado da carga inteira
+            print("\n📈 Gerando SNAPSHOT DA HOMEPAGE...")
+            atualizar_snapshot_homepage(self.conn)
+            self.conn.commit()
+
+            self.checkpoint_final()
+            sucesso = True
 
         except Exception as e:
             print(f"\n❌ ERRO NA MIGRAÇÃO: {e}")
-            self.conn.rollback()
+            if self.conn:
+                # Só o lote em andamento é desfeito; os anteriores já foram confirmados
+                self.conn.rollback()
         finally:
             self.desconectar()
 
+        if sombra:
+            if sucesso:
+                try:
+                    trocar_banco(sombra, self.db_path)
+                    print(f"🔁 {self.db_path} substituído pelo banco sombra")
+                except RuntimeError as e:
+                    print(f"❌ {e}")
+                    print(f"⚠️  Banco sombra mantido em {sombra}; {self.db_path} não foi alterado")
+                    sucesso = False
+            else:
+                for arquivo in (sombra, sombra + "-wal", sombra + "-shm"):
+                    if os.path.exists(arquivo):
+                        os.remove(arquivo)
+                print(f"↩️  Banco sombra descartado; {self.db_path} não foi alterado")
+
+        if sucesso:
+            print("\n" + "="*60)
+            print("✅ MIGRAÇÃO CONCLUÍDA COM SUCESSO!")
+            print("="*60)
+        return sucesso
+
+    def preparar_sombra(self, sombra):
+        """Cópia consistente do banco no ar em <banco>.sombra (backup online do SQLite)"""
+        for arquivo in (sombra, sombra + "-wal", sombra + "-shm"):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+        inicio = time.perf_counter()
+        destino = sqlite3.connect(sombra)
+        try:
+            if os.path.exists(self.db_path):
+                origem = sqlite3.connect(self.db_path, timeout=60)
+                try:
+                    origem.backup(destino)
+                finally:
+                    origem.close()
+        finally:
+            destino.close()
+        print(f"📋 Banco sombra preparado em {time.perf_counter() - inicio:.1f}s: {sombra}")
+
 
 # ============================================
 # EXEMPLO DE USO
@@ -542,6 +603,13 @@ if __name__ == "__main__":
     CAMINHO_BANCO_SQLITE = "bd/estruturado_bd_1971.db"  # Seu arquivo .db
     DIRETORIO_CSVS = "csv_atualizados"  # Pasta com os CSVs
 
+    # True = carga noturna com o site no ar: monta tudo numa cópia e troca no fim
+    BANCO_SOMBRA = False
+
+    # Processos lendo os CSVs em paralelo (None = um só)
+    PROCESSOS = os.cpu_count()
+
     # Cria o migrador e executa
-    migrador = MigradorCSVParaSQLite(CAMINHO_BANCO_SQLITE, DIRETORIO_CSVS)
+    migrador = MigradorCSVParaSQLite(CAMINHO_BANCO_SQLITE, DIRETORIO_CSVS, banco_sombra=BANCO_SOMBRA,
+                                     processos=PROCESSOS)
     migrador.executar_migracao_completa()
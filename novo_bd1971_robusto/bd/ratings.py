@@ -0,0 +1,240 @@
+import sqlite3
+import argparse
+
+from classificacao import data_iso, data_ordenavel, get_formato_campeonato, placar_inteiro
+
+
+# ============================================
+# Rating Elo dos clubes (1971 → hoje)
+# ============================================
+# Percorre as partidas em ordem cronológica e atualiza a força de cada clube
+# depois de cada jogo:
+#
+#   esperado = 1 / (1 + 10^(-(rating_mandante + VANTAGEM_MANDO - rating_visitante) / 400))
+#   novo     = rating + K * G * (resultado - esperado)
+#
+# onde G cresce com a diferença de gols (estilo World Football Elo) e K
+# depende do formato do campeonato na época (get_formato_campeonato) e de o
+# jogo ser mata-mata. No primeiro jogo de cada temporada o rating do clube é
+# puxado um pouco de volta para a média, já que os elencos mudam de um ano
+# para o outro e, nas eras de grupos, muitos clubes jogavam poucas partidas.
+#
+# Cada partida processada grava uma linha por clube em ratings_clubes
+# (rating antes e depois), que serve de histórico para as páginas de clube.
+# Na atualização só as partidas a partir da primeira novidade (jogo novo,
+# placar corrigido, jogo removido) são reprocessadas.
+
+RATING_INICIAL = 1500.0
+VANTAGEM_MANDO = 100.0
+
+# Eras com menos jogos por clube → cada jogo pesa mais
+K_POR_FORMATO = {
+    "grupos_fases": 30.0,
+    "misto": 25.0,
+    "pontos_corridos": 20.0,
+}
+FATOR_MATA_MATA = 1.5
+FASES_MATA_MATA = ("final", "semi", "quartas", "oitavas")
+
+# Fração da distância até RATING_INICIAL descontada no 1º jogo do ano
+REGRESSAO_ENTRE_TEMPORADAS = 0.2
+
+SQL_CRIAR_TABELA = """
+    CREATE TABLE IF NOT EXISTS ratings_clubes (
+        partida_id INTEGER NOT NULL,
+        clube_id INTEGER NOT NULL,
+        ordem INTEGER NOT NULL,
+        ano INTEGER,
+        data TEXT,
+        mandante BOOLEAN NOT NULL,
+        gols_pro INTEGER NOT NULL,
+        gols_contra INTEGER NOT NULL,
+        rating_antes REAL NOT NULL,
+        rating_depois REAL NOT NULL,
+        PRIMARY KEY (partida_id, clube_id),
+        FOREIGN KEY (partida_id) REFERENCES partidas(ID) ON DELETE CASCADE,
+        FOREIGN KEY (clube_id) REFERENCES clubes(ID) ON DELETE CASCADE
+    )
+"""
+SQL_CRIAR_INDICE = """
+    CREATE INDEX IF NOT EXISTS idx_ratings_clubes_clube
+    ON ratings_clubes (clube_id, ordem)
+"""
+
+
+def ordem_cronologica(data, partida_id):
+    """Chave inteira única e ordenável: AAAAMMDD seguido do ID da partida"""
+    return data_ordenavel(data) * 10_000_000 + partida_id
+
+
+def fator_margem(diferenca_gols):
+    """Peso extra para goleadas: 1, 1.5, depois (11 + N) / 8"""
+    diferenca_gols = abs(diferenca_gols)
+    if diferenca_gols <= 1:
+        return 1.0
+    if diferenca_gols == 2:
+        return 1.5
+    return (11.0 + diferenca_gols) / 8.0
+
+
+def fator_k(ano, fase):
+    k = K_POR_FORMATO[get_formato_campeonato(ano)]
+    if fase and any(f in fase.lower() for f in FASES_MATA_MATA):
+        k *= FATOR_MATA_MATA
+    return k
+
+
+def variacao_elo(rating_mandante, rating_visitante, gols_mandante, gols_visitante, k):
+    """Pontos de rating ganhos pelo mandante (o visitante perde o mesmo tanto)"""
+    diferenca = rating_mandante + VANTAGEM_MANDO - rating_visitante
+    esperado = 1.0 / (1.0 + 10.0 ** (-diferenca / 400.0))
+    if gols_mandante > gols_visitante:
+        resultado = 1.0
+    elif gols_mandante == gols_visitante:
+        resultado = 0.5
+    else:
+        resultado = 0.0
+    return k * fator_margem(gols_mandante - gols_visitante) * (resultado - esperado)
+
+
+class MotorRatings:
+    def __init__(self, conn):
+        """
+        Args:
+            conn: Conexão sqlite3 aberta (o commit fica a cargo do chamador)
+        """
+        self.conn = conn
+        self.conn.execute(SQL_CRIAR_TABELA)
+        self.conn.execute(SQL_CRIAR_INDICE)
+
+    def _partidas(self):
+        """
+        Todas as partidas com placar, em ordem cronológica:
+        (ordem, partida_id, ano, data, fase, mandante_id, visitante_id, gm, gv)
+        """
+        partidas = []
+        for (partida_id, data, fase, ano, mandante_id, visitante_id,
+             gm, gv) in self.conn.execute("""
+            SELECT p.ID, p.data, p.fase, ed.ano,
+                   p.mandante_id, p.visitante_id,
+                   p.mandante_placar, p.visitante_placar
+            FROM partidas p
+            JOIN edicoes ed ON p.edicao_id = ed.ID
+        """):
+            gm, gv = placar_inteiro(gm), placar_inteiro(gv)
+            if gm is None or gv is None:
+                continue
+            try:
+                ano = int(str(ano)[:4])
+            except ValueError:
+                continue
+            partidas.append((ordem_cronologica(data, partida_id), partida_id, ano,
+                             data, fase, mandante_id, visitante_id, gm, gv))
+        partidas.sort()
+        return partidas
+
+    def _processadas(self):
+        """{partida_id: (ordem, gols_mandante, gols_visitante)} do que já está gravado"""
+        return {partida_id: (ordem, gp, gc) for partida_id, ordem, gp, gc in self.conn.execute(
+            "SELECT partida_id, ordem, gols_pro, gols_contra FROM ratings_clubes WHERE mandante = 1")}
+
+    def _estado_ate(self, ordem):
+        """Rating e último ano de cada clube considerando só partidas antes de `ordem`"""
+        estado = {}
+        for clube_id, rating, ano in self.conn.execute("""
+            SELECT r.clube_id, r.rating_depois, r.ano
+            FROM ratings_clubes r
+            JOIN (
+                SELECT clube_id, MAX(ordem) AS ordem
+                FROM ratings_clubes
+                WHERE ordem < ?
+                GROUP BY clube_id
+            ) ultimo ON r.clube_id = ultimo.clube_id AND r.ordem = ultimo.ordem
+        """, (ordem,)):
+            estado[clube_id] = (rating, ano)
+        return estado
+
+    def atualizar(self, completo=False):
+        """
+        Processa as partidas novas (ou todas, com completo=True).
+        Retorna o número de partidas processadas.
+        """
+        partidas = self._partidas()
+        processadas = {} if completo else self._processadas()
+
+        # Primeira partida que não bate com o que está gravado: jogo novo,
+        # placar corrigido ou jogo que sumiu do banco
+        atuais = {p[1]: (p[0], p[7], p[8]) for p in partidas}
+        mudancas = [chave[0] for pid, chave in atuais.items() if processadas.get(pid) != chave]
+        mudancas += [chave[0] for pid, chave in processadas.items() if pid not in atuais]
+        inicio = min(mudancas, default=None)
+
+        if inicio is None:
+            print("✅ Ratings: sem partidas novas")
+            return 0
+
+        if completo:
+            self.conn.execute("DELETE FROM ratings_clubes")
+            estado = {}
+        else:
+            self.conn.execute("DELETE FROM ratings_clubes WHERE ordem >= ?", (inicio,))
+            estado = self._estado_ate(inicio)
+
+        linhas = []
+        n = 0
+        for ordem, partida_id, ano, data, fase, mandante_id, visitante_id, gm, gv in partidas:
+            if ordem < inicio:
+                continue
+            ratings = []
+            for clube_id in (mandante_id, visitante_id):
+                rating, ultimo_ano = estado.get(clube_id, (RATING_INICIAL, ano))
+                if ultimo_ano != ano:
+                    rating += (RATING_INICIAL - rating) * REGRESSAO_ENTRE_TEMPORADAS
+                ratings.append(rating)
+
+            delta = variacao_elo(ratings[0], ratings[1], gm, gv, fator_k(ano, fase))
+            depois = (ratings[0] + delta, ratings[1] - delta)
+            estado[mandante_id] = (depois[0], ano)
+            estado[visitante_id] = (depois[1], ano)
+
+            data_partida = data_iso(data_ordenavel(data))
+            linhas.append((partida_id, mandante_id, ordem, ano, data_partida, 1, gm, gv,
+                           ratings[0], depois[0]))
+            linhas.append((partida_id, visitante_id, ordem, ano, data_partida, 0, gv, gm,
+                           ratings[1], depois[1]))
+            n += 1
+
+        self.conn.executemany("""
+            INSERT INTO ratings_clubes
+                (partida_id, clube_id, ordem, ano, data, mandante,
+                 gols_pro, gols_contra, rating_antes, rating_depois)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, linhas)
+        print(f"✅ Ratings: {n} partida(s) processada(s)")
+        return n
+
+
+def atualizar_ratings(conn, completo=False):
+    """Atalho usado pelo migrador ao final da carga"""
+    return MotorRatings(conn).atualizar(completo)
+
+
+# ============================================
+# EXEMPLO DE USO
+# ============================================
+#   python bd/ratings.py                → só partidas novas
+#   python bd/ratings.py --completo     → recalcula tudo (ex.: depois de mudar K)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Atualiza os ratings Elo dos clubes")
+    parser.add_argument("--banco", default="bd/estruturado_bd_1971.db")
+    parser.add_argument("--completo", action="store_true",
+                        help="ignora o que já foi calculado e reprocessa todas as partidas")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.banco)
+    try:
+        atualizar_ratings(conn, args.completo)
+        conn.commit()
+    finally:
+        conn.close()
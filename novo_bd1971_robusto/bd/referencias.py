@@ -0,0 +1,154 @@
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+
+
+# ============================================
+# Dados de referência em memória
+# ============================================
+# clubes, edições, estádios, locais e campeonatos são tabelas pequenas
+# (dezenas/centenas de linhas) que só mudam numa nova carga, mas aparecem em
+# JOIN em quase toda consulta do site. Carregamos tudo uma vez por processo
+# em dicionários (ID → registro, nome/slug → registro, ano → edição); as
+# consultas pesadas passam a devolver só os IDs e os nomes são preenchidos
+# daqui (hidratar_partidas).
+#
+# Como em MotorClassificacao, o cache se recarrega sozinho quando o arquivo
+# do banco muda (nova migração).
+
+ANO_INICIAL = 1971
+
+
+def slugify(text):
+    """
+    Transforma texto em URL amigável.
+    Exemplo: 'São Paulo' -> 'sao-paulo'
+    """
+    text = unicodedata.normalize('NFKD', text)
+    text = text.encode('ascii', 'ignore').decode('ascii')
+    text = text.lower()
+    text = re.sub(r'[^\w\s-]', '', text)
+    text = re.sub(r'[-\s]+', '-', text)
+    return text.strip('-')
+
+
+def versao_arquivo_banco(db_path):
+    """
+    Versão do banco para os caches em memória: (dispositivo, inode, mtime,
+    tamanho) do arquivo .db. Se o .db for um symlink (construir_banco.py),
+    vale o arquivo apontado.
+
+    O -wal fica de fora de propósito: ele é criado e apagado quando conexões
+    só de leitura abrem e fecham, e isso invalidaria os caches sem nenhuma
+    escrita. O que é gravado chega ao .db no checkpoint (o migrador faz um a
+    cada LOTES_POR_CHECKPOINT lotes e um TRUNCATE no fim; o SQLite faz ao
+    fechar a última conexão), e aí a versão muda.
+    """
+    try:
+        st = os.stat(os.path.realpath(db_path))
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _registros(conn, sql):
+    cursor = conn.execute(sql)
+    colunas = [d[0] for d in cursor.description]
+    return {linha[0]: dict(zip(colunas, linha)) for linha in cursor}
+
+
+class DadosReferencia:
+    def __init__(self, conn):
+        """
+        Lê as tabelas de referência de uma vez. Os dicionários não devem ser
+        alterados por quem usa: a mesma instância é compartilhada entre
+        requisições.
+        """
+        self.locais = _registros(conn, "SELECT ID, cidade, estado, UF, regiao, pais FROM locais")
+        self.campeonatos = _registros(conn, "SELECT ID, campeonato, pais, entidade, tipo FROM campeonatos")
+        self.clubes = _registros(conn, "SELECT ID, clube, apelido, local_id, fundacao, ativo FROM clubes")
+        self.estadios = _registros(conn, "SELECT ID, estadio, capacidade, local_id, inauguracao, ativo FROM estadios")
+        self.edicoes = _registros(conn, """
+            SELECT ID, campeonato_id, ano, data_inicio, data_fim, campeao_id, vice_id FROM edicoes
+        """)
+
+        for registro in list(self.clubes.values()) + list(self.estadios.values()):
+            local = self.locais.get(registro["local_id"]) or {}
+            registro["cidade"] = local.get("cidade")
+            registro["estado"] = local.get("estado")
+            registro["UF"] = local.get("UF")
+
+        self.clube_por_nome = {c["clube"]: c for c in self.clubes.values()}
+        self.clube_por_slug = {slugify(c["clube"]): c for c in self.clubes.values() if c["clube"]}
+
+        self.edicao_por_ano = {}
+        for edicao in self.edicoes.values():
+            campeonato = self.campeonatos.get(edicao["campeonato_id"]) or {}
+            edicao["campeonato"] = campeonato.get("campeonato")
+            try:
+                self.edicao_por_ano[int(str(edicao["ano"])[:4])] = edicao
+            except (TypeError, ValueError):
+                continue
+
+        self.anos_disponiveis = sorted(self.edicao_por_ano) or [ANO_INICIAL]
+        self.ano_atual = self.anos_disponiveis[-1]
+
+    def nome_clube(self, clube_id):
+        clube = self.clubes.get(clube_id)
+        return clube["clube"] if clube else None
+
+    def hidratar_partidas(self, partidas):
+        """
+        Completa (in-place) linhas de partidas que trazem só IDs:
+        mandante_id/visitante_id → mandante/visitante, edicao_id → ano e
+        campeonato, clube_id → clube, estadio_id → estadio.
+        """
+        for p in partidas:
+            if "mandante_id" in p:
+                p["mandante"] = self.nome_clube(p["mandante_id"])
+            if "visitante_id" in p:
+                p["visitante"] = self.nome_clube(p["visitante_id"])
+            if "clube_id" in p:
+                p["clube"] = self.nome_clube(p["clube_id"])
+            if "edicao_id" in p:
+                edicao = self.edicoes.get(p["edicao_id"]) or {}
+                p.setdefault("ano", edicao.get("ano"))
+                p["campeonato"] = edicao.get("campeonato")
+            if "estadio_id" in p:
+                estadio = self.estadios.get(p["estadio_id"])
+                p["estadio"] = estadio["estadio"] if estadio else None
+        return partidas
+
+
+class CacheReferencia:
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path: Caminho para o arquivo .db do SQLite
+        """
+        self.db_path = db_path
+        self._dados = None
+        self._versao = None
+        self._lock = threading.Lock()
+
+    def atual(self, conn=None):
+        """DadosReferencia da versão atual do banco (recarrega se o .db mudou)"""
+        versao = versao_arquivo_banco(self.db_path)
+        with self._lock:
+            if self._dados is not None and versao == self._versao:
+                return self._dados
+
+        proprio = conn is None
+        if proprio:
+            conn = sqlite3.connect(self.db_path)
+        try:
+            dados = DadosReferencia(conn)
+        finally:
+            if proprio:
+                conn.close()
+
+        with self._lock:
+            self._dados, self._versao = dados, versao
+        return dados
@@ -0,0 +1,122 @@
+# ============================================
+# Controle das tabelas resumo ("rollups") por edição
+# ============================================
+# As tabelas resumo (carreira dos jogadores, líderes da temporada...) são
+# recalculadas por edição. Para a carga não refazer tudo a cada migração,
+# guardamos em rollups_estado uma impressão digital do que gerou cada edição
+# (SHA-1 das linhas de origem, em ordem). Só as edições cuja impressão mudou
+# são recalculadas.
+#
+# Somas e contagens não servem de impressão: trocar o tipo_evento ou o
+# jogador_id entre duas linhas, ou corrigir um minuto '45+1' para '45+2',
+# deixa as somas iguais e o resumo ficaria velho.
+
+import hashlib
+
+SQL_CRIAR_ESTADO = """
+    CREATE TABLE IF NOT EXISTS rollups_estado (
+        rollup TEXT NOT NULL,
+        edicao_id INTEGER NOT NULL,
+        impressao TEXT NOT NULL,
+        atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (rollup, edicao_id)
+    )
+"""
+
+# Linhas de origem das súmulas de cada edição: escalações + eventos. A 1ª
+# coluna é a edição; as demais (na ordem do ORDER BY) entram no hash. O LEFT
+# JOIN garante uma impressão para toda edição com partidas.
+SQL_IMPRESSAO_SUMULAS = """
+    SELECT p.edicao_id, p.ID, jp.jogador_id, jp.clube_id, jp.titular, jp.minutos_jogados,
+           jp.gols, jp.gol_contra, jp.assistencias, jp.cartao_amarelo, jp.cartao_vermelho
+    FROM partidas p
+    LEFT JOIN jogadores_em_partida jp ON jp.partida_id = p.ID
+    ORDER BY p.edicao_id, p.ID, jp.jogador_id, jp.clube_id
+"""
+SQL_IMPRESSAO_EVENTOS = """
+    SELECT p.edicao_id, p.ID, ev.ID, ev.jogador_id, ev.clube_id, ev.tipo_evento,
+           ev.tipo_gol, ev.minuto
+    FROM partidas p
+    LEFT JOIN eventos_partida ev ON ev.partida_id = p.ID
+    ORDER BY p.edicao_id, p.ID, ev.ID
+"""
+
+# Gols, assistências e cartões de cada jogador em cada partida da edição (?),
+# contados em eventos_partida. carreira_jogadores.py e lideres_temporada.py
+# usam esta mesma subconsulta, com COALESCE(ev.x, jp.x): os eventos valem
+# quando existem, e as colunas de jogadores_em_partida só para partidas sem
+# eventos daquele jogador. Gol contra não conta como gol do jogador.
+# MODELO_EVENTOS_POR_JOGADOR recebe o filtro; o site filtra por jogador.
+MODELO_EVENTOS_POR_JOGADOR = """
+    SELECT
+        e.partida_id,
+        e.jogador_id,
+        SUM(e.tipo_evento = 'Gol' AND COALESCE(e.tipo_gol, '') <> 'Gol Contra') AS gols,
+        SUM(e.tipo_evento = 'Gol' AND e.tipo_gol = 'Penalti') AS gols_penalti,
+        SUM(e.tipo_evento = 'Gol' AND e.tipo_gol = 'Gol Contra') AS gols_contra,
+        SUM(e.tipo_evento = 'Assistência') AS assistencias,
+        SUM(e.tipo_evento = 'Cartão Amarelo') AS amarelos,
+        SUM(e.tipo_evento = 'Cartão Vermelho') AS vermelhos
+    FROM eventos_partida e
+    JOIN partidas pe ON e.partida_id = pe.ID
+    WHERE {filtro}
+    GROUP BY e.partida_id, e.jogador_id
+"""
+SQL_EVENTOS_POR_JOGADOR = MODELO_EVENTOS_POR_JOGADOR.format(filtro="pe.edicao_id = ?")
+
+
+def impressoes_por_edicao(conn, *consultas):
+    """{edicao_id: sha1} das linhas devolvidas pelas consultas (edicao_id, colunas...)"""
+    hashes = {}
+    for indice, sql in enumerate(consultas):
+        for linha in conn.execute(sql):
+            edicao_id = linha[0]
+            if edicao_id is None:
+                continue
+            h = hashes.get(edicao_id)
+            if h is None:
+                h = hashes[edicao_id] = hashlib.sha1()
+            h.update(f"{indice}:{linha[1:]!r}\n".encode())
+    return {edicao_id: h.hexdigest() for edicao_id, h in hashes.items()}
+
+
+class ControleRollup:
+    def __init__(self, conn, rollup):
+        """
+        Args:
+            conn: Conexão sqlite3 aberta (o commit fica a cargo do chamador)
+            rollup: Nome da tabela resumo controlada (chave em rollups_estado)
+        """
+        self.conn = conn
+        self.rollup = rollup
+        self.conn.execute(SQL_CRIAR_ESTADO)
+
+    def edicoes_alteradas(self, impressoes, completo=False):
+        """
+        Compara as impressões atuais com as gravadas.
+
+        Retorna (alteradas, removidas): edições a recalcular e edições que
+        sumiram do banco (cujas linhas resumo devem ser apagadas).
+        """
+        gravadas = dict(self.conn.execute(
+            "SELECT edicao_id, impressao FROM rollups_estado WHERE rollup = ?", (self.rollup,)))
+        alteradas = sorted(e for e, imp in impressoes.items()
+                           if completo or gravadas.get(e) != imp)
+        removidas = sorted(e for e in gravadas if e not in impressoes)
+        return alteradas, removidas
+
+    def marcar(self, edicao_id, impressao):
+        self.conn.execute("""
+            INSERT OR REPLACE INTO rollups_estado (rollup, edicao_id, impressao, atualizado_em)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        """, (self.rollup, edicao_id, impressao))
+
+    def esquecer(self, edicao_id):
+        self.conn.execute(
+            "DELETE FROM rollups_estado WHERE rollup = ? AND edicao_id = ?",
+            (self.rollup, edicao_id))
+
+    def esquecer_tudo(self):
+        """Força o recálculo de todas as edições (ex.: a tabela resumo mudou de formato)"""
+        self.conn.execute("DELETE FROM rollups_estado WHERE rollup = ?", (self.rollup,))
+
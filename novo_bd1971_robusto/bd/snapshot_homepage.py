@@ -0,0 +1,243 @@
+import json
+import hashlib
+import sqlite3
+import argparse
+
+from classificacao import carregar_resultados
+
+
+# ============================================
+# Snapshot da homepage
+# ============================================
+# A homepage (index() do site) mostra a classificação da temporada mais
+# recente, os últimos jogos, o top 5 histórico e as estatísticas gerais.
+# Nada disso muda entre duas cargas do banco, mas o top histórico e as
+# estatísticas varrem todas as partidas a cada visita.
+#
+# Depois de cada migração montamos esse conteúdo uma vez e gravamos como JSON
+# na tabela snapshots. Cada snapshot leva:
+#   - versao:    formato do conteúdo (VERSAO_SNAPSHOT); muda quando o site
+#                passar a esperar outros campos, invalidando os antigos
+#   - impressao: sha1 das linhas de origem (CONSULTAS_IMPRESSAO); se o banco
+#                mudou depois do snapshot (carga sem rodar este script), ela
+#                não bate mais e o site volta a consultar ao vivo
+
+NOME_SNAPSHOT = "homepage"
+VERSAO_SNAPSHOT = 1
+
+SQL_CRIAR_TABELA = """
+    CREATE TABLE IF NOT EXISTS snapshots (
+        nome TEXT PRIMARY KEY,
+        versao INTEGER NOT NULL,
+        impressao TEXT NOT NULL,
+        conteudo TEXT NOT NULL,
+        gerado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# Linhas de origem de tudo que a homepage mostra: placares, datas, fases e
+# grupos das partidas, nomes de clubes e estádios, anos das edições e os
+# jogadores que aparecem em alguma escalação (estatísticas gerais)
+CONSULTAS_IMPRESSAO = (
+    """SELECT ID, edicao_id, data, rodada, fase, mandante_id, visitante_id,
+              mandante_placar, visitante_placar, mandante_grupo, visitante_grupo, estadio_id
+       FROM partidas ORDER BY ID""",
+    "SELECT ID, clube FROM clubes ORDER BY ID",
+    "SELECT ID, ano FROM edicoes ORDER BY ID",
+    "SELECT ID, estadio FROM estadios ORDER BY ID",
+    "SELECT DISTINCT jogador_id FROM jogadores_em_partida ORDER BY jogador_id",
+)
+
+
+def impressao_banco(conn):
+    """Impressão digital (sha1) das linhas que alimentam a homepage"""
+    h = hashlib.sha1()
+    for indice, sql in enumerate(CONSULTAS_IMPRESSAO):
+        for linha in conn.execute(sql):
+            h.update(f"{indice}:{tuple(linha)!r}\n".encode())
+    return h.hexdigest()
+
+
+def ano_mais_recente(conn):
+    resultado = conn.execute("SELECT MAX(CAST(ano AS INTEGER)) FROM edicoes").fetchone()
+    return resultado[0] if resultado[0] else 1971
+
+
+def montar_homepage(conn, ano):
+    """
+    Conteúdo da homepage consultando o banco (o que index() fazia a cada
+    visita). Retorna um dict pronto para JSON e para render_template.
+    """
+    classificacao_atual = carregar_resultados(conn, ano).classificacao()
+
+    # Últimos 10 jogos
+    colunas = ("ID", "mandante", "visitante", "mandante_placar", "visitante_placar",
+               "data", "fase", "ano", "estadio")
+    ultimos_jogos = [dict(zip(colunas, linha)) for linha in conn.execute("""
+        SELECT
+            p.ID,
+            cm.clube AS mandante,
+            cv.clube AS visitante,
+            p.mandante_placar,
+            p.visitante_placar,
+            p.data,
+            p.fase,
+            ed.ano,
+            est.estadio
+        FROM partidas p
+        JOIN clubes cm ON p.mandante_id = cm.ID
+        JOIN clubes cv ON p.visitante_id = cv.ID
+        JOIN edicoes ed ON p.edicao_id = ed.ID
+        LEFT JOIN estadios est ON p.estadio_id = est.ID
+        WHERE ed.ano = ?
+            AND p.mandante_placar IS NOT NULL
+            AND p.visitante_placar IS NOT NULL
+        ORDER BY p.data DESC
+        LIMIT 10
+    """, (ano,))]
+
+    # Top 5 histórico
+    colunas = ("clube", "pontos_total", "jogos_total", "vitorias_total")
+    top_historico = [dict(zip(colunas, linha)) for linha in conn.execute("""
+        WITH jogos_mandante AS (
+            SELECT
+                c.clube,
+                ed.ano,
+                p.mandante_placar AS gols_pro,
+                p.visitante_placar AS gols_sofrido,
+                CASE
+                    WHEN p.mandante_placar > p.visitante_placar THEN
+                        CASE WHEN ed.ano <= 1994 THEN 2 ELSE 3 END
+                    WHEN p.mandante_placar = p.visitante_placar THEN 1
+                    ELSE 0
+                END AS pontos,
+                CASE WHEN p.mandante_placar > p.visitante_placar THEN 1 ELSE 0 END AS vitorias
+            FROM partidas p
+            JOIN clubes c ON p.mandante_id = c.ID
+            JOIN edicoes ed ON p.edicao_id = ed.ID
+        ),
+        jogos_visitante AS (
+            SELECT
+                c.clube,
+                ed.ano,
+                p.visitante_placar AS gols_pro,
+                p.mandante_placar AS gols_sofrido,
+                CASE
+                    WHEN p.visitante_placar > p.mandante_placar THEN
+                        CASE WHEN ed.ano <= 1994 THEN 2 ELSE 3 END
+                    WHEN p.visitante_placar = p.mandante_placar THEN 1
+                    ELSE 0
+                END AS pontos,
+                CASE WHEN p.visitante_placar > p.mandante_placar THEN 1 ELSE 0 END AS vitorias
+            FROM partidas p
+            JOIN clubes c ON p.visitante_id = c.ID
+            JOIN edicoes ed ON p.edicao_id = ed.ID
+        ),
+        todos_jogos AS (
+            SELECT * FROM jogos_mandante
+            UNION ALL
+            SELECT * FROM jogos_visitante
+        )
+        SELECT
+            clube,
+            SUM(pontos) AS pontos_total,
+            COUNT(*) AS jogos_total,
+            SUM(vitorias) AS vitorias_total
+        FROM todos_jogos
+        GROUP BY clube
+        ORDER BY pontos_total DESC, vitorias_total DESC
+        LIMIT 5
+    """)]
+
+    # Estatísticas gerais
+    colunas = ("total_clubes", "total_partidas", "total_jogadores", "total_edicoes")
+    stats_gerais = dict(zip(colunas, conn.execute("""
+        SELECT
+            COUNT(DISTINCT c.ID) as total_clubes,
+            COUNT(DISTINCT p.ID) as total_partidas,
+            COUNT(DISTINCT j.ID) as total_jogadores,
+            COUNT(DISTINCT ed.ano) as total_edicoes
+        FROM clubes c
+        LEFT JOIN partidas p ON c.ID = p.mandante_id OR c.ID = p.visitante_id
+        LEFT JOIN jogadores_em_partida jp ON p.ID = jp.partida_id
+        LEFT JOIN jogadores j ON jp.jogador_id = j.ID
+        LEFT JOIN edicoes ed ON p.edicao_id = ed.ID
+    """).fetchone()))
+
+    return {
+        "ano_atual": ano,
+        "classificacao_atual": classificacao_atual,
+        "ultimos_jogos": ultimos_jogos,
+        "top_historico": top_historico,
+        "stats_gerais": stats_gerais,
+    }
+
+
+def carregar_snapshot(conn, nome=NOME_SNAPSHOT, versao=VERSAO_SNAPSHOT):
+    """
+    Conteúdo do snapshot gravado, ou None se ele não existe, é de outra
+    versão ou ficou velho (o banco mudou depois que ele foi gerado).
+    """
+    try:
+        linha = conn.execute(
+            "SELECT versao, impressao, conteudo FROM snapshots WHERE nome = ?", (nome,)).fetchone()
+    except sqlite3.OperationalError:
+        # Banco sem a tabela snapshots
+        return None
+    if linha is None or linha[0] != versao or linha[1] != impressao_banco(conn):
+        return None
+    return json.loads(linha[2])
+
+
+class GeradorSnapshotHomepage:
+    def __init__(self, conn):
+        """
+        Args:
+            conn: Conexão sqlite3 aberta (o commit fica a cargo do chamador)
+        """
+        self.conn = conn
+        self.conn.execute(SQL_CRIAR_TABELA)
+
+    def gerar(self, forcar=False):
+        """
+        Regrava o snapshot se o banco mudou desde o último (ou sempre, com
+        forcar=True). Retorna True se gravou.
+        """
+        if not forcar and carregar_snapshot(self.conn) is not None:
+            print("✅ Snapshot da homepage: sem alterações")
+            return False
+
+        impressao = impressao_banco(self.conn)
+        conteudo = montar_homepage(self.conn, ano_mais_recente(self.conn))
+        self.conn.execute("""
+            INSERT OR REPLACE INTO snapshots (nome, versao, impressao, conteudo, gerado_em)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (NOME_SNAPSHOT, VERSAO_SNAPSHOT, impressao,
+              json.dumps(conteudo, ensure_ascii=False)))
+        print(f"✅ Snapshot da homepage gravado (temporada {conteudo['ano_atual']})")
+        return True
+
+
+def atualizar_snapshot_homepage(conn, forcar=False):
+    """Atalho usado pelo migrador ao final da carga"""
+    return GeradorSnapshotHomepage(conn).gerar(forcar)
+
+
+# ============================================
+# EXEMPLO DE USO
+# ============================================
+#   python bd/snapshot_homepage.py              → regrava se o banco mudou
+#   python bd/snapshot_homepage.py --forcar     → regrava sempre
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera o snapshot da homepage do site")
+    parser.add_argument("--banco", default="bd/estruturado_bd_1971.db")
+    parser.add_argument("--forcar", action="store_true")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.banco)
+    try:
+        atualizar_snapshot_homepage(conn, args.forcar)
+        conn.commit()
+    finally:
+        conn.close()
@@ -0,0 +1,286 @@
+"""
+Benchmark do OGolScraperRelacional contra o oGol falso (mock_ogol.py).
+
+Sobe o servidor falso com as páginas de um ano do nosso banco (ou páginas
+gravadas do oGol), roda `executar` página a página do calendário como o
+__main__ do scraper faz, numa pasta de saída temporária, e mede:
+
+  - páginas baixadas por segundo e partidas por minuto (ponta a ponta)
+  - por tipo de página: tempo de rede, de parse (BeautifulSoup) e de
+    extração (o código do processar_*, sem rede, parse nem subpáginas)
+  - requisições evitadas pelo cache de URLs, por entidade
+  - 429/500 vistos pelo servidor (com --taxa-429 / --taxa-erro)
+
+Nada sai da máquina: dá para medir qualquer mudança de desempenho do
+scraper sem arriscar bloqueio no site real.
+
+Uso (de dentro de scraping/):
+    python benchmark_scraper.py
+    python benchmark_scraper.py --ano 1972 --latencia-ms 150 --jitter-ms 100
+    python benchmark_scraper.py --taxa-429 0.02 --taxa-erro 0.01 --saida bench.json
+    python benchmark_scraper.py --gravacoes fixtures_ogol
+"""
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import urllib.request
+from datetime import datetime
+from contextlib import redirect_stdout
+
+from bs4 import BeautifulSoup
+
+from scraping_jogadores_treinadores_estadios_v3 import OGolScraperRelacional
+from mock_ogol import ServidorOGolFalso, gerar_paginas, carregar_gravacoes, TIPOS_PAGINA, PARTIDAS_POR_PAGINA
+from telemetria_scraper import tipo_pagina
+
+# Entidades com cache de URL: tipo de página → chave em url_cache
+CACHES = {
+    "clube": "clubes",
+    "estadio": "estadios",
+    "jogador": "jogadores",
+    "treinador": "treinadores",
+    "arbitro": "arbitros",
+}
+
+
+class ScraperMedido(OGolScraperRelacional):
+    """
+    OGolScraperRelacional com cronômetros. Cada processar_* abre um quadro
+    numa pilha; o tempo de rede, de parse e dos processar_* chamados dentro
+    dele é descontado, sobrando só a extração daquele tipo de página.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.medidas = {tipo: {"paginas": 0, "rede": 0.0, "parse": 0.0, "extracao": 0.0, "chamadas": 0}
+                        for tipo in TIPOS_PAGINA + ("salvar_csvs",)}
+        self._pilha = []
+        super().__init__(*args, **kwargs)
+
+    def _descontar(self, segundos):
+        if self._pilha:
+            self._pilha[-1][1] += segundos
+
+    def _medir(self, tipo, funcao, *args, **kwargs):
+        self._pilha.append([tipo, 0.0])
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            total = time.perf_counter() - inicio
+            _, descontado = self._pilha.pop()
+            self.medidas[tipo]["extracao"] += total - descontado
+            self.medidas[tipo]["chamadas"] += 1
+            self._descontar(total)
+
+    # ---------- rede e parse ----------
+
+    def _baixar_html(self, url):
+        inicio = time.perf_counter()
+        html = super()._baixar_html(url)
+        segundos = time.perf_counter() - inicio
+        medida = self.medidas.get(tipo_pagina(url))
+        if medida is not None:
+            medida["paginas"] += 1
+            medida["rede"] += segundos
+        self._descontar(segundos)
+        return html
+
+    def _get_soup(self, url):
+        html = self._baixar_html(url)
+        inicio = time.perf_counter()
+        soup = BeautifulSoup(html, "html.parser")
+        segundos = time.perf_counter() - inicio
+        medida = self.medidas.get(tipo_pagina(url))
+        if medida is not None:
+            medida["parse"] += segundos
+        self._descontar(segundos)
+        return soup
+
+    # ---------- processadores ----------
+
+    def processar_clube(self, url_clube):
+        return self._medir("clube", super().processar_clube, url_clube)
+
+    def processar_estadio(self, url_estadio):
+        return self._medir("estadio", super().processar_estadio, url_estadio)
+
+    def processar_jogador(self, url_jogador):
+        return self._medir("jogador", super().processar_jogador, url_jogador)
+
+    def processar_treinador(self, url_treinador):
+        return self._medir("treinador", super().processar_treinador, url_treinador)
+
+    def processar_arbitro(self, url_arbitro):
+        return self._medir("arbitro", super().processar_arbitro, url_arbitro)
+
+    def processar_detalhes_partida(self, *args):
+        return self._medir("jogo", super().processar_detalhes_partida, *args)
+
+    def salvar_csvs(self):
+        return self._medir("salvar_csvs", super().salvar_csvs)
+
+    def executar(self, *args, **kwargs):
+        return self._medir("calendario", super().executar, *args, **kwargs)
+
+
+# ==================== EXECUÇÃO ====================
+
+def rodar(base_url, calendarios, edicao_id, delay, pasta, verboso=False):
+    """Roda o scraper em todas as páginas do calendário; retorna (scraper, segundos, erro)"""
+    scraper = None
+    erro = None
+    saida = sys.stdout if verboso else io.StringIO()
+    inicio = time.perf_counter()
+    with redirect_stdout(saida):
+        try:
+            for caminho in calendarios:
+                if scraper is None:
+                    scraper = ScraperMedido(base_url + caminho, base_url=base_url,
+                                            output_dir=pasta, delay=delay)
+                else:
+                    scraper.url_lista = base_url + caminho
+                # Como no __main__ do scraper: sem page_atual/page_maxima
+                scraper.executar(edicao_id=edicao_id)
+            scraper._salvar_cache_urls()
+        except Exception as e:
+            erro = str(e)
+    return scraper, time.perf_counter() - inicio, erro
+
+
+def resumir(scraper, segundos, estatisticas_servidor, erro):
+    medidas = scraper.medidas
+    telemetria = scraper.telemetria.fechar()
+    contadores = telemetria["contadores"]
+    paginas = sum(m["paginas"] for m in medidas.values())
+    partidas = medidas["jogo"]["chamadas"]
+
+    por_tipo = {}
+    for tipo, m in medidas.items():
+        if not m["paginas"] and not m["chamadas"]:
+            continue
+        n = m["paginas"] or m["chamadas"]
+        por_tipo[tipo] = {
+            "paginas": m["paginas"],
+            "chamadas": m["chamadas"],
+            "rede_ms_por_pagina": round(m["rede"] / n * 1000, 3),
+            "parse_ms_por_pagina": round(m["parse"] / n * 1000, 3),
+            "extracao_ms_por_pagina": round(m["extracao"] / n * 1000, 3),
+            "rede_s": round(m["rede"], 3),
+            "parse_s": round(m["parse"], 3),
+            "extracao_s": round(m["extracao"], 3),
+        }
+
+    # Acertos do url_cache vêm da telemetria do próprio scraper
+    cache = {}
+    for tipo, chave in CACHES.items():
+        acertos = contadores.get(f"cache.{chave}.sessao", 0) + contadores.get(f"cache.{chave}.persistido", 0)
+        cache[tipo] = {"chamadas": acertos + contadores.get(f"cache.{chave}.falta", 0), "acertos": acertos}
+
+    return {
+        "segundos": round(segundos, 3),
+        "paginas_baixadas": paginas,
+        "paginas_por_s": round(paginas / segundos, 2) if segundos else None,
+        "partidas": partidas,
+        "partidas_por_minuto": round(partidas / segundos * 60, 2) if segundos else None,
+        "erro": erro,
+        "por_tipo": por_tipo,
+        "cache": cache,
+        "requisicoes_evitadas": sum(c["acertos"] for c in cache.values()),
+        "servidor": estatisticas_servidor,
+        "telemetria": telemetria,
+    }
+
+
+def imprimir(resumo):
+    print(f"\n{'tipo':12} {'páginas':>8} {'rede ms':>9} {'parse ms':>9} {'extração ms':>12}   (média por página ou chamada)")
+    print("-" * 58)
+    for tipo, d in resumo["por_tipo"].items():
+        print(f"{tipo:12} {d['paginas']:>8} {d['rede_ms_por_pagina']:>9} "
+              f"{d['parse_ms_por_pagina']:>9} {d['extracao_ms_por_pagina']:>12}")
+
+    print(f"\n{'cache':12} {'chamadas':>9} {'evitadas':>9}")
+    for tipo, c in resumo["cache"].items():
+        print(f"{tipo:12} {c['chamadas']:>9} {c['acertos']:>9}")
+
+    respostas = {}
+    for estat in resumo["servidor"].values():
+        for status, n in estat["status"].items():
+            respostas[status] = respostas.get(status, 0) + n
+    print(f"\n🌐 Respostas do servidor: {dict(sorted(respostas.items()))}")
+    print(f"📄 {resumo['paginas_baixadas']} páginas em {resumo['segundos']}s "
+          f"→ {resumo['paginas_por_s']} páginas/s")
+    print(f"⚽ {resumo['partidas']} partidas → {resumo['partidas_por_minuto']} partidas/min")
+    print(f"♻️  {resumo['requisicoes_evitadas']} requisições evitadas pelo cache de URLs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do scraper contra o oGol falso")
+    parser.add_argument("--banco", default="../bd/estruturado_bd_1971.db")
+    parser.add_argument("--ano", type=int, default=1971)
+    parser.add_argument("--gravacoes", help="pasta com páginas gravadas (ver mock_ogol.py --salvar)")
+    parser.add_argument("--por-pagina", type=int, default=PARTIDAS_POR_PAGINA,
+                        help="partidas por página do calendário")
+    parser.add_argument("--paginas", type=int, help="limita o Nº de páginas do calendário")
+    parser.add_argument("--latencia-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--taxa-429", type=float, default=0)
+    parser.add_argument("--taxa-erro", type=float, default=0)
+    parser.add_argument("--delay", type=float, default=0.01,
+                        help="espera base do scraper entre retentativas (no site real é 45s)")
+    parser.add_argument("--semente", type=int, default=1971)
+    parser.add_argument("--saida", help="grava o resultado em JSON")
+    parser.add_argument("--verboso", action="store_true", help="mostra a saída do scraper")
+    args = parser.parse_args()
+
+    if args.gravacoes:
+        paginas = carregar_gravacoes(args.gravacoes)
+    else:
+        paginas = gerar_paginas(args.banco, args.ano, args.por_pagina)
+    calendarios = sorted((u for u in paginas if tipo_pagina(u) == "calendario"),
+                         key=lambda u: int(u.rsplit("page=", 1)[-1]) if "page=" in u else 0)
+    if args.paginas:
+        calendarios = calendarios[:args.paginas]
+    if not calendarios:
+        print("❌ Nenhuma página de calendário nas fixtures")
+        sys.exit(1)
+    edicao_id = int(calendarios[0].split("/")[3])
+    print(f"📄 {len(paginas)} páginas nas fixtures, {len(calendarios)} página(s) de calendário")
+
+    mock = ServidorOGolFalso(paginas, args.latencia_ms, args.jitter_ms,
+                             args.taxa_429, args.taxa_erro, args.semente)
+    base_url = mock.iniciar()
+    pasta = tempfile.mkdtemp(prefix="bench_scraper_")
+    try:
+        print(f"🚀 Rodando o scraper contra {base_url}...")
+        scraper, segundos, erro = rodar(base_url, calendarios, edicao_id, args.delay, pasta, args.verboso)
+        with urllib.request.urlopen(base_url + "/_estatisticas") as resposta:
+            estatisticas = json.load(resposta)
+    finally:
+        mock.parar()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    if scraper is None:
+        print(f"❌ O scraper não chegou a iniciar: {erro}")
+        sys.exit(1)
+
+    resumo = resumir(scraper, segundos, estatisticas, erro)
+    imprimir(resumo)
+    if erro:
+        print(f"⚠️  Execução interrompida: {erro}")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump({
+                "data": datetime.now().isoformat(timespec="seconds"),
+                "parametros": {k: v for k, v in vars(args).items() if k not in ("saida", "verboso")},
+                **resumo,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"✅ Resultados gravados em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import os
+import csv
+import sqlite3
+import argparse
+
+
+# ============================================
+# Cache persistente URL → ID de entidade
+# ============================================
+# Substitui o cache_urls.csv, que era lido inteiro na abertura e reescrito
+# inteiro só no fim da execução (uma queda perdia tudo o que a sessão tinha
+# aprendido). Agora é um SQLite ao lado dos CSVs:
+#   - cada mapeamento novo é gravado na hora (autocommit)
+#   - nada é carregado de início: consulta pela chave primária (tipo, url)
+#     na primeira vez, e o que já foi visto fica num dicionário em memória
+#   - WAL + busy_timeout: vários processos do scraper podem usar o mesmo
+#     arquivo ao mesmo tempo; INSERT OR IGNORE faz o primeiro a gravar vencer
+#
+# Na primeira abertura, se existir um cache_urls.csv antigo na mesma pasta,
+# ele é importado uma única vez.
+#
+# A interface imita o dicionário antigo ({tipo: {url: id}}), então o
+# scraper continua usando `url in cache['clubes']`, `cache['clubes'][url]`
+# e `cache['clubes'][url] = id`.
+
+ARQUIVO_CACHE = "cache_urls.db"
+ARQUIVO_CSV_ANTIGO = "cache_urls.csv"
+TIPOS = ("jogadores", "treinadores", "arbitros", "clubes", "estadios")
+
+SQL_CRIAR_TABELA = """
+    CREATE TABLE IF NOT EXISTS cache_urls (
+        tipo TEXT NOT NULL,
+        url TEXT NOT NULL,
+        entidade_id INTEGER NOT NULL,
+        PRIMARY KEY (tipo, url)
+    ) WITHOUT ROWID
+"""
+
+
+class TabelaCache:
+    """Visão de um tipo do cache ('clubes', 'jogadores', ...) com cara de dict"""
+
+    def __init__(self, cache, tipo):
+        self.cache = cache
+        self.tipo = tipo
+        self._memoria = {}
+        self.novas = set()     # URLs aprendidas nesta execução
+
+    def get(self, url, padrao=None):
+        entidade_id = self._memoria.get(url)
+        if entidade_id is None:
+            linha = self.cache.conn.execute(
+                "SELECT entidade_id FROM cache_urls WHERE tipo = ? AND url = ?", (self.tipo, url)).fetchone()
+            if linha is None:
+                return padrao
+            entidade_id = self._memoria[url] = linha[0]
+        return entidade_id
+
+    def __contains__(self, url):
+        return self.get(url) is not None
+
+    def __getitem__(self, url):
+        entidade_id = self.get(url)
+        if entidade_id is None:
+            raise KeyError(url)
+        return entidade_id
+
+    def __setitem__(self, url, entidade_id):
+        if self._memoria.get(url) == entidade_id:
+            return
+        self.cache.conn.execute(
+            "INSERT OR IGNORE INTO cache_urls (tipo, url, entidade_id) VALUES (?, ?, ?)",
+            (self.tipo, url, int(entidade_id)))
+        self._memoria[url] = entidade_id
+        self.novas.add(url)
+
+    def __len__(self):
+        return self.cache.conn.execute(
+            "SELECT COUNT(*) FROM cache_urls WHERE tipo = ?", (self.tipo,)).fetchone()[0]
+
+    def items(self):
+        return self.cache.conn.execute(
+            "SELECT url, entidade_id FROM cache_urls WHERE tipo = ? ORDER BY url", (self.tipo,)).fetchall()
+
+
+class CacheUrls:
+    def __init__(self, caminho):
+        """
+        Args:
+            caminho: Arquivo .db do cache (criado se não existir)
+        """
+        self.caminho = caminho
+        novo = not os.path.exists(caminho)
+        self.conn = sqlite3.connect(caminho, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(SQL_CRIAR_TABELA)
+        self._tabelas = {tipo: TabelaCache(self, tipo) for tipo in TIPOS}
+
+        csv_antigo = os.path.join(os.path.dirname(caminho), ARQUIVO_CSV_ANTIGO)
+        if novo and os.path.exists(csv_antigo):
+            n = self.importar_csv(csv_antigo)
+            print(f"   ✓ {n} URLs importadas de {ARQUIVO_CSV_ANTIGO} para {os.path.basename(caminho)}")
+
+    def __getitem__(self, tipo):
+        if tipo not in self._tabelas:
+            self._tabelas[tipo] = TabelaCache(self, tipo)
+        return self._tabelas[tipo]
+
+    def tipos(self):
+        gravados = [t for (t,) in self.conn.execute("SELECT DISTINCT tipo FROM cache_urls")]
+        return list(dict.fromkeys(list(self._tabelas) + gravados))
+
+    def items(self):
+        return [(tipo, self[tipo]) for tipo in self.tipos()]
+
+    def values(self):
+        return [self[tipo] for tipo in self.tipos()]
+
+    def total(self):
+        return self.conn.execute("SELECT COUNT(*) FROM cache_urls").fetchone()[0]
+
+    def aprendidas(self):
+        """Quantas URLs novas esta execução gravou"""
+        return sum(len(tabela.novas) for tabela in self._tabelas.values())
+
+    # ---------- CSV ----------
+
+    def importar_csv(self, caminho_csv):
+        """Importa um cache_urls.csv (tipo,url,entity_id) numa transação só"""
+        linhas = []
+        with open(caminho_csv, "r", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                tipo, url, entidade_id = row.get("tipo"), row.get("url"), row.get("entity_id")
+                if not (tipo and url and entidade_id):
+                    continue
+                try:
+                    linhas.append((tipo, url, int(entidade_id)))
+                except ValueError:
+                    continue
+        self.conn.execute("BEGIN")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO cache_urls (tipo, url, entidade_id) VALUES (?, ?, ?)", linhas)
+        self.conn.execute("COMMIT")
+        return len(linhas)
+
+    def exportar_csv(self, caminho_csv):
+        """Grava o cache no formato antigo (tipo,url,entity_id)"""
+        with open(caminho_csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["tipo", "url", "entity_id"])
+            writer.writerows(self.conn.execute(
+                "SELECT tipo, url, entidade_id FROM cache_urls ORDER BY tipo, url"))
+        return self.total()
+
+    def fechar(self):
+        if self.conn is not None:
+            self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            self.conn.close()
+            self.conn = None
+
+
+# ============================================
+# EXEMPLO DE USO
+# ============================================
+#   python cache_urls.py --pasta ../output_csvs                  → contagem por tipo
+#   python cache_urls.py --pasta ../output_csvs --exportar x.csv → formato antigo
+#   python cache_urls.py --pasta ../output_csvs --importar x.csv
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache persistente URL → entidade do scraper")
+    parser.add_argument("--pasta", default="output_csvs", help="output_dir do scraper")
+    parser.add_argument("--importar", help="importa um CSV tipo,url,entity_id")
+    parser.add_argument("--exportar", help="exporta para CSV tipo,url,entity_id")
+    args = parser.parse_args()
+
+    cache = CacheUrls(os.path.join(args.pasta, ARQUIVO_CACHE))
+    try:
+        if args.importar:
+            print(f"✅ {cache.importar_csv(args.importar)} URLs importadas")
+        if args.exportar:
+            print(f"✅ {cache.exportar_csv(args.exportar)} URLs exportadas para {args.exportar}")
+        for tipo, tabela in cache.items():
+            print(f"   {tipo:12} {len(tabela):>7}")
+        print(f"📊 Total: {cache.total()} URLs")
+    finally:
+        cache.fechar()
@@ -0,0 +1,315 @@
+import os
+import csv
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from contextlib import redirect_stdout, redirect_stderr
+
+from scraping_jogadores_treinadores_estadios_v3 import OGolScraperRelacional
+from registro_central import RegistroCentral
+from cache_urls import ARQUIVO_CACHE
+
+
+# ============================================
+# Scraping em vários processos
+# ============================================
+# O __main__ do scraper percorre as páginas do calendário de UMA edição, uma
+# de cada vez. Aqui as páginas de várias edições viram tarefas numa fila
+# (registro_central.db) e N processos pegam tarefas até a fila esvaziar:
+#
+#   - cada processo grava num shard próprio (<pasta>/shards/w<k>/*.csv),
+#     então ninguém disputa os mesmos arquivos
+#   - IDs e deduplicação de entidades vêm do RegistroCentral: o mesmo
+#     jogador visto por dois processos recebe um ID só, e nenhum ID de
+#     partida ou evento se repete entre shards
+#   - o cache de URLs (cache_urls.db) é o mesmo para todos
+#   - o intervalo entre requisições é global: 4 processos com --intervalo 2
+#     fazem no máximo 1 requisição a cada 2s, somados
+#
+# No fim, mesclar_shards junta os shards nos CSVs de <pasta>. A mescla é
+# idempotente (pode rodar de novo sem duplicar nada), e os shards ficam lá
+# até serem apagados à mão.
+#
+# Uma execução interrompida continua de onde parou: tarefas concluídas não
+# são refeitas; as que estavam em andamento ou terminaram com erro voltam
+# para a fila.
+
+ARQUIVO_REGISTRO = "registro_central.db"
+PASTA_SHARDS = "shards"
+INTERVALO_PROGRESSO = 10
+
+# Arquivo → colunas (na ordem do salvar_csvs do scraper)
+CAMPOS_ENTIDADES = {
+    'locais.csv': ['id', 'cidade', 'uf', 'estado', 'regiao', 'pais'],
+    'clubes.csv': ['id', 'clube', 'apelido', 'local_id', 'fundacao', 'ativo'],
+    'estadios.csv': ['id', 'estadio', 'capacidade', 'local_id', 'inauguracao', 'ativo'],
+    'jogadores.csv': ['id', 'nome', 'apelido', 'nascimento', 'falecimento', 'nacionalidade', 'naturalidade',
+                      'altura', 'peso', 'posicao', 'pe_preferido', 'aposentado'],
+    'treinadores.csv': ['id', 'nome', 'apelido', 'nascimento', 'falecimento', 'nacionalidade', 'naturalidade',
+                        'aposentado'],
+    'arbitros.csv': ['id', 'nome', 'apelido', 'nascimento', 'falecimento', 'nacionalidade', 'naturalidade',
+                     'aposentado'],
+}
+
+CAMPOS_PARTIDAS = ['id', 'edicao_id', 'campeonato_id', 'data', 'hora', 'fase', 'rodada', 'estadio_id',
+                   'mandante_id', 'visitante_id', 'mandante_placar', 'visitante_placar', 'mandante_penalti',
+                   'visitante_penalti', 'prorrogacao', 'publico']
+CHAVE_PARTIDA = ('edicao_id', 'data', 'mandante_id', 'visitante_id')
+
+# Relacionais: colunas e chave de deduplicação
+CAMPOS_RELACIONAIS = {
+    'jogadores_em_partida.csv': (['partida_id', 'jogador_id', 'clube_id', 'titular', 'posicao_jogada',
+                                  'numero_camisa'], ('partida_id', 'jogador_id')),
+    'treinadores_em_partida.csv': (['partida_id', 'treinador_id', 'clube_id', 'tipo'],
+                                   ('partida_id', 'treinador_id', 'clube_id')),
+    'arbitros_em_partida.csv': (['partida_id', 'arbitro_id'], ('partida_id', 'arbitro_id')),
+    'eventos_partida.csv': (['id', 'partida_id', 'jogador_id', 'clube_id', 'tipo_evento', 'tipo_gol', 'minuto'],
+                            ('partida_id', 'jogador_id', 'clube_id', 'tipo_evento', 'tipo_gol', 'minuto')),
+}
+
+
+# ==================== TAREFAS ====================
+
+def carregar_config(caminho):
+    """
+    JSON com as edições a raspar:
+        [{"edicao_id": 45, "url": "https://www.ogol.com.br/edicao/.../calendario?...&page=",
+          "paginas": [1, 8]}, ...]
+    """
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def montar_tarefas(edicoes):
+    tarefas = []
+    for edicao in edicoes:
+        inicio, fim = edicao["paginas"]
+        for pagina in range(int(inicio), int(fim) + 1):
+            tarefas.append((int(edicao["edicao_id"]), pagina, edicao["url"] + str(pagina)))
+    return tarefas
+
+
+# ==================== TRABALHADOR ====================
+
+def trabalhador(numero, pasta, caminho_registro, intervalo, delay, base_url):
+    """Processo filho: pega tarefas da fila até ela esvaziar"""
+    nome = f"w{numero}"
+    pasta_shard = os.path.join(pasta, PASTA_SHARDS, nome)
+    os.makedirs(pasta_shard, exist_ok=True)
+
+    with open(os.path.join(pasta_shard, "scraper.log"), "a", encoding="utf-8") as log, \
+            redirect_stdout(log), redirect_stderr(log):
+        registro = RegistroCentral(caminho_registro, intervalo)
+        scraper = OGolScraperRelacional(None, base_url=base_url, output_dir=pasta_shard, delay=delay,
+                                        registro=registro, cache_urls=os.path.join(pasta, ARQUIVO_CACHE))
+        try:
+            while True:
+                tarefa = registro.pegar_tarefa(nome)
+                if tarefa is None:
+                    break
+                edicao_id, pagina, url = tarefa
+                print(f"\n{'='*70}\n📄 [{nome}] Edição {edicao_id}, página {pagina}\n{'='*70}")
+
+                # O checkpoint do scraper é por página; cada tarefa começa do zero
+                if os.path.exists(scraper.checkpoint_path):
+                    os.remove(scraper.checkpoint_path)
+                scraper.url_lista = url
+                try:
+                    # Como no __main__ do scraper: sem page_atual/page_maxima
+                    scraper.executar(edicao_id=edicao_id)
+                except Exception as e:
+                    print(f"❌ [{nome}] Erro na edição {edicao_id}, página {pagina}: {e}")
+                    registro.falhar_tarefa(edicao_id, pagina, e)
+                    if "BLOQUEIO" in str(e):
+                        # Outros processos vão bater no mesmo 429; melhor parar este
+                        break
+                    continue
+                registro.concluir_tarefa(edicao_id, pagina)
+        finally:
+            scraper._salvar_cache_urls()
+            scraper.url_cache.fechar()
+            scraper.telemetria.imprimir_resumo(scraper.telemetria.fechar())
+            registro.fechar()
+
+
+# ==================== MESCLA ====================
+
+def _ler_csv(caminho):
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, "r", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _gravar_csv(caminho, campos, linhas):
+    """Grava num temporário e troca de uma vez (quem lê nunca vê CSV pela metade)"""
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=campos, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(linhas)
+    os.replace(temporario, caminho)
+
+
+def _ordenar_por_id(linhas):
+    return sorted(linhas, key=lambda r: int(r['id']) if str(r.get('id', '')).isdigit() else 0)
+
+
+def mesclar_shards(pasta):
+    """Junta <pasta>/shards/*/ nos CSVs de <pasta>; retorna {arquivo: linhas}"""
+    raiz_shards = os.path.join(pasta, PASTA_SHARDS)
+    if not os.path.isdir(raiz_shards):
+        return {}
+    shards = sorted(os.path.join(raiz_shards, d) for d in os.listdir(raiz_shards)
+                    if os.path.isdir(os.path.join(raiz_shards, d)))
+    pastas = [pasta] + shards
+    totais = {}
+
+    # Entidades: o ID é único no registro central; a mesma entidade pode
+    # aparecer em vários shards (reescritas inteiras), então vence a primeira
+    # e campos vazios são completados pelas outras
+    for arquivo, campos in CAMPOS_ENTIDADES.items():
+        por_id = {}
+        for origem in pastas:
+            for linha in _ler_csv(os.path.join(origem, arquivo)):
+                atual = por_id.setdefault(linha['id'], linha)
+                for campo in campos:
+                    if not atual.get(campo) and linha.get(campo):
+                        atual[campo] = linha[campo]
+        if por_id:
+            _gravar_csv(os.path.join(pasta, arquivo), campos, _ordenar_por_id(por_id.values()))
+            totais[arquivo] = len(por_id)
+
+    # Partidas: a mesma página raspada duas vezes (tarefa repetida depois de
+    # uma queda) gera a mesma partida com outro ID; fica a de menor ID
+    por_chave = {}
+    descartadas = set()
+    for origem in pastas:
+        for linha in _ler_csv(os.path.join(origem, 'partidas.csv')):
+            chave = tuple(linha.get(c, '') for c in CHAVE_PARTIDA)
+            atual = por_chave.get(chave)
+            if atual is None:
+                por_chave[chave] = linha
+            elif int(linha['id']) < int(atual['id']):
+                descartadas.add(atual['id'])
+                por_chave[chave] = linha
+            elif linha['id'] != atual['id']:
+                descartadas.add(linha['id'])
+    if por_chave:
+        _gravar_csv(os.path.join(pasta, 'partidas.csv'), CAMPOS_PARTIDAS, _ordenar_por_id(por_chave.values()))
+        totais['partidas.csv'] = len(por_chave)
+
+    # Relacionais: sem as linhas das partidas descartadas, sem repetições
+    for arquivo, (campos, chave_campos) in CAMPOS_RELACIONAIS.items():
+        vistas = {}
+        for origem in pastas:
+            for linha in _ler_csv(os.path.join(origem, arquivo)):
+                if linha.get('partida_id') in descartadas:
+                    continue
+                vistas.setdefault(tuple(linha.get(c, '') for c in chave_campos), linha)
+        if vistas:
+            _gravar_csv(os.path.join(pasta, arquivo), campos, list(vistas.values()))
+            totais[arquivo] = len(vistas)
+
+    if descartadas:
+        print(f"   ♻️ {len(descartadas)} partidas repetidas entre shards descartadas")
+    return totais
+
+
+# ==================== COORDENADOR ====================
+
+def coordenar(edicoes, pasta, processos=4, intervalo=2.0, delay=45, base_url="https://www.ogol.com.br",
+              caminho_registro=None, mesclar=True):
+    """Enfileira as páginas, roda os processos e mescla os shards; retorna o resumo das tarefas"""
+    os.makedirs(pasta, exist_ok=True)
+    caminho_registro = caminho_registro or os.path.join(pasta, ARQUIVO_REGISTRO)
+
+    registro = RegistroCentral(caminho_registro, intervalo)
+    try:
+        # IDs e chaves do que já está nos CSVs de destino
+        print("📥 Semeando o registro central com os CSVs existentes...")
+        with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+            base = OGolScraperRelacional(None, base_url=base_url, output_dir=pasta, arquivo_telemetria=None)
+        registro.semear(base)
+        base.url_cache.fechar()
+
+        registro.adicionar_tarefas(montar_tarefas(edicoes))
+        reabertas = registro.reabrir_interrompidas()
+        if reabertas:
+            print(f"   ↩️ {reabertas} tarefas interrompidas ou com erro voltaram para a fila")
+        print(f"📋 Tarefas: {registro.resumo_tarefas()}")
+
+        print(f"🚀 {processos} processos, 1 requisição a cada {intervalo}s no total")
+        filhos = [multiprocessing.Process(target=trabalhador,
+                                          args=(k, pasta, caminho_registro, intervalo, delay, base_url))
+                  for k in range(1, processos + 1)]
+        for filho in filhos:
+            filho.start()
+
+        inicio = time.time()
+        while any(filho.is_alive() for filho in filhos):
+            for filho in filhos:
+                filho.join(timeout=INTERVALO_PROGRESSO / len(filhos))
+            estados = registro.resumo_tarefas()
+            print(f"⏱️ {int(time.time() - inicio)}s · {estados.get('concluida', 0)} concluídas · "
+                  f"{estados.get('em_andamento', 0)} em andamento · {estados.get('pendente', 0)} pendentes · "
+                  f"{estados.get('erro', 0)} com erro")
+
+        for edicao_id, pagina, erro in registro.tarefas_com_erro():
+            print(f"   ⚠️ Edição {edicao_id}, página {pagina}: {erro}")
+
+        if mesclar:
+            print("🔀 Mesclando shards...")
+            for arquivo, n in mesclar_shards(pasta).items():
+                print(f"   💾 {arquivo}: {n} linhas")
+        return registro.resumo_tarefas()
+    finally:
+        registro.fechar()
+
+
+# ============================================
+# EXEMPLO DE USO
+# ============================================
+#   python coordenador_scraping.py --config edicoes.json --processos 4 --intervalo 2
+#   python coordenador_scraping.py --edicao 45 --paginas 1-8 \
+#       --url "https://www.ogol.com.br/edicao/campeonato-brasileiro-2015/79735/calendario?fase_in=78272&equipa=0&estado=1&filtro=&op=calendario&page="
+#   python coordenador_scraping.py --pasta ../output_csvs --so-mesclar
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scraping do oGol em vários processos com registro central de IDs")
+    parser.add_argument("--config", help="JSON com [{edicao_id, url, paginas: [inicio, fim]}]")
+    parser.add_argument("--edicao", type=int, help="edicao_id (sem --config)")
+    parser.add_argument("--url", help="URL do calendário terminando em 'page=' (sem --config)")
+    parser.add_argument("--paginas", default="1-1", help="intervalo de páginas, ex.: 3-8 (sem --config)")
+    parser.add_argument("--pasta", default="output_csvs", help="output_dir final do scraper")
+    parser.add_argument("--processos", type=int, default=4)
+    parser.add_argument("--intervalo", type=float, default=2.0,
+                        help="segundos entre duas requisições, somando todos os processos")
+    parser.add_argument("--delay", type=float, default=45, help="espera base do scraper entre retentativas")
+    parser.add_argument("--base-url", default="https://www.ogol.com.br")
+    parser.add_argument("--registro", help=f"arquivo do registro central (padrão: <pasta>/{ARQUIVO_REGISTRO})")
+    parser.add_argument("--sem-mesclar", action="store_true", help="deixa os shards sem juntar")
+    parser.add_argument("--so-mesclar", action="store_true", help="só junta os shards já existentes")
+    args = parser.parse_args()
+
+    if args.so_mesclar:
+        for arquivo, n in mesclar_shards(args.pasta).items():
+            print(f"💾 {arquivo}: {n} linhas")
+        sys.exit(0)
+
+    if args.config:
+        edicoes = carregar_config(args.config)
+    elif args.edicao and args.url:
+        inicio, _, fim = args.paginas.partition("-")
+        edicoes = [{"edicao_id": args.edicao, "url": args.url, "paginas": [int(inicio), int(fim or inicio)]}]
+    else:
+        parser.error("informe --config ou --edicao e --url")
+
+    estados = coordenar(edicoes, args.pasta, args.processos, args.intervalo, args.delay, args.base_url,
+                        args.registro, mesclar=not args.sem_mesclar)
+    if estados.get("erro"):
+        print(f"⚠️ {estados['erro']} tarefas terminaram com erro; rode de novo para tentar só elas")
+        sys.exit(1)
+    print("✅ Scraping concluído")
@@ -0,0 +1,480 @@
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import threading
+from html import escape
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bd"))
+from referencias import slugify
+from telemetria_scraper import tipo_pagina
+
+
+# ============================================
+# Servidor oGol falso (local)
+# ============================================
+# Serve páginas com a mesma marcação que o OGolScraperRelacional lê no oGol
+# (calendário, jogo, clube, estádio, jogador, treinador, árbitro), montadas a
+# partir do nosso próprio banco. Assim dá para rodar o scraper inteiro sem
+# tocar no site de verdade e sem arriscar bloqueio por 429.
+#
+# Páginas gravadas do oGol podem substituir as geradas: uma pasta com
+# indice.json ({"/caminho?page=N": "arquivo.html"}) passada em --gravacoes.
+# --salvar grava as páginas geradas nesse mesmo formato.
+#
+# Para simular o site real:
+#   latencia_ms / jitter_ms  → atraso de cada resposta
+#   taxa_429                 → fração de respostas "429 Too Many Requests"
+#   taxa_erro                → fração de respostas "500"
+# Contagens por tipo de página ficam em /_estatisticas (JSON).
+
+PARTIDAS_POR_PAGINA = 50
+
+TIPOS_PAGINA = ("calendario", "jogo", "clube", "estadio", "jogador", "treinador", "arbitro")
+
+
+def chave_url(url):
+    """Caminho + página do calendário; os demais parâmetros são ignorados"""
+    partes = urlsplit(url)
+    pagina = parse_qs(partes.query).get("page")
+    return partes.path + (f"?page={pagina[0]}" if pagina else "")
+
+
+def url_calendario(ano, edicao_id, pagina):
+    return f"/edicao/campeonato-brasileiro-{ano}/{edicao_id}/calendario?page={pagina}"
+
+
+# ==================== PÁGINAS ====================
+
+def _linha_dado(rotulo, valor):
+    if valor in (None, "", 0):
+        return ""
+    return (f'<div class="card-data__row"><span class="card-data__label">{escape(rotulo)}</span>'
+            f'<span class="card-data__value">{escape(str(valor))}</span></div>')
+
+
+def _pagina(titulo, corpo):
+    return (f'<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8">'
+            f'<title>{escape(titulo)} - oGol</title></head><body>'
+            f'<div id="page_header"><a href="/">oGol</a></div>{corpo}</body></html>')
+
+
+def _cidade(local):
+    if not local or not local.get("cidade"):
+        return None
+    return f"{local['cidade']} ({local['UF']})" if local.get("UF") else local["cidade"]
+
+
+def _bio(titulo, linhas):
+    return _pagina(titulo, f'<div class="card-data bio">{"".join(linhas)}</div>')
+
+
+class GeradorPaginas:
+    def __init__(self, conn, por_pagina=PARTIDAS_POR_PAGINA):
+        """
+        Monta, a partir do banco, as páginas que o scraper visita.
+
+        Args:
+            conn: Conexão sqlite3 com o banco estruturado
+            por_pagina: Partidas por página do calendário
+        """
+        self.conn = conn
+        self.por_pagina = por_pagina
+        self.conn.row_factory = sqlite3.Row
+
+        def tabela(sql):
+            return {linha["ID"]: dict(linha) for linha in self.conn.execute(sql)}
+
+        self.locais = tabela("SELECT * FROM locais")
+        self.clubes = tabela("SELECT * FROM clubes")
+        self.estadios = tabela("SELECT * FROM estadios")
+        self.jogadores = tabela("SELECT * FROM jogadores")
+        self.treinadores = tabela("SELECT * FROM treinadores")
+        self.arbitros = tabela("SELECT * FROM arbitros")
+
+    # ---------- URLs ----------
+
+    def url_clube(self, clube_id):
+        return f"/equipe/{slugify(self.clubes[clube_id]['clube'])}/{clube_id}"
+
+    def url_estadio(self, estadio_id):
+        return f"/estadio/{slugify(self.estadios[estadio_id]['estadio'])}/{estadio_id}"
+
+    def _url_pessoa(self, prefixo, registro):
+        return f"/{prefixo}/{slugify(registro['apelido'] or registro['nome'])}/{registro['ID']}"
+
+    def url_jogo(self, partida):
+        dia, mes, ano = (partida["data"] or "01/01/1900").split("/")
+        mandante = slugify(self.clubes[partida["mandante_id"]]["clube"])
+        visitante = slugify(self.clubes[partida["visitante_id"]]["clube"])
+        return f"/jogo/{ano}-{mes}-{dia}-{mandante}-{visitante}/{partida['ID']}"
+
+    # ---------- entidades ----------
+
+    def pagina_clube(self, clube):
+        local = self.locais.get(clube["local_id"])
+        linhas = [_linha_dado("Nome", clube["clube"]), _linha_dado("Apelidos", clube["apelido"]),
+                  _linha_dado("Ano de Fundação", clube["fundacao"]), _linha_dado("Cidade", _cidade(local))]
+        return _pagina(clube["clube"], f'<div class="zz-tpl-rb">{"".join(linhas)}</div>')
+
+    def pagina_estadio(self, estadio):
+        local = self.locais.get(estadio["local_id"])
+        capacidade = f"{estadio['capacidade']:,}".replace(",", ".") if estadio["capacidade"] else None
+        linhas = [_linha_dado("Nome", estadio["estadio"]), _linha_dado("Cidade", _cidade(local)),
+                  _linha_dado("Ano de Inauguração", estadio["inauguracao"]),
+                  _linha_dado("Lotação", capacidade)]
+        return _pagina(estadio["estadio"], f'<div class="zz-tpl-rb">{"".join(linhas)}</div>')
+
+    def pagina_jogador(self, jogador):
+        altura_peso = None
+        if jogador["altura"] and jogador["peso"]:
+            altura_peso = f"{jogador['altura']} cm / {jogador['peso']} kg"
+        return _bio(jogador["nome"], [
+            _linha_dado("Nome", jogador["nome"]),
+            _linha_dado("Data de Nascimento", jogador["nascimento"]),
+            _linha_dado("Nacionalidade", jogador["nacionalidade"]),
+            _linha_dado("País de Nascimento (Naturalidade)", jogador["naturalidade"]),
+            _linha_dado("Posição", jogador["posicao"]),
+            _linha_dado("Pé preferencial", jogador["pe_preferido"]),
+            _linha_dado("Altura / Peso", altura_peso),
+            _linha_dado("Situação", jogador["falecimento"] and f"Falecido ({jogador['falecimento']})"
+                        or ("Aposentado" if jogador["aposentado"] else None)),
+        ])
+
+    def pagina_pessoa(self, pessoa):
+        """Treinador ou árbitro (mesmo layout)"""
+        return _bio(pessoa["nome"], [
+            _linha_dado("Nome", pessoa["nome"]),
+            _linha_dado("Data de Nascimento", pessoa["nascimento"]),
+            _linha_dado("Nacionalidade", pessoa["nacionalidade"]),
+            _linha_dado("Naturalidade", pessoa["naturalidade"]),
+            _linha_dado("Situação", pessoa["falecimento"] and f"Falecido ({pessoa['falecimento']})"
+                        or ("Aposentado" if pessoa["aposentado"] else None)),
+        ])
+
+    # ---------- jogo ----------
+
+    @staticmethod
+    def _evento_html(evento):
+        minuto = f"{evento['minuto']}'" if evento["minuto"] is not None else ""
+        tipo, tipo_gol = evento["tipo_evento"], evento["tipo_gol"]
+        if tipo == "Gol":
+            if tipo_gol == "Penalti":
+                minuto += " (pen.)"
+            elif tipo_gol == "Gol Contra":
+                minuto += " (g.c.)"
+            span = '<span class="icn_zerozero" title="Gol">⚽</span>'
+        elif tipo == "Assistência":
+            span = '<span class="icn_zerozero">B</span>'
+        elif tipo == "Cartão Amarelo":
+            span = '<span class="icn_zerozero yellow" title="Cartão amarelo">R</span>'
+        elif tipo == "Segundo Amarelo":
+            span = '<span class="icn_zerozero yellow">S</span>'
+        elif tipo == "Cartão Vermelho":
+            span = '<span class="icn_zerozero red" title="Cartão vermelho">R</span>'
+        elif tipo == "Entrou":
+            span = '<span class="icn_zerozero" title="Entrou">7</span>'
+        elif tipo == "Substituição":
+            span = '<span class="icn_zerozero" title="Saiu">8</span>'
+        else:
+            return ""
+        return f"{span}<div>{escape(minuto)}</div>"
+
+    def _jogador_html(self, escalado, eventos):
+        jogador = self.jogadores.get(escalado["jogador_id"])
+        if not jogador:
+            return ""
+        numero = escalado["numero_camisa"] if escalado["numero_camisa"] is not None else ""
+        eventos_html = "".join(self._evento_html(e) for e in eventos)
+        return (f'<div class="player"><div class="number">{numero}</div>'
+                f'<div class="name"><a href="{self._url_pessoa("jogador", jogador)}">'
+                f'{escape(jogador["apelido"] or jogador["nome"])}</a></div>'
+                f'<div class="events">{eventos_html}</div></div>')
+
+    def pagina_jogo(self, partida, escalacoes, eventos, treinadores, arbitro_id):
+        mandante = self.clubes[partida["mandante_id"]]["clube"]
+        visitante = self.clubes[partida["visitante_id"]]["clube"]
+
+        info = [_linha_dado("Data", partida["data"])]
+        estadio = self.estadios.get(partida["estadio_id"])
+        if estadio:
+            info.append(f'<div class="card-data__row"><span class="card-data__label">Estádio</span>'
+                        f'<span class="card-data__value"><a href="{self.url_estadio(estadio["ID"])}">'
+                        f'{escape(estadio["estadio"])}</a></span></div>')
+        arbitro = self.arbitros.get(arbitro_id)
+        if arbitro:
+            info.append(f'<div class="card-data__row"><span class="card-data__label">Árbitro</span>'
+                        f'<span class="card-data__value"><a href="{self._url_pessoa("arbitro", arbitro)}">'
+                        f'{escape(arbitro["nome"])}</a></span></div>')
+        if partida["publico"]:
+            info.append(_linha_dado("Público", f"{partida['publico']:,}".replace(",", ".")))
+
+        linhas = []
+        for titular in (1, 0):
+            colunas = []
+            for clube_id in (partida["mandante_id"], partida["visitante_id"]):
+                jogadores = "".join(
+                    self._jogador_html(e, eventos.get((e["jogador_id"], clube_id), []))
+                    for e in escalacoes if e["clube_id"] == clube_id and bool(e["titular"]) == bool(titular))
+                colunas.append(f'<div class="zz-tpl-col is-50">{jogadores}</div>')
+            linhas.append(f'<div class="zz-tpl-row game_report">{"".join(colunas)}</div>')
+
+        colunas = []
+        for clube_id in (partida["mandante_id"], partida["visitante_id"]):
+            treinador = self.treinadores.get(treinadores.get(clube_id))
+            link = (f'<a href="{self._url_pessoa("treinador", treinador)}">{escape(treinador["nome"])}</a>'
+                    if treinador else "")
+            colunas.append(f'<div class="zz-tpl-col is-50">{link}</div>')
+        linhas.append(f'<div class="zz-tpl-row game_report">{"".join(colunas)}</div>')
+
+        placar = f"{partida['mandante_placar']}-{partida['visitante_placar']}"
+        return _pagina(f"{mandante} {placar} {visitante}", (
+            f'<div class="card-data"><h2 class="card-data__title">Informação do jogo</h2>'
+            f'{"".join(info)}</div>'
+            f'<div id="game_report">{"".join(linhas)}</div>'))
+
+    # ---------- calendário ----------
+
+    def pagina_calendario(self, partidas):
+        linhas = []
+        for p in partidas:
+            if p["mandante_placar"] is None or p["visitante_placar"] is None:
+                placar = "vs"
+            else:
+                placar = f"{p['mandante_placar']}-{p['visitante_placar']}"
+            mandante = self.clubes[p["mandante_id"]]["clube"]
+            visitante = self.clubes[p["visitante_id"]]["clube"]
+            linhas.append(
+                f'<tr><td>{p["rodada"] or ""}</td><td>{escape(p["data"] or "")}</td>'
+                f'<td>{escape(p["hora"] or "")}</td>'
+                f'<td><a href="{self.url_clube(p["mandante_id"])}">{escape(mandante)}</a></td><td></td>'
+                f'<td class="result"><a href="{self.url_jogo(p)}">{placar}</a></td><td></td>'
+                f'<td><a href="{self.url_clube(p["visitante_id"])}">{escape(visitante)}</a></td>'
+                f'<td>{escape(p["fase"] or "")}</td></tr>')
+        return _pagina("Calendário", f'<table class="zztable stats"><tbody>{"".join(linhas)}</tbody></table>')
+
+    # ---------- tudo ----------
+
+    def gerar(self, ano=None):
+        """{chave_url: html} de todas as páginas (de um ano ou de todos)"""
+        sql = """
+            SELECT p.*, ed.ano FROM partidas p JOIN edicoes ed ON p.edicao_id = ed.ID
+            {filtro} ORDER BY ed.ano, p.ID
+        """
+        if ano:
+            partidas = [dict(p) for p in self.conn.execute(sql.format(filtro="WHERE ed.ano = ?"), (ano,))]
+        else:
+            partidas = [dict(p) for p in self.conn.execute(sql.format(filtro=""))]
+        ids = {p["ID"] for p in partidas}
+
+        def agrupar(sql_tabela):
+            grupos = {}
+            for linha in self.conn.execute(sql_tabela):
+                if linha["partida_id"] in ids:
+                    grupos.setdefault(linha["partida_id"], []).append(dict(linha))
+            return grupos
+
+        escalacoes = agrupar("SELECT * FROM jogadores_em_partida ORDER BY partida_id, titular DESC, numero_camisa")
+        eventos = agrupar("SELECT * FROM eventos_partida ORDER BY partida_id, ID")
+        treinadores = agrupar("SELECT * FROM treinadores_em_partida")
+        arbitros = agrupar("SELECT * FROM arbitros_em_partida")
+
+        paginas = {}
+        usados = {"clube": set(), "estadio": set(), "jogador": set(), "treinador": set(), "arbitro": set()}
+
+        por_edicao = {}
+        for p in partidas:
+            por_edicao.setdefault((p["ano"], p["edicao_id"]), []).append(p)
+        for (ano_edicao, edicao_id), lista in por_edicao.items():
+            for inicio in range(0, len(lista), self.por_pagina):
+                pagina = inicio // self.por_pagina + 1
+                paginas[url_calendario(ano_edicao, edicao_id, pagina)] = \
+                    self.pagina_calendario(lista[inicio:inicio + self.por_pagina])
+
+        for p in partidas:
+            eventos_jogador = {}
+            for e in eventos.get(p["ID"], []):
+                eventos_jogador.setdefault((e["jogador_id"], e["clube_id"]), []).append(e)
+            treinador_clube = {t["clube_id"]: t["treinador_id"] for t in treinadores.get(p["ID"], [])}
+            arbitro_id = next((a["arbitro_id"] for a in arbitros.get(p["ID"], [])), None)
+            paginas[self.url_jogo(p)] = self.pagina_jogo(
+                p, escalacoes.get(p["ID"], []), eventos_jogador, treinador_clube, arbitro_id)
+
+            usados["clube"].update((p["mandante_id"], p["visitante_id"]))
+            if p["estadio_id"] in self.estadios:
+                usados["estadio"].add(p["estadio_id"])
+            usados["jogador"].update(e["jogador_id"] for e in escalacoes.get(p["ID"], []))
+            usados["treinador"].update(treinador_clube.values())
+            if arbitro_id:
+                usados["arbitro"].add(arbitro_id)
+
+        for clube_id in usados["clube"]:
+            paginas[self.url_clube(clube_id)] = self.pagina_clube(self.clubes[clube_id])
+        for estadio_id in usados["estadio"]:
+            paginas[self.url_estadio(estadio_id)] = self.pagina_estadio(self.estadios[estadio_id])
+        for prefixo, tabela, montar in (("jogador", self.jogadores, self.pagina_jogador),
+                                        ("treinador", self.treinadores, self.pagina_pessoa),
+                                        ("arbitro", self.arbitros, self.pagina_pessoa)):
+            for pessoa_id in usados[prefixo]:
+                if pessoa_id in tabela:
+                    paginas[self._url_pessoa(prefixo, tabela[pessoa_id])] = montar(tabela[pessoa_id])
+        return paginas
+
+
+def gerar_paginas(banco, ano=None, por_pagina=PARTIDAS_POR_PAGINA):
+    conn = sqlite3.connect(banco)
+    try:
+        return GeradorPaginas(conn, por_pagina).gerar(ano)
+    finally:
+        conn.close()
+
+
+def salvar_paginas(paginas, pasta):
+    """Grava as páginas no formato de --gravacoes (pasta com indice.json)"""
+    os.makedirs(pasta, exist_ok=True)
+    indice = {}
+    for i, (url, html) in enumerate(sorted(paginas.items())):
+        arquivo = f"{i:06d}_{tipo_pagina(url)}.html"
+        with open(os.path.join(pasta, arquivo), "w", encoding="utf-8") as f:
+            f.write(html)
+        indice[url] = arquivo
+    with open(os.path.join(pasta, "indice.json"), "w", encoding="utf-8") as f:
+        json.dump(indice, f, ensure_ascii=False, indent=1)
+
+
+def carregar_gravacoes(pasta):
+    with open(os.path.join(pasta, "indice.json"), encoding="utf-8") as f:
+        indice = json.load(f)
+    paginas = {}
+    for url, arquivo in indice.items():
+        with open(os.path.join(pasta, arquivo), encoding="utf-8") as f:
+            paginas[chave_url(url)] = f.read()
+    return paginas
+
+
+# ==================== SERVIDOR ====================
+
+class ServidorOGolFalso:
+    def __init__(self, paginas, latencia_ms=0, jitter_ms=0, taxa_429=0.0, taxa_erro=0.0, semente=1971):
+        """
+        Args:
+            paginas: {chave_url: html} (ver gerar_paginas / carregar_gravacoes)
+            latencia_ms: Atraso fixo de cada resposta
+            jitter_ms: Atraso extra aleatório (0 a jitter_ms)
+            taxa_429: Fração das requisições respondidas com 429
+            taxa_erro: Fração das requisições respondidas com 500
+        """
+        self.paginas = {chave: html.encode("utf-8") for chave, html in paginas.items()}
+        self.latencia = latencia_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.taxa_429 = taxa_429
+        self.taxa_erro = taxa_erro
+        self.sorteio = random.Random(semente)
+        self._lock = threading.Lock()
+        self.estatisticas = {}
+        self.servidor = None
+
+    def _contar(self, tipo, status, tamanho):
+        with self._lock:
+            estat = self.estatisticas.setdefault(tipo, {"requisicoes": 0, "bytes": 0, "status": {}})
+            estat["requisicoes"] += 1
+            estat["bytes"] += tamanho
+            estat["status"][str(status)] = estat["status"].get(str(status), 0) + 1
+
+    def responder(self, url):
+        """(status, corpo) de uma requisição, já aplicando latência e falhas"""
+        with self._lock:
+            atraso = self.latencia + (self.sorteio.uniform(0, self.jitter) if self.jitter else 0)
+            sorteio = self.sorteio.random()
+        if atraso:
+            time.sleep(atraso)
+
+        tipo = tipo_pagina(url)
+        if sorteio < self.taxa_429:
+            status, corpo = 429, b"Too Many Requests"
+        elif sorteio < self.taxa_429 + self.taxa_erro:
+            status, corpo = 500, b"Internal Server Error"
+        else:
+            corpo = self.paginas.get(chave_url(url))
+            status = 200 if corpo is not None else 404
+            corpo = corpo if corpo is not None else b"Not Found"
+        self._contar(tipo, status, len(corpo))
+        return status, corpo
+
+    def iniciar(self, porta=0):
+        """Sobe o servidor numa thread; retorna a URL base"""
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path == "/_estatisticas":
+                    with mock._lock:
+                        status, corpo = 200, json.dumps(mock.estatisticas).encode()
+                    tipo_conteudo = "application/json"
+                else:
+                    status, corpo = mock.responder(self.path)
+                    tipo_conteudo = "text/html; charset=utf-8"
+                self.send_response(status)
+                self.send_header("Content-Type", tipo_conteudo)
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", porta), Handler)
+        self.servidor.daemon_threads = True
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.servidor.server_address[1]}"
+
+    def parar(self):
+        if self.servidor:
+            self.servidor.shutdown()
+            self.servidor.server_close()
+
+
+# ============================================
+# EXEMPLO DE USO
+# ============================================
+#   python mock_ogol.py --ano 1971 --porta 8765
+#   python mock_ogol.py --salvar fixtures_ogol          → grava as páginas geradas
+#   python mock_ogol.py --gravacoes fixtures_ogol --taxa-429 0.05 --latencia-ms 200
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor oGol falso para testes e benchmark do scraper")
+    parser.add_argument("--banco", default="../bd/estruturado_bd_1971.db")
+    parser.add_argument("--ano", type=int, help="só as páginas deste ano")
+    parser.add_argument("--gravacoes", help="pasta com indice.json e páginas gravadas")
+    parser.add_argument("--salvar", help="grava as páginas geradas nesta pasta e sai")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--latencia-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--taxa-429", type=float, default=0)
+    parser.add_argument("--taxa-erro", type=float, default=0)
+    args = parser.parse_args()
+
+    paginas = carregar_gravacoes(args.gravacoes) if args.gravacoes else gerar_paginas(args.banco, args.ano)
+    if args.salvar:
+        salvar_paginas(paginas, args.salvar)
+        print(f"✅ {len(paginas)} páginas gravadas em {args.salvar}")
+        sys.exit(0)
+
+    mock = ServidorOGolFalso(paginas, args.latencia_ms, args.jitter_ms, args.taxa_429, args.taxa_erro)
+    url = mock.iniciar(args.porta)
+    calendarios = sorted(u for u in paginas if tipo_pagina(u) == "calendario")
+    print(f"✅ oGol falso em {url} ({len(paginas)} páginas)")
+    for u in calendarios:
+        print(f"   📅 {url}{u}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.parar()
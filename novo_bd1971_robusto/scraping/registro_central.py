@@ -0,0 +1,219 @@
+import time
+import sqlite3
+from contextlib import contextmanager
+
+
+# ============================================
+# Registro central do scraping em paralelo
+# ============================================
+# Um SQLite em WAL que vários processos do OGolScraperRelacional abrem ao
+# mesmo tempo. Ele é a autoridade de:
+#   - IDs: alocar_id('partidas') devolve um número que nenhum outro processo
+#     vai receber (substitui os contadores next_*_id locais)
+#   - deduplicação: obter_ou_criar('jogadores', chave) devolve o ID de quem
+#     criou primeiro aquela chave de atributos, ou aloca um novo
+#   - ritmo: aguardar_vez() espaça as requisições de TODOS os processos em
+#     pelo menos `intervalo` segundos (o limite educado é global, não por
+#     processo)
+#   - tarefas: fila de (edição, página do calendário) que os processos
+#     pegam um de cada vez; sobrevive a quedas (reabrir_interrompidas)
+#
+# Cada operação é uma transação BEGIN IMMEDIATE curta; com busy_timeout os
+# processos só esperam uns pelos outros por milissegundos.
+
+SQL_TABELAS = (
+    """
+    CREATE TABLE IF NOT EXISTS sequencias (
+        tipo TEXT PRIMARY KEY,
+        proximo INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS chaves (
+        tipo TEXT NOT NULL,
+        chave TEXT NOT NULL,
+        id INTEGER NOT NULL,
+        PRIMARY KEY (tipo, chave)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ritmo (
+        nome TEXT PRIMARY KEY,
+        proximo_horario REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tarefas (
+        edicao_id INTEGER NOT NULL,
+        pagina INTEGER NOT NULL,
+        url TEXT NOT NULL,
+        estado TEXT NOT NULL DEFAULT 'pendente',  -- pendente, em_andamento, concluida, erro
+        trabalhador TEXT,
+        tentativas INTEGER NOT NULL DEFAULT 0,
+        erro TEXT,
+        atualizado_em REAL,
+        PRIMARY KEY (edicao_id, pagina)
+    )
+    """,
+)
+
+# Dicionário de entidades do scraper para cada tipo com chave de atributos
+DICIONARIOS = {
+    'locais': 'locais_dict',
+    'clubes': 'clubes_dict',
+    'estadios': 'estadios_dict',
+    'jogadores': 'jogadores_dict',
+    'treinadores': 'treinadores_dict',
+    'arbitros': 'arbitros_dict',
+}
+
+MAX_TENTATIVAS = 3
+
+
+class RegistroCentral:
+    def __init__(self, caminho, intervalo=0.0):
+        """
+        Args:
+            caminho: Arquivo .db do registro (compartilhado pelos processos)
+            intervalo: Segundos mínimos entre duas requisições, somando todos os processos
+        """
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.conn = sqlite3.connect(caminho, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        for sql in SQL_TABELAS:
+            self.conn.execute(sql)
+
+    @contextmanager
+    def _transacao(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # ---------- IDs ----------
+
+    def _alocar(self, conn, tipo):
+        linha = conn.execute("SELECT proximo FROM sequencias WHERE tipo = ?", (tipo,)).fetchone()
+        novo_id = linha[0] if linha else 1
+        conn.execute("INSERT OR REPLACE INTO sequencias (tipo, proximo) VALUES (?, ?)", (tipo, novo_id + 1))
+        return novo_id
+
+    def alocar_id(self, tipo):
+        with self._transacao() as conn:
+            return self._alocar(conn, tipo)
+
+    def obter_ou_criar(self, tipo, chave):
+        """(id, criado): ID já registrado para a chave, ou um novo"""
+        with self._transacao() as conn:
+            linha = conn.execute("SELECT id FROM chaves WHERE tipo = ? AND chave = ?", (tipo, chave)).fetchone()
+            if linha:
+                return linha[0], False
+            novo_id = self._alocar(conn, tipo)
+            conn.execute("INSERT INTO chaves (tipo, chave, id) VALUES (?, ?, ?)", (tipo, chave, novo_id))
+            return novo_id, True
+
+    def semear(self, scraper):
+        """
+        Registra as chaves e os próximos IDs de um scraper já carregado dos
+        CSVs de destino (OGolScraperRelacional._carregar_ids_existentes).
+        Pode ser chamado de novo: nada que já está no registro é perdido.
+        """
+        with self._transacao() as conn:
+            for tipo, atributo in DICIONARIOS.items():
+                conn.executemany(
+                    "INSERT OR IGNORE INTO chaves (tipo, chave, id) VALUES (?, ?, ?)",
+                    [(tipo, chave, registro['id']) for chave, registro in getattr(scraper, atributo).items()])
+            for tipo, atributo in scraper.CONTADORES_ID.items():
+                conn.execute("""
+                    INSERT INTO sequencias (tipo, proximo) VALUES (?, ?)
+                    ON CONFLICT(tipo) DO UPDATE SET proximo = MAX(proximo, excluded.proximo)
+                """, (tipo, getattr(scraper, atributo)))
+
+    # ---------- ritmo ----------
+
+    def aguardar_vez(self, nome="http"):
+        """Reserva o próximo horário livre de requisição e dorme até ele"""
+        if self.intervalo <= 0:
+            return
+        with self._transacao() as conn:
+            linha = conn.execute("SELECT proximo_horario FROM ritmo WHERE nome = ?", (nome,)).fetchone()
+            agora = time.time()
+            vez = max(agora, linha[0]) if linha else agora
+            conn.execute("INSERT OR REPLACE INTO ritmo (nome, proximo_horario) VALUES (?, ?)",
+                         (nome, vez + self.intervalo))
+        if vez > agora:
+            time.sleep(vez - agora)
+
+    # ---------- tarefas ----------
+
+    def adicionar_tarefas(self, tarefas):
+        """tarefas: [(edicao_id, pagina, url)]; as que já existem são mantidas"""
+        with self._transacao() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO tarefas (edicao_id, pagina, url, atualizado_em) VALUES (?, ?, ?, ?)",
+                [(e, p, u, time.time()) for e, p, u in tarefas])
+
+    def reabrir_interrompidas(self):
+        """
+        Tarefas 'em_andamento' de uma execução que caiu e as que esgotaram as
+        tentativas na execução anterior voltam para a fila
+        """
+        with self._transacao() as conn:
+            return conn.execute("""
+                UPDATE tarefas SET estado = 'pendente', trabalhador = NULL, tentativas = 0
+                WHERE estado IN ('em_andamento', 'erro')
+            """).rowcount
+
+    def pegar_tarefa(self, trabalhador):
+        """Próxima tarefa pendente (edicao_id, pagina, url), já marcada para este trabalhador"""
+        with self._transacao() as conn:
+            linha = conn.execute("""
+                SELECT edicao_id, pagina, url FROM tarefas
+                WHERE estado = 'pendente'
+                ORDER BY tentativas, edicao_id, pagina
+                LIMIT 1
+            """).fetchone()
+            if linha is None:
+                return None
+            conn.execute("""
+                UPDATE tarefas SET estado = 'em_andamento', trabalhador = ?, atualizado_em = ?
+                WHERE edicao_id = ? AND pagina = ?
+            """, (trabalhador, time.time(), linha[0], linha[1]))
+            return linha
+
+    def concluir_tarefa(self, edicao_id, pagina):
+        with self._transacao() as conn:
+            conn.execute("""
+                UPDATE tarefas SET estado = 'concluida', erro = NULL, atualizado_em = ?
+                WHERE edicao_id = ? AND pagina = ?
+            """, (time.time(), edicao_id, pagina))
+
+    def falhar_tarefa(self, edicao_id, pagina, erro, max_tentativas=MAX_TENTATIVAS):
+        """Devolve a tarefa para a fila, ou marca 'erro' depois de max_tentativas"""
+        with self._transacao() as conn:
+            conn.execute("""
+                UPDATE tarefas
+                SET tentativas = tentativas + 1,
+                    estado = CASE WHEN tentativas + 1 >= ? THEN 'erro' ELSE 'pendente' END,
+                    erro = ?, trabalhador = NULL, atualizado_em = ?
+                WHERE edicao_id = ? AND pagina = ?
+            """, (max_tentativas, str(erro)[:500], time.time(), edicao_id, pagina))
+
+    def resumo_tarefas(self):
+        """{estado: quantidade}"""
+        return dict(self.conn.execute("SELECT estado, COUNT(*) FROM tarefas GROUP BY estado").fetchall())
+
+    def tarefas_com_erro(self):
+        return self.conn.execute(
+            "SELECT edicao_id, pagina, erro FROM tarefas WHERE estado = 'erro' ORDER BY edicao_id, pagina"
+        ).fetchall()
+
+    def fechar(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -6,10 +6,33 @@ from urllib.parse import urljoin
 import os
 import re
 
+from telemetria_scraper import Telemetria, tipo_pagina
+from cache_urls import CacheUrls, ARQUIVO_CACHE
+
 class OGolScraperRelacional:
-    def __init__(self, url_lista):
+    # Contador local de cada tipo de ID (usado quando não há registro central)
+    CONTADORES_ID = {
+        'locais': 'next_local_id',
+        'clubes': 'next_clube_id',
+        'estadios': 'next_estadio_id',
+        'jogadores': 'next_jogador_id',
+        'treinadores': 'next_treinador_id',
+        'arbitros': 'next_arbitro_id',
+        'partidas': 'next_partida_id',
+        'eventos_partida': 'next_evento_id',
+    }
+
+    def __init__(self, url_lista, base_url="https://www.ogol.com.br", output_dir="output_csvs", delay=45,
+                 arquivo_telemetria="telemetria.jsonl", registro=None, cache_urls=None):
+        """
+        Args:
+            registro: RegistroCentral compartilhado entre processos (IDs, deduplicação
+                      e ritmo global de requisições); None = contadores locais
+            cache_urls: Arquivo do cache de URLs (padrão: output_dir/cache_urls.db)
+        """
         self.url_lista = url_lista
-        self.base_url = "https://www.ogol.com.br"
+        self.registro = registro
+        self.base_url = base_url
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
                         "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -19,7 +42,7 @@ class OGolScraperRelacional:
             "Upgrade-Insecure-Requests": "1",
             "Connection": "keep-alive"
         }
-        self.delay = 45
+        self.delay = delay
 
         # Dicionários usando chaves de atributos (não URLs!)
         self.clubes_dict = {}
@@ -29,15 +52,6 @@ class OGolScraperRelacional:
         self.arbitros_dict = {}
         self.locais_dict = {}
 
-        # Cache de URLs para esta sessão (evita reprocessar mesma URL)
-        self.url_cache = {
-            'jogadores': {},
-            'treinadores': {},
-            'arbitros': {},
-            'clubes': {},
-            'estadios': {}
-        }
-
         # Buffers de novos registros
         self._novo_clube = []
         self._novo_estadio = []
@@ -46,13 +60,18 @@ class OGolScraperRelacional:
         self._novo_arbitro = []
 
         # Caminho dos CSVs
-        self.output_dir = "output_csvs"
+        self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
 
+        # Contadores e tempos por etapa (arquivo_telemetria=None: só em memória)
+        self.telemetria = Telemetria(
+            os.path.join(self.output_dir, arquivo_telemetria) if arquivo_telemetria else None)
+
         # Carrega IDs existentes
         self._carregar_ids_existentes()
 
-        # Carrega cache de URLs persistido de edições anteriores
+        # Cache de URLs (evita reprocessar mesma URL), persistido entre edições
+        self.caminho_cache_urls = cache_urls
         self._carregar_cache_urls()
 
         # Buffers relacionais
@@ -62,6 +81,12 @@ class OGolScraperRelacional:
         self.arbitros_em_partida_lista = []
         self.eventos_partida_lista = []
 
+        # Partidas já salvas por edição (só no modo atualizar, carregadas sob demanda)
+        self._partidas_salvas_cache = {}
+        # IDs de partidas alteradas raspadas de novo: as linhas antigas saem na
+        # mesma gravação em que as novas entram (salvar_csvs)
+        self._partidas_a_substituir = set()
+
         # Caminho do CHECKPOINT
         self.checkpoint_path = os.path.join(self.output_dir, "checkpoint.txt")
 
@@ -237,48 +262,23 @@ class OGolScraperRelacional:
               f"Partida={self.next_partida_id}, Evento={self.next_evento_id}\n")
 
     def _carregar_cache_urls(self):
-        """Carrega cache de URLs persistido de edições anteriores."""
-        cache_path = os.path.join(self.output_dir, "cache_urls.csv")
-        if os.path.exists(cache_path):
-            print("📥 Carregando cache de URLs persistido...")
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    tipo = row.get('tipo', '')
-                    url = row.get('url', '')
-                    entity_id = row.get('entity_id', '')
-
-                    if tipo and url and entity_id:
-                        if tipo not in self.url_cache:
-                            self.url_cache[tipo] = {}
-                        try:
-                            self.url_cache[tipo][url] = int(entity_id)
-                        except ValueError:
-                            continue
-            total_urls = sum(len(v) for v in self.url_cache.values())
-            print(f"   ✓ Cache carregado com {total_urls} URLs")
+        """Abre o cache persistente de URLs (consultado sob demanda, sem carregar tudo)."""
+        caminho = self.caminho_cache_urls or os.path.join(self.output_dir, ARQUIVO_CACHE)
+        self.url_cache = CacheUrls(caminho)
+        print(f"📥 Cache de URLs: {self.url_cache.total()} URLs em {caminho}")
 
     def _salvar_cache_urls(self):
-        """Salva cache de URLs para reutilização em futuras edições."""
-        cache_path = os.path.join(self.output_dir, "cache_urls.csv")
-
-        print("💾 Salvando cache de URLs...")
-        with open(cache_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['tipo', 'url', 'entity_id'])
-            writer.writeheader()
-
-            for tipo, urls_dict in self.url_cache.items():
-                for url, entity_id in urls_dict.items():
-                    writer.writerow({
-                        'tipo': tipo,
-                        'url': url,
-                        'entity_id': entity_id
-                    })
-
-        total_urls = sum(len(v) for v in self.url_cache.values())
-        print(f"   ✓ Cache salvo com {total_urls} URLs")
+        """Cada URL nova já é gravada no cache assim que aprendida; aqui só o resumo."""
+        print(f"💾 Cache de URLs: {self.url_cache.aprendidas()} URLs novas nesta execução "
+              f"({self.url_cache.total()} no total)")
 
     def _get_soup(self, url):
+        """Baixa a página e devolve o HTML já parseado."""
+        html = self._baixar_html(url)
+        with self.telemetria.cronometro(f"parse.{tipo_pagina(url)}"):
+            return BeautifulSoup(html, "html.parser")
+
+    def _baixar_html(self, url):
         """Faz a requisição HTTP com tratamento de erros."""
         tentativa = 0
         max_tentativas = 5
@@ -287,11 +287,19 @@ class OGolScraperRelacional:
 
         while tentativa < max_tentativas:
             try:
+                if self.registro is not None:
+                    # Ritmo global, somado entre todos os processos
+                    with self.telemetria.cronometro("http.espera_ritmo"):
+                        self.registro.aguardar_vez()
                 print(f"🌐 Acessando: {url}")
+                inicio = time.perf_counter()
                 r = requests.get(url, headers=self.headers)
+                self.telemetria.requisicao(url, r.status_code, time.perf_counter() - inicio,
+                                           len(r.content), tentativa + 1)
                 if r.status_code == 429:
                     tentativa += 1
                     erros_429 += 1
+                    self.telemetria.contar("http.retentativas")
                     espera = delay * (tentativa + 1)
                     print(f"⚠️ Erro 429 (tentativa {tentativa}/{max_tentativas}). Aguardando {espera}s...")
 
@@ -304,15 +312,47 @@ class OGolScraperRelacional:
 
                 r.raise_for_status()
                 erros_429 = 0
-                return BeautifulSoup(r.text, "html.parser")
+                return r.text
             except requests.exceptions.RequestException as e:
+                if not isinstance(e, requests.exceptions.HTTPError):
+                    self.telemetria.requisicao(url, 0, time.perf_counter() - inicio, 0, tentativa + 1)
                 tentativa += 1
+                self.telemetria.contar("http.retentativas")
                 espera = delay * (tentativa + 1)
                 print(f"⚠️ Tentativa {tentativa} falhou. Aguardando {espera}s...")
                 time.sleep(espera)
 
+        self.telemetria.contar("http.desistencias")
         raise Exception(f"❌ Falha ao acessar {url} após {max_tentativas} tentativas")
 
+    def _proximo_id(self, tipo):
+        """Próximo ID do tipo: do registro central (vários processos) ou do contador local"""
+        if self.registro is not None:
+            return self.registro.alocar_id(tipo)
+        atributo = self.CONTADORES_ID[tipo]
+        novo_id = getattr(self, atributo)
+        setattr(self, atributo, novo_id + 1)
+        return novo_id
+
+    def _id_novo_registro(self, tipo, chave):
+        """
+        (id, criado) para uma chave de atributos que não está nos dicionários
+        locais. Com registro central, outro processo pode já ter criado a
+        mesma chave: aí volta o ID dele e criado=False.
+        """
+        if self.registro is not None:
+            return self.registro.obter_ou_criar(tipo, chave)
+        return self._proximo_id(tipo), True
+
+    def _contar_cache(self, tipo, url):
+        """True se a URL já está no url_cache (e conta de onde ela veio)"""
+        if url in self.url_cache[tipo]:
+            origem = "sessao" if url in self.url_cache[tipo].novas else "persistido"
+            self.telemetria.contar(f"cache.{tipo}.{origem}")
+            return True
+        self.telemetria.contar(f"cache.{tipo}.falta")
+        return False
+
     def _extrair_link(self, celula):
         tag = celula.find("a")
         texto = tag.get_text(strip=True) if tag else celula.get_text(strip=True)
@@ -409,8 +449,9 @@ class OGolScraperRelacional:
         # Obtém nome completo e região do estado
         estado_nome, regiao = estados_info.get(uf.upper(), (uf, ''))
 
+        local_id, _ = self._id_novo_registro('locais', chave)
         self.locais_dict[chave] = {
-            'id': self.next_local_id,
+            'id': local_id,
             'cidade': cidade,
             'uf': uf.upper(),  # Garante que UF esteja em maiúsculas
             'estado': estado_nome,  # Nome completo do estado
@@ -418,7 +459,6 @@ class OGolScraperRelacional:
             'pais': 'Brasil'
         }
         print(f"   ➤ Local '{cidade}, {uf}' ({estado_nome}) adicionado.")
-        self.next_local_id += 1
 
         return self.locais_dict[chave]['id']
 
@@ -432,7 +472,7 @@ class OGolScraperRelacional:
             return None
 
         # Verifica cache de URL desta sessão
-        if url_clube in self.url_cache['clubes']:
+        if self._contar_cache('clubes', url_clube):
             return self.url_cache['clubes'][url_clube]
 
         print(f"🏟️ Processando clube: {url_clube}")
@@ -475,12 +515,16 @@ class OGolScraperRelacional:
         if chave_atributos in self.clubes_dict:
             clube_id = self.clubes_dict[chave_atributos]['id']
             print(f"   ✓ Clube já existente: {dados.get('nome', '')} (ID: {clube_id})")
+            self.telemetria.contar("clubes.reutilizados")
             self.url_cache['clubes'][url_clube] = clube_id
             return clube_id
 
-        # Clube novo
-        clube_id = self.next_clube_id
-        print(f"   ➕ Novo clube: {dados.get('nome', '')} (ID: {clube_id})")
+        # Clube novo (com registro central, outro processo pode já tê-lo criado)
+        clube_id, criado = self._id_novo_registro('clubes', chave_atributos)
+        if criado:
+            print(f"   ➕ Novo clube: {dados.get('nome', '')} (ID: {clube_id})")
+        else:
+            print(f"   ✓ Clube já criado por outro processo: {dados.get('nome', '')} (ID: {clube_id})")
 
         registro = {
             'id': clube_id,
@@ -493,8 +537,11 @@ class OGolScraperRelacional:
 
         self.clubes_dict[chave_atributos] = registro
         self.url_cache['clubes'][url_clube] = clube_id
-        self._novo_clube.append(registro)
-        self.next_clube_id += 1
+        if criado:
+            self._novo_clube.append(registro)
+            self.telemetria.contar("clubes.criados")
+        else:
+            self.telemetria.contar("clubes.reutilizados")
         return clube_id
 
     def processar_estadio(self, url_estadio):
@@ -503,7 +550,7 @@ class OGolScraperRelacional:
             return None
 
         # Verifica cache de URL desta sessão
-        if url_estadio in self.url_cache['estadios']:
+        if self._contar_cache('estadios', url_estadio):
             return self.url_cache['estadios'][url_estadio]
 
         print(f"🏟️ Processando estádio: {url_estadio}")
@@ -546,12 +593,16 @@ class OGolScraperRelacional:
         if chave_atributos in self.estadios_dict:
             estadio_id = self.estadios_dict[chave_atributos]['id']
             print(f"   ✓ Estádio já existente: {dados.get('nome', '')} (ID: {estadio_id})")
+            self.telemetria.contar("estadios.reutilizados")
             self.url_cache['estadios'][url_estadio] = estadio_id
             return estadio_id
 
-        # Estádio novo
-        estadio_id = self.next_estadio_id
-        print(f"   ➕ Novo estádio: {dados.get('nome', '')} (ID: {estadio_id})")
+        # Estádio novo (com registro central, outro processo pode já tê-lo criado)
+        estadio_id, criado = self._id_novo_registro('estadios', chave_atributos)
+        if criado:
+            print(f"   ➕ Novo estádio: {dados.get('nome', '')} (ID: {estadio_id})")
+        else:
+            print(f"   ✓ Estádio já criado por outro processo: {dados.get('nome', '')} (ID: {estadio_id})")
 
         registro = {
             'id': estadio_id,
@@ -564,8 +615,11 @@ class OGolScraperRelacional:
 
         self.estadios_dict[chave_atributos] = registro
         self.url_cache['estadios'][url_estadio] = estadio_id
-        self._novo_estadio.append(registro)
-        self.next_estadio_id += 1
+        if criado:
+            self._novo_estadio.append(registro)
+            self.telemetria.contar("estadios.criados")
+        else:
+            self.telemetria.contar("estadios.reutilizados")
         return estadio_id
 
     def processar_jogador(self, url_jogador):
@@ -574,7 +628,7 @@ class OGolScraperRelacional:
             return None
 
         # Verifica cache de URL desta sessão
-        if url_jogador in self.url_cache['jogadores']:
+        if self._contar_cache('jogadores', url_jogador):
             return self.url_cache['jogadores'][url_jogador]
 
         print(f"⚽ Processando jogador: {url_jogador}")
@@ -673,14 +727,19 @@ class OGolScraperRelacional:
                 print(f"   ✓ Jogador já existente: {dados.get('nome', '')} (ID: {jogador_id})")
 
         if jogador_encontrado:
+            self.telemetria.contar("jogadores.reutilizados")
             self.url_cache['jogadores'][url_jogador] = jogador_id
             return jogador_id
 
         # Jogador novo - usa chave com apelido se tiver
-        jogador_id = self.next_jogador_id
+        # (com registro central, outro processo pode já tê-lo criado)
         chave_final = chave_com_apelido if chave_com_apelido else chave_sem_apelido
+        jogador_id, criado = self._id_novo_registro('jogadores', chave_final)
 
-        print(f"   ➕ Novo jogador: {dados.get('nome', '')} (apelido: {apelido}) (ID: {jogador_id})")
+        if criado:
+            print(f"   ➕ Novo jogador: {dados.get('nome', '')} (apelido: {apelido}) (ID: {jogador_id})")
+        else:
+            print(f"   ✓ Jogador já criado por outro processo: {dados.get('nome', '')} (ID: {jogador_id})")
 
         registro = {
             'id': jogador_id,
@@ -699,8 +758,11 @@ class OGolScraperRelacional:
 
         self.jogadores_dict[chave_final] = registro
         self.url_cache['jogadores'][url_jogador] = jogador_id
-        self._novo_jogador.append(registro)
-        self.next_jogador_id += 1
+        if criado:
+            self._novo_jogador.append(registro)
+            self.telemetria.contar("jogadores.criados")
+        else:
+            self.telemetria.contar("jogadores.reutilizados")
         return jogador_id
 
     def processar_treinador(self, url_treinador):
@@ -715,7 +777,7 @@ class OGolScraperRelacional:
             apelido = match.group(1).lower().replace('-', ' ').title()
 
         # Verifica cache de URL desta sessão
-        if url_treinador in self.url_cache['treinadores']:
+        if self._contar_cache('treinadores', url_treinador):
             treinador_id = self.url_cache['treinadores'][url_treinador]
 
             # Se achou no cache, mas capturamos um apelido da URL,
@@ -788,13 +850,17 @@ class OGolScraperRelacional:
                 print(f"   ✓ Treinador já existente: {dados.get('nome', '')} (ID: {treinador_id})")
 
         if treinador_encontrado:
+            self.telemetria.contar("treinadores.reutilizados")
             self.url_cache['treinadores'][url_treinador] = treinador_id
             return treinador_id
 
-        # Treinador novo
-        treinador_id = self.next_treinador_id
+        # Treinador novo (com registro central, outro processo pode já tê-lo criado)
         chave_final = chave_com_apelido if chave_com_apelido else chave_sem_apelido
-        print(f"   ➕ Novo treinador: {dados.get('nome', '')} (apelido: {apelido}) (ID: {treinador_id})")
+        treinador_id, criado = self._id_novo_registro('treinadores', chave_final)
+        if criado:
+            print(f"   ➕ Novo treinador: {dados.get('nome', '')} (apelido: {apelido}) (ID: {treinador_id})")
+        else:
+            print(f"   ✓ Treinador já criado por outro processo: {dados.get('nome', '')} (ID: {treinador_id})")
 
         registro = {
             'id': treinador_id,
@@ -809,8 +875,11 @@ class OGolScraperRelacional:
 
         self.treinadores_dict[chave_final] = registro
         self.url_cache['treinadores'][url_treinador] = treinador_id
-        self._novo_treinador.append(registro)
-        self.next_treinador_id += 1
+        if criado:
+            self._novo_treinador.append(registro)
+            self.telemetria.contar("treinadores.criados")
+        else:
+            self.telemetria.contar("treinadores.reutilizados")
         return treinador_id
 
     def processar_arbitro(self, url_arbitro):
@@ -819,7 +888,7 @@ class OGolScraperRelacional:
             return None
 
         # Verifica cache de URL desta sessão
-        if url_arbitro in self.url_cache['arbitros']:
+        if self._contar_cache('arbitros', url_arbitro):
             return self.url_cache['arbitros'][url_arbitro]
 
         print(f"🧑‍⚖️ Processando árbitro: {url_arbitro}")
@@ -888,13 +957,17 @@ class OGolScraperRelacional:
                 print(f"   ✓ Árbitro já existente: {dados.get('nome', '')} (ID: {arbitro_id})")
 
         if arbitro_encontrado:
+            self.telemetria.contar("arbitros.reutilizados")
             self.url_cache['arbitros'][url_arbitro] = arbitro_id
             return arbitro_id
 
-        # Árbitro novo
-        arbitro_id = self.next_arbitro_id
+        # Árbitro novo (com registro central, outro processo pode já tê-lo criado)
         chave_final = chave_com_apelido if chave_com_apelido else chave_sem_apelido
-        print(f"   ➕ Novo árbitro: {dados.get('nome', '')} (apelido: {apelido}) (ID: {arbitro_id})")
+        arbitro_id, criado = self._id_novo_registro('arbitros', chave_final)
+        if criado:
+            print(f"   ➕ Novo árbitro: {dados.get('nome', '')} (apelido: {apelido}) (ID: {arbitro_id})")
+        else:
+            print(f"   ✓ Árbitro já criado por outro processo: {dados.get('nome', '')} (ID: {arbitro_id})")
 
         registro = {
             'id': arbitro_id,
@@ -909,8 +982,11 @@ class OGolScraperRelacional:
 
         self.arbitros_dict[chave_final] = registro
         self.url_cache['arbitros'][url_arbitro] = arbitro_id
-        self._novo_arbitro.append(registro)
-        self.next_arbitro_id += 1
+        if criado:
+            self._novo_arbitro.append(registro)
+            self.telemetria.contar("arbitros.criados")
+        else:
+            self.telemetria.contar("arbitros.reutilizados")
         return arbitro_id
 
     def registrar_evento(self, partida_id, jogador_id, clube_id, tipo_evento, tipo_gol=None, minuto=None):
@@ -919,7 +995,7 @@ class OGolScraperRelacional:
             return
 
         evento = {
-            'id': self.next_evento_id,
+            'id': None,
             'partida_id': partida_id,
             'jogador_id': jogador_id,
             'clube_id': clube_id,
@@ -935,8 +1011,8 @@ class OGolScraperRelacional:
         }
 
         if chave not in existing_keys:
+            evento['id'] = self._proximo_id('eventos_partida')
             self.eventos_partida_lista.append(evento)
-            self.next_evento_id += 1
             print(f"   ➤ Evento '{tipo_evento}' registrado (minuto {minuto})")
 
     def processar_detalhes_partida(self, url_partida, partida_id, mandante_id, visitante_id):
@@ -1254,14 +1330,24 @@ class OGolScraperRelacional:
 
     def salvar_csvs(self):
         """Salva os CSVs de forma incremental, evitando duplicatas."""
-        def append_rows(path, campos, rows):
+        inicio_gravacao = time.perf_counter()
+
+        def append_rows(path, campos, rows, coluna_partida=None):
             existe = os.path.exists(path)
             registros_existentes = set()
+            substituir = bool(existe and coluna_partida and self._partidas_a_substituir)
+            mantidas = []
+            cabecalho = campos
 
             if existe:
                 with open(path, "r", encoding="utf-8") as f:
                     reader = csv.DictReader(f)
+                    cabecalho = reader.fieldnames or campos
                     for r in reader:
+                        if substituir:
+                            if r.get(coluna_partida) in self._partidas_a_substituir:
+                                continue
+                            mantidas.append(r)
                         chave = tuple(r[c].strip() for c in campos if c in r)
                         registros_existentes.add(chave)
 
@@ -1272,6 +1358,18 @@ class OGolScraperRelacional:
                     novas_linhas.append(r)
                     registros_existentes.add(chave)
 
+            if substituir:
+                # Partida raspada de novo: arquivo reescrito sem as linhas antigas
+                # dela e já com as novas, trocado de uma vez
+                temporario = path + ".tmp"
+                with open(temporario, "w", newline="", encoding="utf-8") as f:
+                    w = csv.DictWriter(f, fieldnames=cabecalho, extrasaction="ignore")
+                    w.writeheader()
+                    w.writerows(mantidas)
+                    w.writerows(novas_linhas)
+                os.replace(temporario, path)
+                return
+
             if not novas_linhas:
                 return
 
@@ -1344,48 +1442,130 @@ class OGolScraperRelacional:
             print("💾 locais.csv reescrito")
 
         # Salva relacionais
-        if self.partidas_lista:
-            path = os.path.join(self.output_dir, "partidas.csv")
-            campos = ['id','edicao_id','campeonato_id','data','hora','fase','rodada','estadio_id','mandante_id','visitante_id','mandante_placar','visitante_placar','mandante_penalti','visitante_penalti','prorrogacao', 'publico']
-            append_rows(path, campos, self.partidas_lista)
-            self.partidas_lista.clear()
-            print("💾 partidas.csv atualizado")
-
-        if self.jogadores_em_partida_lista:
+        if self.jogadores_em_partida_lista or self._partidas_a_substituir:
             path = os.path.join(self.output_dir, "jogadores_em_partida.csv")
             campos = ['partida_id','jogador_id','clube_id','titular','posicao_jogada','numero_camisa']
-            append_rows(path, campos, self.jogadores_em_partida_lista)
+            append_rows(path, campos, self.jogadores_em_partida_lista, 'partida_id')
             self.jogadores_em_partida_lista.clear()
             print("💾 jogadores_em_partida.csv atualizado")
 
-        if self.treinadores_em_partida_lista:
+        if self.treinadores_em_partida_lista or self._partidas_a_substituir:
             path = os.path.join(self.output_dir, "treinadores_em_partida.csv")
             campos = ['partida_id','treinador_id','clube_id','tipo']
-            append_rows(path, campos, self.treinadores_em_partida_lista)
+            append_rows(path, campos, self.treinadores_em_partida_lista, 'partida_id')
             self.treinadores_em_partida_lista.clear()
             print("💾 treinadores_em_partida.csv atualizado")
 
-        if self.arbitros_em_partida_lista:
+        if self.arbitros_em_partida_lista or self._partidas_a_substituir:
             path = os.path.join(self.output_dir, "arbitros_em_partida.csv")
             campos = ['partida_id','arbitro_id']
-            append_rows(path, campos, self.arbitros_em_partida_lista)
+            append_rows(path, campos, self.arbitros_em_partida_lista, 'partida_id')
             self.arbitros_em_partida_lista.clear()
             print("💾 arbitros_em_partida.csv atualizado")
 
-        if self.eventos_partida_lista:
+        if self.eventos_partida_lista or self._partidas_a_substituir:
             path = os.path.join(self.output_dir, "eventos_partida.csv")
             campos = ['id','partida_id','jogador_id','clube_id','tipo_evento','tipo_gol','minuto']
-            append_rows(path, campos, self.eventos_partida_lista)
+            append_rows(path, campos, self.eventos_partida_lista, 'partida_id')
             self.eventos_partida_lista.clear()
             print("💾 eventos_partida.csv atualizado")
 
+        # partidas.csv por último: se a gravação parar no meio, a partida
+        # alterada continua com os valores antigos e é raspada de novo na
+        # próxima atualização
+        if self.partidas_lista:
+            path = os.path.join(self.output_dir, "partidas.csv")
+            campos = ['id','edicao_id','campeonato_id','data','hora','fase','rodada','estadio_id','mandante_id','visitante_id','mandante_placar','visitante_placar','mandante_penalti','visitante_penalti','prorrogacao', 'publico']
+            append_rows(path, campos, self.partidas_lista, 'id')
+            self.partidas_lista.clear()
+            print("💾 partidas.csv atualizado")
+        self._partidas_a_substituir.clear()
+
+        self.telemetria.medir("csv.salvar", time.perf_counter() - inicio_gravacao)
+
+    # ======================================================
+    # Atualização incremental (só partidas novas ou alteradas)
+    # ======================================================
+
+    # Campos do calendário que, se mudarem, fazem a partida ser raspada de novo
+    CAMPOS_SITUACAO_PARTIDA = ('data', 'hora', 'mandante_placar', 'visitante_placar',
+                               'mandante_penalti', 'visitante_penalti', 'prorrogacao')
+
+    def _partidas_salvas(self, edicao_id):
+        """Partidas da edição já em partidas.csv: {id: linha} e {(data, mandante, visitante): id}"""
+        if edicao_id not in self._partidas_salvas_cache:
+            por_id, por_chave = {}, {}
+            path = os.path.join(self.output_dir, 'partidas.csv')
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        if row.get('edicao_id') == str(edicao_id):
+                            por_id[row['id']] = row
+                            por_chave[(row['data'], row['mandante_id'], row['visitante_id'])] = row['id']
+            self._partidas_salvas_cache[edicao_id] = (por_id, por_chave)
+            print(f"   ✓ {len(por_id)} partidas da edição {edicao_id} já salvas")
+        return self._partidas_salvas_cache[edicao_id]
+
+    def _situacao_partida(self, edicao_id, link_partida, partida):
+        """
+        ('nova', None), ('inalterada', id) ou ('alterada', id) comparando a
+        linha do calendário com partidas.csv. A partida é achada pela URL do
+        jogo (estável mesmo se a data mudar) ou por (data, mandante, visitante).
+        """
+        por_id, por_chave = self._partidas_salvas(edicao_id)
+        partida_id = self.url_cache['partidas'].get(link_partida) if link_partida else None
+        if partida_id is None or str(partida_id) not in por_id:
+            partida_id = por_chave.get((partida['data'], str(partida['mandante_id']), str(partida['visitante_id'])))
+        if partida_id is None:
+            return 'nova', None
+
+        salva = por_id[str(partida_id)]
+        for campo in self.CAMPOS_SITUACAO_PARTIDA:
+            valor = partida.get(campo)
+            if (salva.get(campo) or '') != ('' if valor is None else str(valor)):
+                print(f"   🔄 Partida {partida_id} mudou: {campo} {salva.get(campo) or '-'} → {valor}")
+                return 'alterada', int(partida_id)
+        return 'inalterada', int(partida_id)
+
+    def _memorizar_partida(self, partida, link_partida):
+        """Depois de raspar: partidas.csv em memória e URL do jogo → ID no cache"""
+        if partida['edicao_id'] in self._partidas_salvas_cache:
+            por_id, por_chave = self._partidas_salvas_cache[partida['edicao_id']]
+            linha = {k: ('' if v is None else str(v)) for k, v in partida.items()}
+            por_id[linha['id']] = linha
+            por_chave[(linha['data'], linha['mandante_id'], linha['visitante_id'])] = linha['id']
+        if link_partida:
+            self.url_cache['partidas'][link_partida] = partida['id']
+
+    def _detalhes_lidos(self, partida_id):
+        """
+        A página do jogo foi aberta? processar_detalhes_partida registra a
+        linha de arbitros_em_partida logo depois de ler a página (mesmo sem
+        árbitro), e não registra nada se a requisição falhar.
+        """
+        return any(r['partida_id'] == partida_id for r in self.arbitros_em_partida_lista)
+
+    def _descartar_linhas_partida(self, partida_id):
+        """Tira dos buffers o que foi raspado (pela metade) de uma partida"""
+        for nome in ('jogadores_em_partida_lista', 'treinadores_em_partida_lista',
+                     'arbitros_em_partida_lista', 'eventos_partida_lista'):
+            setattr(self, nome, [r for r in getattr(self, nome) if r['partida_id'] != partida_id])
+
     # ======================================================
     # Execução principal
     # ======================================================
 
-    def executar(self, edicao_id=1, page_atual=1, page_maxima=1):
-        """Execução principal do scraper"""
-        print("🚀 Iniciando scraping...")
+    def executar(self, edicao_id=1, page_atual=1, page_maxima=1, atualizar=False):
+        """
+        Execução principal do scraper
+
+        Args:
+            atualizar: Modo de atualização da temporada: compara cada linha do
+                       calendário com partidas.csv e só abre a página do jogo
+                       das partidas novas ou com placar/situação diferente
+                       (clubes já conhecidos vêm do cache de URLs, sem requisição)
+        """
+        print("🔄 Iniciando atualização incremental..." if atualizar else "🚀 Iniciando scraping...")
 
         ultimo_jogo = None
         ultima_url_partida = None
@@ -1404,10 +1584,9 @@ class OGolScraperRelacional:
 
         skip = bool(ultimo_jogo)
 
-        for linha in tabela.find_all("tr"):
+        linhas = [linha for linha in tabela.find_all("tr") if len(linha.find_all("td")) >= 6]
+        for numero_linha, linha in enumerate(linhas, 1):
             celulas = linha.find_all("td")
-            if len(celulas) < 6:
-                continue
 
             data = celulas[1].get_text(strip=True)
             hora = celulas[2].get_text(strip=True)
@@ -1473,22 +1652,11 @@ class OGolScraperRelacional:
                     print(f"Erro ao converter placar: {placar}, pulando partida")
                     continue
 
-            partida_id = self.next_partida_id
-            self.next_partida_id += 1
-
-            estadio_id = None
-            publico = None
-
-            try:
-                estadio_id, publico = self.processar_detalhes_partida(link_partida, partida_id, mandante_id, visitante_id)
-            except Exception as e:
-                print(f"⚠️ Erro ao processar detalhes: {e}")
-
-            self.partidas_lista.append({
-                'id': partida_id,
+            partida = {
+                'id': None,
                 'edicao_id': edicao_id,
                 'campeonato_id': 1,
-                'estadio_id': estadio_id,
+                'estadio_id': None,
                 'data': data,
                 'hora': hora,
                 'fase': fase,
@@ -1500,8 +1668,44 @@ class OGolScraperRelacional:
                 'mandante_penalti': penalti_mandante,
                 'visitante_penalti': penalti_visitante,
                 'prorrogacao': prorrogacao,
-                'publico': publico
-            })
+                'publico': None
+            }
+
+            situacao, partida_id = ('nova', None)
+            if atualizar:
+                situacao, partida_id = self._situacao_partida(edicao_id, link_partida, partida)
+                self.telemetria.contar(f"partidas.{situacao}s")
+                if situacao == 'inalterada':
+                    print("   ⏭️ Sem mudanças desde a última execução")
+                    continue
+
+            if partida_id is None:
+                partida_id = self._proximo_id('partidas')
+            partida['id'] = partida_id
+
+            # Sem link não há página do jogo: só a linha do calendário muda
+            detalhes_lidos = not link_partida
+            try:
+                partida['estadio_id'], partida['publico'] = self.processar_detalhes_partida(
+                    link_partida, partida_id, mandante_id, visitante_id)
+                detalhes_lidos = self._detalhes_lidos(partida_id)
+            except Exception as e:
+                print(f"⚠️ Erro ao processar detalhes: {e}")
+
+            if situacao == 'alterada':
+                if not detalhes_lidos:
+                    # As linhas salvas ficam; a partida continua 'alterada' e é
+                    # tentada de novo na próxima atualização
+                    print(f"   ⚠️ Partida {partida_id} não foi raspada de novo; mantidos os dados salvos")
+                    self.telemetria.contar("partidas.falhas")
+                    self._descartar_linhas_partida(partida_id)
+                    self.salvar_csvs()
+                    continue
+                # Mantém o ID; escalações e eventos antigos saem quando os novos forem gravados
+                self._partidas_a_substituir.add(str(partida_id))
+
+            self.partidas_lista.append(partida)
+            self._memorizar_partida(partida, link_partida)
 
             # Salva a última URL de partida processada com sucesso
             ultima_url_partida = link_partida
@@ -1511,6 +1715,7 @@ class OGolScraperRelacional:
                 f.write(checkpoint_info)
 
             self.salvar_csvs()
+            self.telemetria.partida_concluida(partida_id, numero_linha, len(linhas), link_partida)
 
         # Se chegou aqui, a página foi processada com sucesso
         # Limpa o checkpoint para a próxima página
@@ -1518,8 +1723,13 @@ class OGolScraperRelacional:
             os.remove(self.checkpoint_path)
             print(f"🗑️ Checkpoint limpo (página {page_atual} processada com sucesso)")
 
+        if atualizar:
+            c = self.telemetria.contadores
+            print(f"🔄 Atualização: {c.get('partidas.novas', 0)} novas, {c.get('partidas.alteradas', 0)} alteradas, "
+                  f"{c.get('partidas.inalteradas', 0)} sem mudança (acumulado da execução)")
+
         # Detecta se a página estava vazia (possível bloqueio)
-        if not self.partidas_lista or len(self.partidas_lista) == 0:
+        if not atualizar and not self.partidas_lista:
             print(f"⚠️ ATENÇÃO: Nenhuma partida processada nesta página!")
             if page_atual < page_maxima:
                 print(f"❌ PARANDO EXECUÇÃO: Página vazia detectada na página {page_atual}/{page_maxima}")
@@ -1534,6 +1744,10 @@ if __name__ == "__main__":
     max_page = 8
     edicao_id = 45
 
+    # True = atualização da temporada em andamento: só partidas novas ou
+    # alteradas desde a última execução abrem a página do jogo
+    atualizar = False
+
     # URL base (sem o parâmetro page)
     url_base = "https://www.ogol.com.br/edicao/campeonato-brasileiro-2015/79735/calendario?fase_in=78272&equipa=0&estado=1&filtro=&op=calendario&page="
 
@@ -1551,15 +1765,16 @@ if __name__ == "__main__":
             if scraper is None:
                 # Primeira página: cria a instância
                 scraper = OGolScraperRelacional(url)
-                scraper.executar(edicao_id=edicao_id)
             else:
                 # Próximas páginas: reutiliza a mesma instância (CACHE mantido!)
                 scraper.url_lista = url
-                scraper.executar(edicao_id=edicao_id)
+            scraper.telemetria.iniciar_pagina(page_num - min_page + 1, max_page - min_page + 1)
+            scraper.executar(edicao_id=edicao_id, atualizar=atualizar)
 
         # Salva cache de URLs para futuras edições
         if scraper:
             scraper._salvar_cache_urls()
+            scraper.telemetria.imprimir_resumo(scraper.telemetria.fechar())
 
         print(f"\n{'='*70}")
         print("✅ Scraping de todas as páginas concluído com sucesso!")
@@ -1573,6 +1788,7 @@ if __name__ == "__main__":
         # Mesmo com erro, salva o cache
         if scraper:
             scraper._salvar_cache_urls()
+            scraper.telemetria.imprimir_resumo(scraper.telemetria.fechar())
 
             # Salva checkpoint com informações para recuperação
             try:
@@ -0,0 +1,198 @@
+import json
+import time
+import bisect
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+# ============================================
+# Telemetria do scraper
+# ============================================
+# Contadores e cronômetros por etapa do OGolScraperRelacional, baratos o
+# bastante para ficarem sempre ligados (um incremento de dicionário por
+# evento; a rede do oGol domina o tempo de qualquer forma):
+#   - http: latência (histograma), bytes, status, 429, retentativas
+#   - parse.<tipo>: tempo do BeautifulSoup por tipo de página
+#   - cache.<entidade>.{sessao,persistido,falta}: acertos do url_cache (e de
+#     onde veio a URL: desta execução ou do cache persistido)
+#   - <entidade>.{criados,reutilizados}
+#   - csv.salvar: tempo gravando os CSVs
+#
+# Cada requisição, partida e o resumo final viram uma linha JSON no arquivo
+# de telemetria (telemetria.jsonl dentro de output_dir). No terminal sai só
+# uma linha de progresso com ETA a cada `intervalo_progresso` segundos.
+
+LIMITES_LATENCIA_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+PREFIXOS_TIPO = {
+    "/jogo/": "jogo",
+    "/equipe/": "clube",
+    "/estadio/": "estadio",
+    "/jogador/": "jogador",
+    "/treinador/": "treinador",
+    "/arbitro/": "arbitro",
+}
+
+
+def tipo_pagina(url):
+    """Tipo da página do oGol pelo caminho da URL"""
+    caminho = urlsplit(url).path
+    if caminho.endswith("/calendario"):
+        return "calendario"
+    for prefixo, tipo in PREFIXOS_TIPO.items():
+        if caminho.startswith(prefixo):
+            return tipo
+    return "outro"
+
+
+def formatar_duracao(segundos):
+    segundos = int(segundos)
+    if segundos >= 3600:
+        return f"{segundos // 3600}h{segundos % 3600 // 60:02d}m"
+    if segundos >= 60:
+        return f"{segundos // 60}m{segundos % 60:02d}s"
+    return f"{segundos}s"
+
+
+class Telemetria:
+    def __init__(self, arquivo=None, intervalo_progresso=30):
+        """
+        Args:
+            arquivo: Arquivo JSON-lines (anexado); None = só em memória
+            intervalo_progresso: Segundos entre duas linhas de progresso no terminal
+        """
+        self.contadores = {}
+        self.tempos = {}            # nome → [contagem, soma, máximo]
+        self.histograma = [0] * (len(LIMITES_LATENCIA_MS) + 1)
+        self.intervalo_progresso = intervalo_progresso
+        self.inicio = time.perf_counter()
+        self._ultimo_progresso = 0.0
+
+        self.pagina = 1
+        self.total_paginas = 1
+        self.partidas_feitas = 0
+
+        self._arquivo = open(arquivo, "a", encoding="utf-8") if arquivo else None
+
+    # ---------- primitivas ----------
+
+    def contar(self, nome, n=1):
+        self.contadores[nome] = self.contadores.get(nome, 0) + n
+
+    def medir(self, nome, segundos):
+        tempo = self.tempos.get(nome)
+        if tempo is None:
+            self.tempos[nome] = [1, segundos, segundos]
+        else:
+            tempo[0] += 1
+            tempo[1] += segundos
+            if segundos > tempo[2]:
+                tempo[2] = segundos
+
+    @contextmanager
+    def cronometro(self, nome):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.medir(nome, time.perf_counter() - inicio)
+
+    def registrar(self, evento, **campos):
+        """Uma linha no arquivo JSON-lines"""
+        if self._arquivo is None:
+            return
+        campos["ts"] = round(time.time(), 3)
+        campos["evento"] = evento
+        self._arquivo.write(json.dumps(campos, ensure_ascii=False, default=str) + "\n")
+
+    # ---------- etapas ----------
+
+    def requisicao(self, url, status, segundos, tamanho, tentativa):
+        """Uma tentativa de GET (status 0 = falha de conexão)"""
+        tipo = tipo_pagina(url)
+        self.contar("http.requisicoes")
+        self.contar(f"http.status.{status}")
+        self.contar("http.bytes", tamanho)
+        if status == 429:
+            self.contar("http.429")
+        self.medir(f"http.{tipo}", segundos)
+        self.histograma[bisect.bisect_left(LIMITES_LATENCIA_MS, segundos * 1000)] += 1
+        self.registrar("http", url=url, tipo=tipo, status=status, ms=round(segundos * 1000, 1),
+                       bytes=tamanho, tentativa=tentativa)
+
+    def iniciar_pagina(self, pagina, total_paginas):
+        """Página `pagina` de `total_paginas` do intervalo (para o ETA)"""
+        self.pagina = pagina
+        self.total_paginas = total_paginas
+        self.registrar("pagina", pagina=pagina, total_paginas=total_paginas)
+
+    def partida_concluida(self, partida_id, linha, total_linhas, url=None):
+        """Fim de uma linha do calendário (linha 1..total_linhas da página atual)"""
+        self.partidas_feitas += 1
+        decorrido = time.perf_counter() - self.inicio
+        restantes = (total_linhas - linha) + (self.total_paginas - self.pagina) * total_linhas
+        eta = decorrido / self.partidas_feitas * restantes
+        self.registrar("partida", partida_id=partida_id, url=url, pagina=self.pagina,
+                       linha=linha, total_linhas=total_linhas, eta_s=round(eta))
+        if self._arquivo is not None:
+            self._arquivo.flush()
+
+        if decorrido - self._ultimo_progresso >= self.intervalo_progresso:
+            self._ultimo_progresso = decorrido
+            por_minuto = self.partidas_feitas / decorrido * 60 if decorrido else 0
+            print(f"⏱️ Página {self.pagina}/{self.total_paginas} · partida {linha}/{total_linhas} · "
+                  f"{por_minuto:.1f} partidas/min · "
+                  f"{self.contadores.get('http.requisicoes', 0)} requisições · "
+                  f"ETA {formatar_duracao(eta)}")
+
+    # ---------- resumo ----------
+
+    def resumo(self):
+        tempos = {nome: {"n": n, "total_s": round(soma, 3), "media_ms": round(soma / n * 1000, 2),
+                         "max_ms": round(maximo * 1000, 2)}
+                  for nome, (n, soma, maximo) in sorted(self.tempos.items())}
+        rotulos = [f"<={limite}ms" for limite in LIMITES_LATENCIA_MS] + [f">{LIMITES_LATENCIA_MS[-1]}ms"]
+
+        taxas_cache = {}
+        for nome in self.contadores:
+            if nome.startswith("cache.") and nome.count(".") == 2:
+                entidade = nome.split(".")[1]
+                if entidade in taxas_cache:
+                    continue
+                acertos = (self.contadores.get(f"cache.{entidade}.sessao", 0)
+                           + self.contadores.get(f"cache.{entidade}.persistido", 0))
+                total = acertos + self.contadores.get(f"cache.{entidade}.falta", 0)
+                taxas_cache[entidade] = round(acertos / total, 4) if total else None
+
+        return {
+            "duracao_s": round(time.perf_counter() - self.inicio, 3),
+            "partidas": self.partidas_feitas,
+            "contadores": dict(sorted(self.contadores.items())),
+            "tempos": tempos,
+            "latencia_http": dict(zip(rotulos, self.histograma)),
+            "taxa_acerto_cache": taxas_cache,
+        }
+
+    def imprimir_resumo(self, resumo=None):
+        resumo = resumo or self.resumo()
+        c = resumo["contadores"]
+        print(f"📊 Telemetria: {resumo['partidas']} partidas em {formatar_duracao(resumo['duracao_s'])}, "
+              f"{c.get('http.requisicoes', 0)} requisições ({c.get('http.bytes', 0) / 1e6:.1f} MB), "
+              f"{c.get('http.429', 0)} erros 429, {c.get('http.retentativas', 0)} retentativas")
+        for entidade, taxa in resumo["taxa_acerto_cache"].items():
+            if taxa is not None:
+                print(f"   ♻️ cache {entidade}: {taxa:.0%} de acerto, "
+                      f"{c.get(f'{entidade}.criados', 0)} criados, "
+                      f"{c.get(f'{entidade}.reutilizados', 0)} reutilizados")
+        salvar = resumo["tempos"].get("csv.salvar")
+        if salvar:
+            print(f"   💾 CSVs: {salvar['total_s']}s em {salvar['n']} gravações")
+
+    def fechar(self):
+        """Grava o resumo no JSON-lines e fecha o arquivo"""
+        resumo = self.resumo()
+        self.registrar("resumo", **resumo)
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+        return resumo
@@ -1,42 +1,58 @@
 # app.py - Versão Completa
-from flask import Flask, render_template, jsonify, request, redirect, g, url_for
+from flask import Flask, Response, render_template, jsonify, request, redirect, g, url_for
 from datetime import datetime
 import sqlite3
+import hashlib
 import json
+import zlib
+import os
+import sys
+
+# Módulos compartilhados com os scripts do banco (classificação etc.) ficam em ../bd
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bd"))
+
+from classificacao import (MotorClassificacao, data_iso, data_ordenavel,
+                           get_formato_campeonato)
+from lideres_temporada import CATEGORIAS as CATEGORIAS_LIDERES, calcular_lideres
+from snapshot_homepage import carregar_snapshot, montar_homepage
+from referencias import CacheReferencia, slugify, versao_arquivo_banco
+from rollups import MODELO_EVENTOS_POR_JOGADOR
+from perfil_sql import Perfilador
 
 app = Flask(__name__)
 
 # ==================== CONFIGURAÇÕES ====================
-DATABASE = "../bd/estruturado_bd_1971.db"
+# BD1971_DATABASE permite apontar para outro arquivo (ex.: freeze.py)
+DATABASE = os.environ.get("BD1971_DATABASE", "../bd/estruturado_bd_1971.db")
 
-# Função para descobrir automaticamente o ano mais recente
-def obter_ano_mais_recente():
-    """
-    Descobre qual é o ano mais recente com dados no banco.
-    Isso evita erros quando tentamos acessar anos sem dados.
-    """
-    try:
-        conn = sqlite3.connect(DATABASE)
-        cursor = conn.cursor()
-        resultado = cursor.execute("SELECT MAX(CAST(ano AS INTEGER)) FROM edicoes").fetchone()
-        conn.close()
-        return resultado[0] if resultado[0] else 1971
-    except Exception as e:
-        print(f"Erro ao obter ano mais recente: {e}")
-        return 1971
-
-ANO_ATUAL = obter_ano_mais_recente()
-ANOS_DISPONIVEIS = list(range(1971, ANO_ATUAL + 1))
+# Clubes, edições, estádios e locais ficam em memória (um cache por processo),
+# recarregados quando o .db muda. O ano atual e os anos disponíveis saem daqui.
+referencias = CacheReferencia(DATABASE)
+
+# Resultados de cada temporada ficam em memória (arrays NumPy) depois da
+# primeira consulta; o cache se invalida sozinho quando o .db é atualizado.
+motor_classificacao = MotorClassificacao(DATABASE)
+
+# Perfil das consultas SQL (BD1971_PERFIL_SQL=1); None quando desligado
+perfilador = Perfilador.do_ambiente()
+if perfilador:
+    perfilador.instalar(app)
 
 # ==================== DATABASE MANAGEMENT ====================
 
+def conectar(rota=None):
+    """Nova conexão com o banco (medida pelo perfilador, se ligado)"""
+    if perfilador:
+        return perfilador.conectar(DATABASE, rota)
+    return sqlite3.connect(DATABASE)
+
 def get_db():
     """
     Obtém conexão com banco de dados.
     Usamos g (contexto global do Flask) para manter uma conexão por requisição.
     """
     if 'db' not in g:
-        g.db = sqlite3.connect(DATABASE)
+        g.db = conectar()
         g.db.row_factory = sqlite3.Row  # Permite acessar colunas por nome
     return g.db
 
@@ -59,47 +75,6 @@ def dict_from_row(row):
 
 # ==================== FUNÇÕES AUXILIARES ====================
 
-def calcular_pontos_vitoria(ano):
-    """
-    IMPORTANTE: Até 1994, vitória valia 2 pontos.
-    A partir de 1995, passou a valer 3 pontos.
-
-    Esta função é usada em TODOS os cálculos de classificação.
-    """
-    return 2 if ano <= 1994 else 3
-
-def slugify(text):
-    """
-    Transforma texto em URL amigável.
-    Exemplo: 'São Paulo' -> 'sao-paulo'
-    """
-    import unicodedata
-    import re
-
-    text = unicodedata.normalize('NFKD', text)
-    text = text.encode('ascii', 'ignore').decode('ascii')
-    text = text.lower()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[-\s]+', '-', text)
-    return text.strip('-')
-
-def get_formato_campeonato(ano):
-    """
-    Determina o formato do campeonato baseado no ano.
-    Isso ajuda a saber se devemos mostrar grupos ou não.
-
-    Formatos históricos do Brasileirão:
-    - Até 1991: Grupos + Fases eliminatórias
-    - 1992-2002: Misto (grupos + mata-mata)
-    - 2003 em diante: Pontos corridos puro
-    """
-    if ano >= 2003:
-        return 'pontos_corridos'
-    elif ano >= 1992:
-        return 'misto'
-    else:
-        return 'grupos_fases'
-
 # ==================== BEFORE REQUEST ====================
 
 @app.before_request
@@ -108,174 +83,43 @@ def setup_globals():
     Configura variáveis globais disponíveis em todos os templates.
     Isso evita ter que passar essas variáveis em cada render_template.
     """
-    g.ANO_ATUAL = ANO_ATUAL
-    g.ANOS_DISPONIVEIS = ANOS_DISPONIVEIS
+    g.referencias = referencias.atual()
+    g.ANO_ATUAL = g.referencias.ano_atual
+    g.ANOS_DISPONIVEIS = g.referencias.anos_disponiveis
 
 # ==================== ROTAS PRINCIPAIS ====================
 
-@app.route("/")
-def index():
-    """Homepage com resumo da temporada atual e dados históricos"""
-    db = get_db()
+# Conteúdo da homepage por versão do arquivo do banco: o snapshot (ou a
+# consulta ao vivo) só é relido quando o .db muda
+_homepage_cache = {"atual": (None, None)}
 
-    # Classificação do ano atual (top 10)
-    pontos_vitoria = calcular_pontos_vitoria(ANO_ATUAL)
-    classificacao_atual = db.execute(f"""
-        WITH jogos_mandante AS (
-            SELECT
-                c.clube,
-                p.mandante_placar AS gols_pro,
-                p.visitante_placar AS gols_sofrido,
-                CASE
-                    WHEN p.mandante_placar > p.visitante_placar THEN {pontos_vitoria}
-                    WHEN p.mandante_placar = p.visitante_placar THEN 1
-                    ELSE 0
-                END AS pontos,
-                CASE WHEN p.mandante_placar > p.visitante_placar THEN 1 ELSE 0 END AS vitorias,
-                CASE WHEN p.mandante_placar = p.visitante_placar THEN 1 ELSE 0 END AS empates,
-                CASE WHEN p.mandante_placar < p.visitante_placar THEN 1 ELSE 0 END AS derrotas
-            FROM partidas p
-            JOIN clubes c ON p.mandante_id = c.ID
-            JOIN edicoes ed ON p.edicao_id = ed.ID
-            WHERE ed.ano = ?
-        ),
-        jogos_visitante AS (
-            SELECT
-                c.clube,
-                p.visitante_placar AS gols_pro,
-                p.mandante_placar AS gols_sofrido,
-                CASE
-                    WHEN p.visitante_placar > p.mandante_placar THEN {pontos_vitoria}
-                    WHEN p.visitante_placar = p.mandante_placar THEN 1
-                    ELSE 0
-                END AS pontos,
-                CASE WHEN p.visitante_placar > p.mandante_placar THEN 1 ELSE 0 END AS vitorias,
-                CASE WHEN p.visitante_placar = p.mandante_placar THEN 1 ELSE 0 END AS empates,
-                CASE WHEN p.visitante_placar < p.mandante_placar THEN 1 ELSE 0 END AS derrotas
-            FROM partidas p
-            JOIN clubes c ON p.visitante_id = c.ID
-            JOIN edicoes ed ON p.edicao_id = ed.ID
-            WHERE ed.ano = ?
-        ),
-        todos_jogos AS (
-            SELECT * FROM jogos_mandante
-            UNION ALL
-            SELECT * FROM jogos_visitante
-        )
-        SELECT
-            ROW_NUMBER() OVER (
-                ORDER BY SUM(pontos) DESC, SUM(vitorias) DESC,
-                (SUM(gols_pro) - SUM(gols_sofrido)) DESC, SUM(gols_pro) DESC
-            ) AS posicao,
-            clube,
-            COUNT(*) AS jogos,
-            SUM(pontos) AS pts,
-            SUM(vitorias) AS v,
-            SUM(empates) AS e,
-            SUM(derrotas) AS d,
-            SUM(gols_pro) AS gp,
-            SUM(gols_sofrido) AS gc,
-            (SUM(gols_pro) - SUM(gols_sofrido)) AS sg
-        FROM todos_jogos
-        GROUP BY clube
-        ORDER BY pts DESC, v DESC, sg DESC, gp DESC
-    """, (ANO_ATUAL, ANO_ATUAL)).fetchall()
-
-    # Últimos 10 jogos
-    ultimos_jogos = db.execute("""
-        SELECT
-            p.ID,
-            cm.clube AS mandante,
-            cv.clube AS visitante,
-            p.mandante_placar,
-            p.visitante_placar,
-            p.data,
-            p.fase,
-            ed.ano,
-            est.estadio
-        FROM partidas p
-        JOIN clubes cm ON p.mandante_id = cm.ID
-        JOIN clubes cv ON p.visitante_id = cv.ID
-        JOIN edicoes ed ON p.edicao_id = ed.ID
-        LEFT JOIN estadios est ON p.estadio_id = est.ID
-        WHERE ed.ano = ?
-            AND p.mandante_placar IS NOT NULL
-            AND p.visitante_placar IS NOT NULL
-        ORDER BY p.data DESC
-        LIMIT 10
-    """, (ANO_ATUAL,)).fetchall()
+def dados_homepage(db):
+    """
+    Conteúdo da homepage. Vem do snapshot gravado pela migração
+    (bd/snapshot_homepage.py); se ele não existir ou estiver velho, consulta
+    o banco ao vivo.
+    """
+    versao_banco = versao_arquivo_banco(DATABASE)
+    versao, dados = _homepage_cache["atual"]
+    if versao_banco is not None and versao == versao_banco:
+        return dados
 
-    # Top 5 histórico
-    top_historico = db.execute("""
-        WITH jogos_mandante AS (
-            SELECT
-                c.clube,
-                ed.ano,
-                p.mandante_placar AS gols_pro,
-                p.visitante_placar AS gols_sofrido,
-                CASE
-                    WHEN p.mandante_placar > p.visitante_placar THEN
-                        CASE WHEN ed.ano <= 1994 THEN 2 ELSE 3 END
-                    WHEN p.mandante_placar = p.visitante_placar THEN 1
-                    ELSE 0
-                END AS pontos,
-                CASE WHEN p.mandante_placar > p.visitante_placar THEN 1 ELSE 0 END AS vitorias
-            FROM partidas p
-            JOIN clubes c ON p.mandante_id = c.ID
-            JOIN edicoes ed ON p.edicao_id = ed.ID
-        ),
-        jogos_visitante AS (
-            SELECT
-                c.clube,
-                ed.ano,
-                p.visitante_placar AS gols_pro,
-                p.mandante_placar AS gols_sofrido,
-                CASE
-                    WHEN p.visitante_placar > p.mandante_placar THEN
-                        CASE WHEN ed.ano <= 1994 THEN 2 ELSE 3 END
-                    WHEN p.visitante_placar = p.mandante_placar THEN 1
-                    ELSE 0
-                END AS pontos,
-                CASE WHEN p.visitante_placar > p.mandante_placar THEN 1 ELSE 0 END AS vitorias
-            FROM partidas p
-            JOIN clubes c ON p.visitante_id = c.ID
-            JOIN edicoes ed ON p.edicao_id = ed.ID
-        ),
-        todos_jogos AS (
-            SELECT * FROM jogos_mandante
-            UNION ALL
-            SELECT * FROM jogos_visitante
-        )
-        SELECT
-            clube,
-            SUM(pontos) AS pontos_total,
-            COUNT(*) AS jogos_total,
-            SUM(vitorias) AS vitorias_total
-        FROM todos_jogos
-        GROUP BY clube
-        ORDER BY pontos_total DESC, vitorias_total DESC
-        LIMIT 5
-    """).fetchall()
+    dados = carregar_snapshot(db)
+    if dados is None or dados["ano_atual"] != g.ANO_ATUAL:
+        dados = montar_homepage(db, g.ANO_ATUAL)
+    _homepage_cache["atual"] = (versao_banco, dados)
+    return dados
 
-    # Estatísticas gerais
-    stats_gerais = db.execute("""
-        SELECT
-            COUNT(DISTINCT c.ID) as total_clubes,
-            COUNT(DISTINCT p.ID) as total_partidas,
-            COUNT(DISTINCT j.ID) as total_jogadores,
-            COUNT(DISTINCT ed.ano) as total_edicoes
-        FROM clubes c
-        LEFT JOIN partidas p ON c.ID = p.mandante_id OR c.ID = p.visitante_id
-        LEFT JOIN jogadores_em_partida jp ON p.ID = jp.partida_id
-        LEFT JOIN jogadores j ON jp.jogador_id = j.ID
-        LEFT JOIN edicoes ed ON p.edicao_id = ed.ID
-    """).fetchone()
+@app.route("/")
+def index():
+    """Homepage com resumo da temporada atual e dados históricos"""
+    dados = dados_homepage(get_db())
 
     return render_template('index.html',
-                         classificacao_atual=[dict_from_row(r) for r in classificacao_atual],
-                         ultimos_jogos=[dict_from_row(r) for r in ultimos_jogos],
-                         top_historico=[dict_from_row(r) for r in top_historico],
-                         stats_gerais=dict_from_row(stats_gerais))
+                         classificacao_atual=dados["classificacao_atual"],
+                         ultimos_jogos=dados["ultimos_jogos"],
+                         top_historico=dados["top_historico"],
+                         stats_gerais=dados["stats_gerais"])
 
 @app.route("/explorar")
 def explorar():
@@ -408,8 +252,7 @@ def temporada(ano):
         # Tem grupos! Calcular classificação de cada grupo
         for grupo_row in grupos_existentes:
             grupo = grupo_row['mandante_grupo']
-            class_grupo = calcular_classificacao_grupo(ano, grupo)
-            classificacoes_por_grupo[grupo] = class_grupo
+            classificacoes_por_grupo[grupo] = calcular_classificacao_grupo(ano, grupo)
 
         # Para temporada.html, vamos passar classificação geral também
         classificacao = calcular_classificacao_geral(ano)
@@ -417,229 +260,142 @@ def temporada(ano):
         # Não tem grupos, classificação simples
         classificacao = calcular_classificacao_geral(ano)
 
-    # Artilheiros
-    artilheiros = db.execute("""
-        SELECT
-            j.nome,
-            j.apelido,
-            j.ID as jogador_id,
-            SUM(jp.gols) as total_gols,
-            COUNT(DISTINCT jp.partida_id) as jogos
-        FROM jogadores_em_partida jp
-        JOIN jogadores j ON jp.jogador_id = j.ID
-        JOIN partidas p ON jp.partida_id = p.ID
-        JOIN edicoes ed ON p.edicao_id = ed.ID
-        WHERE ed.ano = ? AND jp.gols > 0
-        GROUP BY j.ID
-        ORDER BY total_gols DESC, jogos ASC
-        LIMIT 10
-    """, (ano,)).fetchall()
+    # Artilheiros (ranking pré-calculado em lideres_temporada)
+    artilheiros = consultar_lideres(db, edicao['ID'], ['gols'], 10)['gols']
 
     return render_template('temporada.html',
                          ano=ano,
                          edicao=dict_from_row(edicao),
-                         classificacao=[dict_from_row(r) for r in classificacao],
-                         classificacoes_por_grupo={g: [dict_from_row(r) for r in c]
-                                                   for g, c in classificacoes_por_grupo.items()},
-                         artilheiros=[dict_from_row(r) for r in artilheiros],
+                         classificacao=classificacao,
+                         classificacoes_por_grupo=classificacoes_por_grupo,
+                         artilheiros=artilheiros,
                          formato=formato)
 
-def calcular_classificacao_geral(ano):
+LIDERES_LIMITE_PADRAO = 10
+LIDERES_LIMITE_MAXIMO = 100
+
+def consultar_lideres(db, edicao_id, categorias, limite=LIDERES_LIMITE_PADRAO):
+    """
+    Top-N de cada categoria da edição: {categoria: [{posicao, jogador_id,
+    nome, apelido, clube_id, clube, valor, jogos}, ...]}.
+
+    Lê a tabela lideres_temporada (bd/lideres_temporada.py), onde cada
+    ranking já está ordenado; se ela não existir, calcula na hora.
+    """
+    try:
+        return {
+            categoria: [dict_from_row(r) for r in db.execute("""
+                SELECT l.posicao, l.jogador_id, j.nome, j.apelido,
+                       l.clube_id, c.clube, l.valor, l.jogos
+                FROM lideres_temporada l
+                JOIN jogadores j ON l.jogador_id = j.ID
+                LEFT JOIN clubes c ON l.clube_id = c.ID
+                WHERE l.edicao_id = ? AND l.categoria = ? AND l.ordem <= ?
+                ORDER BY l.ordem
+            """, (edicao_id, categoria, limite))]
+            for categoria in categorias
+        }
+    except sqlite3.OperationalError:
+        # Banco sem a tabela resumo (bd/lideres_temporada.py ainda não rodou)
+        rankings = calcular_lideres(db, edicao_id)
+
+    selecionados = {categoria: rankings[categoria][:limite] for categoria in categorias}
+    jogador_ids = sorted({l[2] for linhas in selecionados.values() for l in linhas})
+    marcadores = ", ".join("?" * len(jogador_ids))
+    jogadores = {r['ID']: (r['nome'], r['apelido']) for r in db.execute(
+        f"SELECT ID, nome, apelido FROM jogadores WHERE ID IN ({marcadores})", jogador_ids)}
+
+    return {
+        categoria: [
+            {"posicao": posicao, "jogador_id": jogador_id,
+             "nome": jogadores.get(jogador_id, (None, None))[0],
+             "apelido": jogadores.get(jogador_id, (None, None))[1],
+             "clube_id": clube_id, "clube": g.referencias.nome_clube(clube_id),
+             "valor": valor, "jogos": jogos}
+            for _ordem, posicao, jogador_id, clube_id, valor, jogos in linhas
+        ]
+        for categoria, linhas in selecionados.items()
+    }
+
+def calcular_classificacao_geral(ano, ate_rodada=None):
     """
     Calcula classificação geral do ano, respeitando sistema de pontos.
     Esta função é o coração do sistema de classificação!
-    """
-    db = get_db()
-    pontos_vitoria = calcular_pontos_vitoria(ano)
 
-    return db.execute(f"""
-        WITH jogos_mandante AS (
-            SELECT
-                c.clube, c.ID as clube_id,
-                p.mandante_placar AS gols_pro,
-                p.visitante_placar AS gols_sofrido,
-                CASE
-                    WHEN p.mandante_placar > p.visitante_placar THEN {pontos_vitoria}
-                    WHEN p.mandante_placar = p.visitante_placar THEN 1
-                    ELSE 0
-                END AS pontos,
-                CASE WHEN p.mandante_placar > p.visitante_placar THEN 1 ELSE 0 END AS v,
-                CASE WHEN p.mandante_placar = p.visitante_placar THEN 1 ELSE 0 END AS e,
-                CASE WHEN p.mandante_placar < p.visitante_placar THEN 1 ELSE 0 END AS d
-            FROM partidas p
-            JOIN clubes c ON p.mandante_id = c.ID
-            JOIN edicoes ed ON p.edicao_id = ed.ID
-            WHERE ed.ano = ?
-        ),
-        jogos_visitante AS (
-            SELECT
-                c.clube, c.ID as clube_id,
-                p.visitante_placar AS gols_pro,
-                p.mandante_placar AS gols_sofrido,
-                CASE
-                    WHEN p.visitante_placar > p.mandante_placar THEN {pontos_vitoria}
-                    WHEN p.visitante_placar = p.mandante_placar THEN 1
-                    ELSE 0
-                END AS pontos,
-                CASE WHEN p.visitante_placar > p.mandante_placar THEN 1 ELSE 0 END AS v,
-                CASE WHEN p.visitante_placar = p.mandante_placar THEN 1 ELSE 0 END AS e,
-                CASE WHEN p.visitante_placar < p.mandante_placar THEN 1 ELSE 0 END AS d
-            FROM partidas p
-            JOIN clubes c ON p.visitante_id = c.ID
-            JOIN edicoes ed ON p.edicao_id = ed.ID
-            WHERE ed.ano = ?
-        ),
-        todos_jogos AS (
-            SELECT * FROM jogos_mandante
-            UNION ALL
-            SELECT * FROM jogos_visitante
-        )
-        SELECT
-            ROW_NUMBER() OVER (
-                ORDER BY SUM(pontos) DESC, SUM(v) DESC,
-                (SUM(gols_pro) - SUM(gols_sofrido)) DESC, SUM(gols_pro) DESC
-            ) AS pos,
-            clube,
-            clube_id,
-            COUNT(*) AS j,
-            SUM(pontos) AS pts,
-            SUM(v) AS v,
-            SUM(e) AS e,
-            SUM(d) AS d,
-            SUM(gols_pro) AS gp,
-            SUM(gols_sofrido) AS gc,
-            (SUM(gols_pro) - SUM(gols_sofrido)) AS sg
-        FROM todos_jogos
-        GROUP BY clube
-        ORDER BY pts DESC, v DESC, sg DESC, gp DESC
-    """, (ano, ano)).fetchall()
+    O cálculo em si fica em bd/classificacao.py (compartilhado com a API e os
+    scripts); aqui só usamos a conexão da requisição na primeira leitura.
+    """
+    return motor_classificacao.classificacao(ano, ate_rodada=ate_rodada, conn=get_db())
 
 def calcular_classificacao_grupo(ano, grupo):
     """
     Calcula classificação de um grupo específico.
     Usado para campeonatos com fase de grupos.
     """
-    db = get_db()
-    pontos_vitoria = calcular_pontos_vitoria(ano)
-
-    return db.execute(f"""
-        WITH jogos_mandante AS (
-            SELECT
-                c.clube,
-                p.mandante_placar AS gols_pro,
-                p.visitante_placar AS gols_sofrido,
-                CASE
-                    WHEN p.mandante_placar > p.visitante_placar THEN {pontos_vitoria}
-                    WHEN p.mandante_placar = p.visitante_placar THEN 1
-                    ELSE 0
-                END AS pontos,
-                CASE WHEN p.mandante_placar > p.visitante_placar THEN 1 ELSE 0 END AS v,
-                CASE WHEN p.mandante_placar = p.visitante_placar THEN 1 ELSE 0 END AS e,
-                CASE WHEN p.mandante_placar < p.visitante_placar THEN 1 ELSE 0 END AS d
-            FROM partidas p
-            JOIN clubes c ON p.mandante_id = c.ID
-            JOIN edicoes ed ON p.edicao_id = ed.ID
-            WHERE ed.ano = ? AND p.mandante_grupo = ?
-        ),
-        jogos_visitante AS (
-            SELECT
-                c.clube,
-                p.visitante_placar AS gols_pro,
-                p.mandante_placar AS gols_sofrido,
-                CASE
-                    WHEN p.visitante_placar > p.mandante_placar THEN {pontos_vitoria}
-                    WHEN p.visitante_placar = p.mandante_placar THEN 1
-                    ELSE 0
-                END AS pontos,
-                CASE WHEN p.visitante_placar > p.mandante_placar THEN 1 ELSE 0 END AS v,
-                CASE WHEN p.visitante_placar = p.mandante_placar THEN 1 ELSE 0 END AS e,
-                CASE WHEN p.visitante_placar < p.mandante_placar THEN 1 ELSE 0 END AS d
-            FROM partidas p
-            JOIN clubes c ON p.visitante_id = c.ID
-            JOIN edicoes ed ON p.edicao_id = ed.ID
-            WHERE ed.ano = ? AND p.visitante_grupo = ?
-        ),
-        todos_jogos AS (
-            SELECT * FROM jogos_mandante
-            UNION ALL
-            SELECT * FROM jogos_visitante
-        )
-        SELECT
-            ROW_NUMBER() OVER (
-                ORDER BY SUM(pontos) DESC, SUM(v) DESC,
-                (SUM(gols_pro) - SUM(gols_sofrido)) DESC, SUM(gols_pro) DESC
-            ) AS pos,
-            clube,
-            COUNT(*) AS j,
-            SUM(pontos) AS pts,
-            SUM(v) AS v,
-            SUM(e) AS e,
-            SUM(d) AS d,
-            SUM(gols_pro) AS gp,
-            SUM(gols_sofrido) AS gc,
-            (SUM(gols_pro) - SUM(gols_sofrido)) AS sg
-        FROM todos_jogos
-        GROUP BY clube
-        ORDER BY pts DESC, v DESC, sg DESC, gp DESC
-    """, (ano, grupo, ano, grupo)).fetchall()
+    return motor_classificacao.resultados(ano, conn=get_db()).classificacao_grupo(grupo)
 
 @app.route("/clube/<string:nome>")
 def clube(nome):
     """Página detalhada de um clube"""
     db = get_db()
 
-    info = db.execute("""
-        SELECT c.*, l.cidade, l.estado, l.UF
-        FROM clubes c
-        LEFT JOIN locais l ON c.local_id = l.ID
-        WHERE c.clube = ?
-    """, (nome,)).fetchone()
+    info = g.referencias.clube_por_nome.get(nome)
 
     if not info:
         return render_template('error.html',
                              mensagem=f"Clube '{nome}' não encontrado."), 404
 
+    clube_id = info['ID']
     stats = db.execute("""
         SELECT
             COUNT(DISTINCT p.ID) as total_jogos,
             SUM(CASE
-                WHEN (cm.clube = ? AND p.mandante_placar > p.visitante_placar) OR
-                     (cv.clube = ? AND p.visitante_placar > p.mandante_placar)
+                WHEN (p.mandante_id = ? AND p.mandante_placar > p.visitante_placar) OR
+                     (p.visitante_id = ? AND p.visitante_placar > p.mandante_placar)
                 THEN 1 ELSE 0 END) as vitorias,
             SUM(CASE WHEN p.mandante_placar = p.visitante_placar THEN 1 ELSE 0 END) as empates,
             SUM(CASE
-                WHEN (cm.clube = ? AND p.mandante_placar < p.visitante_placar) OR
-                     (cv.clube = ? AND p.visitante_placar < p.mandante_placar)
+                WHEN (p.mandante_id = ? AND p.mandante_placar < p.visitante_placar) OR
+                     (p.visitante_id = ? AND p.visitante_placar < p.mandante_placar)
                 THEN 1 ELSE 0 END) as derrotas
         FROM partidas p
-        JOIN clubes cm ON p.mandante_id = cm.ID
-        JOIN clubes cv ON p.visitante_id = cv.ID
-        WHERE cm.clube = ? OR cv.clube = ?
-    """, (nome, nome, nome, nome, nome, nome)).fetchone()
+        WHERE p.mandante_id = ? OR p.visitante_id = ?
+    """, (clube_id,) * 6).fetchone()
 
     ultimos_jogos = db.execute("""
         SELECT
             p.ID,
-            cm.clube as mandante,
-            cv.clube as visitante,
+            p.mandante_id,
+            p.visitante_id,
             p.mandante_placar,
             p.visitante_placar,
             p.data,
             ed.ano,
             p.fase
         FROM partidas p
-        JOIN clubes cm ON p.mandante_id = cm.ID
-        JOIN clubes cv ON p.visitante_id = cv.ID
         JOIN edicoes ed ON p.edicao_id = ed.ID
-        WHERE cm.clube = ? OR cv.clube = ?
+        WHERE p.mandante_id = ? OR p.visitante_id = ?
         ORDER BY ed.ano DESC, p.data DESC
         LIMIT 20
-    """, (nome, nome)).fetchall()
+    """, (clube_id, clube_id)).fetchall()
+    ultimos_jogos = g.referencias.hidratar_partidas([dict_from_row(r) for r in ultimos_jogos])
+
+    # Rating Elo atual (tabela gerada por bd/ratings.py)
+    try:
+        rating = db.execute("""
+            SELECT rating_depois FROM ratings_clubes
+            WHERE clube_id = ?
+            ORDER BY ordem DESC
+            LIMIT 1
+        """, (clube_id,)).fetchone()
+    except sqlite3.OperationalError:
+        rating = None
 
     return render_template('clube.html',
-                         clube=dict_from_row(info),
+                         clube=info,
                          stats=dict_from_row(stats),
-                         ultimos_jogos=[dict_from_row(r) for r in ultimos_jogos])
+                         rating=round(rating[0]) if rating else None,
+                         ultimos_jogos=ultimos_jogos)
 
 # Continuarei com as rotas restantes (jogo, jogador, etc.) na próxima mensagem
 # por questão de tamanho...
@@ -803,11 +559,93 @@ def jogo(jogo_id):
         treinadores=[dict_from_row(t) for t in treinadores]
     )
 
+# ==================== PAGINAÇÃO DE PARTIDAS ====================
+
+TAMANHO_PAGINA = 20
+TAMANHO_PAGINA_MAXIMO = 100
+
+def ler_cursor(valor):
+    """
+    Cursor de paginação no formato '<edicao_id>,<partida_id>' (o último item
+    da página anterior). Retorna (edicao_id, partida_id), ou None sem cursor.
+    Levanta ValueError para um cursor malformado.
+    """
+    if not valor:
+        return None
+    partes = valor.split(',')
+    if len(partes) != 2:
+        raise ValueError(f"cursor inválido: {valor!r}")
+    return int(partes[0]), int(partes[1])
+
+def paginar_partidas(db, sql, parametros, cursor=None, limite=TAMANHO_PAGINA):
+    """
+    Paginação por chave (keyset): em vez de OFFSET, cada página começa logo
+    depois do último (edicao_id, ID) da anterior. O custo de cada página não
+    cresce com o número de páginas já vistas.
+
+    `sql` deve selecionar p.edicao_id e p.ID AS partida_id e ter o marcador
+    {cursor} no WHERE; a ordenação (edicao_id DESC, ID DESC) é acrescentada
+    aqui. As chaves são numéricas: ed.ano é TEXT ('1973/1974') e não serve
+    de cursor; as edições são numeradas em ordem cronológica.
+    Clubes e campeonato vêm só como IDs (mandante_id, visitante_id,
+    clube_id, edicao_id) e os nomes são preenchidos pelo cache de
+    referências, sem JOIN.
+
+    Retorna (partidas, proximo_cursor); proximo_cursor é None na última página.
+    """
+    limite = max(1, min(limite or TAMANHO_PAGINA, TAMANHO_PAGINA_MAXIMO))
+    if cursor:
+        filtro = "AND (p.edicao_id < ? OR (p.edicao_id = ? AND p.ID < ?))"
+        parametros = tuple(parametros) + (cursor[0], cursor[0], cursor[1])
+    else:
+        filtro = ""
+
+    linhas = db.execute(
+        sql.format(cursor=filtro) + " ORDER BY p.edicao_id DESC, p.ID DESC LIMIT ?",
+        tuple(parametros) + (limite + 1,)
+    ).fetchall()
+
+    partidas = g.referencias.hidratar_partidas([dict_from_row(l) for l in linhas[:limite]])
+    for p in partidas:
+        # Jogador/treinador: clube pelo qual atuou; árbitro/estádio: campeonato
+        p["detalhe"] = p.get("clube") or p.get("campeonato")
+    proximo = None
+    if len(linhas) > limite:
+        ultima = partidas[-1]
+        proximo = f"{ultima['edicao_id']},{ultima['partida_id']}"
+    return partidas, proximo
+
+SQL_PARTIDAS_JOGADOR = """
+    SELECT
+        p.ID as partida_id,
+        p.data,
+        ed.ano,
+        p.mandante_id,
+        p.visitante_id,
+        p.mandante_placar,
+        p.visitante_placar,
+        p.edicao_id,
+        jp.clube_id,
+        jp.titular
+    FROM jogadores_em_partida jp
+    JOIN partidas p ON jp.partida_id = p.ID
+    JOIN edicoes ed ON p.edicao_id = ed.ID
+    WHERE jp.jogador_id = ? {cursor}
+"""
+
+# Eventos de um jogador (?) por partida, para a carreira sem a tabela resumo
+SQL_EVENTOS_DO_JOGADOR = MODELO_EVENTOS_POR_JOGADOR.format(filtro="e.jogador_id = ?")
+
 # ROTAS SIMPLES para páginas individuais
 
 @app.route("/jogador/<int:jogador_id>")
 def jogador(jogador_id):
-    """Página do jogador"""
+    """
+    Página do jogador.
+    O resumo da carreira vem da tabela jogador_carreira_resumo (uma linha por
+    clube × temporada); a lista de partidas mostra só a primeira página e o
+    resto é carregado sob demanda por /api/jogador/<id>/partidas.
+    """
     db = get_db()
 
     info_jogador = db.execute("""
@@ -819,38 +657,109 @@ def jogador(jogador_id):
     if not info_jogador:
         return render_template('error.html', mensagem="Jogador não encontrado."), 404
 
-    partidas = db.execute("""
-        SELECT
-            p.ID as partida_id,
-            p.data,
-            ed.ano,
-            cm.clube as mandante,
-            cv.clube as visitante,
-            p.mandante_placar,
-            p.visitante_placar,
-            c.clube as clube_jogador,
-            jp.gols,
-            jp.assistencias,
-            jp.cartao_amarelo,
-            jp.cartao_vermelho,
-            jp.titular
-        FROM jogadores_em_partida jp
-        JOIN partidas p ON jp.partida_id = p.ID
-        JOIN clubes c ON jp.clube_id = c.ID
-        JOIN clubes cm ON p.mandante_id = cm.ID
-        JOIN clubes cv ON p.visitante_id = cv.ID
-        JOIN edicoes ed ON p.edicao_id = ed.ID
-        WHERE jp.jogador_id = ?
-        ORDER BY ed.ano DESC, p.data DESC
-    """, (jogador_id,)).fetchall()
+    try:
+        carreira = db.execute("""
+            SELECT r.ano, c.clube, r.jogos, r.titular, r.gols, r.assistencias,
+                   r.cartao_amarelo, r.cartao_vermelho
+            FROM jogador_carreira_resumo r
+            JOIN clubes c ON r.clube_id = c.ID
+            WHERE r.jogador_id = ?
+            ORDER BY r.ano DESC, c.clube
+        """, (jogador_id,)).fetchall()
+    except sqlite3.OperationalError:
+        # Banco sem a tabela resumo (bd/carreira_jogadores.py ainda não rodou)
+        carreira = db.execute(f"""
+            SELECT ed.ano, c.clube, COUNT(*) AS jogos, TOTAL(jp.titular) AS titular,
+                   TOTAL(COALESCE(ev.gols, jp.gols)) AS gols,
+                   TOTAL(COALESCE(ev.assistencias, jp.assistencias)) AS assistencias,
+                   TOTAL(COALESCE(ev.amarelos, jp.cartao_amarelo)) AS cartao_amarelo,
+                   TOTAL(COALESCE(ev.vermelhos, jp.cartao_vermelho)) AS cartao_vermelho
+            FROM jogadores_em_partida jp
+            LEFT JOIN ({SQL_EVENTOS_DO_JOGADOR}) ev
+                   ON ev.partida_id = jp.partida_id AND ev.jogador_id = jp.jogador_id
+            JOIN partidas p ON jp.partida_id = p.ID
+            JOIN clubes c ON jp.clube_id = c.ID
+            JOIN edicoes ed ON p.edicao_id = ed.ID
+            WHERE jp.jogador_id = ?
+            GROUP BY ed.ano, c.clube
+            ORDER BY ed.ano DESC, c.clube
+        """, (jogador_id, jogador_id)).fetchall()
+
+    carreira = [dict_from_row(r) for r in carreira]
+    totais = {chave: int(sum(r[chave] or 0 for r in carreira))
+              for chave in ('jogos', 'titular', 'gols', 'assistencias',
+                            'cartao_amarelo', 'cartao_vermelho')}
+
+    partidas, proximo = paginar_partidas(db, SQL_PARTIDAS_JOGADOR, (jogador_id,))
 
     return render_template("jogador.html",
                           jogador=dict_from_row(info_jogador),
-                          partidas=[dict_from_row(p) for p in partidas])
+                          carreira=carreira,
+                          totais=totais,
+                          partidas=partidas,
+                          proximo_cursor=proximo)
+
+SQL_PARTIDAS_ARBITRO = """
+    SELECT
+        p.ID as partida_id,
+        p.data,
+        ed.ano,
+        p.mandante_id,
+        p.visitante_id,
+        p.mandante_placar,
+        p.visitante_placar,
+        p.edicao_id
+    FROM arbitros_em_partida ap
+    JOIN partidas p ON ap.partida_id = p.ID
+    JOIN edicoes ed ON p.edicao_id = ed.ID
+    WHERE ap.arbitro_id = ? {cursor}
+"""
+
+SQL_PARTIDAS_TREINADOR = """
+    SELECT
+        p.ID as partida_id,
+        p.data,
+        ed.ano,
+        p.mandante_id,
+        p.visitante_id,
+        p.mandante_placar,
+        p.visitante_placar,
+        p.edicao_id,
+        tp.clube_id,
+        tp.tipo
+    FROM treinadores_em_partida tp
+    JOIN partidas p ON tp.partida_id = p.ID
+    JOIN edicoes ed ON p.edicao_id = ed.ID
+    WHERE tp.treinador_id = ? {cursor}
+"""
+
+SQL_PARTIDAS_ESTADIO = """
+    SELECT
+        p.ID as partida_id,
+        p.data,
+        ed.ano,
+        p.mandante_id,
+        p.visitante_id,
+        p.mandante_placar,
+        p.visitante_placar,
+        p.publico,
+        p.edicao_id
+    FROM partidas p
+    JOIN edicoes ed ON p.edicao_id = ed.ID
+    WHERE p.estadio_id = ? {cursor}
+"""
+
+# Entidades com lista de partidas paginada: /api/<entidade>/<id>/partidas
+CONSULTAS_PARTIDAS = {
+    'jogador': SQL_PARTIDAS_JOGADOR,
+    'arbitro': SQL_PARTIDAS_ARBITRO,
+    'treinador': SQL_PARTIDAS_TREINADOR,
+    'estadio': SQL_PARTIDAS_ESTADIO,
+}
 
 @app.route("/arbitro/<int:arbitro_id>")
 def arbitro(arbitro_id):
-    """Página do árbitro"""
+    """Página do árbitro (partidas paginadas por /api/arbitro/<id>/partidas)"""
     db = get_db()
 
     info_arbitro = db.execute("""
@@ -862,33 +771,20 @@ def arbitro(arbitro_id):
     if not info_arbitro:
         return render_template('error.html', mensagem="Árbitro não encontrado."), 404
 
-    partidas = db.execute("""
-        SELECT
-            p.ID as partida_id,
-            p.data,
-            ed.ano,
-            cm.clube as mandante,
-            cv.clube as visitante,
-            p.mandante_placar,
-            p.visitante_placar,
-            camp.campeonato
-        FROM arbitros_em_partida ap
-        JOIN partidas p ON ap.partida_id = p.ID
-        JOIN clubes cm ON p.mandante_id = cm.ID
-        JOIN clubes cv ON p.visitante_id = cv.ID
-        JOIN edicoes ed ON p.edicao_id = ed.ID
-        JOIN campeonatos camp ON ed.campeonato_id = camp.ID
-        WHERE ap.arbitro_id = ?
-        ORDER BY ed.ano DESC, p.data DESC
-    """, (arbitro_id,)).fetchall()
+    total = db.execute(
+        "SELECT COUNT(*) FROM arbitros_em_partida WHERE arbitro_id = ?", (arbitro_id,)
+    ).fetchone()[0]
+    partidas, proximo = paginar_partidas(db, SQL_PARTIDAS_ARBITRO, (arbitro_id,))
 
     return render_template("arbitro.html",
                           arbitro=dict_from_row(info_arbitro),
-                          partidas=[dict_from_row(p) for p in partidas])
+                          total_partidas=total,
+                          partidas=partidas,
+                          proximo_cursor=proximo)
 
 @app.route("/treinador/<int:treinador_id>")
 def treinador(treinador_id):
-    """Página do treinador"""
+    """Página do treinador (partidas paginadas por /api/treinador/<id>/partidas)"""
     db = get_db()
 
     info_treinador = db.execute("""
@@ -900,34 +796,20 @@ def treinador(treinador_id):
     if not info_treinador:
         return render_template('error.html', mensagem="Treinador não encontrado."), 404
 
-    partidas = db.execute("""
-        SELECT
-            p.ID as partida_id,
-            p.data,
-            ed.ano,
-            cm.clube as mandante,
-            cv.clube as visitante,
-            p.mandante_placar,
-            p.visitante_placar,
-            c.clube as clube_treinador,
-            tp.tipo
-        FROM treinadores_em_partida tp
-        JOIN partidas p ON tp.partida_id = p.ID
-        JOIN clubes c ON tp.clube_id = c.ID
-        JOIN clubes cm ON p.mandante_id = cm.ID
-        JOIN clubes cv ON p.visitante_id = cv.ID
-        JOIN edicoes ed ON p.edicao_id = ed.ID
-        WHERE tp.treinador_id = ?
-        ORDER BY ed.ano DESC, p.data DESC
-    """, (treinador_id,)).fetchall()
+    total = db.execute(
+        "SELECT COUNT(*) FROM treinadores_em_partida WHERE treinador_id = ?", (treinador_id,)
+    ).fetchone()[0]
+    partidas, proximo = paginar_partidas(db, SQL_PARTIDAS_TREINADOR, (treinador_id,))
 
     return render_template("treinador.html",
                           treinador=dict_from_row(info_treinador),
-                          partidas=[dict_from_row(p) for p in partidas])
+                          total_partidas=total,
+                          partidas=partidas,
+                          proximo_cursor=proximo)
 
 @app.route("/estadio/<int:estadio_id>")
 def estadio(estadio_id):
-    """Página do estádio"""
+    """Página do estádio (partidas paginadas por /api/estadio/<id>/partidas)"""
     db = get_db()
 
     info_estadio = db.execute("""
@@ -944,30 +826,16 @@ def estadio(estadio_id):
     if not info_estadio:
         return render_template('error.html', mensagem="Estádio não encontrado."), 404
 
-    partidas = db.execute("""
-        SELECT
-            p.ID as partida_id,
-            p.data,
-            ed.ano,
-            cm.clube as mandante,
-            cv.clube as visitante,
-            p.mandante_placar,
-            p.visitante_placar,
-            p.publico,
-            camp.campeonato
-        FROM partidas p
-        JOIN clubes cm ON p.mandante_id = cm.ID
-        JOIN clubes cv ON p.visitante_id = cv.ID
-        JOIN edicoes ed ON p.edicao_id = ed.ID
-        JOIN campeonatos camp ON ed.campeonato_id = camp.ID
-        WHERE p.estadio_id = ?
-        ORDER BY ed.ano DESC, p.data DESC
-        LIMIT 50
-    """, (estadio_id,)).fetchall()
+    total = db.execute(
+        "SELECT COUNT(*) FROM partidas WHERE estadio_id = ?", (estadio_id,)
+    ).fetchone()[0]
+    partidas, proximo = paginar_partidas(db, SQL_PARTIDAS_ESTADIO, (estadio_id,))
 
     return render_template("estadio.html",
                           estadio=dict_from_row(info_estadio),
-                          partidas=[dict_from_row(p) for p in partidas])
+                          total_partidas=total,
+                          partidas=partidas,
+                          proximo_cursor=proximo)
 
 # ==================== APIs PARA GRÁFICOS ====================
 
@@ -1010,6 +878,490 @@ def api_evolucao_clube(nome):
 
     return jsonify([dict_from_row(r) for r in evolucao])
 
+@app.route("/api/temporada/<int:ano>/classificacao_por_rodada")
+def api_classificacao_por_rodada(ano):
+    """
+    Posição, pontos e saldo de cada clube depois de cada etapa (rodada) da
+    temporada, para gráficos de posição ao longo do campeonato.
+
+    Lê a tabela pré-calculada classificacao_por_rodada (ver
+    bd/historico_classificacao.py); se ela ainda não foi gerada para a
+    temporada, calcula em memória com o motor de classificação.
+
+    Parâmetro opcional: ?clube=<nome> para devolver só um clube.
+    Séries com null indicam etapas antes da estreia do clube.
+    """
+    db = get_db()
+    filtro_clube = request.args.get('clube')
+
+    try:
+        linhas = db.execute("""
+            SELECT cr.etapa, cr.fase, cr.rodada, cr.data,
+                   cr.clube_id, c.clube, cr.posicao, cr.pontos, cr.saldo_gols
+            FROM classificacao_por_rodada cr
+            JOIN edicoes ed ON cr.edicao_id = ed.ID
+            JOIN clubes c ON cr.clube_id = c.ID
+            WHERE ed.ano = ?
+            ORDER BY cr.etapa, cr.posicao
+        """, (ano,)).fetchall()
+        linhas = [tuple(l) for l in linhas]
+    except sqlite3.OperationalError:
+        # Banco antigo, sem a tabela pré-calculada
+        linhas = []
+
+    if not linhas:
+        resultados = motor_classificacao.resultados(ano, conn=db)
+        linhas = [
+            (info["etapa"], info["fase"], info["rodada"], info["data"],
+             t["clube_id"], t["clube"], t["pos"], t["pts"], t["sg"])
+            for info, tabela in resultados.historico_por_etapa()
+            for t in tabela
+        ]
+
+    if not linhas:
+        return jsonify({"erro": f"Temporada {ano} sem partidas."}), 404
+
+    etapas = {}
+    clubes = {}
+    for etapa, fase, rodada, data, clube_id, nome, posicao, pontos, saldo in linhas:
+        data = data_iso(data) if isinstance(data, int) else data
+        etapas.setdefault(etapa, {"etapa": etapa, "fase": fase, "rodada": rodada, "data": data})
+        if filtro_clube and nome != filtro_clube:
+            continue
+        clubes.setdefault(clube_id, {"clube_id": clube_id, "clube": nome, "pontos_por_etapa": {}})
+        clubes[clube_id]["pontos_por_etapa"][etapa] = (posicao, pontos, saldo)
+
+    ordem_etapas = sorted(etapas)
+    series = []
+    for c in clubes.values():
+        pontos_por_etapa = c.pop("pontos_por_etapa")
+        valores = [pontos_por_etapa.get(e, (None, None, None)) for e in ordem_etapas]
+        c["posicao"] = [v[0] for v in valores]
+        c["pontos"] = [v[1] for v in valores]
+        c["saldo_gols"] = [v[2] for v in valores]
+        series.append(c)
+
+    # Ordena os clubes pela posição final
+    series.sort(key=lambda c: (c["posicao"][-1] is None, c["posicao"][-1] or 0))
+
+    return jsonify({
+        "ano": ano,
+        "etapas": [etapas[e] for e in ordem_etapas],
+        "clubes": series,
+    })
+
+@app.route("/api/temporada/<int:ano>/lideres")
+def api_lideres(ano):
+    """
+    Líderes da temporada por categoria (gols, gols de pênalti, gols contra,
+    assistências, cartões, jogos).
+
+    Parâmetros opcionais:
+        ?categoria=gols,assistencias   (padrão: todas)
+        ?limite=N                      (padrão 10, máximo 100)
+    """
+    db = get_db()
+    edicao = db.execute("SELECT ID FROM edicoes WHERE ano = ?", (ano,)).fetchone()
+    if not edicao:
+        return jsonify({"erro": f"Temporada {ano} não encontrada."}), 404
+
+    categorias = [c for c in request.args.get('categoria', '').split(',') if c] or list(CATEGORIAS_LIDERES)
+    desconhecidas = [c for c in categorias if c not in CATEGORIAS_LIDERES]
+    if desconhecidas:
+        return jsonify({"erro": f"Categoria inválida: {', '.join(desconhecidas)}",
+                        "categorias": list(CATEGORIAS_LIDERES)}), 400
+
+    limite = request.args.get('limite', LIDERES_LIMITE_PADRAO, type=int)
+    limite = max(1, min(limite, LIDERES_LIMITE_MAXIMO))
+
+    lideres = consultar_lideres(db, edicao['ID'], categorias, limite)
+    return jsonify({
+        "ano": ano,
+        "lideres": {c: {"titulo": CATEGORIAS_LIDERES[c], "jogadores": lideres[c]} for c in categorias},
+    })
+
+@app.route("/api/ratings")
+def api_ratings():
+    """
+    Ranking dos clubes pelo rating Elo (ver bd/ratings.py).
+
+    Parâmetros opcionais:
+        ?ano=1985   → rating de cada clube ao fim daquela temporada
+        ?limite=20  → só os N primeiros
+    """
+    db = get_db()
+    ano = request.args.get('ano', type=int)
+    limite = request.args.get('limite', type=int)
+
+    filtro = "WHERE ano <= ?" if ano else ""
+    parametros = (ano,) if ano else ()
+    try:
+        linhas = db.execute(f"""
+            WITH ultimo AS (
+                SELECT clube_id, MAX(ordem) AS ordem, COUNT(*) AS jogos
+                FROM ratings_clubes
+                {filtro}
+                GROUP BY clube_id
+            )
+            SELECT c.ID AS clube_id, c.clube, r.rating_depois AS rating,
+                   u.jogos, r.ano AS ultimo_ano, r.data AS ultimo_jogo
+            FROM ultimo u
+            JOIN ratings_clubes r ON r.clube_id = u.clube_id AND r.ordem = u.ordem
+            JOIN clubes c ON c.ID = u.clube_id
+            ORDER BY r.rating_depois DESC
+        """, parametros).fetchall()
+    except sqlite3.OperationalError:
+        return jsonify({"erro": "Ratings ainda não calculados (rode bd/ratings.py)."}), 404
+
+    ranking = []
+    for posicao, linha in enumerate(linhas[:limite] if limite else linhas, start=1):
+        item = dict_from_row(linha)
+        item['posicao'] = posicao
+        item['rating'] = round(item['rating'], 1)
+        ranking.append(item)
+    return jsonify(ranking)
+
+@app.route("/api/ratings/<string:nome>")
+def api_ratings_clube(nome):
+    """Histórico do rating Elo de um clube, partida a partida"""
+    db = get_db()
+    try:
+        historico = db.execute("""
+            SELECT r.partida_id, r.data, r.ano, r.mandante,
+                   r.gols_pro, r.gols_contra,
+                   ROUND(r.rating_antes, 1) AS rating_antes,
+                   ROUND(r.rating_depois, 1) AS rating_depois
+            FROM ratings_clubes r
+            JOIN clubes c ON r.clube_id = c.ID
+            WHERE c.clube = ?
+            ORDER BY r.ordem
+        """, (nome,)).fetchall()
+    except sqlite3.OperationalError:
+        return jsonify({"erro": "Ratings ainda não calculados (rode bd/ratings.py)."}), 404
+
+    return jsonify([dict_from_row(r) for r in historico])
+
+@app.route("/api/<string:entidade>/<int:entidade_id>/partidas")
+def api_partidas(entidade, entidade_id):
+    """
+    Partidas de um jogador, árbitro, treinador ou estádio, paginadas por chave.
+    Parâmetros: ?after=<edicao_id>,<partida_id> (cursor "proximo" da página anterior)
+                &limit=N (padrão 20, máximo 100)
+    """
+    if entidade not in CONSULTAS_PARTIDAS:
+        return jsonify({"erro": f"Entidade '{entidade}' não tem lista de partidas."}), 404
+    try:
+        cursor = ler_cursor(request.args.get('after'))
+    except ValueError:
+        return jsonify({"erro": "Parâmetro 'after' inválido (esperado <edicao_id>,<partida_id>)."}), 400
+
+    partidas, proximo = paginar_partidas(
+        get_db(), CONSULTAS_PARTIDAS[entidade], (entidade_id,),
+        cursor=cursor,
+        limite=request.args.get('limit', TAMANHO_PAGINA, type=int))
+    return jsonify({"partidas": partidas, "proximo": proximo})
+
+# ==================== API v1 (dados em lote) ====================
+#
+# Leitura em massa para parceiros, no lugar de raspar as páginas HTML:
+#   /api/v1/partidas, /api/v1/eventos, /api/v1/escalacoes,
+#   /api/v1/jogadores, /api/v1/clubes, /api/v1/edicoes
+#
+# As respostas são NDJSON (um objeto JSON por linha) geradas direto do cursor
+# do SQLite, em lotes: a lista inteira nunca é montada em memória. Filtros
+# (conforme o recurso): ?ano= ?edicao= ?clube=<ID ou nome> ?jogador= ?partida=
+# ?tipo= ?desde=AAAA-MM-DD ?ate=AAAA-MM-DD. ?campos=a,b,c escolhe as colunas.
+# Com Accept-Encoding: gzip a saída é comprimida em fluxo. O ETag muda a cada
+# carga do banco; If-None-Match com o mesmo valor devolve 304.
+
+API_V1_LOTE = 500
+
+# Data da partida como AAAA-MM-DD no SQL (o banco tem DD/MM/AAAA e AAAA-MM-DD)
+SQL_DATA_ISO = """(CASE WHEN p.data LIKE '%/%'
+    THEN substr(p.data, 7, 4) || '-' || substr(p.data, 4, 2) || '-' || substr(p.data, 1, 2)
+    ELSE substr(p.data, 1, 10) END)"""
+
+CAMPOS_V1 = {
+    'partidas': ['id', 'edicao_id', 'ano', 'campeonato', 'data', 'hora', 'fase', 'grupo',
+                 'rodada', 'mandante_id', 'mandante', 'visitante_id', 'visitante',
+                 'mandante_placar', 'visitante_placar', 'mandante_penalti',
+                 'visitante_penalti', 'prorrogacao', 'estadio_id', 'estadio', 'publico'],
+    'eventos': ['id', 'partida_id', 'edicao_id', 'ano', 'data', 'jogador_id', 'jogador',
+                'clube_id', 'clube', 'tipo_evento', 'tipo_gol', 'minuto'],
+    'escalacoes': ['partida_id', 'edicao_id', 'ano', 'data', 'jogador_id', 'jogador',
+                   'clube_id', 'clube', 'titular', 'posicao_jogada', 'numero_camisa',
+                   'minutos_jogados', 'minuto_entrada', 'minuto_saida'],
+    'jogadores': ['id', 'nome', 'apelido', 'nascimento', 'falecimento', 'nacionalidade',
+                  'naturalidade', 'altura', 'peso', 'posicao', 'posicao_detalhada',
+                  'pe_preferido'],
+    'clubes': ['id', 'clube', 'apelido', 'cidade', 'estado', 'UF', 'fundacao', 'ativo'],
+    'edicoes': ['id', 'ano', 'campeonato', 'data_inicio', 'data_fim',
+                'campeao_id', 'campeao', 'vice_id', 'vice'],
+}
+
+def _inteiro_v1(nome):
+    valor = request.args.get(nome, '').strip()
+    if not valor:
+        return None
+    try:
+        return int(valor)
+    except ValueError:
+        raise ValueError(f"Parâmetro '{nome}' deve ser um número inteiro.")
+
+def _data_v1(nome):
+    valor = request.args.get(nome, '').strip()
+    if not valor:
+        return None
+    try:
+        return datetime.strptime(valor, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"Parâmetro '{nome}' deve estar no formato AAAA-MM-DD.")
+
+def _clube_v1(ref):
+    """ID do clube em ?clube= (aceita ID, nome exato ou slug)"""
+    valor = request.args.get('clube', '').strip()
+    if not valor:
+        return None
+    if valor.isdigit():
+        return int(valor)
+    clube = ref.clube_por_nome.get(valor) or ref.clube_por_slug.get(slugify(valor))
+    if not clube:
+        raise ValueError(f"Clube '{valor}' não encontrado.")
+    return clube['ID']
+
+def _filtros_partida_v1(ref, where, params):
+    """Filtros de edição e data, aplicados à tabela partidas (alias p)"""
+    ano = _inteiro_v1('ano')
+    if ano is not None:
+        edicao = ref.edicao_por_ano.get(ano)
+        where.append("p.edicao_id = ?")
+        params.append(edicao['ID'] if edicao else None)
+    edicao_id = _inteiro_v1('edicao')
+    if edicao_id is not None:
+        where.append("p.edicao_id = ?")
+        params.append(edicao_id)
+    for nome, operador in (('desde', '>='), ('ate', '<=')):
+        data = _data_v1(nome)
+        if data:
+            where.append(f"{SQL_DATA_ISO} {operador} ?")
+            params.append(data)
+
+def _sql_v1(select, where, ordem):
+    return select + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY " + ordem
+
+def _linhas_sql_v1(sql, params, completar):
+    """
+    Gerador (preguiçoso) das linhas da consulta, lidas em lotes de
+    API_V1_LOTE. Usa conexão própria: o fluxo continua depois que a função
+    da rota retorna.
+    """
+    rota = request.endpoint
+
+    def gerar():
+        conn = conectar(rota)
+        try:
+            cursor = conn.execute(sql, params)
+            colunas = [d[0] for d in cursor.description]
+            while True:
+                bloco = cursor.fetchmany(API_V1_LOTE)
+                if not bloco:
+                    break
+                yield from completar([dict(zip(colunas, linha)) for linha in bloco])
+        finally:
+            conn.close()
+    return gerar
+
+def _completar_partidas_v1(ref):
+    """Nomes de clubes, edição e estádio vêm do cache de referências (sem JOIN)"""
+    def completar(linhas):
+        for linha in ref.hidratar_partidas(linhas):
+            if 'data' in linha:
+                linha['data'] = data_iso(data_ordenavel(linha['data'])) or linha['data']
+            yield linha
+    return completar
+
+def consulta_partidas_v1(ref):
+    where, params = [], []
+    _filtros_partida_v1(ref, where, params)
+    clube_id = _clube_v1(ref)
+    if clube_id is not None:
+        where.append("(p.mandante_id = ? OR p.visitante_id = ?)")
+        params += [clube_id, clube_id]
+    sql = _sql_v1("""
+        SELECT p.ID AS id, p.edicao_id, p.data, p.hora, p.fase, p.grupo, p.rodada,
+               p.mandante_id, p.visitante_id, p.mandante_placar, p.visitante_placar,
+               p.mandante_penalti, p.visitante_penalti, p.prorrogacao,
+               p.estadio_id, p.publico
+        FROM partidas p
+    """, where, "p.ID")
+    return _linhas_sql_v1(sql, params, _completar_partidas_v1(ref))
+
+def consulta_eventos_v1(ref):
+    where, params = [], []
+    _filtros_partida_v1(ref, where, params)
+    for nome, coluna in (('partida', 'e.partida_id'), ('jogador', 'e.jogador_id')):
+        valor = _inteiro_v1(nome)
+        if valor is not None:
+            where.append(f"{coluna} = ?")
+            params.append(valor)
+    clube_id = _clube_v1(ref)
+    if clube_id is not None:
+        where.append("e.clube_id = ?")
+        params.append(clube_id)
+    if request.args.get('tipo'):
+        where.append("e.tipo_evento = ?")
+        params.append(request.args['tipo'])
+    sql = _sql_v1("""
+        SELECT e.ID AS id, e.partida_id, p.edicao_id, p.data, e.jogador_id,
+               COALESCE(j.apelido, j.nome) AS jogador, e.clube_id,
+               e.tipo_evento, e.tipo_gol, e.minuto
+        FROM eventos_partida e
+        JOIN partidas p ON e.partida_id = p.ID
+        LEFT JOIN jogadores j ON e.jogador_id = j.ID
+    """, where, "e.ID")
+    return _linhas_sql_v1(sql, params, _completar_partidas_v1(ref))
+
+def consulta_escalacoes_v1(ref):
+    where, params = [], []
+    _filtros_partida_v1(ref, where, params)
+    for nome, coluna in (('partida', 'jp.partida_id'), ('jogador', 'jp.jogador_id')):
+        valor = _inteiro_v1(nome)
+        if valor is not None:
+            where.append(f"{coluna} = ?")
+            params.append(valor)
+    clube_id = _clube_v1(ref)
+    if clube_id is not None:
+        where.append("jp.clube_id = ?")
+        params.append(clube_id)
+    sql = _sql_v1("""
+        SELECT jp.partida_id, p.edicao_id, p.data, jp.jogador_id,
+               COALESCE(j.apelido, j.nome) AS jogador, jp.clube_id, jp.titular,
+               jp.posicao_jogada, jp.numero_camisa, jp.minutos_jogados,
+               jp.minuto_entrada, jp.minuto_saida
+        FROM jogadores_em_partida jp
+        JOIN partidas p ON jp.partida_id = p.ID
+        LEFT JOIN jogadores j ON jp.jogador_id = j.ID
+    """, where, "jp.partida_id, jp.clube_id, jp.jogador_id")
+    return _linhas_sql_v1(sql, params, _completar_partidas_v1(ref))
+
+def consulta_jogadores_v1(ref):
+    # Filtros de edição/clube/data valem para "quem jogou": subconsulta nas escalações
+    where, params = [], []
+    _filtros_partida_v1(ref, where, params)
+    clube_id = _clube_v1(ref)
+    if clube_id is not None:
+        where.append("jp.clube_id = ?")
+        params.append(clube_id)
+    sql = """
+        SELECT j.ID AS id, j.nome, j.apelido, j.nascimento, j.falecimento, j.nacionalidade,
+               j.naturalidade, j.altura, j.peso, j.posicao, j.posicao_detalhada, j.pe_preferido
+        FROM jogadores j
+    """
+    if where:
+        sql += """
+        WHERE j.ID IN (
+            SELECT jp.jogador_id
+            FROM jogadores_em_partida jp
+            JOIN partidas p ON jp.partida_id = p.ID
+            WHERE """ + " AND ".join(where) + ")"
+    return _linhas_sql_v1(sql + " ORDER BY j.ID", params, iter)
+
+def consulta_clubes_v1(ref):
+    def gerar():
+        for clube_id in sorted(ref.clubes):
+            linha = dict(ref.clubes[clube_id])
+            linha['id'] = linha.pop('ID')
+            yield linha
+    return gerar
+
+def consulta_edicoes_v1(ref):
+    def gerar():
+        for ano in ref.anos_disponiveis:
+            edicao = ref.edicao_por_ano.get(ano)
+            if not edicao:
+                continue
+            linha = dict(edicao)
+            linha['id'] = linha.pop('ID')
+            linha['campeao'] = ref.nome_clube(linha['campeao_id'])
+            linha['vice'] = ref.nome_clube(linha['vice_id'])
+            yield linha
+    return gerar
+
+CONSULTAS_V1 = {
+    'partidas': consulta_partidas_v1,
+    'eventos': consulta_eventos_v1,
+    'escalacoes': consulta_escalacoes_v1,
+    'jogadores': consulta_jogadores_v1,
+    'clubes': consulta_clubes_v1,
+    'edicoes': consulta_edicoes_v1,
+}
+
+def _gzip_em_fluxo(pedacos):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 → formato gzip
+    for pedaco in pedacos:
+        comprimido = compressor.compress(pedaco)
+        if comprimido:
+            yield comprimido
+    yield compressor.flush()
+
+def resposta_ndjson(gerar_linhas, campos):
+    """Response em fluxo: um objeto JSON por linha, em blocos de API_V1_LOTE linhas"""
+    def ndjson():
+        bloco = []
+        for linha in gerar_linhas():
+            bloco.append(json.dumps({c: linha.get(c) for c in campos}, ensure_ascii=False))
+            if len(bloco) >= API_V1_LOTE:
+                yield ("\n".join(bloco) + "\n").encode('utf-8')
+                bloco = []
+        if bloco:
+            yield ("\n".join(bloco) + "\n").encode('utf-8')
+
+    corpo = ndjson()
+    cabecalhos = {'Vary': 'Accept-Encoding'}
+    if request.accept_encodings['gzip']:
+        corpo = _gzip_em_fluxo(corpo)
+        cabecalhos['Content-Encoding'] = 'gzip'
+    return Response(corpo, mimetype='application/x-ndjson', headers=cabecalhos)
+
+@app.route("/api/v1")
+def api_v1_indice():
+    """Recursos disponíveis e seus campos"""
+    return jsonify({recurso: {"url": f"/api/v1/{recurso}", "campos": campos}
+                    for recurso, campos in CAMPOS_V1.items()})
+
+@app.route("/api/v1/<string:recurso>")
+def api_v1(recurso):
+    """Exportação em NDJSON de um recurso (ver comentário da seção)"""
+    if recurso not in CONSULTAS_V1:
+        return jsonify({"erro": f"Recurso '{recurso}' não existe.",
+                        "recursos": list(CONSULTAS_V1)}), 404
+
+    # Mesmo banco + mesma URL → mesmo conteúdo
+    versao = versao_arquivo_banco(DATABASE)
+    etag = hashlib.sha1(f"{versao}:{request.full_path}".encode()).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        resposta = Response(status=304)
+        resposta.set_etag(etag, weak=True)
+        return resposta
+
+    campos = CAMPOS_V1[recurso]
+    if request.args.get('campos'):
+        pedidos = [c.strip() for c in request.args['campos'].split(',') if c.strip()]
+        desconhecidos = [c for c in pedidos if c not in campos]
+        if desconhecidos:
+            return jsonify({"erro": f"Campo(s) inválido(s): {', '.join(desconhecidos)}",
+                            "campos": campos}), 400
+        campos = pedidos
+
+    try:
+        gerar_linhas = CONSULTAS_V1[recurso](g.referencias)
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    resposta = resposta_ndjson(gerar_linhas, campos)
+    resposta.set_etag(etag, weak=True)
+    return resposta
+
 # ==================== FILTROS JINJA ====================
 
 @app.template_filter('slugify')
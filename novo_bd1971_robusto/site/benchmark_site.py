@@ -0,0 +1,369 @@
+"""
+Benchmark de carga do site (vazão e latência por rota).
+
+Sobe o app num processo separado apontando para uma CÓPIA do banco (o
+original nunca é tocado) e dispara requisições HTTP de verdade, com N
+clientes simultâneos, sorteando URLs de uma mistura realista: homepage,
+todas as temporadas, clubes, jogos, jogadores, árbitros, treinadores,
+estádios, busca e as APIs. No fim mostra, por rota, requisições/s e
+p50/p95/p99 e grava tudo em JSON.
+
+Com --comparar <anterior.json>, cada rota é comparada com a execução
+anterior; p95 pior que a tolerância (padrão 20%) é marcado como regressão
+e o script sai com código 1 (dá para usar em CI).
+
+Uso (de dentro de site/):
+    python benchmark_site.py
+    python benchmark_site.py --concorrencia 16 --duracao 60 --saida bench.json
+    python benchmark_site.py --comparar bench.json --saida bench_novo.json
+    python benchmark_site.py --url http://127.0.0.1:8000   # servidor já rodando
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import socket
+import sqlite3
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+PASTA_SITE = os.path.dirname(os.path.abspath(__file__))
+
+# Peso de cada rota na mistura (proporcional ao tráfego esperado)
+PESOS_ROTAS = {
+    "index": 10,
+    "temporada": 12,
+    "clube": 12,
+    "jogo": 15,
+    "jogador": 10,
+    "arbitro": 3,
+    "treinador": 3,
+    "estadio": 3,
+    "explorar": 4,
+    "buscar": 8,
+    "api_classificacao_por_rodada": 4,
+    "api_lideres": 4,
+    "api_ratings": 2,
+    "api_evolucao_clube": 3,
+    "api_partidas": 4,
+    "api_v1_partidas": 2,
+}
+
+QUANTIS = (50, 95, 99)
+MINIMO_AMOSTRAS_COMPARACAO = 20   # rotas com menos requisições não acusam regressão (ruído)
+
+
+# ==================== URLs ====================
+
+def montar_urls(banco, limite_por_rota=300, semente=1971):
+    """
+    {rota: [urls]} a partir do conteúdo do banco. Rotas com muitas páginas
+    (jogos, jogadores) usam uma amostra fixa (mesma semente → mesmas URLs).
+    """
+    sorteio = random.Random(semente)
+    conn = sqlite3.connect(banco)
+    try:
+        def ids(sql):
+            valores = [linha[0] for linha in conn.execute(sql)]
+            sorteio.shuffle(valores)
+            return valores[:limite_por_rota]
+
+        anos = [int(str(a)[:4]) for (a,) in conn.execute("SELECT ano FROM edicoes ORDER BY ano")]
+        clubes = [c for (c,) in conn.execute("""
+            SELECT DISTINCT c.clube FROM clubes c
+            JOIN partidas p ON c.ID IN (p.mandante_id, p.visitante_id)
+        """)]
+        jogos = ids("SELECT ID FROM partidas")
+        jogadores = ids("SELECT DISTINCT jogador_id FROM jogadores_em_partida")
+        arbitros = ids("SELECT DISTINCT arbitro_id FROM arbitros_em_partida")
+        treinadores = ids("SELECT DISTINCT treinador_id FROM treinadores_em_partida")
+        estadios = ids("SELECT DISTINCT estadio_id FROM partidas WHERE estadio_id IS NOT NULL")
+        termos = sorted({palavra for (nome,) in conn.execute(
+            "SELECT nome FROM jogadores ORDER BY ID LIMIT 200") if nome
+            for palavra in nome.split() if len(palavra) >= 4})
+        termos = termos[:100] + [c.split()[-1] for c in clubes]
+    finally:
+        conn.close()
+
+    q = urllib.parse.quote
+    return {
+        "index": ["/"],
+        "temporada": [f"/temporada/{a}" for a in anos],
+        "clube": [f"/clube/{q(c)}" for c in clubes],
+        "jogo": [f"/jogo/{i}" for i in jogos],
+        "jogador": [f"/jogador/{i}" for i in jogadores],
+        "arbitro": [f"/arbitro/{i}" for i in arbitros],
+        "treinador": [f"/treinador/{i}" for i in treinadores],
+        "estadio": [f"/estadio/{i}" for i in estadios],
+        "explorar": ["/explorar"],
+        "buscar": [f"/buscar?q={q(t)}" for t in termos],
+        "api_classificacao_por_rodada": [f"/api/temporada/{a}/classificacao_por_rodada" for a in anos],
+        "api_lideres": [f"/api/temporada/{a}/lideres" for a in anos],
+        "api_ratings": ["/api/ratings"] + [f"/api/ratings?ano={a}" for a in anos],
+        "api_evolucao_clube": [f"/api/evolucao_clube/{q(c)}" for c in clubes],
+        "api_partidas": [f"/api/jogador/{i}/partidas" for i in jogadores[:50]]
+                        + [f"/api/arbitro/{i}/partidas" for i in arbitros[:20]],
+        "api_v1_partidas": [f"/api/v1/partidas?ano={a}" for a in anos],
+    }
+
+
+# ==================== SERVIDOR ====================
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def servir(banco, porta):
+    """Modo interno (--servir): roda o app com o servidor threaded do Werkzeug"""
+    os.environ["BD1971_DATABASE"] = os.path.abspath(banco)
+    sys.path.insert(0, PASTA_SITE)
+    from werkzeug.serving import make_server
+    import app as site_app
+    make_server("127.0.0.1", porta, site_app.app, threaded=True).serve_forever()
+
+
+class ServidorTeste:
+    """Copia o banco para uma pasta temporária e sobe o app num subprocesso"""
+
+    def __init__(self, banco):
+        self.banco_original = banco
+        self.pasta = None
+        self.processo = None
+        self.url = None
+
+    def __enter__(self):
+        self.pasta = tempfile.mkdtemp(prefix="bench_bd1971_")
+        self.banco = os.path.join(self.pasta, os.path.basename(self.banco_original))
+        shutil.copy2(self.banco_original, self.banco)
+
+        porta = porta_livre()
+        self.url = f"http://127.0.0.1:{porta}"
+        self.processo = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--servir", str(porta), "--banco", self.banco],
+            cwd=PASTA_SITE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        limite = time.time() + 30
+        while time.time() < limite:
+            if self.processo.poll() is not None:
+                raise RuntimeError("o servidor do app terminou antes de responder")
+            try:
+                urllib.request.urlopen(self.url + "/", timeout=2).read()
+                return self
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.2)
+        raise RuntimeError("o servidor do app não respondeu em 30s")
+
+    def __exit__(self, *erro):
+        if self.processo:
+            self.processo.terminate()
+            self.processo.wait(timeout=10)
+        if self.pasta:
+            shutil.rmtree(self.pasta, ignore_errors=True)
+
+
+# ==================== CARGA ====================
+
+def requisitar(url):
+    """(status, segundos, bytes); status 0 = erro de conexão"""
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=60) as resposta:
+            corpo = resposta.read()
+            status = resposta.status
+    except urllib.error.HTTPError as e:
+        corpo = e.read()
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        corpo = b""
+        status = 0
+    return status, time.perf_counter() - inicio, len(corpo)
+
+
+def percentil(ordenados, p):
+    if not ordenados:
+        return None
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+class Carga:
+    def __init__(self, base_url, urls, concorrencia=8, semente=1971):
+        """
+        Args:
+            base_url: http://host:porta do site
+            urls: {rota: [caminhos]} (ver montar_urls)
+            concorrencia: Nº de clientes simultâneos
+        """
+        self.base_url = base_url.rstrip("/")
+        self.urls = {rota: lista for rota, lista in urls.items() if lista}
+        self.rotas = list(self.urls)
+        self.pesos = [PESOS_ROTAS.get(rota, 1) for rota in self.rotas]
+        self.concorrencia = concorrencia
+        self.semente = semente
+        self._lock = threading.Lock()
+
+    def _cliente(self, indice, ate, maximo, medicoes):
+        sorteio = random.Random(self.semente + indice)
+        locais = []
+        while time.perf_counter() < ate and (maximo is None or len(locais) < maximo):
+            rota = sorteio.choices(self.rotas, self.pesos)[0]
+            caminho = sorteio.choice(self.urls[rota])
+            status, segundos, tamanho = requisitar(self.base_url + caminho)
+            locais.append((rota, status, segundos, tamanho))
+        with self._lock:
+            medicoes.extend(locais)
+
+    def rodar(self, duracao=None, requisicoes=None):
+        """Roda até `duracao` segundos ou `requisicoes` no total. Retorna (medicoes, segundos)"""
+        medicoes = []
+        maximo = None if requisicoes is None else max(1, requisicoes // self.concorrencia)
+        ate = time.perf_counter() + (duracao if duracao else 10 ** 9)
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(self.concorrencia) as executor:
+            for i in range(self.concorrencia):
+                executor.submit(self._cliente, i, ate, maximo, medicoes)
+        return medicoes, time.perf_counter() - inicio
+
+    def aquecer(self):
+        """Uma passada por amostra de cada rota (cache do SQLite, motor de classificação...)"""
+        for rota in self.rotas:
+            for caminho in self.urls[rota][:5]:
+                requisitar(self.base_url + caminho)
+
+
+def resumir(medicoes, segundos):
+    """Estatísticas por rota e no total"""
+    por_rota = {}
+    for rota, status, tempo, tamanho in medicoes:
+        por_rota.setdefault(rota, []).append((status, tempo, tamanho))
+    por_rota["TOTAL"] = [(s, t, b) for _, s, t, b in medicoes]
+
+    resumo = {}
+    for rota, linhas in por_rota.items():
+        tempos = sorted(t for _, t, _ in linhas)
+        resumo[rota] = {
+            "requisicoes": len(linhas),
+            "erros": sum(1 for s, _, _ in linhas if s == 0 or s >= 500),
+            "nao_200": sum(1 for s, _, _ in linhas if s != 200),
+            "req_por_s": round(len(linhas) / segundos, 2) if segundos else None,
+            "bytes_medio": round(sum(b for _, _, b in linhas) / len(linhas)) if linhas else 0,
+            **{f"p{p}_ms": round(percentil(tempos, p) * 1000, 2) for p in QUANTIS},
+            "max_ms": round(tempos[-1] * 1000, 2),
+        }
+    return resumo
+
+
+def comparar(atual, anterior, tolerancia):
+    """Rotas cujo p95 piorou mais que `tolerancia` (fração): [(rota, antes, depois)]"""
+    regressoes = []
+    for rota, dados in atual.items():
+        antes = anterior.get(rota)
+        if not antes or not antes.get("p95_ms"):
+            continue
+        if min(dados["requisicoes"], antes["requisicoes"]) < MINIMO_AMOSTRAS_COMPARACAO:
+            continue
+        if dados["p95_ms"] > antes["p95_ms"] * (1 + tolerancia):
+            regressoes.append((rota, antes["p95_ms"], dados["p95_ms"]))
+    return regressoes
+
+
+def imprimir(resumo, anterior=None):
+    print(f"\n{'rota':32} {'req':>6} {'erros':>5} {'req/s':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}" + ("   p95 antes" if anterior else ""))
+    print("-" * (82 + (12 if anterior else 0)))
+    for rota in sorted(resumo, key=lambda r: (r == "TOTAL", r)):
+        d = resumo[rota]
+        linha = (f"{rota:32} {d['requisicoes']:>6} {d['erros']:>5} {d['req_por_s']:>8} "
+                 f"{d['p50_ms']:>8} {d['p95_ms']:>8} {d['p99_ms']:>8}")
+        if anterior and rota in anterior:
+            linha += f"   {anterior[rota]['p95_ms']:>9}"
+        print(linha)
+
+
+def versao_git():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PASTA_SITE,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carga das rotas do site")
+    parser.add_argument("--banco", default="../bd/estruturado_bd_1971.db",
+                        help="banco de origem (o benchmark usa uma cópia)")
+    parser.add_argument("--url", help="usa um servidor já rodando em vez de subir o app")
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--duracao", type=float, default=30, help="segundos de carga")
+    parser.add_argument("--requisicoes", type=int, help="total de requisições (em vez de --duracao)")
+    parser.add_argument("--semente", type=int, default=1971)
+    parser.add_argument("--saida", default="benchmark_site.json")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="piora de p95 aceita antes de acusar regressão (0.2 = 20%%)")
+    parser.add_argument("--servir", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.servir:
+        servir(args.banco, args.servir)
+        return
+
+    urls = montar_urls(args.banco, semente=args.semente)
+    print(f"📄 {sum(len(v) for v in urls.values())} URLs em {len(urls)} rotas")
+
+    def medir(base_url):
+        carga = Carga(base_url, urls, args.concorrencia, args.semente)
+        print(f"🔥 Aquecendo {base_url}...")
+        carga.aquecer()
+        alvo = f"{args.requisicoes} requisições" if args.requisicoes else f"{args.duracao:g}s"
+        print(f"🚀 {args.concorrencia} cliente(s) simultâneo(s), {alvo}...")
+        return carga.rodar(None if args.requisicoes else args.duracao, args.requisicoes)
+
+    if args.url:
+        medicoes, segundos = medir(args.url)
+    else:
+        with ServidorTeste(args.banco) as servidor:
+            medicoes, segundos = medir(servidor.url)
+
+    resumo = resumir(medicoes, segundos)
+    anterior = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)["rotas"]
+    imprimir(resumo, anterior)
+
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump({
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "commit": versao_git(),
+            "concorrencia": args.concorrencia,
+            "segundos": round(segundos, 2),
+            "semente": args.semente,
+            "rotas": resumo,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ Resultados gravados em {args.saida}")
+
+    if resumo["TOTAL"]["erros"]:
+        print(f"⚠️  {resumo['TOTAL']['erros']} requisição(ões) com erro (5xx ou falha de conexão)")
+
+    if anterior:
+        regressoes = comparar(resumo, anterior, args.tolerancia)
+        for rota, antes, depois in regressoes:
+            print(f"❌ Regressão em {rota}: p95 {antes} ms → {depois} ms")
+        if regressoes:
+            sys.exit(1)
+        print(f"✅ Nenhuma rota piorou mais de {args.tolerancia:.0%} no p95")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+import os
+import sys
+import json
+import shutil
+import sqlite3
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Módulos compartilhados ficam em ../bd (como no app.py)
+PASTA_SITE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(PASTA_SITE, "..", "bd"))
+
+from referencias import DadosReferencia
+
+
+# ============================================
+# Pré-renderização estática do site ("freeze")
+# ============================================
+# Temporadas encerradas não mudam mais. Este script renderiza as páginas
+# históricas (temporadas, clubes, jogos, jogadores, árbitros, treinadores,
+# estádios) e as APIs JSON de temporada para arquivos estáticos, que o nginx
+# ou uma CDN servem direto. Só a temporada atual, a homepage, a busca e
+# qualquer URL com query string (?after=..., ?limite=, ?categoria=, ?clube=)
+# continuam indo ao Flask: os arquivos congelados são sempre a resposta sem
+# parâmetros.
+#
+# As páginas são renderizadas pelo próprio app (test_client), em vários
+# processos. Cada página tem uma impressão digital das linhas do banco que
+# ela mostra (mais a versão do código/templates e dos dados de referência);
+# o manifesto da última geração ({url: [impressão, status]}) fica em
+# <saida>/.freeze_manifesto.json e só as páginas cuja impressão mudou são
+# renderizadas de novo. Páginas que não dão 200 (ex.: /api/ratings/<clube>
+# sem ratings calculados) não geram arquivo e continuam indo ao Flask.
+#
+# Exemplo de nginx:
+#
+#   location / {
+#       root /srv/bd1971/build;
+#       # try_files ignora a query string: com parâmetros, direto ao Flask
+#       error_page 418 = @flask;
+#       if ($args) { return 418; }
+#       try_files $uri/index.html $uri.json @flask;
+#   }
+#   location @flask { proxy_pass http://127.0.0.1:5000; }
+
+MANIFESTO = ".freeze_manifesto.json"
+
+# Arquivos cujo conteúdo muda o HTML gerado: qualquer alteração refaz tudo
+ARQUIVOS_CODIGO = ("app.py", "templates", os.path.join("..", "bd"))
+
+# Impressões por página: (tipo, SQL). A 1ª coluna é a chave da página (o ID
+# da entidade; temporadas pelo edicao_id, porque ed.ano é TEXT e a URL usa
+# o ano inteiro); as demais entram no hash, na ordem do ORDER BY.
+# Colunas de auditoria (criado_em/atualizado_em) ficam de fora de propósito:
+# a migração as regrava sem que nada visível mude.
+FONTES = (
+    ("temporada", """
+        SELECT edicao_id, ID, data, fase, grupo, rodada, mandante_id, visitante_id,
+               mandante_placar, visitante_placar, mandante_grupo, visitante_grupo
+        FROM partidas
+        ORDER BY edicao_id, ID
+    """),
+    ("temporada", """
+        SELECT p.edicao_id, jp.partida_id, jp.jogador_id, jp.clube_id, jp.minutos_jogados,
+               j.nome, j.apelido
+        FROM jogadores_em_partida jp
+        JOIN partidas p ON jp.partida_id = p.ID
+        JOIN jogadores j ON jp.jogador_id = j.ID
+        ORDER BY p.edicao_id, jp.partida_id, jp.jogador_id
+    """),
+    ("temporada", """
+        SELECT p.edicao_id, e.partida_id, e.jogador_id, e.clube_id, e.tipo_evento, e.tipo_gol, e.minuto
+        FROM eventos_partida e
+        JOIN partidas p ON e.partida_id = p.ID
+        ORDER BY p.edicao_id, e.ID
+    """),
+    ("jogo", """
+        SELECT ID, edicao_id, data, hora, fase, grupo, rodada, estadio_id,
+               mandante_id, visitante_id, mandante_placar, visitante_placar,
+               mandante_penalti, visitante_penalti, prorrogacao, publico, renda
+        FROM partidas
+        ORDER BY ID
+    """),
+    ("jogo", """
+        SELECT jp.partida_id, jp.jogador_id, jp.clube_id, jp.titular, jp.posicao_jogada,
+               jp.numero_camisa, jp.minutos_jogados, jp.minuto_entrada, jp.minuto_saida,
+               j.nome, j.apelido, j.posicao
+        FROM jogadores_em_partida jp
+        JOIN jogadores j ON jp.jogador_id = j.ID
+        ORDER BY jp.partida_id, jp.jogador_id
+    """),
+    ("jogo", """
+        SELECT e.partida_id, e.jogador_id, e.clube_id, e.tipo_evento, e.tipo_gol, e.minuto,
+               j.nome, j.apelido
+        FROM eventos_partida e
+        JOIN jogadores j ON e.jogador_id = j.ID
+        ORDER BY e.partida_id, e.ID
+    """),
+    ("jogo", """
+        SELECT ap.partida_id, a.ID, a.nome, a.apelido
+        FROM arbitros_em_partida ap JOIN arbitros a ON ap.arbitro_id = a.ID
+        ORDER BY ap.partida_id, a.ID
+    """),
+    ("jogo", """
+        SELECT tp.partida_id, t.ID, t.nome, t.apelido, tp.clube_id, tp.tipo
+        FROM treinadores_em_partida tp JOIN treinadores t ON tp.treinador_id = t.ID
+        ORDER BY tp.partida_id, t.ID, tp.clube_id
+    """),
+    ("jogador", """
+        SELECT ID, nome, apelido, nascimento, falecimento, nacionalidade, naturalidade,
+               altura, peso, posicao, posicao_detalhada, pe_preferido, aposentado, url_foto
+        FROM jogadores
+        ORDER BY ID
+    """),
+    ("jogador", """
+        SELECT jp.jogador_id, jp.partida_id, jp.clube_id, jp.titular, jp.minutos_jogados,
+               p.edicao_id, p.data, p.mandante_id, p.visitante_id,
+               p.mandante_placar, p.visitante_placar
+        FROM jogadores_em_partida jp JOIN partidas p ON jp.partida_id = p.ID
+        ORDER BY jp.jogador_id, jp.partida_id, jp.clube_id
+    """),
+    ("jogador", """
+        SELECT jogador_id, partida_id, clube_id, tipo_evento, tipo_gol, minuto
+        FROM eventos_partida
+        ORDER BY jogador_id, ID
+    """),
+    ("arbitro", """
+        SELECT ID, nome, apelido, nascimento, falecimento, nacionalidade, naturalidade,
+               aposentado, url_foto
+        FROM arbitros
+        ORDER BY ID
+    """),
+    ("arbitro", """
+        SELECT ap.arbitro_id, p.ID, p.edicao_id, p.data, p.mandante_id, p.visitante_id,
+               p.mandante_placar, p.visitante_placar
+        FROM arbitros_em_partida ap JOIN partidas p ON ap.partida_id = p.ID
+        ORDER BY ap.arbitro_id, p.ID
+    """),
+    ("treinador", """
+        SELECT ID, nome, apelido, nascimento, falecimento, nacionalidade, naturalidade,
+               aposentado, url_foto
+        FROM treinadores
+        ORDER BY ID
+    """),
+    ("treinador", """
+        SELECT tp.treinador_id, p.ID, tp.clube_id, tp.tipo, p.edicao_id, p.data,
+               p.mandante_id, p.visitante_id, p.mandante_placar, p.visitante_placar
+        FROM treinadores_em_partida tp JOIN partidas p ON tp.partida_id = p.ID
+        ORDER BY tp.treinador_id, p.ID, tp.clube_id
+    """),
+    ("estadio", """
+        SELECT estadio_id, ID, edicao_id, data, mandante_id, visitante_id,
+               mandante_placar, visitante_placar, publico
+        FROM partidas
+        WHERE estadio_id IS NOT NULL
+        ORDER BY estadio_id, ID
+    """),
+    ("clube", """
+        SELECT clube_id, ID, edicao_id, data, fase, mandante_placar, visitante_placar, mando
+        FROM (
+            SELECT mandante_id AS clube_id, ID, edicao_id, data, fase,
+                   mandante_placar, visitante_placar, 1 AS mando
+            FROM partidas
+            UNION ALL
+            SELECT visitante_id, ID, edicao_id, data, fase,
+                   mandante_placar, visitante_placar, 0
+            FROM partidas
+        )
+        ORDER BY clube_id, ID, mando
+    """),
+    ("explorar", """
+        SELECT DISTINCT '', clube_id
+        FROM (SELECT mandante_id AS clube_id FROM partidas
+              UNION SELECT visitante_id FROM partidas)
+        ORDER BY clube_id
+    """),
+)
+
+# Tabelas pré-calculadas que também aparecem nas páginas (podem não existir)
+FONTES_OPCIONAIS = (
+    ("clube", """
+        SELECT r.clube_id, r.rating_depois
+        FROM ratings_clubes r
+        JOIN (SELECT clube_id, MAX(ordem) AS ordem FROM ratings_clubes GROUP BY clube_id) u
+          ON r.clube_id = u.clube_id AND r.ordem = u.ordem
+        ORDER BY r.clube_id
+    """),
+)
+
+
+def versao_codigo():
+    """Hash dos arquivos do site e dos módulos compartilhados"""
+    h = hashlib.sha1()
+    for item in ARQUIVOS_CODIGO:
+        caminho = os.path.join(PASTA_SITE, item)
+        arquivos = [caminho] if os.path.isfile(caminho) else sorted(
+            os.path.join(raiz, nome)
+            for raiz, pastas, nomes in os.walk(caminho)
+            if "__pycache__" not in raiz
+            for nome in nomes if nome.endswith((".py", ".html"))
+        )
+        for arquivo in arquivos:
+            h.update(os.path.relpath(arquivo, PASTA_SITE).encode())
+            with open(arquivo, "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+def versao_referencias(referencias):
+    """Hash de clubes, edições, estádios, locais e campeonatos (aparecem em todas as páginas)"""
+    h = hashlib.sha1()
+    for tabela in (referencias.clubes, referencias.edicoes, referencias.estadios,
+                   referencias.locais, referencias.campeonatos):
+        for chave in sorted(tabela):
+            h.update(repr(sorted(tabela[chave].items())).encode())
+    return h.hexdigest()
+
+
+def calcular_impressoes(conn):
+    """{(tipo, chave): sha1} das linhas de origem de cada página"""
+    hashes = {}
+    fontes = list(FONTES)
+    for tipo, sql in FONTES_OPCIONAIS:
+        try:
+            conn.execute(sql + " LIMIT 0")
+            fontes.append((tipo, sql))
+        except sqlite3.OperationalError:
+            continue
+    for tipo, sql in fontes:
+        for linha in conn.execute(sql):
+            h = hashes.get((tipo, linha[0]))
+            if h is None:
+                h = hashes[(tipo, linha[0])] = hashlib.sha1()
+            h.update(repr(linha[1:]).encode())
+    return {chave: h.hexdigest() for chave, h in hashes.items()}
+
+
+def listar_paginas(conn, referencias):
+    """
+    [(url, tipo, chave)] de tudo que deve ser congelado. A temporada atual
+    fica de fora (muda a cada rodada e é servida pelo Flask).
+    """
+    paginas = [("/explorar", "explorar", "")]
+    for ano, edicao in sorted(referencias.edicao_por_ano.items()):
+        if ano == referencias.ano_atual:
+            continue
+        for url in (f"/temporada/{ano}",
+                    f"/api/temporada/{ano}/classificacao_por_rodada",
+                    f"/api/temporada/{ano}/lideres"):
+            paginas.append((url, "temporada", edicao["ID"]))
+    for clube in referencias.clubes.values():
+        nome = clube["clube"]
+        if not nome or "/" in nome:
+            continue
+        for url in (f"/clube/{nome}", f"/api/evolucao_clube/{nome}", f"/api/ratings/{nome}"):
+            paginas.append((url, "clube", clube["ID"]))
+    for estadio_id in referencias.estadios:
+        paginas.append((f"/estadio/{estadio_id}", "estadio", estadio_id))
+    for tipo, tabela in (("jogo", "partidas"), ("jogador", "jogadores"),
+                         ("arbitro", "arbitros"), ("treinador", "treinadores")):
+        for (entidade_id,) in conn.execute(f"SELECT ID FROM {tabela} ORDER BY ID"):
+            paginas.append((f"/{tipo}/{entidade_id}", tipo, entidade_id))
+    return paginas
+
+
+def caminho_arquivo(saida, url):
+    """/temporada/1971 → <saida>/temporada/1971/index.html; APIs → <url>.json"""
+    partes = url.strip("/").split("/")
+    if partes[0] == "api":
+        return os.path.join(saida, *partes[:-1], partes[-1] + ".json")
+    return os.path.join(saida, *partes, "index.html")
+
+
+# ==================== RENDERIZAÇÃO (processos) ====================
+
+_cliente = None
+
+
+def _iniciar_processo(banco):
+    """Cada processo importa o app apontando para o banco informado"""
+    global _cliente
+    os.environ["BD1971_DATABASE"] = os.path.abspath(banco)
+    sys.path.insert(0, PASTA_SITE)
+    import app as site_app
+    _cliente = site_app.app.test_client()
+
+
+def _renderizar(tarefas):
+    """Renderiza um lote [(url, arquivo)] e devolve [(url, status)]"""
+    resultados = []
+    for url, arquivo in tarefas:
+        resposta = _cliente.get(url)
+        if resposta.status_code == 200:
+            os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+            temporario = arquivo + ".tmp"
+            with open(temporario, "wb") as f:
+                f.write(resposta.get_data())
+            os.replace(temporario, arquivo)
+        resultados.append((url, resposta.status_code))
+    return resultados
+
+
+class Congelador:
+    def __init__(self, banco, saida, processos=None):
+        """
+        Args:
+            banco: Caminho para o arquivo .db do SQLite
+            saida: Pasta onde os arquivos estáticos são gravados
+            processos: Nº de processos de renderização (padrão: nº de CPUs)
+        """
+        self.banco = banco
+        self.saida = saida
+        self.processos = processos or os.cpu_count() or 1
+
+    def _ler_manifesto(self):
+        try:
+            with open(os.path.join(self.saida, MANIFESTO), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _gravar_manifesto(self, manifesto):
+        caminho = os.path.join(self.saida, MANIFESTO)
+        with open(caminho + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifesto, f, ensure_ascii=False, sort_keys=True)
+        os.replace(caminho + ".tmp", caminho)
+
+    def congelar(self, completo=False):
+        """
+        Renderiza as páginas novas ou alteradas (todas, com completo=True) e
+        apaga as que deixaram de existir. Retorna o nº de páginas gravadas.
+        """
+        conn = sqlite3.connect(self.banco)
+        try:
+            referencias = DadosReferencia(conn)
+            impressoes = calcular_impressoes(conn)
+            paginas = listar_paginas(conn, referencias)
+        finally:
+            conn.close()
+
+        prefixo = f"{versao_codigo()}:{versao_referencias(referencias)}:"
+        atual = {url: hashlib.sha1((prefixo + impressoes.get((tipo, chave), "")).encode()).hexdigest()
+                 for url, tipo, chave in paginas}
+        anterior = {} if completo else self._ler_manifesto()
+
+        pendentes = [url for url, impressao in atual.items()
+                     if anterior.get(url, [None])[0] != impressao]
+        removidas = [url for url in anterior if url not in atual]
+        print(f"📄 {len(atual)} página(s): {len(pendentes)} a renderizar, "
+              f"{len(atual) - len(pendentes)} sem alterações, {len(removidas)} removida(s)")
+
+        os.makedirs(self.saida, exist_ok=True)
+        shutil.copytree(os.path.join(PASTA_SITE, "static"), os.path.join(self.saida, "static"),
+                        dirs_exist_ok=True)
+
+        for url in removidas:
+            try:
+                os.remove(caminho_arquivo(self.saida, url))
+            except OSError:
+                pass
+
+        tarefas = [(url, caminho_arquivo(self.saida, url)) for url in pendentes]
+        tamanho_lote = max(1, min(200, len(tarefas) // (self.processos * 4) or 1))
+        lotes = [tarefas[i:i + tamanho_lote] for i in range(0, len(tarefas), tamanho_lote)]
+
+        resultados = []
+        if self.processos == 1 or len(lotes) <= 1:
+            _iniciar_processo(self.banco)
+            for lote in lotes:
+                resultados.extend(_renderizar(lote))
+        else:
+            with ProcessPoolExecutor(self.processos, initializer=_iniciar_processo,
+                                     initargs=(self.banco,)) as executor:
+                for parcial in executor.map(_renderizar, lotes):
+                    resultados.extend(parcial)
+
+        manifesto = {url: anterior[url] for url in atual if url in anterior}
+        gravadas = 0
+        falhas = 0
+        for url, status in resultados:
+            manifesto[url] = [atual[url], status]
+            if status == 200:
+                gravadas += 1
+                continue
+            # Sem arquivo estático: a URL continua indo ao Flask
+            falhas += 1
+            try:
+                os.remove(caminho_arquivo(self.saida, url))
+            except OSError:
+                pass
+        self._gravar_manifesto(manifesto)
+
+        print(f"✅ {gravadas} página(s) gravada(s) em {self.saida}")
+        if falhas:
+            print(f"⚠️  {falhas} página(s) não renderizada(s) (status diferente de 200); "
+                  "continuam sendo servidas pelo Flask")
+        return gravadas
+
+
+# ============================================
+# EXEMPLO DE USO (de dentro de site/, como o app)
+# ============================================
+#   python freeze.py                      → só páginas alteradas
+#   python freeze.py --completo           → renderiza tudo de novo
+#   python freeze.py --saida /srv/bd1971/build --processos 8
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera as páginas históricas do site como arquivos estáticos")
+    parser.add_argument("--banco", default="../bd/estruturado_bd_1971.db")
+    parser.add_argument("--saida", default="build")
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--completo", action="store_true",
+                        help="ignora o manifesto e renderiza todas as páginas")
+    args = parser.parse_args()
+
+    Congelador(args.banco, args.saida, args.processos).congelar(args.completo)
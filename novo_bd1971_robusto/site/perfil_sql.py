@@ -0,0 +1,297 @@
+import os
+import re
+import time
+import logging
+import sqlite3
+import hashlib
+import threading
+from collections import deque
+
+from flask import g, request, has_request_context, Response
+
+
+# ============================================
+# Perfil das consultas SQL do site
+# ============================================
+# Liga com BD1971_PERFIL_SQL=1. Desligado, o app usa sqlite3.connect puro e
+# nada daqui roda (custo zero).
+#
+# Ligado, a conexão de cada requisição mede cada comando:
+#   - texto normalizado (literais viram ?, espaços colapsados)
+#   - tempo (execute + fetch das linhas) e número de linhas devolvidas
+#   - plano (EXPLAIN QUERY PLAN) na primeira vez que o comando aparece
+# Comandos acima de BD1971_SQL_LENTA_MS (padrão 50 ms) vão para o log de
+# consultas lentas (BD1971_LOG_SQL_LENTA = arquivo; sem ele, stderr).
+# Percentis por rota e por comando ficam em /_metrics, no formato texto do
+# Prometheus.
+
+QUANTIS = (0.5, 0.9, 0.99)
+AMOSTRAS_POR_SERIE = 1024   # janela das últimas medições usada nos percentis
+TAMANHO_TEXTO_METRICA = 200
+
+RE_TEXTO = re.compile(r"'(?:[^']|'')*'")
+RE_NUMERO = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+RE_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+RE_ESPACOS = re.compile(r"\s+")
+
+
+def normalizar_sql(sql):
+    """SELECT * FROM t WHERE a = 3 AND b IN (1, 2)  →  SELECT * FROM t WHERE a = ? AND b IN (?...)"""
+    sql = RE_TEXTO.sub("?", sql)
+    sql = RE_NUMERO.sub("?", sql)
+    sql = RE_ESPACOS.sub(" ", sql).strip()
+    return RE_LISTA.sub("(?...)", sql)
+
+
+def id_consulta(normalizada):
+    return hashlib.sha1(normalizada.encode()).hexdigest()[:10]
+
+
+class Serie:
+    """Contagem, soma e janela das últimas medições de uma rota/comando"""
+
+    def __init__(self):
+        self.contagem = 0
+        self.soma = 0.0
+        self.amostras = deque(maxlen=AMOSTRAS_POR_SERIE)
+
+    def adicionar(self, valor):
+        self.contagem += 1
+        self.soma += valor
+        self.amostras.append(valor)
+
+    def quantis(self):
+        ordenadas = sorted(self.amostras)
+        if not ordenadas:
+            return {}
+        return {q: ordenadas[min(len(ordenadas) - 1, int(q * len(ordenadas)))] for q in QUANTIS}
+
+
+class Medicao:
+    __slots__ = ("sql", "normalizada", "parametros", "duracao", "linhas")
+
+    def __init__(self, sql, normalizada, parametros):
+        self.sql = sql
+        self.normalizada = normalizada
+        self.parametros = parametros
+        self.duracao = 0.0
+        self.linhas = 0
+
+
+class CursorPerfilado(sqlite3.Cursor):
+    """Soma na Medicao o tempo gasto buscando linhas e quantas vieram"""
+    medicao = None
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        linha = super().fetchone()
+        self.medicao.duracao += time.perf_counter() - inicio
+        if linha is not None:
+            self.medicao.linhas += 1
+        return linha
+
+    def fetchmany(self, size=None):
+        inicio = time.perf_counter()
+        linhas = super().fetchmany(self.arraysize if size is None else size)
+        self.medicao.duracao += time.perf_counter() - inicio
+        self.medicao.linhas += len(linhas)
+        return linhas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        linhas = super().fetchall()
+        self.medicao.duracao += time.perf_counter() - inicio
+        self.medicao.linhas += len(linhas)
+        return linhas
+
+    def __next__(self):
+        inicio = time.perf_counter()
+        try:
+            linha = super().__next__()
+        finally:
+            self.medicao.duracao += time.perf_counter() - inicio
+        self.medicao.linhas += 1
+        return linha
+
+
+class ConexaoPerfilada(sqlite3.Connection):
+    """
+    Conexão que registra cada execute(). As medições são entregues ao
+    Perfilador no close() (fim da requisição ou do fluxo da API v1).
+    """
+
+    def execute(self, sql, parametros=()):
+        normalizada = self.perfilador.normalizar(sql)
+        self.perfilador.ver_plano(self, normalizada, sql, parametros)
+
+        cursor = self.cursor(CursorPerfilado)
+        cursor.medicao = Medicao(sql, normalizada, parametros)
+        inicio = time.perf_counter()
+        cursor.execute(sql, parametros)
+        cursor.medicao.duracao += time.perf_counter() - inicio
+        self.medicoes.append(cursor.medicao)
+        return cursor
+
+    def close(self):
+        medicoes, self.medicoes = self.medicoes, []
+        self.perfilador.registrar_consultas(self.rota, medicoes)
+        super().close()
+
+
+class Perfilador:
+    def __init__(self, limite_lenta_ms=50.0, arquivo_log=None):
+        """
+        Args:
+            limite_lenta_ms: A partir de quantos ms um comando vai para o log de lentas
+            arquivo_log: Arquivo do log de lentas (None = stderr)
+        """
+        self.limite_lenta = limite_lenta_ms / 1000.0
+        self._lock = threading.Lock()
+        self._normalizadas = {}
+        self.planos = {}
+        self.rotas = {}
+        self.consultas_por_requisicao = {}
+        self.comandos = {}
+        self.linhas_por_comando = {}
+        self.lentas = 0
+
+        self.log = logging.getLogger("bd1971.sql_lenta")
+        self.log.setLevel(logging.WARNING)
+        self.log.propagate = False
+        if not self.log.handlers:
+            handler = logging.FileHandler(arquivo_log, encoding="utf-8") if arquivo_log \
+                else logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.log.addHandler(handler)
+
+    @classmethod
+    def do_ambiente(cls):
+        """Perfilador configurado pelas variáveis de ambiente, ou None se desligado"""
+        if os.environ.get("BD1971_PERFIL_SQL", "").lower() not in ("1", "true", "sim"):
+            return None
+        return cls(float(os.environ.get("BD1971_SQL_LENTA_MS", "50")),
+                   os.environ.get("BD1971_LOG_SQL_LENTA") or None)
+
+    # ---------- conexões ----------
+
+    def conectar(self, caminho, rota=None):
+        """Conexão perfilada; `rota` rotula as medições (padrão: endpoint da requisição atual)"""
+        conn = sqlite3.connect(caminho, factory=ConexaoPerfilada)
+        conn.perfilador = self
+        conn.medicoes = []
+        if rota is None:
+            rota = (request.endpoint or "?") if has_request_context() else "-"
+        conn.rota = rota
+        return conn
+
+    def normalizar(self, sql):
+        normalizada = self._normalizadas.get(sql)
+        if normalizada is None:
+            normalizada = self._normalizadas[sql] = normalizar_sql(sql)
+        return normalizada
+
+    def ver_plano(self, conn, normalizada, sql, parametros):
+        """Guarda o EXPLAIN QUERY PLAN na primeira vez que o comando aparece"""
+        if normalizada in self.planos:
+            return
+        plano = ""
+        if normalizada.split(" ", 1)[0].upper() in ("SELECT", "WITH"):
+            try:
+                linhas = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, parametros).fetchall()
+                plano = " | ".join(str(linha[-1]) for linha in linhas)
+            except sqlite3.Error as e:
+                plano = f"(sem plano: {e})"
+        self.planos[normalizada] = plano
+
+    # ---------- registro ----------
+
+    def registrar_consultas(self, rota, medicoes):
+        if not medicoes:
+            return
+        with self._lock:
+            for m in medicoes:
+                chave = id_consulta(m.normalizada)
+                if chave not in self.comandos:
+                    self.comandos[chave] = (m.normalizada, Serie())
+                    self.linhas_por_comando[chave] = 0
+                self.comandos[chave][1].adicionar(m.duracao)
+                self.linhas_por_comando[chave] += m.linhas
+        for m in medicoes:
+            if m.duracao >= self.limite_lenta:
+                with self._lock:
+                    self.lentas += 1
+                self.log.warning(
+                    "rota=%s tempo=%.1fms linhas=%d consulta=%s sql=%s parametros=%r plano=%s",
+                    rota, m.duracao * 1000, m.linhas, id_consulta(m.normalizada),
+                    m.normalizada, m.parametros, self.planos.get(m.normalizada, ""))
+
+    def registrar_requisicao(self, rota, duracao, n_consultas):
+        with self._lock:
+            self.rotas.setdefault(rota, Serie()).adicionar(duracao)
+            self.consultas_por_requisicao.setdefault(rota, Serie()).adicionar(n_consultas)
+
+    # ---------- Flask ----------
+
+    def instalar(self, app):
+        """Mede cada requisição e publica /_metrics"""
+
+        @app.before_request
+        def _inicio_perfil():
+            g._perfil_inicio = time.perf_counter()
+
+        @app.teardown_request
+        def _fim_perfil(erro=None):
+            inicio = g.pop("_perfil_inicio", None)
+            if inicio is None:
+                return
+            db = g.get("db")
+            n_consultas = len(db.medicoes) if isinstance(db, ConexaoPerfilada) else 0
+            self.registrar_requisicao(request.endpoint or "?", time.perf_counter() - inicio, n_consultas)
+
+        @app.route("/_metrics")
+        def _metrics():
+            return Response(self.exportar(), mimetype="text/plain; version=0.0.4")
+
+    # ---------- Prometheus ----------
+
+    def exportar(self):
+        """Métricas no formato texto do Prometheus"""
+        linhas = []
+
+        def resumo(nome, ajuda, series, rotulo):
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} summary")
+            for valor_rotulo, serie in sorted(series.items()):
+                r = f'{rotulo}="{escapar_rotulo(valor_rotulo)}"'
+                for q, valor in serie.quantis().items():
+                    linhas.append(f'{nome}{{{r},quantile="{q}"}} {valor:.6g}')
+                linhas.append(f"{nome}_sum{{{r}}} {serie.soma:.6g}")
+                linhas.append(f"{nome}_count{{{r}}} {serie.contagem}")
+
+        with self._lock:
+            resumo("bd1971_requisicao_segundos", "Tempo de resposta por rota",
+                   self.rotas, "rota")
+            resumo("bd1971_consultas_por_requisicao", "Comandos SQL executados por requisição",
+                   self.consultas_por_requisicao, "rota")
+            resumo("bd1971_sql_segundos", "Tempo de cada comando SQL (execute + fetch)",
+                   {chave: serie for chave, (_, serie) in self.comandos.items()}, "consulta")
+
+            linhas.append("# HELP bd1971_sql_linhas_total Linhas devolvidas por comando SQL")
+            linhas.append("# TYPE bd1971_sql_linhas_total counter")
+            for chave, total in sorted(self.linhas_por_comando.items()):
+                linhas.append(f'bd1971_sql_linhas_total{{consulta="{chave}"}} {total}')
+
+            linhas.append("# HELP bd1971_sql_info Texto normalizado de cada comando SQL")
+            linhas.append("# TYPE bd1971_sql_info gauge")
+            for chave, (normalizada, _) in sorted(self.comandos.items()):
+                texto = escapar_rotulo(normalizada[:TAMANHO_TEXTO_METRICA])
+                linhas.append(f'bd1971_sql_info{{consulta="{chave}",texto="{texto}"}} 1')
+
+            linhas.append("# HELP bd1971_sql_lentas_total Comandos acima do limite de consulta lenta")
+            linhas.append("# TYPE bd1971_sql_lentas_total counter")
+            linhas.append(f"bd1971_sql_lentas_total {self.lentas}")
+        return "\n".join(linhas) + "\n"
+
+
+def escapar_rotulo(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
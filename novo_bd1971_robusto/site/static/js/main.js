@@ -14,6 +14,7 @@ document.addEventListener('DOMContentLoaded', function() {
     inicializarBuscaDinamica();
     inicializarAnimacoes();
     inicializarTooltips();
+    inicializarListasPaginadas();
 });
 
 // ==================== BUSCA DINÂMICA ====================
@@ -375,6 +376,88 @@ function inicializarTooltips() {
     });
 }
 
+// ==================== LISTAS PAGINADAS ====================
+
+/**
+ * Listas de partidas longas (jogador, árbitro, treinador, estádio) vêm do
+ * servidor só com a primeira página. Quando o fim da lista aparece na tela,
+ * buscamos a próxima página na API usando o cursor guardado em data-proximo
+ * ("<edicao_id>,<partida_id>" da última partida já mostrada).
+ *
+ * Marcação esperada:
+ *   <div class="lista-paginada" data-url="/api/..." data-proximo="2,480">
+ *       <div class="jogos-lista">...cards...</div>
+ *       <button class="lista-carregar-mais">Carregar mais</button>
+ *   </div>
+ */
+function inicializarListasPaginadas() {
+    document.querySelectorAll('.lista-paginada').forEach(function(lista) {
+        const itens = lista.querySelector('.jogos-lista');
+        const botao = lista.querySelector('.lista-carregar-mais');
+        let carregando = false;
+
+        async function carregarMais() {
+            const cursor = lista.dataset.proximo;
+            if (!cursor || carregando) return;
+            carregando = true;
+
+            try {
+                const url = `${lista.dataset.url}?after=${encodeURIComponent(cursor)}`;
+                const resposta = await fetch(url);
+                const dados = await resposta.json();
+
+                dados.partidas.forEach(function(partida) {
+                    itens.insertAdjacentHTML('beforeend', cardPartida(partida));
+                });
+                lista.dataset.proximo = dados.proximo || '';
+            } catch (erro) {
+                console.error('Erro ao carregar partidas:', erro);
+            } finally {
+                carregando = false;
+                if (!lista.dataset.proximo && botao) botao.remove();
+            }
+        }
+
+        if (botao) botao.addEventListener('click', carregarMais);
+
+        // Carrega sozinho ao rolar até o fim da lista
+        if (botao && 'IntersectionObserver' in window) {
+            new IntersectionObserver(function(entradas) {
+                if (entradas.some(e => e.isIntersecting)) carregarMais();
+            }, { rootMargin: '200px' }).observe(botao);
+        }
+    });
+}
+
+/**
+ * Mesmo card de partida renderizado pelo template (macro card_partida).
+ */
+function cardPartida(p) {
+    const escapar = texto => String(texto ?? '').replace(/[&<>"]/g,
+        c => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' }[c]));
+    const detalhe = p.detalhe ? `<span class="rodada">${escapar(p.detalhe)}</span>` : '';
+
+    return `
+        <a href="/jogo/${p.partida_id}" class="jogo-card-link">
+            <div class="jogo-card">
+                <div class="jogo-data">
+                    <span class="data">${escapar(p.data)}</span>
+                    <span class="ano">${escapar(p.ano)}</span>
+                    ${detalhe}
+                </div>
+                <div class="jogo-placar">
+                    <div class="time time-mandante"><span class="nome-time">${escapar(p.mandante)}</span></div>
+                    <div class="placar">
+                        <span class="gols">${escapar(p.mandante_placar)}</span>
+                        <span class="separador">×</span>
+                        <span class="gols">${escapar(p.visitante_placar)}</span>
+                    </div>
+                    <div class="time time-visitante"><span class="nome-time">${escapar(p.visitante)}</span></div>
+                </div>
+            </div>
+        </a>`;
+}
+
 // ==================== FUNÇÕES UTILITÁRIAS ====================
 
 /**